@@ -0,0 +1,77 @@
+"""Хранение и сравнение базовых результатов бенчмарков"""
+import json
+import platform
+import sys
+from datetime import datetime
+from pathlib import Path
+
+BASELINES_DIR = Path(__file__).parent / "baselines"
+
+
+def load_baseline(path):
+    """Загружает базовые результаты или возвращает None, если файла нет"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, **metadata):
+    """Сохраняет результаты как новую базу вместе с описанием окружения"""
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+    data = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        **metadata,
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+    return path
+
+
+def compare(results, baseline, metrics, tolerance_percent, tolerance_overrides=None):
+    """
+    Сравнивает результаты с базой
+
+    Args:
+        results: {имя_бенчмарка: {метрика: значение}}
+        baseline: Загруженная база (см. save_baseline)
+        metrics: Метрики для сравнения (чем меньше, тем лучше)
+        tolerance_percent: Допустимое ухудшение в процентах
+        tolerance_overrides: Допустимое ухудшение для отдельных бенчмарков {имя: проценты}
+
+    Returns:
+        Список строк с описанием регрессий
+    """
+    regressions = []
+    base_results = (baseline or {}).get("results", {})
+    for name, values in results.items():
+        base_values = base_results.get(name)
+        if not base_values:
+            continue
+        tolerance = (tolerance_overrides or {}).get(name, tolerance_percent)
+        for metric in metrics:
+            current, base = values.get(metric), base_values.get(metric)
+            if current is None or not base:
+                continue
+            change = (current - base) / base * 100
+            if change > tolerance:
+                regressions.append(f"{name}.{metric}: {base:.4g} -> {current:.4g} (+{change:.1f}% > {tolerance}%)")
+    return regressions
+
+
+def format_comparison(results, baseline, metric):
+    """Форматирует таблицу результатов с изменением относительно базы"""
+    base_results = (baseline or {}).get("results", {})
+    lines = [f"{'Бенчмарк':<40}{metric:>14}{'база':>14}{'изменение':>12}"]
+    for name, values in results.items():
+        current = values[metric]
+        base = base_results.get(name, {}).get(metric)
+        change = f"{(current - base) / base * 100:+.1f}%" if base else "-"
+        base_text = f"{base:.4g}" if base else "-"
+        lines.append(f"{name:<40}{current:>14.4g}{base_text:>14}{change:>12}")
+    return "\n".join(lines)
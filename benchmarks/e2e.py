@@ -0,0 +1,111 @@
+"""End-to-end бенчмарк библиотеки на локальном стенде магазина в headless-браузере.
+
+Запуск:
+    python -m benchmarks.e2e --repetitions 5                # сравнение с базой
+    python -m benchmarks.e2e --repetitions 10 --save-baseline
+
+Без сохраненной базы (benchmarks/baselines/e2e.json) сравнивать не с чем: скрипт
+сообщает об этом и завершается с кодом 2, ее нужно записать на машине с браузером.
+"""
+import argparse
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.baseline import BASELINES_DIR, compare, format_comparison, load_baseline, save_baseline
+from examples.amazon.pages import AmazonHomePage
+from examples.amazon.stand_in_shop import StandInShop
+from page_object_library import DriverFactory, PageFactory, setup_logger
+
+BASELINE_PATH = BASELINES_DIR / "e2e.json"
+METRICS = ("median",)
+
+
+class StepTimer:
+    """Замеряет длительность шагов сценария"""
+
+    def __init__(self):
+        self.durations = defaultdict(list)
+
+    def measure(self, name, func, *args, **kwargs):
+        start_time = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.durations[name].append(time.perf_counter() - start_time)
+        return result
+
+    def results(self):
+        return {
+            name: {
+                "median": statistics.median(values),
+                "min": min(values),
+                "max": max(values),
+                "runs": len(values),
+            }
+            for name, values in self.durations.items()
+        }
+
+
+def shopping_flow(page_factory, timer, query="levoit air purifier"):
+    """Основной сценарий: открыть сайт, найти товар, добавить в корзину, изменить количество"""
+    home_page = timer.measure("open", page_factory.create_new_page(AmazonHomePage).open)
+    search_results = timer.measure("search", home_page.header.search, query)
+    product_page = timer.measure("select_product", search_results.select_product, 0)
+    timer.measure("add_to_cart", product_page.add_to_cart)
+    cart_page = timer.measure("open_cart", product_page.header.go_to_cart)
+    cart_items = timer.measure("get_cart_items", cart_page.get_cart_items)
+    timer.measure("cart_quantity_change", cart_items[0].increase_quantity)
+    subtotal = timer.measure("get_subtotal", cart_page.get_subtotal_as_float)
+    return subtotal
+
+
+def run(repetitions, latency=0.0, browser_type="chrome", warmup=1):
+    """Запускает сценарий указанное количество раз и возвращает статистику по шагам"""
+    timer = StepTimer()
+    with StandInShop(latency=latency) as shop:
+        driver = DriverFactory.create_driver(browser_type, headless=True, driver_name="benchmark")
+        try:
+            page_factory = PageFactory(driver, base_url=shop.url, driver_name="benchmark")
+            for iteration in range(warmup + repetitions):
+                shop.state.reset()
+                driver.delete_all_cookies()
+                flow_timer = timer if iteration >= warmup else StepTimer()
+                flow_timer.measure("total", shopping_flow, page_factory, flow_timer)
+        finally:
+            driver.quit()
+    return timer.results()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.e2e", description=__doc__.splitlines()[0])
+    parser.add_argument("--repetitions", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="Задержка ответов стенда в секундах")
+    parser.add_argument("--browser-type", default="chrome")
+    parser.add_argument("--tolerance", type=float, default=20.0, help="Допустимое ухудшение медианы в процентах")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    setup_logger(log_dir="logs", log_to_console=False, log_prefix="benchmark_e2e")
+    results = run(args.repetitions, args.latency, args.browser_type, args.warmup)
+    baseline = load_baseline(args.baseline)
+    print(format_comparison(results, baseline, "median"))
+
+    if args.save_baseline:
+        path = save_baseline(args.baseline, results, browser=args.browser_type, latency=args.latency)
+        print(f"База сохранена: {path}")
+        return 0
+
+    if baseline is None:
+        print(f"Нет базы для сравнения: {args.baseline}. Запишите ее с --save-baseline")
+        return 2
+
+    regressions = compare(results, baseline, METRICS, args.tolerance)
+    for regression in regressions:
+        print(f"РЕГРЕССИЯ {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""Микробенчмарки горячих путей библиотеки на чистом Python (без браузера).
+
+Запуск:
+    python -m benchmarks.micro                       # сравнение с базой, код 1 при регрессии
+    python -m benchmarks.micro --save-baseline
+    python -m benchmarks.micro --filter auto_log --tolerance 30
+
+Время зависит от машины, поэтому вместе с результатами замеряется калибровочный цикл
+на чистом Python: при сравнении время из базы умножается на отношение калибровок текущей
+машины и машины, где записана база. Так база, записанная на одной машине, годится и для CI.
+"""
+import argparse
+import gc
+import logging
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+from selenium.webdriver.common.by import By
+
+from benchmarks.baseline import BASELINES_DIR, compare, format_comparison, load_baseline, save_baseline
+from page_object_library import BaseElement, BasePage, Button, PageFactory, auto_log
+from page_object_library.core.locator import LocatorMeta
+from page_object_library.testing import SnapshotDriver
+from page_object_library.utils.decorators import format_param_value
+from examples.amazon.pages import AmazonCartPage
+
+BASELINE_PATH = BASELINES_DIR / "micro.json"
+METRICS = ("ns_per_op",)
+
+
+class BenchmarkDriver:
+    """
+    Минимальный драйвер без браузера
+
+    Каждая команда занимает round_trip секунд, как запрос к локальному chromedriver,
+    поэтому лишние запросы к браузеру видны в результатах, а не скрыты мгновенным ответом.
+    """
+    current_url = "http://localhost/"
+    title = "Benchmark"
+    round_trip = 0.0002
+
+    def __init__(self):
+        self.document_id = 0
+
+    def execute_script(self, script, *args):
+        self._round_trip()
+        if "readyState" in script:
+            return "complete"
+        return [self.current_url, f"document-{self.document_id}"]
+
+    def get(self, url):
+        self._round_trip()
+        self.current_url = url
+        self.document_id += 1
+
+    def _round_trip(self):
+        # Занятое ожидание: time.sleep на интервалах в доли миллисекунды слишком неточен
+        deadline = time.perf_counter() + self.round_trip
+        while time.perf_counter() < deadline:
+            pass
+
+
+class BenchmarkPage(BasePage):
+    SEARCH_INPUT = (By.ID, "twotabsearchtextbox")
+
+    def _init_elements(self):
+        self.search_button = Button(self, (By.ID, "nav-search-submit-button"), "Кнопка поиска")
+
+    @auto_log
+    def select_product(self, index=0, search_text="levoit air purifier"):
+        return index
+
+
+class _QuietHandler(logging.Handler):
+    """Обработчик, принимающий записи без вывода: измеряется стоимость формирования логов, а не диска"""
+
+    def emit(self, record):
+        pass
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable
+    number: int
+    noise_factor: float = 1.0  # Множитель допуска для шумных бенчмарков
+    normalized: bool = True  # False - время задано имитацией задержки и от скорости машины не зависит
+
+
+def create_page_class():
+    return LocatorMeta("GeneratedPage", (BasePage,), {
+        "__module__": __name__,
+        "LOGIN_BUTTON": (By.ID, "signInSubmit"),
+        "EMAIL_INPUT": (By.ID, "ap_email"),
+        "PASSWORD_FIELD": (By.NAME, "password"),
+        "ERROR_MESSAGE": (By.CSS_SELECTOR, ".a-alert-error"),
+        "NAV_CART_LINK": (By.XPATH, "//a[@id='nav-cart']"),
+        "login": lambda self, email, password: self,
+    })
+
+
+def build_cart_html(items=20):
+    """Корзина в разметке Amazon: items товаров и промежуточная сумма"""
+    rows = "".join(
+        f'<div class="a-row sc-list-item" data-asin="B0{index:08d}">'
+        f'<span class="a-truncate-cut">Product {index}</span>'
+        f'<span class="a-size-medium sc-price">${index}.99</span>'
+        f'<input type="submit" data-action="increase-quantity" value="+"></div>'
+        for index in range(items)
+    )
+    return (f'<html><head><title>Amazon.com Shopping Cart</title></head><body><form>{rows}</form>'
+            f'<span id="sc-subtotal-amount-activecart"><span class="sc-price">$1,234.56</span></span></body></html>')
+
+
+def build_benchmarks():
+    driver = BenchmarkDriver()
+    page = BenchmarkPage(driver, base_url="http://localhost", driver_name="benchmark")
+    factory = PageFactory(driver, base_url="http://localhost", driver_name="benchmark")
+    # Кеш хранит слабые ссылки: без сильной ссылки страница удаляется и каждый вызов становится промахом
+    cached_page = factory.create_page(BenchmarkPage)
+    # Попадание в кеш для открытой страницы проверяет документ одним запросом к браузеру
+    opened_factory = PageFactory(driver, base_url="http://localhost", driver_name="benchmark")
+    opened_page = opened_factory.create_page(BenchmarkPage).open()
+    locator = BenchmarkPage.SEARCH_INPUT
+    snapshot_driver = SnapshotDriver({AmazonCartPage.DEFAULT_URL: build_cart_html()}, base_url="http://localhost")
+    snapshot_driver.get(AmazonCartPage.DEFAULT_URL)
+
+    return [
+        # Создание классов зависит от состояния сборщика мусора и заметно шумит
+        Benchmark("locator_meta_new", create_page_class, 500, noise_factor=2.0),
+        Benchmark("generate_description", lambda: LocatorMeta._generate_description(
+            "SEARCH_SUBMIT_BUTTON", By.CSS_SELECTOR, "#nav-search-submit-button"), 20000),
+        Benchmark("auto_log_call", lambda: page.select_product(1), 5000),
+        Benchmark("format_param_value_str", lambda: format_param_value("search_text", "levoit air purifier"), 50000),
+        Benchmark("format_param_value_locator", lambda: format_param_value("locator", locator), 50000),
+        Benchmark("format_param_value_tuple", lambda: format_param_value("locator", (By.ID, "add-to-cart-button")), 50000),
+        Benchmark("page_factory_create_cached", lambda page=cached_page: factory.create_page(BenchmarkPage), 20000),
+        Benchmark("page_factory_create_cached_opened",
+                  lambda page=opened_page: opened_factory.create_page(BenchmarkPage), 500, normalized=False),
+        Benchmark("page_factory_create_new", lambda: factory.create_new_page(BenchmarkPage), 5000),
+        Benchmark("base_element_init", lambda: BaseElement(page, (By.ID, "nav-cart"), "Иконка корзины"), 50000),
+        Benchmark("snapshot_cart_subtotal", lambda: AmazonCartPage(
+            snapshot_driver, base_url="http://localhost", driver_name="benchmark").get_subtotal_as_float(), 1000),
+    ]
+
+
+def measure_time(func, number, repeat):
+    """Лучшее время одной операции в наносекундах из repeat прогонов по number вызовов"""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter_ns()
+            for _ in range(number):
+                func()
+            elapsed = time.perf_counter_ns() - start
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best / number
+
+
+def measure_allocations(func, samples=200):
+    """
+    Память на операцию по данным tracemalloc
+
+    Returns:
+        (пиковый прирост памяти за одну операцию в байтах, удерживаемая память на операцию в байтах)
+    """
+    tracemalloc.start()
+    try:
+        func()
+        peaks = []
+        start_current, _ = tracemalloc.get_traced_memory()
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - current)
+        end_current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks), max(end_current - start_current, 0) / samples
+
+
+def calibration_workload():
+    """Эталонная нагрузка: вызовы, словари, строки и мелкие объекты, как в горячих путях библиотеки"""
+    counts = {}
+    for index in range(1000):
+        key = f"key{index % 50}"
+        counts[key] = counts.get(key, 0) + len((key, index))
+    return counts
+
+
+def calibrate(repeat=5):
+    """Время калибровочного цикла в наносекундах на этой машине"""
+    return round(measure_time(calibration_workload, 200, repeat), 1)
+
+
+def normalize_baseline(baseline, calibration_ns, skip=()):
+    """
+    Пересчитывает ns_per_op базы на скорость текущей машины
+
+    Args:
+        baseline: Загруженная база с calibration_ns машины, где она записана
+        calibration_ns: Калибровка текущей машины (см. calibrate)
+        skip: Бенчмарки, время которых от скорости машины не зависит
+
+    Returns:
+        База с пересчитанным временем (исходная, если в ней нет калибровки)
+    """
+    if not baseline or not baseline.get("calibration_ns"):
+        return baseline
+    factor = calibration_ns / baseline["calibration_ns"]
+    results = {
+        name: dict(values, ns_per_op=values["ns_per_op"] * factor)
+        if name not in skip and "ns_per_op" in values else values
+        for name, values in baseline.get("results", {}).items()
+    }
+    return dict(baseline, results=results)
+
+
+def run(name_filter=None, repeat=5, scale=1.0, names=None):
+    """Запускает микробенчмарки (только names, если заданы) и возвращает {имя: метрики}"""
+    root_logger = logging.getLogger()
+    saved_handlers, saved_level = root_logger.handlers[:], root_logger.level
+    root_logger.handlers = [_QuietHandler()]
+    root_logger.setLevel(logging.INFO)
+
+    results = {}
+    try:
+        for benchmark in build_benchmarks():
+            if name_filter and name_filter not in benchmark.name or names is not None and benchmark.name not in names:
+                continue
+            number = max(int(benchmark.number * scale), 1)
+            benchmark.func()
+            ns_per_op = measure_time(benchmark.func, number, repeat)
+            peak_bytes, retained_bytes = measure_allocations(benchmark.func)
+            results[benchmark.name] = {
+                "ns_per_op": round(ns_per_op, 1),
+                "peak_bytes_per_op": round(peak_bytes, 1),
+                "retained_bytes_per_op": round(retained_bytes, 1),
+            }
+    finally:
+        root_logger.handlers = saved_handlers
+        root_logger.setLevel(saved_level)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.micro", description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default=None, help="Запускать только бенчмарки, содержащие подстроку")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="Множитель количества вызовов")
+    parser.add_argument("--tolerance", type=float, default=25.0, help="Допустимое ухудшение в процентах")
+    parser.add_argument("--metrics", default=",".join(METRICS),
+                        help="Сравниваемые метрики через запятую (ns_per_op, peak_bytes_per_op, retained_bytes_per_op)")
+    parser.add_argument("--confirm-runs", type=int, default=2,
+                        help="Сколько раз перемерять бенчмарки с регрессией, прежде чем признать ее")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    # Калибровка до и после прогона: лучший результат не искажается временным замедлением машины
+    calibration_ns = calibrate(args.repeat)
+    results = run(args.filter, args.repeat, args.scale)
+    calibration_ns = min(calibration_ns, calibrate(args.repeat))
+    benchmarks = build_benchmarks()
+    baseline = load_baseline(args.baseline)
+    if baseline and baseline.get("calibration_ns"):
+        print(f"Калибровка: {calibration_ns:.4g} нс, в базе {baseline['calibration_ns']:.4g} нс; "
+              f"время базы пересчитано с множителем {calibration_ns / baseline['calibration_ns']:.2f}")
+    elif baseline:
+        print("В базе нет калибровки: время сравнивается без поправки на машину, перезапишите базу")
+    baseline = normalize_baseline(baseline, calibration_ns,
+                                  {benchmark.name for benchmark in benchmarks if not benchmark.normalized})
+    print(format_comparison(results, baseline, "ns_per_op"))
+    print()
+    print(format_comparison(results, baseline, "peak_bytes_per_op"))
+
+    if args.save_baseline:
+        path = save_baseline(args.baseline, results, calibration_ns=calibration_ns)
+        print(f"База сохранена: {path}")
+        return 0
+
+    overrides = {benchmark.name: args.tolerance * benchmark.noise_factor
+                 for benchmark in benchmarks if benchmark.noise_factor != 1.0}
+    metrics = args.metrics.split(",")
+    regressions = compare(results, baseline, metrics, args.tolerance, overrides)
+    for _ in range(args.confirm_runs):
+        if not regressions:
+            break
+        # Общая машина CI замедляется рывками: регрессия засчитывается, только если повторяется при перемере
+        suspects = {regression.split(".", 1)[0] for regression in regressions}
+        print(f"Перемер: {', '.join(sorted(suspects))}")
+        for name, values in run(args.filter, args.repeat, args.scale, names=suspects).items():
+            results[name] = {metric: min(value, results[name][metric]) for metric, value in values.items()}
+        regressions = compare(results, baseline, metrics, args.tolerance, overrides)
+    for regression in regressions:
+        print(f"РЕГРЕССИЯ {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -59,6 +59,10 @@ class HeaderComponent(ElementGroup):
         self.account_menu.click()
         return self
 
+    def is_signed_in(self):
+        """Выполнен ли вход: для гостя меню аккаунта предлагает войти ("Hello, sign in")"""
+        return "sign in" not in self.account_menu.get_text().lower()
+
 
 class CartItemComponent(ElementGroup):
     """Компонент элемента корзины"""
@@ -0,0 +1,41 @@
+"""Сценарии нагрузки на основе page objects Amazon.
+
+Запуск против локального стенда:
+    python -m page_object_library.load examples.amazon.load_scenarios --users 5 --duration 60 --ramp-up 10
+"""
+from page_object_library.load import Scenario
+from examples.amazon.pages import AmazonHomePage, AmazonCartPage
+
+SEARCH_QUERIES = ["levoit air purifier", "usb c cable", "coffee grinder", "desk lamp"]
+
+
+def browse_and_search(user):
+    """Открывает главную страницу и ищет случайный товар"""
+    home_page = user.create_page(AmazonHomePage)
+    home_page.open()
+    home_page.header.search(user.random.choice(SEARCH_QUERIES))
+
+
+def search_and_add_to_cart(user):
+    """Ищет товар, открывает его карточку и добавляет в корзину"""
+    home_page = user.create_page(AmazonHomePage)
+    home_page.open()
+    search_results = home_page.header.search(user.random.choice(SEARCH_QUERIES))
+    product_page = search_results.select_product(0)
+    product_page.get_product_price_as_float()
+    product_page.add_to_cart()
+
+
+def view_cart(user):
+    """Открывает корзину и читает промежуточную сумму"""
+    cart_page = user.create_page(AmazonCartPage)
+    cart_page.open()
+    if cart_page.get_cart_items_count():
+        cart_page.get_subtotal_as_float()
+
+
+SCENARIOS = [
+    Scenario("browse_and_search", browse_and_search, weight=5),
+    Scenario("search_and_add_to_cart", search_and_add_to_cart, weight=2),
+    Scenario("view_cart", view_cart, weight=3),
+]
@@ -26,6 +26,22 @@ class AmazonLoginPage(BasePage):
         self.sign_in_button.click()
         return self.navigate_to(AmazonHomePage)
 
+    def sign_in(self, lease):
+        """
+        Входит под арендованным аккаунтом (AccountLease)
+
+        Если у аккаунта есть действующий снимок сессии, вход через форму не выполняется.
+        """
+        def login(account):
+            self.open()
+            return self.login(account.email, account.password)
+
+        def is_signed_in():
+            return self.navigate_to(AmazonHomePage).header.is_signed_in()
+
+        home_page = lease.sign_in(self.driver, self.base_url, login, is_signed_in)
+        return home_page or self.navigate_to(AmazonHomePage)
+
 
 class AmazonHomePage(BasePage):
 
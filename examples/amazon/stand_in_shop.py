@@ -0,0 +1,386 @@
+"""Локальный стенд магазина, повторяющий DOM Amazon, используемый в примерах page objects.
+
+Запуск:
+    python -m examples.amazon.stand_in_shop --port 8000 --latency 0.05
+
+Затем тесты и нагрузку можно направить на стенд: --base-url http://127.0.0.1:8000
+"""
+import argparse
+import html
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, quote_plus, urlparse
+
+
+@dataclass
+class Product:
+    asin: str
+    title: str
+    price: float
+
+
+PRODUCTS = [
+    Product("B07VVK39F7", "LEVOIT Air Purifier for Home Allergies Pets Hair in Bedroom, H13 True HEPA Filter", 99.99),
+    Product("B08KWLTX9Z", "LEVOIT Air Purifiers for Home Large Room, Smart WiFi Alexa Control, Core 300S", 149.99),
+    Product("B0BNKXJ2FV", "LEVOIT Air Purifier Replacement Filter, 3-in-1 H13 True HEPA", 1249.50),
+    Product("B01GGKYKQM", "USB C Cable 6ft, Fast Charging Braided Cord", 8.99),
+    Product("B077JBQZPX", "Electric Coffee Grinder for Beans, Spices and More", 19.95),
+    Product("B08F9JQ5N3", "LED Desk Lamp with Wireless Charger, USB Charging Port", 39.99),
+]
+PRODUCTS_BY_ASIN = {product.asin: product for product in PRODUCTS}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<header id="navbar">
+  <form id="nav-search-bar-form" method="get" action="/s">
+    <input type="text" id="twotabsearchtextbox" name="k" value="{query}">
+    <input type="submit" id="nav-search-submit-button" value="Go">
+  </form>
+  <a id="nav-link-accountList" href="/ap/signin">Hello, {user}</a>
+  <a id="nav-orders" href="/gp/css/order-history">Returns &amp; Orders</a>
+  <a id="nav-cart" href="/gp/cart/view.html"><span id="nav-cart-count">{cart_count}</span> Cart</a>
+</header>
+<main>
+{content}
+</main>
+</body></html>
+"""
+
+
+def format_price(value: float) -> str:
+    return f"${value:,.2f}"
+
+
+class ShopState:
+    """Состояние стенда: корзины и пользователи сессий"""
+
+    def __init__(self):
+        self.carts: Dict[str, Dict[str, int]] = {}
+        self.users: Dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    def reset(self, session_id: Optional[str] = None, keep_users=False):
+        """Сбрасывает состояние одной сессии или всего стенда; keep_users оставляет вход выполненным"""
+        with self.lock:
+            if session_id is None:
+                self.carts.clear()
+                if not keep_users:
+                    self.users.clear()
+            else:
+                self.carts.pop(session_id, None)
+                if not keep_users:
+                    self.users.pop(session_id, None)
+
+
+class StandInShopHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов стенда"""
+    server_version = "StandInShop/1.0"
+
+    # Устанавливаются сервером
+    state: ShopState = None
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- Инфраструктура ---
+
+    def _session(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        if "session-id" in cookie:
+            return cookie["session-id"].value, False
+        return uuid.uuid4().hex, True
+
+    def _send(self, status, body="", content_type="text/html; charset=utf-8", headers=None):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        if self._new_session:
+            self.send_header("Set-Cookie", f"session-id={self._session_id}; Path=/")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _redirect(self, location):
+        self._send(303, headers={"Location": location})
+
+    def _render(self, title, content, query=""):
+        with self.state.lock:
+            cart_count = sum(self.state.carts.get(self._session_id, {}).values())
+            user = self.state.users.get(self._session_id, "sign in")
+        self._send(200, PAGE_TEMPLATE.format(
+            title=html.escape(title),
+            query=html.escape(query),
+            user=html.escape(user),
+            cart_count=cart_count,
+            content=content
+        ))
+
+    def _form(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length).decode("utf-8")
+        return {name: values[0] for name, values in parse_qs(data).items()}
+
+    def _handle(self, method):
+        if self.latency:
+            time.sleep(self.latency)
+
+        self._session_id, self._new_session = self._session()
+        url = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        form = self._form() if method == "POST" else {}
+
+        routes = {
+            ("GET", "/"): self.home,
+            ("GET", "/s"): self.search_results,
+            ("GET", "/ap/signin"): self.sign_in,
+            ("POST", "/ap/signin"): self.sign_in_submit,
+            ("GET", "/gp/cart/view.html"): self.cart,
+            ("POST", "/cart/add"): self.cart_add,
+            ("POST", "/cart/update"): self.cart_update,
+            ("GET", "/checkout"): self.checkout,
+            ("POST", "/__reset"): self.reset,
+        }
+        handler = routes.get((method, url.path))
+        if handler is None and method == "GET" and url.path.startswith("/dp/"):
+            return self.product(url.path[len("/dp/"):], params)
+        if handler is None:
+            return self._send(404, "<html><body><h1>Not found</h1></body></html>")
+        return handler(params or form)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    # --- Страницы ---
+
+    def home(self, params):
+        deals = "\n".join(
+            f'<div class="deal"><a href="/dp/{p.asin}">{html.escape(p.title)}</a></div>' for p in PRODUCTS[:3]
+        )
+        self._render("Amazon.com. Spend less. Smile more.", f'<div id="gw-layout">{deals}</div>')
+
+    def search_results(self, params):
+        query = params.get("k", "")
+        words = [word for word in query.lower().split() if word]
+        found = [p for p in PRODUCTS if any(word in p.title.lower() for word in words)] or PRODUCTS
+        items = "\n".join(
+            f'<div class="s-result-item" data-asin="{p.asin}">'
+            f'<h2><a class="a-link-normal" href="/dp/{p.asin}"><span class="a-size-medium">{html.escape(p.title)}</span></a></h2>'
+            f'<span class="a-price"><span class="a-offscreen">{format_price(p.price)}</span></span>'
+            f'</div>'
+            for p in found
+        )
+        self._render(f"Amazon.com : {query}", f'<div class="s-main-slot">{items}</div>', query=query)
+
+    def product(self, asin, params):
+        product = PRODUCTS_BY_ASIN.get(asin)
+        if product is None:
+            return self._send(404, "<html><body><h1>Product not found</h1></body></html>")
+        whole, fraction = f"{product.price:,.2f}".split(".")
+        added = '<div id="sw-atc-confirmation">Added to Cart</div>' if params.get("added") else ""
+        self._render(product.title, f"""
+<div id="dp">
+  <h1><span id="productTitle">{html.escape(product.title)}</span></h1>
+  <div id="corePrice_feature_div">
+    <span class="a-price"><span class="a-offscreen">{format_price(product.price)}</span>
+      <span aria-hidden="true"><span class="a-price-symbol">$</span><span class="a-price-whole">{whole}</span><span class="a-price-fraction">{fraction}</span></span>
+    </span>
+  </div>
+  <form method="post" action="/cart/add">
+    <input type="hidden" name="asin" value="{product.asin}">
+    <input type="submit" id="add-to-cart-button" name="submit.add-to-cart" value="Add to Cart">
+  </form>
+  {added}
+</div>""")
+
+    def sign_in(self, params):
+        email = params.get("email")
+        if not email:
+            content = """
+<form name="signIn" method="get" action="/ap/signin">
+  <label for="ap_email">Email or mobile phone number</label>
+  <input type="email" id="ap_email" name="email">
+  <input type="submit" id="continue" value="Continue">
+</form>"""
+        else:
+            content = f"""
+<form name="signIn" method="post" action="/ap/signin">
+  <input type="hidden" name="email" value="{html.escape(email)}">
+  <label for="ap_password">Password</label>
+  <input type="password" id="ap_password" name="password">
+  <input type="submit" id="signInSubmit" value="Sign in">
+  <a id="auth-fpp-link-bottom" href="/ap/forgotpassword">Forgot your password?</a>
+</form>"""
+        self._render("Amazon Sign-In", content)
+
+    def sign_in_submit(self, form):
+        if not form.get("email") or not form.get("password"):
+            return self._redirect("/ap/signin")
+        with self.state.lock:
+            self.state.users[self._session_id] = form["email"]
+        self._redirect("/")
+
+    def cart(self, params):
+        with self.state.lock:
+            cart = dict(self.state.carts.get(self._session_id, {}))
+
+        rows = []
+        for asin, quantity in cart.items():
+            product = PRODUCTS_BY_ASIN[asin]
+            rows.append(f"""
+<div class="sc-list-item" data-asin="{asin}" data-quantity="{quantity}">
+  <span class="a-truncate-cut">{html.escape(product.title)}</span>
+  <span class="sc-price">{format_price(product.price)}</span>
+  <form method="post" action="/cart/update">
+    <input type="hidden" name="asin" value="{asin}">
+    <input type="submit" name="action" data-action="decrease-quantity" value="-">
+    <span class="sc-quantity">{quantity}</span>
+    <input type="submit" name="action" data-action="increase-quantity" value="+">
+    <input type="submit" name="action" value="Delete">
+  </form>
+</div>""")
+
+        subtotal = sum(PRODUCTS_BY_ASIN[asin].price * quantity for asin, quantity in cart.items())
+        content = f"""
+<div id="sc-active-cart">
+  <h1>Shopping Cart</h1>
+  {''.join(rows) or '<h2 class="sc-empty-cart">Your Amazon Cart is empty</h2>'}
+  <div id="sc-subtotal-amount-activecart"><span class="a-size-medium">{format_price(subtotal)}</span></div>
+  <form method="get" action="/checkout">
+    <input type="submit" name="proceedToRetailCheckout" value="Proceed to checkout">
+  </form>
+</div>"""
+        self._render("Amazon.com Shopping Cart", content)
+
+    def cart_add(self, form):
+        asin = form.get("asin")
+        if asin not in PRODUCTS_BY_ASIN:
+            return self._send(400, "<html><body>Unknown product</body></html>")
+        with self.state.lock:
+            cart = self.state.carts.setdefault(self._session_id, {})
+            cart[asin] = cart.get(asin, 0) + 1
+        self._redirect(f"/dp/{asin}?added=1")
+
+    def cart_update(self, form):
+        asin, action = form.get("asin"), form.get("action")
+        with self.state.lock:
+            cart = self.state.carts.setdefault(self._session_id, {})
+            if asin in cart:
+                if action == "+":
+                    cart[asin] += 1
+                elif action == "-":
+                    cart[asin] -= 1
+                if action == "Delete" or cart[asin] <= 0:
+                    del cart[asin]
+        self._redirect("/gp/cart/view.html")
+
+    def checkout(self, params):
+        with self.state.lock:
+            cart = dict(self.state.carts.get(self._session_id, {}))
+        total = sum(PRODUCTS_BY_ASIN[asin].price * quantity for asin, quantity in cart.items())
+        self._render("Amazon.com Checkout", f"""
+<div class="ship-to-this-address"><a href="#">Deliver to this address</a></div>
+<a id="add-new-address-popover-link" href="#">Add a new address</a>
+<div id="payment-method">Visa ending in 1111</div>
+<div class="grand-total-price">{format_price(total)}</div>
+<input type="submit" id="placeYourOrder" value="Place your order">""")
+
+    def reset(self, form):
+        """Сброс состояния: scope=all - весь стенд, scope=cart - только корзина сессии, иначе вся сессия"""
+        scope = form.get("scope")
+        self.state.reset(None if scope == "all" else self._session_id, keep_users=scope == "cart")
+        self._send(204)
+
+
+class StandInShop:
+    """
+    Локальный стенд магазина на стандартном HTTP-сервере
+
+    Пример:
+        with StandInShop(latency=0.05) as shop:
+            page_factory = PageFactory(driver, base_url=shop.url)
+    """
+    # Стенд принимает любой непустой пароль: подставляется аккаунтам без пароля в окружении
+    placeholder_password = "stand-in-password"
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0):
+        """
+        Args:
+            host: Адрес для прослушивания
+            port: Порт (0 - выбрать свободный)
+            latency: Искусственная задержка каждого ответа в секундах
+        """
+        self.state = ShopState()
+        handler = type("ConfiguredStandInShopHandler", (StandInShopHandler,), {
+            "state": self.state,
+            "latency": latency,
+        })
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def reset_url(self):
+        """Служебный адрес сброса состояния (POST, поле scope)"""
+        return f"{self.url}/__reset"
+
+    def search_url(self, query):
+        return f"{self.url}/s?k={quote_plus(query)}"
+
+    def start(self):
+        """Запускает сервер в фоновом потоке"""
+        self._thread = threading.Thread(target=self.server.serve_forever, name="stand-in-shop", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Останавливает сервер"""
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m examples.amazon.stand_in_shop",
+                                     description="Локальный стенд магазина для тестов и бенчмарков")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Задержка каждого ответа в секундах")
+    args = parser.parse_args(argv)
+
+    shop = StandInShop(args.host, args.port, args.latency)
+    print(f"Стенд магазина запущен: {shop.url}")
+    try:
+        shop.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shop.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,21 @@
-from .core import DriverFactory, MultiDriverManager, BasePage, BaseElement, ElementGroup
+from .core import DriverFactory, MultiDriverManager, DriverPool, DriverPoolStats, PooledDriverManager
+from .core import BrowserAdmission, AdmissionTimeout
+from .core import AccountPool, AccountLease, AccountPoolExhausted, AccountPasswordMissing
+from .core import StateResetter, ResetStrategy, HttpReset
+from .core import BasePage, BaseElement, ElementGroup
 from .core import Button, Input, Checkbox, Radio, Dropdown, Link
 from .core import Locator, PageLocators
-from .core import PageFactory, MultiPageFactory
-from .utils import setup_logger, auto_log
+from .core import AsyncBasePage, AsyncBaseElement, AsyncElementGroup, AsyncPageFactory, wrap_async
+from .core import PageFactory, MultiPageFactory, PageCache, PageCacheStats
+from .core import ParallelScenarioRunner, ParallelScenarioError, ScenarioResult, UserContext
+from .core import CommandTracker, instrument_driver, track_commands, check_command_budget
+from .utils import setup_logger, auto_log, RingBufferHandler, get_failure_buffer
+from .utils import no_auto_log, set_auto_log_enabled, is_auto_log_enabled, add_action_listener, remove_action_listener
+from .utils import ContextThreadPoolExecutor, bind_context, get_call_depth, get_call_stack
+from .utils import SlowActionDetector, slow_action_detector, configure_slow_actions
+from .utils import DirectoryArtifactStore, ArtifactBundleStore, FailureArtifactCollector
+from .utils import TimingDatabase, lpt_schedule
+from .utils import DependencyGraph
+from .utils import RetryPolicy, retry, retry_metrics
 
 __version__ = '1.0.0'
\ No newline at end of file
@@ -1,5 +1,16 @@
 from .driver_factory import DriverFactory, MultiDriverManager
+from .admission import AdmissionStats, AdmissionTimeout, BrowserAdmission, process_tree_rss, read_available_memory
+from .accounts import Account, AccountLease, AccountPool, AccountPoolExhausted, AccountPasswordMissing, load_accounts
+from .browser_matrix import BrowserSlots, BrowserSlotTimeout, parse_browsers, parse_limits
+from .driver_pool import DriverPool, DriverPoolStats, PooledDriverManager, check_driver_health
+from .state_reset import (
+    ResetStrategy, StateResetter, HttpReset, DismissAlert, CloseExtraWindows, ClearStorage, ClearCookies,
+    OpenBlankPage, default_strategies, reset_driver
+)
+from .command_counter import CommandTracker, CommandRecord, CommandStats, instrument_driver, track_commands, check_command_budget
 from .base_page import BasePage
-from .page_factory import PageFactory, MultiPageFactory
+from .page_factory import PageFactory, MultiPageFactory, PageCache, PageCacheStats
+from .parallel import ParallelScenarioRunner, ParallelScenarioError, ScenarioResult, UserContext, SyncPoints
 from .component import BaseElement, ElementGroup, Button, Input, Checkbox, Radio, Dropdown, Link
 from .locator import Locator, PageLocators
+from .async_page import AsyncBasePage, AsyncBaseElement, AsyncElementGroup, AsyncPageFactory, DriverExecutorPool, wrap_async
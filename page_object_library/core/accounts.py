@@ -0,0 +1,299 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+class AccountPoolExhausted(TimeoutError):
+    """Свободные аккаунты не появились за время ожидания"""
+
+
+class AccountPasswordMissing(LookupError):
+    """Переменная окружения с паролем аккаунта не задана"""
+
+
+@dataclass
+class Account:
+    """Учетная запись тестового пользователя"""
+    id: str
+    email: str
+    password: str = field(default="", repr=False)
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+def load_accounts(path, default_password: Optional[str] = None) -> List[Account]:
+    """
+    Загружает аккаунты из JSON-файла
+
+    Формат: {"accounts": [{"id": "buyer1", "email": "...", "password_env": "BUYER1_PASSWORD"}]}.
+    password_env - имя переменной окружения с паролем. Если она не задана, аккаунт получает
+    default_password, а без него пропускается; если не осталось ни одного аккаунта,
+    выбрасывается AccountPasswordMissing. Пароль прямо в файле (password) допустим только
+    без password_env. Остальные поля попадают в Account.extra.
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    accounts = []
+    missing = []
+    for entry in data["accounts"]:
+        entry = dict(entry)
+        password_env = entry.pop("password_env", None)
+        password = entry.pop("password", "")
+        if password_env:
+            password = os.environ.get(password_env, default_password)
+            if password is None:
+                missing.append(password_env)
+                logging.warning(f"Аккаунт {entry.get('id')} из {path} пропущен: не задана переменная {password_env}")
+                continue
+        accounts.append(Account(id=str(entry.pop("id")), email=entry.pop("email"), password=password, extra=entry))
+    if not accounts and missing:
+        raise AccountPasswordMissing(f"Не заданы переменные окружения с паролями аккаунтов из {path}: "
+                                     f"{', '.join(missing)}")
+    if len({account.id for account in accounts}) != len(accounts):
+        raise ValueError(f"Идентификаторы аккаунтов в {path} повторяются")
+    return accounts
+
+
+def process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class AccountLease:
+    """
+    Аккаунт, выданный тесту пулом; после теста возвращается через release()
+
+    Снимок сессии (cookies после входа) хранится в файле аккаунта и переиспользуется
+    следующими арендаторами: пока аккаунт выдан, файл пишет только его владелец.
+    """
+
+    def __init__(self, pool: "AccountPool", account: Account, owner: str):
+        self.pool = pool
+        self.account = account
+        self.owner = owner
+        self.released = False
+
+    @property
+    def id(self) -> str:
+        return self.account.id
+
+    @property
+    def email(self) -> str:
+        return self.account.email
+
+    @property
+    def password(self) -> str:
+        return self.account.password
+
+    @property
+    def session_path(self) -> Path:
+        return self.pool.sessions_dir / f"{self.account.id}.json"
+
+    def save_session(self, driver):
+        """Сохраняет cookies драйвера как снимок сессии аккаунта"""
+        snapshot = {"saved": time.time(), "url": driver.current_url, "cookies": driver.get_cookies()}
+        self.session_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.session_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(snapshot, ensure_ascii=False), encoding="utf-8")
+        os.replace(temp_path, self.session_path)
+        logging.info(f"Снимок сессии аккаунта '{self.account.id}' сохранен ({len(snapshot['cookies'])} cookies)")
+
+    def load_session(self) -> Optional[dict]:
+        """Возвращает снимок сессии, если он есть и не старше session_max_age"""
+        try:
+            snapshot = json.loads(self.session_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if self.pool.session_max_age and time.time() - snapshot["saved"] > self.pool.session_max_age:
+            return None
+        return snapshot
+
+    def forget_session(self):
+        self.session_path.unlink(missing_ok=True)
+
+    def restore_session(self, driver, url: str) -> bool:
+        """
+        Подставляет cookies снимка в драйвер
+
+        Cookies можно добавить только для открытого домена, поэтому сначала открывается url.
+        """
+        snapshot = self.load_session()
+        if snapshot is None:
+            return False
+        driver.get(url)
+        for cookie in snapshot["cookies"]:
+            cookie = {key: value for key, value in cookie.items() if key != "sameSite" or value}
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logging.warning(f"Cookie '{cookie.get('name')}' аккаунта '{self.account.id}' не восстановлена: {e}")
+        driver.refresh()
+        return True
+
+    def sign_in(self, driver, url: str, login: Callable[[Account], Any],
+                is_signed_in: Callable[[], bool] = None):
+        """
+        Входит в аккаунт: из снимка сессии, а при его отсутствии или устаревании - через login(account)
+
+        Args:
+            driver: Драйвер, в котором нужно войти
+            url: Страница сайта для восстановления cookies
+            login: Вход через интерфейс; получает Account и возвращает, например, страницу
+            is_signed_in: Проверка, что восстановленная сессия действительна
+
+        Returns:
+            Результат login() или None, если сессия восстановлена из снимка
+        """
+        if self.restore_session(driver, url):
+            if is_signed_in is None or is_signed_in():
+                logging.info(f"Сессия аккаунта '{self.account.id}' восстановлена из снимка")
+                self.pool.stats["sessions_restored"] += 1
+                return None
+            logging.info(f"Снимок сессии аккаунта '{self.account.id}' устарел, выполняем вход")
+            self.forget_session()
+            driver.delete_all_cookies()
+
+        result = login(self.account)
+        self.pool.stats["logins"] += 1
+        self.save_session(driver)
+        return result
+
+    def release(self):
+        if not self.released:
+            self.pool.release(self)
+            self.released = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+        return False
+
+    def __repr__(self):
+        return f"AccountLease({self.account.id!r}, owner={self.owner!r})"
+
+
+class AccountPool:
+    """
+    Пул тестовых аккаунтов, общий для всех процессов (воркеров xdist) на машине
+
+    Аренда хранится в базе SQLite в state_dir: выдача идет в транзакции BEGIN IMMEDIATE,
+    поэтому два процесса не получат один аккаунт. Аренда процесса, который завершился
+    не вернув аккаунт, считается брошенной и освобождается.
+    Несколько аккаунтов выдаются одной транзакцией, чтобы многопользовательские тесты
+    разных воркеров не захватывали аккаунты по одному и не блокировали друг друга.
+    """
+
+    def __init__(self, accounts: List[Account], state_dir, session_max_age=3600.0, poll_interval=0.2):
+        """
+        Args:
+            accounts: Аккаунты пула
+            state_dir: Каталог базы аренды и снимков сессий
+            session_max_age: Время жизни снимка сессии в секундах (0 - без ограничения)
+            poll_interval: Интервал проверки освобождения аккаунтов при ожидании
+        """
+        if not accounts:
+            raise ValueError("Пул аккаунтов пуст")
+        self.accounts = {account.id: account for account in accounts}
+        self.state_dir = Path(state_dir)
+        self.sessions_dir = self.state_dir / "sessions"
+        self.session_max_age = session_max_age
+        self.poll_interval = poll_interval
+        self.stats = {"leases": 0, "waits": 0, "wait_time": 0.0, "logins": 0, "sessions_restored": 0}
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.state_dir / "leases.sqlite"), timeout=30,
+                                           isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "account_id TEXT PRIMARY KEY, owner TEXT NOT NULL, pid INTEGER NOT NULL, leased_at REAL NOT NULL)"
+            )
+
+    @classmethod
+    def from_file(cls, path, state_dir=None, default_password: Optional[str] = None, **settings) -> "AccountPool":
+        path = Path(path)
+        return cls(load_accounts(path, default_password), state_dir or path.parent / ".account_pool", **settings)
+
+    def lease(self, owner="", timeout=60.0) -> AccountLease:
+        """Выдает свободный аккаунт, ожидая его освобождения не дольше timeout секунд"""
+        return self.lease_many(1, owner, timeout)[0]
+
+    def lease_many(self, count: int, owner="", timeout=60.0) -> List[AccountLease]:
+        """Выдает count разных аккаунтов одновременно"""
+        if count > len(self.accounts):
+            raise ValueError(f"Запрошено {count} аккаунтов, в пуле только {len(self.accounts)}")
+
+        start_time = time.monotonic()
+        waited = False
+        while True:
+            account_ids = self._try_lease(count, owner)
+            if account_ids:
+                break
+            if time.monotonic() - start_time >= timeout:
+                raise AccountPoolExhausted(f"Нет {count} свободных аккаунтов за {timeout}с (владелец: {owner})")
+            if not waited:
+                logging.info(f"Ожидание {count} свободных аккаунтов для {owner}")
+                waited = True
+            time.sleep(self.poll_interval)
+
+        with self._lock:
+            self.stats["leases"] += count
+            if waited:
+                self.stats["waits"] += 1
+                self.stats["wait_time"] += time.monotonic() - start_time
+        logging.info(f"Аккаунты {', '.join(account_ids)} выданы: {owner}")
+        return [AccountLease(self, self.accounts[account_id], owner) for account_id in account_ids]
+
+    def _try_lease(self, count, owner) -> Optional[List[str]]:
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                leased = {}
+                for account_id, pid in connection.execute("SELECT account_id, pid FROM leases").fetchall():
+                    if process_alive(pid):
+                        leased[account_id] = pid
+                    else:
+                        logging.warning(f"Аккаунт '{account_id}' брошен завершившимся процессом {pid}, освобождаем")
+                        connection.execute("DELETE FROM leases WHERE account_id = ?", (account_id,))
+
+                free = [account_id for account_id in self.accounts if account_id not in leased]
+                if len(free) < count:
+                    connection.execute("COMMIT")
+                    return None
+                chosen = free[:count]
+                connection.executemany(
+                    "INSERT INTO leases (account_id, owner, pid, leased_at) VALUES (?, ?, ?, ?)",
+                    [(account_id, owner, os.getpid(), time.time()) for account_id in chosen]
+                )
+                connection.execute("COMMIT")
+                return chosen
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def release(self, lease: AccountLease):
+        """Возвращает аккаунт в пул"""
+        with self._lock:
+            self._connection.execute("DELETE FROM leases WHERE account_id = ? AND pid = ?",
+                                     (lease.account.id, os.getpid()))
+        logging.info(f"Аккаунт '{lease.account.id}' возвращен в пул")
+
+    def leased_ids(self) -> List[str]:
+        with self._lock:
+            return [account_id for account_id, in self._connection.execute("SELECT account_id FROM leases")]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
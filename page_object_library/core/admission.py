@@ -0,0 +1,358 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+MB = 1024 * 1024
+
+# Имя слотов BrowserSlots, которыми ограничивается число живых браузеров на машине
+MACHINE_SLOTS = "browsers"
+
+PROC = Path("/proc")
+
+
+class AdmissionTimeout(TimeoutError):
+    """Браузер не получил разрешения на запуск за время ожидания"""
+
+
+def read_available_memory() -> Optional[int]:
+    """Доступная память машины в байтах (MemAvailable из /proc/meminfo) или None, если /proc недоступен"""
+    try:
+        with open(PROC / "meminfo", encoding="ascii") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _children_map() -> Dict[int, List[int]]:
+    children = {}
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text(encoding="ascii", errors="replace")
+        except OSError:
+            continue
+        # Имя процесса в скобках может содержать пробелы, поэтому поля считаются после последней ')'
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+    return children
+
+
+def _rss(pid: int) -> int:
+    try:
+        with open(PROC / str(pid) / "status", encoding="ascii", errors="replace") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree_rss(pids: List[int]) -> Dict[int, int]:
+    """RSS каждого процесса вместе со всеми его потомками в байтах: {pid: rss} (пусто без /proc)"""
+    if not pids or not PROC.exists():
+        return {}
+    children = _children_map()
+    result = {}
+    for root in pids:
+        seen = set()
+        stack = [root]
+        while stack:
+            pid = stack.pop()
+            if pid in seen:
+                continue
+            seen.add(pid)
+            stack.extend(children.get(pid, ()))
+        result[root] = sum(_rss(pid) for pid in seen)
+    return result
+
+
+def driver_process_id(driver) -> Optional[int]:
+    """PID процесса chromedriver/geckodriver локального драйвера; браузер - его потомок"""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+
+@dataclass
+class AdmissionStats:
+    """Статистика допуска браузеров"""
+    admitted: int = 0
+    waits: int = 0
+    wait_time: float = 0.0
+    max_wait: float = 0.0
+    memory_waits: int = 0
+    timeouts: int = 0
+    peak_live: int = 0
+    waits_by_owner: Dict[str, float] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+    def merge(self, other: "AdmissionStats") -> "AdmissionStats":
+        waits_by_owner = dict(self.waits_by_owner)
+        for owner, waited in other.waits_by_owner.items():
+            waits_by_owner[owner] = waits_by_owner.get(owner, 0.0) + waited
+        return AdmissionStats(
+            admitted=self.admitted + other.admitted, waits=self.waits + other.waits,
+            wait_time=self.wait_time + other.wait_time, max_wait=max(self.max_wait, other.max_wait),
+            memory_waits=self.memory_waits + other.memory_waits, timeouts=self.timeouts + other.timeouts,
+            peak_live=max(self.peak_live, other.peak_live), waits_by_owner=waits_by_owner,
+        )
+
+    def summary(self) -> str:
+        return (f"допущено {self.admitted}, ожиданий {self.waits} ({self.wait_time:.1f}с, "
+                f"максимум {self.max_wait:.1f}с, из-за памяти {self.memory_waits}), "
+                f"пик одновременных браузеров {self.peak_live}, таймаутов {self.timeouts}")
+
+
+class BrowserAdmission:
+    """
+    Допуск к запуску браузеров с учетом числа живых браузеров и памяти машины
+
+    Запрос на запуск ждет в очереди, пока не выполнятся условия: живых браузеров меньше
+    max_browsers, доступной памяти (MemAvailable) останется не меньше min_available_mb
+    после запуска еще одного браузера и суммарный RSS браузеров не превысит max_total_rss_mb.
+    Очередь справедливая: запросы допускаются строго по убыванию priority, при равном
+    приоритете - в порядке поступления, поэтому поздний запрос не обгонит ранний.
+
+    Память читается из /proc вне блокировки и не чаще раза в poll_interval; решения о допуске
+    принимаются по последнему замеру. Браузеры, которые еще запускаются или запущены после
+    замера, в нем не видны, поэтому на каждый такой браузер резервируется оценка: средний
+    RSS измеренных браузеров или browser_memory_mb.
+    Проверка памяти действует на всю машину, ограничение числа браузеров - в пределах процесса;
+    со slots (BrowserSlots с ограничением MACHINE_SLOTS) каждый живой браузер дополнительно
+    занимает общий слот, и ограничение действует для всех процессов на машине.
+    """
+
+    def __init__(self, max_browsers: Optional[int] = None, min_available_mb: float = 0,
+                 max_total_rss_mb: Optional[float] = None, browser_memory_mb: float = 500,
+                 poll_interval=0.5, timeout: Optional[float] = None,
+                 available_memory: Callable[[], Optional[int]] = read_available_memory,
+                 tree_rss: Callable[[List[int]], Dict[int, int]] = process_tree_rss, slots=None):
+        """
+        Args:
+            max_browsers: Максимум одновременно живых браузеров (None - без ограничения)
+            min_available_mb: Сколько памяти машины должно остаться свободной после запуска
+            max_total_rss_mb: Ограничение суммарного RSS браузеров (None - без ограничения)
+            browser_memory_mb: Оценка памяти браузера, пока нет измерений
+            poll_interval: Как часто ожидающие запросы перепроверяют память (и период замеров /proc)
+            timeout: Максимальное ожидание допуска по умолчанию в секундах (None - без ограничения)
+            available_memory: Источник доступной памяти в байтах
+            tree_rss: RSS процессов с потомками в байтах: tree_rss(pids) -> {pid: rss}
+            slots: BrowserSlots для общего ограничения числа браузеров всех процессов (None - без него)
+        """
+        self.max_browsers = max_browsers
+        self.min_available = min_available_mb * MB
+        self.max_total_rss = max_total_rss_mb * MB if max_total_rss_mb else None
+        self.browser_memory = browser_memory_mb * MB
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.available_memory = available_memory
+        self.tree_rss = tree_rss
+        self.slots = slots
+        self.stats = AdmissionStats()
+        self._queue = []
+        self._sequence = itertools.count()
+        # id(драйвера) -> (PID службы, время запуска, общий слот)
+        self._live: Dict[int, Tuple[Optional[int], float, Optional[int]]] = {}
+        self._launching = 0
+        self._condition = threading.Condition()
+        # Последний замер памяти: {pid: rss}, доступная память и момент начала замера
+        self._rss_sample: Dict[int, int] = {}
+        self._available_sample: Optional[int] = None
+        self._sampled_at = float("-inf")
+        self._next_sample = float("-inf")
+
+    @property
+    def live_count(self) -> int:
+        with self._condition:
+            return len(self._live) + self._launching
+
+    @property
+    def waiting(self) -> int:
+        """Сколько запросов ждут допуска"""
+        with self._condition:
+            return len(self._queue)
+
+    def can_launch(self) -> bool:
+        """Будет ли новый браузер допущен без ожидания"""
+        self._sample_memory()
+        with self._condition:
+            if self._queue or self._blocking_reason() is not None:
+                return False
+        return self.slots is None or self.slots.busy(MACHINE_SLOTS) < self.slots.limits[MACHINE_SLOTS]
+
+    def launch(self, create: Callable, owner="", priority=0, timeout: Optional[float] = None):
+        """
+        Запускает браузер после допуска
+
+        Args:
+            create: Функция запуска, возвращающая драйвер
+            owner: Кто запрашивает браузер (для статистики ожидания)
+            priority: Приоритет запроса: больший допускается раньше
+            timeout: Максимальное ожидание допуска в секундах (по умолчанию self.timeout)
+
+        Returns:
+            Драйвер; после закрытия его нужно вернуть через dispose(driver)
+        """
+        slot = self._admit(owner, priority, self.timeout if timeout is None else timeout)
+        try:
+            driver = create()
+        except BaseException:
+            self._release_slot(slot)
+            with self._condition:
+                self._launching -= 1
+                self._condition.notify_all()
+            raise
+        with self._condition:
+            self._launching -= 1
+            self._live[id(driver)] = (driver_process_id(driver), time.monotonic(), slot)
+            self._condition.notify_all()
+        return driver
+
+    def dispose(self, driver):
+        """Сообщает, что браузер закрыт и его место свободно"""
+        with self._condition:
+            _, _, slot = self._live.pop(id(driver), (None, None, None))
+            self._condition.notify_all()
+        self._release_slot(slot)
+
+    def _release_slot(self, slot):
+        if self.slots is not None:
+            self.slots.release(MACHINE_SLOTS, slot)
+
+    def _admit(self, owner, priority, timeout) -> Optional[int]:
+        """Ждет своей очереди и условий запуска; возвращает общий слот (None без slots)"""
+        start_time = time.monotonic()
+        # Номер поступления уникален, поэтому до сравнения owner дело не доходит
+        entry = (-priority, next(self._sequence), owner)
+        blocked_by_memory = False
+        slot = None
+        with self._condition:
+            heapq.heappush(self._queue, entry)
+        try:
+            while True:
+                # Чтение /proc идет без блокировки, под ней сравниваются только сохраненные значения
+                self._sample_memory()
+                with self._condition:
+                    reason = self._blocking_reason() if self._queue[0] is entry else "queue"
+                    if reason is not None:
+                        blocked_by_memory = blocked_by_memory or reason == "memory"
+                        self._wait_turn(owner, timeout, start_time)
+                        continue
+                    heapq.heappop(self._queue)
+                    self._launching += 1
+                if self.slots is None:
+                    break
+                # Общий слот берется без блокировки: транзакция SQLite может ждать другие процессы
+                try:
+                    slot = self.slots.try_acquire(MACHINE_SLOTS, owner)
+                except BaseException:
+                    with self._condition:
+                        self._launching -= 1
+                    raise
+                if slot is not None:
+                    break
+                with self._condition:
+                    # Все браузеры машины заняты другими процессами: запрос возвращается на свое место в очереди
+                    self._launching -= 1
+                    heapq.heappush(self._queue, entry)
+                    self._condition.notify_all()
+                    self._wait_turn(owner, timeout, start_time)
+        except BaseException:
+            with self._condition:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                self._condition.notify_all()
+            raise
+
+        with self._condition:
+            waited = time.monotonic() - start_time
+            stats = self.stats
+            stats.admitted += 1
+            stats.peak_live = max(stats.peak_live, len(self._live) + self._launching)
+            # Допуск без очереди занимает миллисекунды на чтение /proc и ожиданием не считается
+            if waited >= 0.01:
+                stats.waits += 1
+                stats.wait_time += waited
+                stats.max_wait = max(stats.max_wait, waited)
+                stats.memory_waits += int(blocked_by_memory)
+                stats.waits_by_owner[owner] = stats.waits_by_owner.get(owner, 0.0) + waited
+                logging.info(f"Браузер для {owner} допущен к запуску после ожидания {waited:.2f}с")
+            self._condition.notify_all()
+        return slot
+
+    def _wait_turn(self, owner, timeout, start_time):
+        """Ждет изменения состояния или следующего замера; вызывается под блокировкой"""
+        remaining = None if timeout is None else timeout - (time.monotonic() - start_time)
+        if remaining is not None and remaining <= 0:
+            self.stats.timeouts += 1
+            raise AdmissionTimeout(f"Браузер для {owner} не допущен к запуску за {timeout}с: "
+                                   f"живых браузеров {len(self._live) + self._launching}")
+        wait = self.poll_interval if remaining is None else min(self.poll_interval, remaining)
+        self._condition.wait(wait)
+
+    def _sample_memory(self):
+        """Замеряет память браузеров и машины, если прошлый замер старше poll_interval"""
+        if not self.min_available and not self.max_total_rss:
+            return
+        with self._condition:
+            started = time.monotonic()
+            if started < self._next_sample:
+                return
+            # Следующий замер назначается сразу, чтобы параллельные запросы не читали /proc повторно
+            self._next_sample = started + self.poll_interval
+            pids = [pid for pid, _, _ in self._live.values() if pid is not None]
+        rss = self.tree_rss(pids) if pids else {}
+        available = self.available_memory() if self.min_available else None
+        with self._condition:
+            self._rss_sample = rss
+            self._available_sample = available
+            self._sampled_at = started
+
+    def _blocking_reason(self) -> Optional[str]:
+        """Почему нельзя запустить еще один браузер прямо сейчас (None - можно); вызывается под блокировкой"""
+        live = len(self._live) + self._launching
+        if self.max_browsers is not None and live >= self.max_browsers:
+            return "limit"
+        if not self.min_available and not self.max_total_rss:
+            return None
+
+        measured = []
+        unmeasured = self._launching
+        for pid, started, _ in self._live.values():
+            if pid is None:
+                continue  # Удаленный браузер не занимает память этой машины
+            if pid in self._rss_sample and started <= self._sampled_at:
+                measured.append(self._rss_sample[pid])
+            else:
+                unmeasured += 1
+        estimate = sum(measured) / len(measured) if measured and sum(measured) else self.browser_memory
+        reserved = (unmeasured + 1) * estimate
+        if self.max_total_rss and sum(measured) + reserved > self.max_total_rss:
+            return "memory"
+        available = self._available_sample
+        if self.min_available and available is not None and available - reserved < self.min_available:
+            # Единственный браузер процесса допускается всегда, иначе тест никогда не начнется
+            if live > 0:
+                return "memory"
+        return None
+
+    def memory_snapshot(self) -> dict:
+        """Текущее состояние: живые браузеры, их суммарный RSS и доступная память в мегабайтах"""
+        with self._condition:
+            pids = [pid for pid, _, _ in self._live.values() if pid is not None]
+            live = len(self._live) + self._launching
+        available = self.available_memory()
+        return {"live": live, "rss_mb": sum(self.tree_rss(pids).values()) / MB if pids else 0.0,
+                "available_mb": available / MB if available is not None else None}
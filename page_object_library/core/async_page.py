@@ -0,0 +1,175 @@
+import asyncio
+import functools
+import inspect
+import threading
+from typing import Dict, Type, TypeVar
+
+from page_object_library.core.base_page import BasePage
+from page_object_library.core.component import BaseElement, ElementGroup
+from page_object_library.utils.context import ContextThreadPoolExecutor
+
+T = TypeVar('T', bound='BasePage')
+
+
+class DriverExecutorPool:
+    """
+    Пул исполнителей: у каждого драйвера свой ограниченный пул потоков
+
+    WebDriver не рассчитан на одновременные команды из разных потоков, поэтому
+    по умолчанию команды одного драйвера выполняются последовательно в одном потоке,
+    а разные драйверы работают параллельно.
+    """
+
+    def __init__(self, max_workers_per_driver=1):
+        self.max_workers_per_driver = max_workers_per_driver
+        self._executors: Dict[int, ContextThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def get_executor(self, driver) -> ContextThreadPoolExecutor:
+        """Возвращает исполнитель драйвера, создавая его при первом обращении"""
+        key = id(driver)
+        with self._lock:
+            executor = self._executors.get(key)
+            if executor is None:
+                executor = self._executors[key] = ContextThreadPoolExecutor(
+                    max_workers=self.max_workers_per_driver,
+                    thread_name_prefix=f"driver-{getattr(driver, 'session_id', None) or key}"
+                )
+            return executor
+
+    def shutdown_driver(self, driver, wait=True):
+        """Останавливает исполнитель драйвера"""
+        with self._lock:
+            executor = self._executors.pop(id(driver), None)
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def shutdown(self, wait=True):
+        """Останавливает все исполнители"""
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=wait)
+
+
+# Пул исполнителей по умолчанию для асинхронных оберток
+driver_executors = DriverExecutorPool()
+
+
+class AsyncPageObject:
+    """
+    Асинхронная обертка над страницей, компонентом или элементом
+
+    Вызовы методов возвращают корутины: блокирующий вызов WebDriver выполняется
+    в пуле потоков драйвера, а цикл событий в это время обслуживает другие сессии.
+    Контекст вызова (вложенность auto_log) переносится в поток исполнителя.
+    Вложенные страницы, компоненты и элементы также оборачиваются.
+    """
+
+    def __init__(self, target, executors: DriverExecutorPool = None):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_executors", executors or driver_executors)
+
+    @property
+    def sync(self):
+        """Исходный синхронный объект"""
+        return self._target
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        executor = self._executors.get_executor(self._target.driver)
+        result = await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+        return wrap_async(result, self._executors)
+
+    def __getattr__(self, name):
+        # Свойства (например, title или element) обращаются к драйверу, поэтому тоже выполняются в пуле
+        if isinstance(inspect.getattr_static(type(self._target), name, None), property):
+            return self._run(getattr, self._target, name)
+
+        value = getattr(self._target, name)
+        if inspect.ismethod(value):
+            @functools.wraps(value)
+            async def method(*args, **kwargs):
+                return await self._run(value, *args, **kwargs)
+            return method
+
+        return wrap_async(value, self._executors)
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._target!r})"
+
+
+class AsyncBasePage(AsyncPageObject):
+    """Асинхронная обертка над страницей"""
+
+    async def open(self):
+        """Открывает страницу: await page.open()"""
+        return await self._run(self._target.open)
+
+    async def navigate_to(self, page_class: Type[T]) -> "AsyncBasePage":
+        """Переходит на другую страницу и возвращает ее асинхронную обертку"""
+        return await self._run(self._target.navigate_to, page_class)
+
+
+class AsyncElementGroup(AsyncPageObject):
+    """Асинхронная обертка над компонентом"""
+
+
+class AsyncBaseElement(AsyncPageObject):
+    """Асинхронная обертка над элементом"""
+
+    async def click(self):
+        """Кликает по элементу: await element.click()"""
+        return await self._run(self._target.click)
+
+
+def wrap_async(value, executors: DriverExecutorPool = None):
+    """Оборачивает страницы, компоненты и элементы (в том числе в списках) в асинхронные обертки"""
+    if isinstance(value, AsyncPageObject):
+        return value
+    if isinstance(value, BasePage):
+        return AsyncBasePage(value, executors)
+    if isinstance(value, ElementGroup):
+        return AsyncElementGroup(value, executors)
+    if isinstance(value, BaseElement):
+        return AsyncBaseElement(value, executors)
+    if isinstance(value, list) and value and isinstance(value[0], (BasePage, ElementGroup, BaseElement)):
+        return [wrap_async(item, executors) for item in value]
+    return value
+
+
+class AsyncPageFactory:
+    """Асинхронный фасад над MultiPageFactory для управления множеством сессий из одного цикла событий"""
+
+    def __init__(self, multi_page_factory, max_workers_per_driver=1):
+        """
+        Args:
+            multi_page_factory: MultiPageFactory, создающая драйверы и страницы
+            max_workers_per_driver: Количество потоков, выполняющих команды одного драйвера
+        """
+        self.multi_page_factory = multi_page_factory
+        self.executors = DriverExecutorPool(max_workers_per_driver)
+
+    async def create_page(self, page_class: Type[T], driver_name="default", **kwargs) -> AsyncBasePage:
+        """Создает страницу (и при необходимости драйвер) без блокировки цикла событий"""
+        loop = asyncio.get_running_loop()
+        # Создание драйвера долгое и не привязано к исполнителю драйвера, поэтому выполняется в общем пуле
+        page = await loop.run_in_executor(
+            None, functools.partial(self.multi_page_factory.create_page, page_class, driver_name, **kwargs)
+        )
+        return AsyncBasePage(page, self.executors)
+
+    def close(self):
+        """Останавливает пулы потоков драйверов"""
+        self.executors.shutdown()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+        return False
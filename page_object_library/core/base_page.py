@@ -10,10 +10,28 @@ from page_object_library.core.component import BaseElement
 T = TypeVar('T', bound='BasePage')
 E = TypeVar('E', bound='BaseElement')
 
+# Возвращает URL и идентификатор текущего документа; идентификатор меняется при каждой загрузке документа
+DOCUMENT_IDENTITY_SCRIPT = (
+    "if (!window.__pageObjectDocumentId) {"
+    " window.__pageObjectDocumentId = Date.now() + '-' + Math.random().toString(36).slice(2);"
+    " }"
+    " return [window.location.href, window.__pageObjectDocumentId];"
+)
+
+
+def read_document_identity(driver):
+    """Получает URL и идентификатор текущего документа за один запрос к браузеру (None при ошибке)"""
+    try:
+        return tuple(driver.execute_script(DOCUMENT_IDENTITY_SCRIPT))
+    except Exception:
+        return None
+
 
 class BasePage(metaclass=LocatorMeta):
     """Базовый класс для всех страниц"""
     DEFAULT_URL = None  # Переопределяется в подклассах
+    auto_log_methods = True  # Публичные методы страниц логируются автоматически
+    document_identity = None  # URL и документ, загруженные последним open() этой страницы
 
     def __init__(self, driver, base_url=None, timeout=10, driver_name="default"):
         self.driver = driver  # Драйвер Selenium
@@ -53,6 +71,7 @@ class BasePage(metaclass=LocatorMeta):
 
         self.driver.get(self.url)
         self.wait_for_page_loaded()
+        self.document_identity = read_document_identity(self.driver)
         return self
 
     @auto_log
@@ -92,12 +111,14 @@ class BasePage(metaclass=LocatorMeta):
         """
         Переход на другую страницу.
 
-        Автоматически открывает страницу, если у неё задан URL.
+        Автоматически открывает страницу, если у неё задан URL (DEFAULT_URL).
+        Страницы без собственного URL (например, результаты поиска после клика)
+        не переоткрываются, иначе браузер ушел бы на base_url.
         Возвращает типизированный объект страницы.
         """
         new_page = page_class(self.driver, base_url=self.base_url, driver_name=self.driver_name)
 
-        if new_page.url:
+        if new_page.DEFAULT_URL:
             new_page.open()
 
         return new_page
@@ -0,0 +1,185 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from itertools import zip_longest
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from page_object_library.core.accounts import process_alive
+
+SUPPORTED_BROWSERS = ("chrome", "firefox")
+
+
+class BrowserSlotTimeout(TimeoutError):
+    """Свободный слот браузера не появился за время ожидания"""
+
+
+def parse_browsers(value: str) -> List[str]:
+    """Разбирает список браузеров вида "chrome,firefox" """
+    browsers = []
+    for browser in (part.strip().lower() for part in value.split(",")):
+        if not browser or browser in browsers:
+            continue
+        if browser not in SUPPORTED_BROWSERS:
+            raise ValueError(f"Неподдерживаемый тип браузера: {browser}")
+        browsers.append(browser)
+    if not browsers:
+        raise ValueError("Список браузеров пуст")
+    return browsers
+
+
+def parse_limits(value: Optional[str]) -> Dict[str, int]:
+    """Разбирает ограничения вида "firefox=2,chrome=4" """
+    limits = {}
+    for part in filter(None, (part.strip() for part in (value or "").split(","))):
+        browser, _, limit = part.partition("=")
+        browser = browser.strip().lower()
+        if browser not in SUPPORTED_BROWSERS or not limit.strip().isdigit() or int(limit) < 1:
+            raise ValueError(f"Неверное ограничение браузера: {part} (ожидается браузер=число)")
+        limits[browser] = int(limit)
+    return limits
+
+
+def interleave(groups: Dict[str, List]) -> List:
+    """Чередует элементы групп по одному (порядок внутри групп сохраняется)"""
+    return [item for row in zip_longest(*groups.values()) for item in row if item is not None]
+
+
+def limit_groups(browsers: Iterable[Optional[str]], limits: Dict[str, int]) -> List[Optional[str]]:
+    """
+    Группы xdist_group для тестов: тесты браузера с ограничением limit по кругу делятся
+    между limit группами, остальные тесты не закрепляются (None)
+    """
+    counters = {}
+    groups = []
+    for browser in browsers:
+        limit = limits.get(browser)
+        if not limit:
+            groups.append(None)
+            continue
+        index = counters[browser] = counters.get(browser, -1) + 1
+        groups.append(f"browser-{browser}-{index % limit}")
+    return groups
+
+
+@dataclass
+class BrowserSlotStats:
+    """Ожидание слотов одного браузера"""
+    leases: int = 0
+    waits: int = 0
+    wait_time: float = 0.0
+
+
+class BrowserSlots:
+    """
+    Ограничение числа одновременно занятых слотов каждого браузера для всех процессов на машине
+
+    Слоты хранятся в базе SQLite так же, как аренда аккаунтов в AccountPool: выдача идет
+    в транзакции BEGIN IMMEDIATE, слоты завершившихся процессов освобождаются.
+    Для браузеров без ограничения слоты не выдаются. BrowserAdmission берет здесь слот
+    на каждый живой браузер, чтобы ограничение --max-browsers действовало для всех воркеров.
+    """
+
+    def __init__(self, path, limits: Dict[str, int], poll_interval=0.2):
+        self.path = Path(path)
+        self.limits = dict(limits)
+        self.poll_interval = poll_interval
+        self.stats: Dict[str, BrowserSlotStats] = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), timeout=30, isolation_level=None,
+                                           check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS slots ("
+                "browser TEXT NOT NULL, slot INTEGER NOT NULL, owner TEXT NOT NULL, pid INTEGER NOT NULL, "
+                "PRIMARY KEY (browser, slot))"
+            )
+
+    def acquire(self, browser: str, owner="", timeout=600.0) -> Optional[int]:
+        """Занимает слот браузера, ожидая его не дольше timeout секунд; None - браузер без ограничения"""
+        limit = self.limits.get(browser)
+        if not limit:
+            return None
+
+        start_time = time.monotonic()
+        waited = False
+        while True:
+            slot = self._try_acquire(browser, limit, owner)
+            if slot is not None:
+                break
+            if time.monotonic() - start_time >= timeout:
+                raise BrowserSlotTimeout(f"Нет свободного слота {browser} (ограничение {limit}) за {timeout}с")
+            if not waited:
+                logging.info(f"Тест {owner} ждет свободного слота {browser} (ограничение {limit})")
+                waited = True
+            time.sleep(self.poll_interval)
+
+        with self._lock:
+            stats = self.stats.setdefault(browser, BrowserSlotStats())
+            stats.leases += 1
+            if waited:
+                stats.waits += 1
+                stats.wait_time += time.monotonic() - start_time
+        return slot
+
+    def try_acquire(self, browser: str, owner="") -> Optional[int]:
+        """Занимает слот браузера с ограничением без ожидания; None - свободных слотов нет"""
+        return self._try_acquire(browser, self.limits[browser], owner)
+
+    def _try_acquire(self, browser, limit, owner) -> Optional[int]:
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                taken = set()
+                for slot, pid in connection.execute("SELECT slot, pid FROM slots WHERE browser = ?", (browser,)):
+                    if process_alive(pid):
+                        taken.add(slot)
+                    else:
+                        connection.execute("DELETE FROM slots WHERE browser = ? AND slot = ?", (browser, slot))
+                free = [slot for slot in range(limit) if slot not in taken]
+                if free:
+                    connection.execute("INSERT INTO slots (browser, slot, owner, pid) VALUES (?, ?, ?, ?)",
+                                       (browser, free[0], owner, os.getpid()))
+                connection.execute("COMMIT")
+                return free[0] if free else None
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def release(self, browser: str, slot: Optional[int]):
+        if slot is None:
+            return
+        with self._lock:
+            self._connection.execute("DELETE FROM slots WHERE browser = ? AND slot = ? AND pid = ?",
+                                     (browser, slot, os.getpid()))
+
+    def busy(self, browser: str) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM slots WHERE browser = ?", (browser,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+@dataclass
+class BrowserResults:
+    """Итоги тестов одного браузера"""
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    duration: float = 0.0
+
+    def summary(self) -> str:
+        return (f"пройдено {self.passed}, упало {self.failed}, пропущено {self.skipped}, "
+                f"время тестов {self.duration:.1f}с")
+
+
+def browser_of(user_properties: Iterable) -> Optional[str]:
+    """Браузер теста из report.user_properties (туда его пишет фикстура browser_type)"""
+    return dict(user_properties).get("browser")
@@ -0,0 +1,173 @@
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List
+
+
+@dataclass
+class CommandRecord:
+    """Одна команда WebDriver, отправленная в драйвер браузера"""
+    driver_name: str
+    command: str
+    duration: float
+    payload_size: int
+    timestamp: float
+
+
+class CommandStats:
+    """Накопительная статистика команд WebDriver"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_duration = 0.0
+        self.payload_bytes = 0
+        self.by_command = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, record: CommandRecord):
+        with self._lock:
+            self.count += 1
+            self.total_duration += record.duration
+            self.payload_bytes += record.payload_size
+            self.by_command[record.command] += 1
+
+    def __repr__(self):
+        return (f"CommandStats(count={self.count}, total_duration={self.total_duration:.3f}, "
+                f"payload_bytes={self.payload_bytes})")
+
+
+class CommandTracker:
+    """
+    Область подсчета команд WebDriver (например, один тест)
+
+    Пока трекер активен, в него попадают команды всех инструментированных драйверов.
+    """
+
+    def __init__(self, keep_records=True):
+        self.keep_records = keep_records
+        self.records: List[CommandRecord] = []
+        self.total = CommandStats()
+        self.by_driver: Dict[str, CommandStats] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def count(self):
+        """Общее количество команд"""
+        return self.total.count
+
+    def add(self, record: CommandRecord):
+        with self._lock:
+            if self.keep_records:
+                self.records.append(record)
+            driver_stats = self.by_driver.get(record.driver_name)
+            if driver_stats is None:
+                driver_stats = self.by_driver[record.driver_name] = CommandStats()
+        self.total.add(record)
+        driver_stats.add(record)
+
+    def summary(self) -> str:
+        """Возвращает краткую сводку для логов"""
+        drivers = ", ".join(f"{name}: {stats.count}" for name, stats in self.by_driver.items())
+        top = ", ".join(f"{command}={count}" for command, count in self.total.by_command.most_common(5))
+        return (f"{self.count} команд за {self.total.total_duration:.2f}с, {self.total.payload_bytes} байт"
+                f"{f' ({drivers})' if drivers else ''}{f'; чаще всего: {top}' if top else ''}")
+
+    def __enter__(self):
+        with _trackers_lock:
+            _active_trackers.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        with _trackers_lock:
+            _active_trackers.remove(self)
+        return False
+
+
+# Активные области подсчета команд
+_active_trackers: List[CommandTracker] = []
+_trackers_lock = threading.Lock()
+
+
+def track_commands(keep_records=True) -> CommandTracker:
+    """Создает область подсчета команд для использования в блоке with"""
+    return CommandTracker(keep_records)
+
+
+def _payload_size(params) -> int:
+    """Оценивает размер тела запроса команды в байтах"""
+    if not params:
+        return 0
+    try:
+        return len(json.dumps(params, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _record_command(stats: CommandStats, driver_name: str, command: str, duration: float, params):
+    record = CommandRecord(driver_name, command, duration, _payload_size(params), time.time())
+    stats.add(record)
+    if _active_trackers:
+        with _trackers_lock:
+            trackers = list(_active_trackers)
+        for tracker in trackers:
+            tracker.add(record)
+
+
+def instrument_driver(driver, driver_name="default") -> CommandStats:
+    """
+    Оборачивает command_executor драйвера для подсчета каждой команды
+
+    Повторный вызов для того же драйвера только обновляет имя драйвера в записях.
+
+    Returns:
+        Статистика команд драйвера (также доступна как driver.command_stats)
+    """
+    executor = driver.command_executor
+    if getattr(executor, '_command_counter_name', None) is not None:
+        executor._command_counter_name = driver_name
+        return driver.command_stats
+
+    stats = CommandStats()
+    original_execute = executor.execute
+    executor._command_counter_name = driver_name
+
+    def execute(command, params=None):
+        start_time = time.perf_counter()
+        try:
+            return original_execute(command, params)
+        finally:
+            _record_command(stats, executor._command_counter_name, command, time.perf_counter() - start_time, params)
+
+    executor.execute = execute
+    driver.command_stats = stats
+    return stats
+
+
+def check_command_budget(tracker: CommandTracker, max_round_trips, action="fail", name="тест"):
+    """
+    Проверяет, не превышен ли бюджет команд WebDriver
+
+    Args:
+        tracker: Область подсчета команд
+        max_round_trips: Максимально допустимое количество команд
+        action: "fail" - выбросить AssertionError, "warn" - записать предупреждение в лог
+        name: Имя проверяемой области для сообщения
+
+    Returns:
+        True, если бюджет не превышен
+    """
+    if max_round_trips is None or tracker.count <= max_round_trips:
+        return True
+
+    message = (f"Превышен бюджет команд WebDriver для {name}: "
+               f"{tracker.count} > {max_round_trips} ({tracker.summary()})")
+    if action == "fail":
+        raise AssertionError(message)
+    if action != "warn":
+        raise ValueError(f"Неизвестное действие при превышении бюджета: {action}")
+
+    logging.warning(message)
+    return False
@@ -5,10 +5,14 @@ from selenium.common.exceptions import TimeoutException
 
 from page_object_library.core.locator import LocatorMeta
 from page_object_library.utils.decorators import auto_log
+from page_object_library.utils.retry import RetryPolicy, element_retry
 
 
-class BaseElement:
+class BaseElement(metaclass=LocatorMeta):
     """Базовый класс для элементов страницы"""
+    auto_log_methods = False  # Методы элементов логируются явно через @auto_log
+    # Повтор действий при временных ошибках (stale, перекрытый клик); None отключает повторы
+    retry_policy = RetryPolicy()
 
     def __init__(self, page, locator, description=None, element=None):
         self.page = page
@@ -17,6 +21,7 @@ class BaseElement:
         self.locator = locator
         self.description = description
         self._element = element  # Можно передать уже найденный элемент
+        self._located = element is None
         self.wait = WebDriverWait(self.driver, 10)
 
     @property
@@ -31,6 +36,11 @@ class BaseElement:
                 raise TimeoutException(f"Элемент {self.locator} не найден за 10 секунд")
         return self._element
 
+    def _prepare_retry(self, exception):
+        """Перед повтором действия элемент, найденный по локатору, ищется заново"""
+        if self._located:
+            self._element = None
+
     @auto_log
     def is_visible(self):
         """Проверяет видимость элемента"""
@@ -52,6 +62,7 @@ class BaseElement:
             return False
 
     @auto_log
+    @element_retry
     def click(self):
         """Базовый метод клика для всех элементов"""
         try:
@@ -64,11 +75,13 @@ class BaseElement:
             raise Exception(f"Ошибка при клике: {e}")
 
     @auto_log
+    @element_retry
     def get_text(self):
         """Получает текст элемента"""
         return self.element.text
 
     @auto_log
+    @element_retry
     def get_attribute(self, name):
         """Получает атрибут элемента"""
         return self.element.get_attribute(name)
@@ -81,6 +94,7 @@ class Button(BaseElement):
         super().__init__(page, locator, description, parent_element)
 
     @auto_log
+    @element_retry
     def is_enabled(self):
         """Проверяет, активна ли кнопка"""
         return self.element.is_enabled()
@@ -93,6 +107,7 @@ class Input(BaseElement):
         super().__init__(page, locator, description, element)
 
     @auto_log
+    @element_retry
     def type(self, text):
         """Вводит текст в поле"""
         try:
@@ -103,12 +118,14 @@ class Input(BaseElement):
             raise Exception(f"Ошибка при вводе текста: {e}")
 
     @auto_log
+    @element_retry
     def clear(self):
         """Очищает поле"""
         self.element.clear()
         return self.page
 
     @auto_log
+    @element_retry
     def get_value(self):
         """Получает значение поля"""
         return self.element.get_attribute("value")
@@ -135,6 +152,7 @@ class Checkbox(BaseElement):
         return self.page
 
     @auto_log
+    @element_retry
     def is_checked(self):
         """Проверяет, отмечен ли чекбокс"""
         return self.element.is_selected()
@@ -154,6 +172,7 @@ class Radio(BaseElement):
         return self.page
 
     @auto_log
+    @element_retry
     def is_selected(self):
         """Проверяет, выбрана ли радиокнопка"""
         return self.element.is_selected()
@@ -166,6 +185,7 @@ class Dropdown(BaseElement):
         super().__init__(page, locator, description, element)
 
     @auto_log
+    @element_retry
     def select_by_text(self, text):
         """Выбирает элемент по видимому тексту"""
         select = Select(self.element)
@@ -173,6 +193,7 @@ class Dropdown(BaseElement):
         return self.page
 
     @auto_log
+    @element_retry
     def select_by_index(self, index):
         """Выбирает элемент по индексу"""
         select = Select(self.element)
@@ -180,6 +201,7 @@ class Dropdown(BaseElement):
         return self.page
 
     @auto_log
+    @element_retry
     def get_selected_option(self):
         """Получает выбранный элемент"""
         select = Select(self.element)
@@ -193,6 +215,7 @@ class Link(BaseElement):
         super().__init__(page, locator, description, element)
 
     @auto_log
+    @element_retry
     def get_url(self):
         """Получает URL ссылки"""
         return self.element.get_attribute("href")
@@ -200,6 +223,7 @@ class Link(BaseElement):
 
 class ElementGroup(metaclass=LocatorMeta):
     """Базовый класс для групп элементов на странице"""
+    auto_log_methods = True  # Публичные методы компонентов логируются автоматически
 
     def __init__(self, page, timeout=10):
         """
@@ -212,4 +236,10 @@ class ElementGroup(metaclass=LocatorMeta):
         self.driver = page.driver
         self.driver_name = getattr(page, 'driver_name', 'unknown')  # Получаем имя драйвера от страницы
         self.wait = WebDriverWait(self.driver, timeout)
-        self.group_name = self.__
\ No newline at end of file
+        self.group_name = self.__class__.__name__
+        self._init_elements()
+
+    def _init_elements(self):
+        """Инициализирует элементы группы.
+        Переопределяется в подклассах."""
+        pass
@@ -2,12 +2,15 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 import logging
+import threading
+
+from page_object_library.core.command_counter import instrument_driver
 
 
 class DriverFactory:
     @staticmethod
-    def create_driver(browser_type="chrome", headless=False, options=None):
-        """Создает WebDriver с указанными настройками"""
+    def create_driver(browser_type="chrome", headless=False, options=None, driver_name="default"):
+        """Создает WebDriver с указанными настройками и подсчетом команд"""
         logging.info(f"Создание драйвера {browser_type}. Headless: {headless}")
 
         if browser_type.lower() == "chrome":
@@ -30,83 +33,155 @@ class DriverFactory:
         else:
             raise ValueError(f"Неподдерживаемый тип браузера: {browser_type}")
 
+        instrument_driver(driver, driver_name)
         driver.maximize_window()
         return driver
 
 
 class MultiDriverManager:
-    """Менеджер для работы с несколькими драйверами"""
-
-    def __init__(self):
+    """Менеджер для работы с несколькими драйверами
+
+    Потокобезопасен: словарь драйверов защищен общей блокировкой, а создание
+    драйвера выполняется под блокировкой конкретного имени, поэтому потоки,
+    создающие разные драйверы, не ждут друг друга.
+
+    С admission (BrowserAdmission) запуск нового браузера ждет допуска по числу живых
+    браузеров и памяти машины; priorities задает приоритет очереди для имен драйверов.
+    """
+
+    def __init__(self, admission=None, priorities=None):
+        """
+        Args:
+            admission: BrowserAdmission для ограничения одновременных браузеров (None - без ограничения)
+            priorities: Приоритеты допуска по именам драйверов {имя: приоритет}, по умолчанию 0
+        """
+        self.admission = admission
+        self.priorities = dict(priorities or {})
         self.drivers = {}
         self.current_driver_name = None
+        self._lock = threading.RLock()
+        self._creation_locks = {}
+
+    def _get_creation_lock(self, name):
+        """Возвращает блокировку создания драйвера с указанным именем"""
+        with self._lock:
+            lock = self._creation_locks.get(name)
+            if lock is None:
+                lock = self._creation_locks[name] = threading.Lock()
+            return lock
 
     def create_driver(self, name="default", browser_type="chrome", headless=False, options=None):
         """Создает новый драйвер с указанным именем"""
+        with self._get_creation_lock(name):
+            return self._create_driver(name, browser_type, headless, options)
+
+    def _create_driver(self, name, browser_type, headless, options):
+        """Создает драйвер; вызывается под блокировкой создания для этого имени"""
         logging.info(f"Создание драйвера с именем '{name}'")
 
         if name in self.drivers:
             logging.info(f"Драйвер '{name}' уже существует. Закрываем его.")
             self.close_driver(name)
 
-        driver = DriverFactory.create_driver(browser_type, headless, options)
-        self.drivers[name] = driver
+        # Сам браузер запускается без общей блокировки, чтобы не блокировать другие имена
+        driver = self._launch_driver(name, browser_type, headless, options)
 
-        if self.current_driver_name is None:
-            self.current_driver_name = name
+        with self._lock:
+            self.drivers[name] = driver
+            if self.current_driver_name is None:
+                self.current_driver_name = name
 
         return driver
 
+    def _launch_driver(self, name, browser_type, headless, options):
+        """Запускает браузер для драйвера с указанным именем"""
+        if self.admission is None:
+            return DriverFactory.create_driver(browser_type, headless, options, driver_name=name)
+        return self.admission.launch(
+            lambda: DriverFactory.create_driver(browser_type, headless, options, driver_name=name),
+            owner=name, priority=self.priorities.get(name, 0)
+        )
+
+    def _dispose_driver(self, driver):
+        """Освобождает драйвер, удаленный из менеджера"""
+        try:
+            driver.quit()
+        finally:
+            if self.admission is not None:
+                self.admission.dispose(driver)
+
     def get_driver(self, name="default"):
         """Получает драйвер по имени"""
-        if name not in self.drivers:
-            raise ValueError(f"Драйвер с именем '{name}' не существует")
-        return self.drivers[name]
+        with self._lock:
+            if name not in self.drivers:
+                raise ValueError(f"Драйвер с именем '{name}' не существует")
+            return self.drivers[name]
+
+    def get_all_drivers(self):
+        """Возвращает снимок словаря драйверов {имя: драйвер}"""
+        with self._lock:
+            return dict(self.drivers)
 
     def get_or_create_driver(self, name="default", browser_type="chrome", headless=False, options=None):
         """Получает существующий драйвер или создает новый"""
-        if name in self.drivers:
+        with self._lock:
+            driver = self.drivers.get(name)
+        if driver is not None:
             logging.info(f"Используем существующий драйвер '{name}'")
-            return self.drivers[name]
-        else:
+            return driver
+
+        with self._get_creation_lock(name):
+            # Повторная проверка: драйвер мог быть создан другим потоком, пока мы ждали блокировку
+            with self._lock:
+                driver = self.drivers.get(name)
+            if driver is not None:
+                logging.info(f"Используем существующий драйвер '{name}'")
+                return driver
+
             logging.info(f"Создаем новый драйвер '{name}'")
-            return self.create_driver(name, browser_type, headless, options)
+            return self._create_driver(name, browser_type, headless, options)
 
     def switch_to_driver(self, name):
         """Переключается на другой драйвер"""
-        if name not in self.drivers:
-            raise ValueError(f"Драйвер с именем '{name}' не существует")
+        with self._lock:
+            if name not in self.drivers:
+                raise ValueError(f"Драйвер с именем '{name}' не существует")
 
-        logging.info(f"Переключение на драйвер '{name}'")
-        self.current_driver_name = name
-        return self.drivers[name]
+            logging.info(f"Переключение на драйвер '{name}'")
+            self.current_driver_name = name
+            return self.drivers[name]
 
     def get_current_driver(self):
         """Получает текущий активный драйвер"""
-        if self.current_driver_name is None:
-            raise ValueError("Нет активного драйвера")
-        return self.drivers[self.current_driver_name]
+        with self._lock:
+            if self.current_driver_name is None:
+                raise ValueError("Нет активного драйвера")
+            return self.drivers[self.current_driver_name]
 
     def close_driver(self, name=None):
         """Закрывает указанный драйвер"""
-        if name is None:
-            name = self.current_driver_name
+        with self._lock:
+            if name is None:
+                name = self.current_driver_name
 
-        if name not in self.drivers:
-            return
+            if name not in self.drivers:
+                return
 
-        logging.info(f"Закрытие драйвера '{name}'")
-        self.drivers[name].quit()
-        del self.drivers[name]
+            driver = self.drivers.pop(name)
 
-        if name == self.current_driver_name:
-            self.current_driver_name = next(iter(self.drivers)) if self.drivers else None
+            if name == self.current_driver_name:
+                self.current_driver_name = next(iter(self.drivers)) if self.drivers else None
+
+        logging.info(f"Закрытие драйвера '{name}'")
+        self._dispose_driver(driver)
 
     def close_all_drivers(self):
         """Закрывает все драйверы"""
         logging.info("Закрытие всех драйверов")
-        for name in list(self.drivers.keys()):
-            self.drivers[name].quit()
+        with self._lock:
+            drivers = list(self.drivers.values())
+            self.drivers.clear()
+            self.current_driver_name = None
 
-        self.drivers.clear()
-        self.current_driver_name = None
\ No newline at end of file
+        for driver in drivers:
+            self._dispose_driver(driver)
@@ -0,0 +1,226 @@
+import logging
+import threading
+from dataclasses import dataclass, fields
+
+from page_object_library.core.driver_factory import DriverFactory, MultiDriverManager
+from page_object_library.core.state_reset import reset_driver
+
+
+def check_driver_health(driver) -> bool:
+    """Жив ли драйвер: сессия отвечает и у браузера есть хотя бы одно окно"""
+    try:
+        return bool(driver.window_handles)
+    except Exception as e:
+        logging.warning(f"Драйвер не прошел проверку работоспособности: {e}")
+        return False
+
+
+@dataclass
+class DriverPoolStats:
+    """Статистика пула драйверов"""
+    created: int = 0
+    reused: int = 0
+    replaced: int = 0
+    retired: int = 0
+    resets: int = 0
+    reset_failures: int = 0
+    evicted: int = 0
+
+    @property
+    def leases(self) -> int:
+        return self.created + self.reused
+
+    @property
+    def reuse_rate(self) -> float:
+        return self.reused / self.leases if self.leases else 0.0
+
+    def as_dict(self) -> dict:
+        return {item.name: getattr(self, item.name) for item in fields(self)}
+
+    def merge(self, other: "DriverPoolStats") -> "DriverPoolStats":
+        return DriverPoolStats(**{name: value + getattr(other, name) for name, value in self.as_dict().items()})
+
+    def summary(self) -> str:
+        return (f"выдано {self.leases} (переиспользовано {self.reused}, {self.reuse_rate:.0%}), "
+                f"запущено {self.created}, заменено сломанных {self.replaced}, выведено по лимиту {self.retired}, "
+                f"сбросов {self.resets} (ошибок {self.reset_failures}), закрыто свободных ради памяти {self.evicted}")
+
+
+class DriverPool:
+    """
+    Пул переиспользуемых драйверов одного процесса (воркера xdist)
+
+    Драйверы хранятся по ключу (имя, браузер, headless). Перед выдачей свободный драйвер
+    проверяется на работоспособность и при необходимости заменяется новым, при возврате
+    состояние драйвера сбрасывается. Драйвер, который не удалось сбросить или который
+    отработал max_uses тестов, закрывается.
+
+    С admission (BrowserAdmission) новый браузер запускается только после допуска; если
+    допуска нет, пул сначала закрывает свободный драйвер другого ключа, чтобы не держать
+    простаивающий браузер, пока тест ждет памяти.
+
+    Потокобезопасен: запуск и закрытие браузеров выполняются вне блокировки.
+    """
+
+    def __init__(self, browser_type="chrome", headless=False, max_uses=0,
+                 health_check=check_driver_health, reset=reset_driver, admission=None):
+        """
+        Args:
+            browser_type: Браузер по умолчанию
+            headless: Режим headless по умолчанию
+            max_uses: Сколько раз можно выдать один драйвер (0 - без ограничения)
+            health_check: Проверка драйвера перед выдачей: health_check(driver) -> bool
+            reset: Сброс драйвера при возврате: reset(driver) -> bool, например StateResetter
+            admission: BrowserAdmission для ограничения одновременных браузеров (None - без ограничения)
+        """
+        self.browser_type = browser_type
+        self.headless = headless
+        self.max_uses = max_uses
+        self.health_check = health_check
+        self.reset = reset
+        self.admission = admission
+        self.stats = DriverPoolStats()
+        self._idle = {}
+        self._leased = {}
+        self._uses = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, name="default", browser_type=None, headless=None):
+        """Выдает свободный работоспособный драйвер или запускает новый"""
+        key = (name, browser_type or self.browser_type, self.headless if headless is None else headless)
+
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                driver = idle.pop() if idle else None
+            if driver is None:
+                break
+            if self.health_check(driver):
+                with self._lock:
+                    self.stats.reused += 1
+                    self._lease(driver, key)
+                logging.info(f"Переиспользуем драйвер '{name}' из пула")
+                return driver
+
+            logging.warning(f"Драйвер '{name}' из пула не отвечает, заменяем его новым")
+            with self._lock:
+                self.stats.replaced += 1
+                self._uses.pop(id(driver), None)
+            self._quit(driver)
+
+        driver = self._launch(name, key)
+        with self._lock:
+            self.stats.created += 1
+            self._uses[id(driver)] = 0
+            self._lease(driver, key)
+        return driver
+
+    def _launch(self, name, key):
+        if self.admission is None:
+            return DriverFactory.create_driver(key[1], key[2], driver_name=name)
+        if not self.admission.can_launch():
+            self._evict_idle()
+        return self.admission.launch(lambda: DriverFactory.create_driver(key[1], key[2], driver_name=name),
+                                     owner=name)
+
+    def _evict_idle(self):
+        """Закрывает самый давно освободившийся свободный драйвер, если он есть"""
+        with self._lock:
+            idle = next((drivers for drivers in self._idle.values() if drivers), None)
+            if idle is None:
+                return
+            driver = idle.pop(0)
+            self._uses.pop(id(driver), None)
+            self.stats.evicted += 1
+        logging.info("Закрываем свободный драйвер пула, чтобы освободить место для нового браузера")
+        self._quit(driver)
+
+    def _lease(self, driver, key):
+        self._leased[id(driver)] = (driver, key)
+        self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+
+    def release(self, driver):
+        """Возвращает драйвер в пул после сброса состояния"""
+        with self._lock:
+            leased = self._leased.pop(id(driver), None)
+            uses = self._uses.get(id(driver), 0)
+        if leased is None:
+            raise ValueError("Драйвер не был выдан этим пулом")
+
+        if self.max_uses and uses >= self.max_uses:
+            logging.info(f"Драйвер '{leased[1][0]}' отработал {uses} тестов и закрывается")
+            with self._lock:
+                self.stats.retired += 1
+            self._discard(driver)
+            return
+
+        reset_ok = self.reset(driver)
+        with self._lock:
+            self.stats.resets += 1
+            if reset_ok:
+                self._idle.setdefault(leased[1], []).append(driver)
+                return
+            self.stats.reset_failures += 1
+        self._discard(driver)
+
+    def discard(self, driver):
+        """Закрывает выданный драйвер, не возвращая его в пул"""
+        with self._lock:
+            self._leased.pop(id(driver), None)
+        self._discard(driver)
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        self._quit(driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"Ошибка при закрытии драйвера: {e}")
+        if self.admission is not None:
+            self.admission.dispose(driver)
+
+    @property
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(drivers) for drivers in self._idle.values())
+
+    @property
+    def leased_count(self) -> int:
+        with self._lock:
+            return len(self._leased)
+
+    def close_all(self):
+        """Закрывает все драйверы пула, включая выданные"""
+        with self._lock:
+            drivers = [driver for idle in self._idle.values() for driver in idle]
+            drivers += [driver for driver, _ in self._leased.values()]
+            self._idle.clear()
+            self._leased.clear()
+            self._uses.clear()
+        logging.info(f"Закрытие пула драйверов: {len(drivers)} драйверов. {self.stats.summary()}")
+        for driver in drivers:
+            self._quit(driver)
+
+
+class PooledDriverManager(MultiDriverManager):
+    """MultiDriverManager, который берет драйверы из пула и возвращает их туда вместо закрытия"""
+
+    def __init__(self, pool: DriverPool, priorities=None):
+        super().__init__(admission=pool.admission, priorities=priorities)
+        self.pool = pool
+
+    def _launch_driver(self, name, browser_type, headless, options):
+        if options is not None:
+            # Драйвер с особыми настройками нельзя выдать другому тесту
+            logging.info(f"Драйвер '{name}' с собственными настройками создается вне пула")
+            return super()._launch_driver(name, browser_type, headless, options)
+        return self.pool.acquire(name, browser_type, headless)
+
+    def _dispose_driver(self, driver):
+        try:
+            self.pool.release(driver)
+        except ValueError:
+            super()._dispose_driver(driver)
@@ -22,7 +22,12 @@ class Locator:
 
 
 class LocatorMeta(type):
-    """Метакласс для автоматической генерации описаний локаторов"""
+    """Метакласс для автоматической генерации описаний локаторов
+
+    Также оборачивает публичные методы класса в auto_log, если у класса
+    включен атрибут auto_log_methods (см. instrument_class), и сообщает подписчикам
+    о создании экземпляров (граф зависимостей тестов от page objects).
+    """
 
     def __new__(mcs, name, bases, attrs):
         for attr_name, attr_value in list(attrs.items()):
@@ -31,7 +36,31 @@ class LocatorMeta(type):
                 description = mcs._generate_description(attr_name, by, value)
                 attrs[attr_name] = Locator(by, value, description)
 
-        return super().__new__(mcs, name, bases, attrs)
+        cls = super().__new__(mcs, name, bases, attrs)
+
+        # Импорт внутри метода, так как decorators сам импортирует этот модуль
+        from page_object_library.utils.decorators import instrument_class
+        return instrument_class(cls)
+
+    @classmethod
+    def track_instances(mcs, enabled: bool):
+        """
+        Включает или выключает уведомление подписчиков о создании экземпляров
+
+        Без подписчиков __call__ не переопределен, и создание страниц и элементов
+        идет через type.__call__ без накладных расходов.
+        """
+        if enabled:
+            mcs.__call__ = mcs._notifying_call
+        elif "__call__" in mcs.__dict__:
+            del mcs.__call__
+
+    def _notifying_call(cls, *args, **kwargs):
+        instance = type.__call__(cls, *args, **kwargs)
+        # Импорт внутри метода по той же причине, что и в __new__
+        from page_object_library.utils.dependencies import notify_class_used
+        notify_class_used(cls)
+        return instance
 
     @staticmethod
     def _generate_description(attr_name, by, value):
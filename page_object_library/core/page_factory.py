@@ -1,13 +1,122 @@
-from typing import TypeVar, Type, Dict, Any
+from collections import OrderedDict
+from typing import TypeVar, Type, Dict, Callable
 import logging
+import threading
+import time
+import weakref
+
+from page_object_library.core.base_page import read_document_identity
+from page_object_library.core.parallel import ParallelScenarioRunner, ScenarioResult
 
 T = TypeVar('T', bound='BasePage')
 
 
+class PageCacheStats:
+    """Счетчики кеша страниц"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.expirations = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+    def __repr__(self):
+        counters = ", ".join(f"{name}={value}" for name, value in self.__dict__.items())
+        return f"PageCacheStats({counters})"
+
+
+class _PageCacheEntry:
+    __slots__ = ("page_ref", "created_at")
+
+    def __init__(self, page):
+        self.page_ref = weakref.ref(page)
+        self.created_at = time.monotonic()
+
+
+class PageCache:
+    """
+    Ограниченный LRU-кеш объектов страниц
+
+    Хранит слабые ссылки на страницы, поэтому не удерживает их в памяти.
+    Запись считается недействительной по истечении ttl секунд, а открытая страница - еще
+    и если у драйвера сменился URL или документ, загруженный ее open() (после навигации
+    закешированные элементы ссылаются на старый DOM). Документ проверяется одним запросом
+    к браузеру только при попадании в кеш и только для открытых страниц; неоткрытая
+    страница к документу не привязана, ее элементы ищутся заново при первом обращении.
+    """
+
+    def __init__(self, driver, max_size=32, ttl=None):
+        """
+        Args:
+            driver: WebDriver, которому принадлежат страницы
+            max_size: Максимальное количество страниц в кеше
+            ttl: Время жизни записи в секундах (None - без ограничения)
+        """
+        self.driver = driver
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = PageCacheStats()
+        self._entries: "OrderedDict[str, _PageCacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Возвращает страницу из кеша или None, если записи нет или она устарела"""
+        with self._lock:
+            entry = self._entries.get(key)
+            page = entry.page_ref() if entry is not None else None
+            if page is None or (self.ttl is not None and time.monotonic() - entry.created_at > self.ttl):
+                if entry is not None:
+                    del self._entries[key]
+                    self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            document_identity = page.document_identity
+
+        # Запрос к браузеру идет без блокировки, чтобы не задерживать другие потоки
+        if document_identity is not None and read_document_identity(self.driver) != document_identity:
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                self.stats.invalidations += 1
+                self.stats.misses += 1
+            return None
+
+        with self._lock:
+            if self._entries.get(key) is entry:
+                self._entries.move_to_end(key)
+            self.stats.hits += 1
+        return page
+
+    def put(self, key: str, page):
+        """Добавляет страницу в кеш, вытесняя самые давно использованные записи"""
+        entry = _PageCacheEntry(page)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self):
+        """Очищает кеш"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
 class PageFactory:
     """Фабрика для создания объектов страниц без явной передачи драйвера"""
 
-    def __init__(self, driver, base_url=None, driver_name="default"):
+    def __init__(self, driver, base_url=None, driver_name="default", cache_size=32, cache_ttl=None):
         """
         Инициализация фабрики страниц
 
@@ -15,11 +124,13 @@ class PageFactory:
             driver: WebDriver instance
             base_url: Базовый URL для всех страниц (опционально)
             driver_name: Имя драйвера для логгирования
+            cache_size: Максимальное количество страниц в кеше
+            cache_ttl: Время жизни страницы в кеше в секундах (None - без ограничения)
         """
         self.driver = driver
         self.base_url = base_url
         self.driver_name = driver_name
-        self._page_cache: Dict[str, Any] = {}
+        self._page_cache = PageCache(driver, max_size=cache_size, ttl=cache_ttl)
         logging.info(f"Инициализирована фабрика страниц для драйвера '{driver_name}' с base_url: {base_url}")
 
     def create_page(self, page_class: Type[T], use_cache=True, base_url=None) -> T:
@@ -41,13 +152,12 @@ class PageFactory:
         cache_key = f"{page_name}_{effective_base_url}" if effective_base_url else page_name
 
         # Проверяем кеш, если включено кеширование
-        if use_cache and cache_key in self._page_cache:
-            logging.info(f"Возвращаем страницу {page_name} из кеша")
-            return self._page_cache[cache_key]
+        if use_cache:
+            page = self._page_cache.get(cache_key)
+            if page is not None:
+                return page
 
         # Создаем новый экземпляр страницы
-        logging.info(f"Создаем новый экземпляр страницы {page_name} с base_url: {effective_base_url}")
-
         if effective_base_url:
             page = page_class(self.driver, base_url=effective_base_url, driver_name=self.driver_name)
         else:
@@ -55,10 +165,15 @@ class PageFactory:
 
         # Сохраняем в кеш, если включено кеширование
         if use_cache:
-            self._page_cache[cache_key] = page
+            self._page_cache.put(cache_key, page)
 
         return page
 
+    @property
+    def cache_stats(self) -> PageCacheStats:
+        """Счетчики попаданий, промахов и вытеснений кеша страниц"""
+        return self._page_cache.stats
+
     def clear_cache(self):
         """Очищает кеш страниц"""
         self._page_cache.clear()
@@ -92,9 +207,13 @@ class PageFactory:
 
 
 class MultiPageFactory:
-    """Фабрика для работы с несколькими драйверами и их страницами"""
+    """Фабрика для работы с несколькими драйверами и их страницами
+
+    Потокобезопасна: фабрики страниц создаются под блокировкой своего ключа.
+    """
 
-    def __init__(self, multi_driver_manager, default_browser_type="chrome", default_headless=False, default_base_url=None):
+    def __init__(self, multi_driver_manager, default_browser_type="chrome", default_headless=False, default_base_url=None,
+                 cache_size=32, cache_ttl=None):
         """
         Инициализация фабрики для нескольких драйверов
 
@@ -103,12 +222,18 @@ class MultiPageFactory:
             default_browser_type: Тип браузера по умолчанию для автоматического создания
             default_headless: Режим headless по умолчанию для автоматического создания
             default_base_url: Базовый URL по умолчанию для всех драйверов
+            cache_size: Размер кеша страниц каждой фабрики
+            cache_ttl: Время жизни страницы в кеше каждой фабрики в секундах
         """
         self.multi_driver = multi_driver_manager
         self.default_browser_type = default_browser_type
         self.default_headless = default_headless
         self.default_base_url = default_base_url
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
         self._factories: Dict[str, PageFactory] = {}
+        self._lock = threading.Lock()
+        self._creation_locks: Dict[str, threading.Lock] = {}
 
     def get_factory(self, driver_name="default", browser_type=None, headless=None, base_url=None) -> PageFactory:
         """
@@ -126,14 +251,31 @@ class MultiPageFactory:
         effective_base_url = base_url or self.default_base_url
         factory_key = f"{driver_name}_{effective_base_url}" if effective_base_url else driver_name
 
-        if factory_key not in self._factories:
+        with self._lock:
+            factory = self._factories.get(factory_key)
+            if factory is not None:
+                return factory
+            creation_lock = self._creation_locks.setdefault(factory_key, threading.Lock())
+
+        with creation_lock:
+            with self._lock:
+                factory = self._factories.get(factory_key)
+            if factory is not None:
+                return factory
+
             browser_type = browser_type or self.default_browser_type
             headless = headless if headless is not None else self.default_headless
 
             driver = self.multi_driver.get_or_create_driver(driver_name, browser_type, headless)
-            self._factories[factory_key] = PageFactory(driver, base_url=effective_base_url, driver_name=driver_name)
+            factory = PageFactory(
+                driver, base_url=effective_base_url, driver_name=driver_name,
+                cache_size=self.cache_size, cache_ttl=self.cache_ttl
+            )
+
+            with self._lock:
+                self._factories[factory_key] = factory
 
-        return self._factories[factory_key]
+        return factory
 
     def create_page(self, page_class: Type[T], driver_name="default", browser_type=None, headless=None, base_url=None) -> T:
         """
@@ -152,8 +294,36 @@ class MultiPageFactory:
         factory = self.get_factory(driver_name, browser_type, headless, base_url)
         return factory.create_page(page_class)
 
+    def run_parallel(self, flows: Dict[str, Callable], sync_timeout=None, raise_on_error=False,
+                     **factory_kwargs) -> Dict[str, ScenarioResult]:
+        """
+        Запускает сценарии пользователей одновременно, каждый на своем драйвере
+
+        Каждая функция получает UserContext с фабрикой страниц своего драйвера
+        и методом sync(point) для синхронизации с остальными пользователями.
+
+        Args:
+            flows: Словарь {имя_драйвера: функция(UserContext)}
+            sync_timeout: Таймаут ожидания в точках синхронизации в секундах
+            raise_on_error: Выбросить ParallelScenarioError, если хотя бы один сценарий упал
+            **factory_kwargs: Параметры get_factory (browser_type, headless, base_url)
+
+        Returns:
+            Словарь {имя_драйвера: ScenarioResult} с результатами, исключениями и длительностью
+        """
+        runner = ParallelScenarioRunner(self, sync_timeout)
+        return runner.run(flows, raise_on_error=raise_on_error, **factory_kwargs)
+
+    async def run_parallel_async(self, flows: Dict[str, Callable], sync_timeout=None, raise_on_error=False,
+                                 **factory_kwargs) -> Dict[str, ScenarioResult]:
+        """Асинхронный вариант run_parallel для использования внутри цикла событий asyncio"""
+        runner = ParallelScenarioRunner(self, sync_timeout)
+        return await runner.run_async(flows, raise_on_error=raise_on_error, **factory_kwargs)
+
     def clear_all_caches(self):
         """Очищает кеш всех фабрик"""
-        for factory in self._factories.values():
+        with self._lock:
+            factories = list(self._factories.values())
+        for factory in factories:
             factory.clear_cache()
         logging.info("Очищен кеш всех фабрик страниц")
\ No newline at end of file
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from page_object_library.utils.context import ContextThreadPoolExecutor
+
+
+@dataclass
+class ScenarioResult:
+    """Результат сценария одного пользователя"""
+    driver_name: str
+    result: Any = None
+    exception: Optional[Exception] = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.exception is None
+
+
+class ParallelScenarioError(Exception):
+    """Ошибка одного или нескольких сценариев при параллельном запуске"""
+
+    def __init__(self, results: Dict[str, ScenarioResult]):
+        self.results = results
+        failed = {name: result.exception for name, result in results.items() if not result.ok}
+        details = "; ".join(f"{name}: {exception!r}" for name, exception in failed.items())
+        super().__init__(f"Сценарии завершились с ошибкой: {details}")
+
+
+class SyncPoints:
+    """
+    Именованные точки синхронизации сценариев
+
+    Каждая точка - барьер на всех участников. Если один из сценариев упал,
+    все точки ломаются, чтобы остальные сценарии не ждали его вечно.
+    """
+
+    def __init__(self, parties, timeout=None):
+        self.parties = parties
+        self.timeout = timeout
+        self._barriers: Dict[str, threading.Barrier] = {}
+        self._broken = False
+        self._lock = threading.Lock()
+
+    def _get_barrier(self, point):
+        with self._lock:
+            barrier = self._barriers.get(point)
+            if barrier is None:
+                barrier = self._barriers[point] = threading.Barrier(self.parties)
+                if self._broken:
+                    barrier.abort()
+            return barrier
+
+    def wait(self, point, timeout=None):
+        """Ожидает, пока все сценарии дойдут до точки синхронизации"""
+        return self._get_barrier(point).wait(timeout if timeout is not None else self.timeout)
+
+    def abort(self):
+        """Ломает все точки синхронизации"""
+        with self._lock:
+            self._broken = True
+            barriers = list(self._barriers.values())
+        for barrier in barriers:
+            barrier.abort()
+
+
+class UserContext:
+    """Контекст сценария одного пользователя: фабрика страниц его драйвера и точки синхронизации"""
+
+    def __init__(self, driver_name, factory, sync_points: SyncPoints):
+        self.driver_name = driver_name
+        self.factory = factory
+        self._sync_points = sync_points
+
+    @property
+    def driver(self):
+        return self.factory.driver
+
+    def create_page(self, page_class, **kwargs):
+        """Создает страницу для драйвера этого пользователя"""
+        return self.factory.create_page(page_class, **kwargs)
+
+    def sync(self, point, timeout=None):
+        """Ожидает остальных пользователей в точке синхронизации"""
+        logging.info(f"[Driver {self.driver_name}] Ожидание остальных пользователей в точке '{point}'")
+        return self._sync_points.wait(point, timeout)
+
+
+class ParallelScenarioRunner:
+    """Запускает сценарии нескольких пользователей одновременно, каждый на своем драйвере"""
+
+    def __init__(self, multi_page_factory, sync_timeout=None):
+        """
+        Args:
+            multi_page_factory: MultiPageFactory, создающая драйверы и фабрики страниц
+            sync_timeout: Таймаут ожидания в точках синхронизации в секундах
+        """
+        self.multi_page_factory = multi_page_factory
+        self.sync_timeout = sync_timeout
+
+    def _run_flow(self, driver_name, flow, sync_points, factory_kwargs):
+        start_time = time.perf_counter()
+        try:
+            factory = self.multi_page_factory.get_factory(driver_name, **factory_kwargs)
+            result = flow(UserContext(driver_name, factory, sync_points))
+            return ScenarioResult(driver_name, result=result, duration=time.perf_counter() - start_time)
+        except Exception as e:
+            sync_points.abort()
+            logging.error(f"[Driver {driver_name}] Сценарий завершился с ошибкой: {e}")
+            return ScenarioResult(driver_name, exception=e, duration=time.perf_counter() - start_time)
+        except BaseException:
+            # KeyboardInterrupt и SystemExit - не провал сценария: остальные освобождаются, прерывание идет дальше
+            sync_points.abort()
+            raise
+
+    def _finish(self, results, start_time, raise_on_error):
+        timings = ", ".join(f"{name}: {result.duration:.2f}с" for name, result in results.items())
+        logging.info(f"Параллельные сценарии завершены за {time.perf_counter() - start_time:.2f}с ({timings})")
+
+        if raise_on_error and any(not result.ok for result in results.values()):
+            raise ParallelScenarioError(results)
+        return results
+
+    def run(self, flows: Dict[str, Callable], raise_on_error=False, **factory_kwargs) -> Dict[str, ScenarioResult]:
+        """
+        Запускает сценарии в отдельных потоках
+
+        Args:
+            flows: Словарь {имя_драйвера: функция(UserContext)}
+            raise_on_error: Выбросить ParallelScenarioError, если хотя бы один сценарий упал
+            **factory_kwargs: Параметры MultiPageFactory.get_factory (browser_type, headless, base_url)
+
+        Returns:
+            Словарь {имя_драйвера: ScenarioResult}
+        """
+        sync_points = SyncPoints(len(flows), self.sync_timeout)
+        start_time = time.perf_counter()
+
+        with ContextThreadPoolExecutor(max_workers=max(len(flows), 1), thread_name_prefix="scenario") as executor:
+            futures = {
+                name: executor.submit(self._run_flow, name, flow, sync_points, factory_kwargs)
+                for name, flow in flows.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
+
+        return self._finish(results, start_time, raise_on_error)
+
+    async def run_async(self, flows: Dict[str, Callable], raise_on_error=False,
+                        **factory_kwargs) -> Dict[str, ScenarioResult]:
+        """
+        Асинхронный вариант run: блокирующие сценарии выполняются в потоках,
+        а цикл событий ожидает их завершения, не блокируясь
+        """
+        loop = asyncio.get_running_loop()
+        sync_points = SyncPoints(len(flows), self.sync_timeout)
+        start_time = time.perf_counter()
+
+        with ContextThreadPoolExecutor(max_workers=max(len(flows), 1), thread_name_prefix="scenario") as executor:
+            futures = [
+                loop.run_in_executor(executor, self._run_flow, name, flow, sync_points, factory_kwargs)
+                for name, flow in flows.items()
+            ]
+            results = {result.driver_name: result for result in await asyncio.gather(*futures)}
+
+        return self._finish(results, start_time, raise_on_error)
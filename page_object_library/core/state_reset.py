@@ -0,0 +1,195 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+from selenium.common.exceptions import NoAlertPresentException
+
+# Очистка хранилищ текущего источника; на about:blank доступ к хранилищам запрещен, поэтому ошибки глушатся
+STORAGE_RESET_SCRIPT = (
+    "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+)
+
+BLANK_URL = "about:blank"
+
+
+class ResetStrategy:
+    """
+    Один шаг сброса состояния между тестами
+
+    Наследники реализуют reset(driver) и при неудаче выбрасывают исключение.
+    Шаги с before_quit = True выполняются и для драйверов, которые после теста закрываются:
+    так сбрасывается состояние на стороне сервера, переживающее браузер.
+    """
+    name = "шаг сброса"
+    before_quit = False
+
+    def reset(self, driver):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class DismissAlert(ResetStrategy):
+    """Закрывает открытый алерт"""
+    name = "алерт"
+
+    def reset(self, driver):
+        try:
+            driver.switch_to.alert.dismiss()
+        except NoAlertPresentException:
+            pass
+
+
+class CloseExtraWindows(ResetStrategy):
+    """Закрывает все окна, кроме первого, и переключается на него"""
+    name = "окна"
+
+    def reset(self, driver):
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+
+class ClearStorage(ResetStrategy):
+    """Очищает localStorage и sessionStorage открытого сайта"""
+    name = "хранилища"
+
+    def reset(self, driver):
+        driver.execute_script(STORAGE_RESET_SCRIPT)
+
+
+class ClearCookies(ResetStrategy):
+    """Удаляет cookies"""
+    name = "cookies"
+
+    def reset(self, driver):
+        driver.delete_all_cookies()
+        # delete_all_cookies очищает только cookies текущего домена; Chromium умеет очистить все
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+
+class OpenBlankPage(ResetStrategy):
+    """Уводит браузер с сайта на about:blank"""
+    name = "about:blank"
+
+    def reset(self, driver):
+        driver.get(BLANK_URL)
+
+
+class HttpReset(ResetStrategy):
+    """
+    Сброс на стороне сайта HTTP-запросом, например к служебному адресу тестового стенда
+
+    Запрос отправляется с cookies браузера (текущего домена), поэтому сайт может сбросить
+    именно сессию теста. Шаг должен идти раньше очистки cookies и ухода с сайта.
+    """
+    before_quit = True
+
+    def __init__(self, url, data: Optional[Dict[str, str]] = None, method="POST",
+                 cookie_names: Optional[List[str]] = None, timeout=5.0, name="HTTP-сброс"):
+        """
+        Args:
+            url: Адрес сброса
+            data: Поля формы запроса
+            method: HTTP-метод
+            cookie_names: Какие cookies браузера передавать (None - все)
+            timeout: Таймаут запроса в секундах
+            name: Название шага в логах и статистике
+        """
+        self.url = url
+        self.data = data
+        self.method = method
+        self.cookie_names = cookie_names
+        self.timeout = timeout
+        self.name = name
+
+    def reset(self, driver):
+        cookies = [cookie for cookie in driver.get_cookies()
+                   if self.cookie_names is None or cookie["name"] in self.cookie_names]
+        headers = {}
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{cookie['name']}={cookie['value']}" for cookie in cookies)
+        body = urlencode(self.data).encode("utf-8") if self.data is not None else None
+        request = Request(self.url, data=body, headers=headers, method=self.method)
+        with urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+def default_strategies() -> List[ResetStrategy]:
+    """Сброс состояния браузера: алерт, окна, хранилища, cookies и about:blank"""
+    return [DismissAlert(), CloseExtraWindows(), ClearStorage(), ClearCookies(), OpenBlankPage()]
+
+
+class StateResetter:
+    """
+    Сброс состояния между тестами из последовательности шагов (ResetStrategy)
+
+    Вызывается как функция: resetter(driver) -> bool, поэтому подходит для DriverPool(reset=...).
+    Шаги сайта (HttpReset) добавляются в начало через add(..., first=True), пока браузер еще на сайте.
+    Собирает время и ошибки каждого шага.
+    """
+
+    def __init__(self, strategies: List[ResetStrategy] = None):
+        self.strategies = list(default_strategies() if strategies is None else strategies)
+        self.stats: Dict[str, List[float]] = {}
+        self.failures: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, strategy: ResetStrategy, first=False) -> "StateResetter":
+        if first:
+            self.strategies.insert(0, strategy)
+        else:
+            self.strategies.append(strategy)
+        return self
+
+    def __call__(self, driver) -> bool:
+        """
+        Выполняет все шаги по порядку, останавливаясь на первой ошибке
+
+        Returns:
+            True, если сброс прошел успешно; иначе драйвер лучше не переиспользовать
+        """
+        return self._run(driver, self.strategies, stop_on_error=True)
+
+    def before_quit(self, driver) -> bool:
+        """Выполняет шаги before_quit для драйвера, который будет закрыт; ошибки не прерывают сброс"""
+        return self._run(driver, [strategy for strategy in self.strategies if strategy.before_quit],
+                         stop_on_error=False)
+
+    def _run(self, driver, strategies, stop_on_error) -> bool:
+        success = True
+        for strategy in strategies:
+            start_time = time.perf_counter()
+            try:
+                strategy.reset(driver)
+            except Exception as e:
+                logging.warning(f"Не удалось сбросить состояние ({strategy.name}): {e}")
+                with self._lock:
+                    self.failures[strategy.name] = self.failures.get(strategy.name, 0) + 1
+                success = False
+                if stop_on_error:
+                    return False
+            finally:
+                with self._lock:
+                    self.stats.setdefault(strategy.name, []).append(time.perf_counter() - start_time)
+        return success
+
+    def summary(self) -> str:
+        with self._lock:
+            return ", ".join(
+                f"{name}: {len(durations)} раз, {sum(durations) / len(durations) * 1000:.0f}мс в среднем"
+                + (f", ошибок {self.failures[name]}" if self.failures.get(name) else "")
+                for name, durations in self.stats.items()
+            ) or "сбросов не было"
+
+
+def reset_driver(driver) -> bool:
+    """Сбрасывает состояние браузера шагами по умолчанию (см. default_strategies)"""
+    return StateResetter()(driver)
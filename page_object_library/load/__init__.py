@@ -0,0 +1 @@
+from .runner import LoadRunner, LoadProfile, LoadReport, Scenario, VirtualUser, percentile
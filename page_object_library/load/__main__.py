@@ -0,0 +1,95 @@
+"""Точка входа нагрузочного прогона: python -m page_object_library.load --help"""
+import argparse
+import importlib
+import json
+import sys
+
+from page_object_library.core.admission import BrowserAdmission
+from page_object_library.core.driver_factory import MultiDriverManager
+from page_object_library.core.page_factory import MultiPageFactory
+from page_object_library.load.runner import LoadProfile, LoadRunner, Scenario
+from page_object_library.utils.logger import setup_logger
+
+
+def load_scenarios(specs):
+    """
+    Загружает сценарии по спецификациям вида "модуль:функция[=вес]" или "модуль"
+
+    Модуль без указания функции должен содержать список SCENARIOS из объектов Scenario.
+    """
+    scenarios = []
+    for spec in specs:
+        target, _, weight = spec.partition("=")
+        module_name, _, func_name = target.partition(":")
+        module = importlib.import_module(module_name)
+        if func_name:
+            scenarios.append(Scenario(func_name, getattr(module, func_name), float(weight or 1.0)))
+        else:
+            scenarios.extend(module.SCENARIOS)
+    return scenarios
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m page_object_library.load",
+                                     description="Нагрузка виртуальными пользователями через page objects")
+    parser.add_argument("scenarios", nargs="+",
+                        help="Сценарии: 'модуль:функция=вес' или модуль со списком SCENARIOS")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Базовый URL тестируемого сайта")
+    parser.add_argument("--users", type=int, default=1, help="Количество виртуальных пользователей")
+    parser.add_argument("--duration", type=float, default=None, help="Длительность нагрузки в секундах")
+    parser.add_argument("--iterations", type=int, default=1, help="Количество сценариев на пользователя")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Время наращивания нагрузки в секундах")
+    parser.add_argument("--ramp-down", type=float, default=0.0, help="Время снижения нагрузки в секундах")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Пауза между сценариями в секундах")
+    parser.add_argument("--seed", type=int, default=None, help="Начальное значение генератора случайных чисел")
+    parser.add_argument("--browser-type", default="chrome", help="Тип браузера: chrome или firefox")
+    parser.add_argument("--headed", action="store_true", help="Запускать браузеры с окном (по умолчанию headless)")
+    parser.add_argument("--max-browsers", type=int, default=0,
+                        help="Максимум одновременно живых браузеров (0 - без ограничения)")
+    parser.add_argument("--min-available-mb", type=float, default=0,
+                        help="Сколько мегабайт памяти машины должно остаться свободными после запуска браузера")
+    parser.add_argument("--json", dest="json_path", default=None, help="Путь для сохранения отчета в JSON")
+    parser.add_argument("--log-dir", default="logs", help="Директория логов")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logger(log_dir=args.log_dir, log_to_console=False, log_prefix="load")
+
+    admission = None
+    if args.max_browsers or args.min_available_mb:
+        admission = BrowserAdmission(max_browsers=args.max_browsers or None, min_available_mb=args.min_available_mb)
+    manager = MultiDriverManager(admission=admission)
+    factory = MultiPageFactory(
+        manager,
+        default_browser_type=args.browser_type,
+        default_headless=not args.headed,
+        default_base_url=args.base_url
+    )
+    profile = LoadProfile(
+        users=args.users,
+        duration=args.duration,
+        iterations=args.iterations,
+        ramp_up=args.ramp_up,
+        ramp_down=args.ramp_down,
+        think_time=args.think_time,
+        seed=args.seed
+    )
+
+    try:
+        report = LoadRunner(factory, load_scenarios(args.scenarios), profile).run()
+    finally:
+        manager.close_all_drivers()
+
+    print(report.format_table())
+    if admission is not None:
+        print(f"Допуск браузеров: {admission.stats.summary()}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report.__dict__, f, ensure_ascii=False, indent=2)
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+import logging
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from page_object_library.utils.context import ContextThreadPoolExecutor
+from page_object_library.utils.decorators import add_action_listener, remove_action_listener
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class Scenario:
+    """Сценарий виртуального пользователя с весом в общей смеси"""
+    name: str
+    func: Callable
+    weight: float = 1.0
+
+
+@dataclass
+class LoadProfile:
+    """
+    Профиль нагрузки
+
+    Если задан duration, пользователи работают указанное время (iterations игнорируется),
+    иначе каждый пользователь выполняет iterations сценариев.
+    """
+    users: int = 1
+    duration: Optional[float] = None
+    iterations: Optional[int] = 1
+    ramp_up: float = 0.0
+    ramp_down: float = 0.0
+    think_time: float = 0.0
+    seed: Optional[int] = None
+
+    def start_delay(self, index) -> float:
+        """Задержка старта пользователя при плавном наращивании нагрузки"""
+        return self.ramp_up * index / self.users if self.users else 0.0
+
+    def stop_time(self, index, started_at) -> Optional[float]:
+        """Момент остановки пользователя при плавном снижении нагрузки (последние уходят позже)"""
+        if self.duration is None:
+            return None
+        leave_early = self.ramp_down * (self.users - 1 - index) / self.users if self.users else 0.0
+        return started_at + self.duration - leave_early
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Процентиль методом ближайшего ранга"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+@dataclass
+class ActionStats:
+    """Статистика одного действия (метода страницы или сценария)"""
+    name: str
+    durations: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def count(self):
+        return len(self.durations)
+
+    def summary(self, elapsed) -> Dict[str, float]:
+        values = sorted(self.durations)
+        result = {
+            "count": len(values),
+            "errors": self.errors,
+            "throughput": len(values) / elapsed if elapsed else 0.0,
+            "mean": sum(values) / len(values) if values else 0.0,
+            "max": values[-1] if values else 0.0,
+        }
+        for percent in PERCENTILES:
+            result[f"p{percent}"] = percentile(values, percent)
+        return result
+
+
+class LoadMetrics:
+    """Потокобезопасный сборщик длительностей действий и сценариев"""
+
+    def __init__(self):
+        self.actions: Dict[str, ActionStats] = {}
+        self.scenarios: Dict[str, ActionStats] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _add(storage, name, duration, failed):
+        stats = storage.get(name)
+        if stats is None:
+            stats = storage[name] = ActionStats(name)
+        stats.durations.append(duration)
+        if failed:
+            stats.errors += 1
+
+    def add_action(self, name, duration, failed=False):
+        with self._lock:
+            self._add(self.actions, name, duration, failed)
+
+    def add_scenario(self, name, duration, failed=False):
+        with self._lock:
+            self._add(self.scenarios, name, duration, failed)
+
+
+@dataclass
+class LoadReport:
+    """Итоги нагрузочного прогона"""
+    elapsed: float
+    users: int
+    iterations: int
+    errors: int
+    scenarios: Dict[str, Dict[str, float]]
+    actions: Dict[str, Dict[str, float]]
+
+    def format_table(self) -> str:
+        """Форматирует отчет в виде текстовой таблицы"""
+        columns = ["count", "errors", "throughput"] + [f"p{percent}" for percent in PERCENTILES] + ["max"]
+        header = f"{'Действие':<48}" + "".join(f"{column:>11}" for column in columns)
+        lines = [
+            f"Пользователей: {self.users}, итераций: {self.iterations}, ошибок: {self.errors}, "
+            f"время: {self.elapsed:.2f}с, пропускная способность: {self.iterations / self.elapsed if self.elapsed else 0:.2f} ит/с",
+        ]
+        for title, rows in (("Сценарии", self.scenarios), ("Действия страниц", self.actions)):
+            lines += ["", title, header]
+            for name, row in sorted(rows.items(), key=lambda item: -item[1]["count"]):
+                cells = []
+                for column in columns:
+                    value = row[column]
+                    cells.append(f"{value:>11}" if column in ("count", "errors") else f"{value:>11.3f}")
+                lines.append(f"{name[:47]:<48}" + "".join(cells))
+        return "\n".join(lines)
+
+
+class VirtualUser:
+    """Виртуальный пользователь: свой драйвер, своя фабрика страниц и свой генератор случайных чисел"""
+
+    def __init__(self, index, driver_name, factory, rng: random.Random):
+        self.index = index
+        self.driver_name = driver_name
+        self.factory = factory
+        self.random = rng
+        self.iteration = 0
+
+    @property
+    def driver(self):
+        return self.factory.driver
+
+    def create_page(self, page_class, **kwargs):
+        """Создает страницу для драйвера этого пользователя"""
+        return self.factory.create_page(page_class, **kwargs)
+
+
+class LoadRunner:
+    """
+    Генератор нагрузки из виртуальных пользователей, управляющих браузерами через page objects
+
+    Каждый пользователь получает свой драйвер из MultiPageFactory и в цикле выполняет
+    сценарии, выбранные случайно с учетом весов. Длительности всех действий под auto_log
+    собираются по ключу "Страница.метод".
+    """
+
+    def __init__(self, multi_page_factory, scenarios: List[Scenario], profile: LoadProfile,
+                 driver_prefix="vu", close_drivers=True):
+        """
+        Args:
+            multi_page_factory: MultiPageFactory, создающая драйверы виртуальных пользователей
+            scenarios: Список сценариев с весами
+            profile: Профиль нагрузки
+            driver_prefix: Префикс имен драйверов виртуальных пользователей
+            close_drivers: Закрывать ли драйверы пользователей по окончании
+        """
+        if not scenarios:
+            raise ValueError("Не задано ни одного сценария нагрузки")
+        if profile.duration is None and not profile.iterations:
+            raise ValueError("Нужно задать длительность или количество итераций")
+
+        self.multi_page_factory = multi_page_factory
+        self.scenarios = scenarios
+        self.profile = profile
+        self.driver_prefix = driver_prefix
+        self.close_drivers = close_drivers
+        self.metrics = LoadMetrics()
+        self._driver_names = {f"{driver_prefix}{index}" for index in range(profile.users)}
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Досрочно останавливает всех пользователей после текущей итерации"""
+        self._stop.set()
+
+    def _on_action(self, driver_name, object_name, method_name, duration, failed):
+        if driver_name in self._driver_names:
+            self.metrics.add_action(f"{object_name}.{method_name}", duration, failed)
+
+    def _run_user(self, index, started_at):
+        driver_name = f"{self.driver_prefix}{index}"
+        seed = None if self.profile.seed is None else self.profile.seed + index
+        rng = random.Random(seed)
+        weights = [scenario.weight for scenario in self.scenarios]
+
+        if self._stop.wait(self.profile.start_delay(index)):
+            return 0
+
+        factory = self.multi_page_factory.get_factory(driver_name)
+        user = VirtualUser(index, driver_name, factory, rng)
+        stop_at = self.profile.stop_time(index, started_at)
+
+        while not self._stop.is_set():
+            if stop_at is not None and time.perf_counter() >= stop_at:
+                break
+            if stop_at is None and user.iteration >= self.profile.iterations:
+                break
+
+            scenario = rng.choices(self.scenarios, weights)[0]
+            start_time = time.perf_counter()
+            failed = False
+            try:
+                scenario.func(user)
+            except Exception as e:
+                failed = True
+                logging.error(f"[Driver {driver_name}] Сценарий '{scenario.name}' завершился с ошибкой: {e}")
+            self.metrics.add_scenario(scenario.name, time.perf_counter() - start_time, failed)
+            user.iteration += 1
+
+            if self.profile.think_time:
+                self._stop.wait(self.profile.think_time)
+
+        if self.close_drivers:
+            self.multi_page_factory.multi_driver.close_driver(driver_name)
+        return user.iteration
+
+    def run(self) -> LoadReport:
+        """Запускает нагрузку и возвращает отчет"""
+        logging.info(f"Запуск нагрузки: {self.profile.users} пользователей, сценарии: "
+                     f"{', '.join(f'{s.name}({s.weight})' for s in self.scenarios)}")
+        add_action_listener(self._on_action)
+        started_at = time.perf_counter()
+        try:
+            with ContextThreadPoolExecutor(max_workers=max(self.profile.users, 1),
+                                           thread_name_prefix=self.driver_prefix) as executor:
+                futures = [executor.submit(self._run_user, index, started_at) for index in range(self.profile.users)]
+                iterations = sum(future.result() for future in futures)
+        finally:
+            remove_action_listener(self._on_action)
+
+        elapsed = time.perf_counter() - started_at
+        report = LoadReport(
+            elapsed=elapsed,
+            users=self.profile.users,
+            iterations=iterations,
+            errors=sum(stats.errors for stats in self.metrics.scenarios.values()),
+            scenarios={name: stats.summary(elapsed) for name, stats in self.metrics.scenarios.items()},
+            actions={name: stats.summary(elapsed) for name, stats in self.metrics.actions.items()},
+        )
+        logging.info(f"Нагрузка завершена:\n{report.format_table()}")
+        return report
@@ -0,0 +1,779 @@
+"""
+Плагин pytest библиотеки page objects
+
+Подключается в conftest.py: pytest_plugins = ["page_object_library.pytest_plugin"]
+
+Фикстуры:
+    state_reset: сброс состояния между тестами (StateResetter); переопределяется в conftest.py,
+        чтобы добавить шаги сайта, например HttpReset к тестовому стенду
+    driver_pool: пул драйверов процесса; под pytest-xdist у каждого воркера свой пул
+    pooled_driver: драйвер "default" из пула, после теста сбрасывается и возвращается в пул
+    pooled_multi_driver: PooledDriverManager, все драйверы которого берутся из пула
+
+Статистика переиспользования драйверов (по воркерам) и повторов шагов (RetryPolicy)
+выводится в итоговой сводке pytest.
+
+История длительностей тестов и действий page objects пишется в SQLite только по запросу:
+с --timing-db PATH, --timing-order или --timing-failed-first (последние два без --timing-db
+используют .page_object_timings.sqlite). С --timing-order тесты запускаются от долгих
+к коротким, а под xdist распределяются по воркерам правилом LPT через метки xdist_group
+(нужен запуск с --dist loadgroup); --timing-failed-first ставит вперед тесты, упавшие в прошлый раз.
+
+Граф зависимостей тестов от модулей page objects (какие классы страниц, компонентов
+и элементов создавал тест) пишется в SQLite только по запросу: с --dependency-db PATH или
+--affected-since REF (без --dependency-db используется .page_object_deps.sqlite). С --affected-since
+запускаются только тесты, затронутые изменениями относительно коммита REF по git diff.
+
+Матрица браузеров: с --browsers chrome,firefox тесты, использующие фикстуру browser_type
+(через driver, multi_driver и фабрики страниц), запускаются для каждого браузера; под xdist
+тесты разных браузеров чередуются и идут одновременно. --browser-limit firefox=2 ограничивает
+число воркеров, одновременно выполняющих тесты браузера: его тесты закрепляются не более чем
+за двумя группами xdist_group (нужен запуск с --dist loadgroup), поэтому остальные воркеры
+в это время выполняют тесты других браузеров, а не ждут. Итоги выводятся по браузерам.
+
+Допуск браузеров: с --max-browsers N и/или --min-available-mb M новые браузеры запускаются,
+только пока живых браузеров всех воркеров машины меньше N (счетчик общий, в базе SQLite) и у
+машины после запуска останется не меньше M мегабайт свободной памяти (MemAvailable);
+остальные запросы ждут в очереди.
+Время ожидания тестов выводится в итоговой сводке.
+    browser_admission: BrowserAdmission процесса или None без ограничений
+
+Пул тестовых аккаунтов (--accounts accounts.json) выдает одновременно идущим тестам
+разные аккаунты, в том числе тестам разных воркеров xdist:
+    account: аккаунт на время теста (AccountLease)
+    accounts: выдача нескольких аккаунтов сразу: accounts(2)
+"""
+import logging
+import os
+import subprocess
+import threading
+import time
+from typing import Dict, Optional
+
+import pytest
+
+from page_object_library.core.accounts import AccountPasswordMissing, AccountPool
+from page_object_library.core.admission import MACHINE_SLOTS, AdmissionStats, BrowserAdmission
+from page_object_library.core.browser_matrix import (
+    BrowserResults, BrowserSlots, browser_of, interleave, limit_groups, parse_browsers, parse_limits
+)
+from page_object_library.core.driver_pool import DriverPool, DriverPoolStats, PooledDriverManager
+from page_object_library.core.state_reset import StateResetter
+from page_object_library.utils.decorators import add_action_listener, remove_action_listener
+from page_object_library.utils.dependencies import (
+    DependencyGraph, add_usage_listener, changed_files, class_dependencies, remove_usage_listener, select_affected
+)
+from page_object_library.utils.retry import retry_metrics
+from page_object_library.utils.timings import (
+    ActionTiming, TimingDatabase, fill_missing_durations, lpt_schedule, order_by_history
+)
+
+DRIVER_POOL_KEY = pytest.StashKey[DriverPool]()
+WORKER_POOL_STATS_KEY = pytest.StashKey[dict]()
+TIMING_KEY = pytest.StashKey["TimingRecorder"]()
+ACCOUNT_POOL_KEY = pytest.StashKey[AccountPool]()
+BROWSER_MATRIX_KEY = pytest.StashKey["BrowserMatrix"]()
+DEPENDENCY_KEY = pytest.StashKey["DependencyRecorder"]()
+AFFECTED_KEY = pytest.StashKey[dict]()
+ADMISSION_KEY = pytest.StashKey["AdmissionReporter"]()
+
+# База истории для --timing-order и --timing-failed-first, если --timing-db не указан
+DEFAULT_TIMING_DB = ".page_object_timings.sqlite"
+# База графа зависимостей для --affected-since, если --dependency-db не указан
+DEFAULT_DEPENDENCY_DB = ".page_object_deps.sqlite"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("page-object-library", "Библиотека page objects")
+    group.addoption(
+        "--reuse-drivers", action="store_true", default=False,
+        help="Переиспользовать драйверы между тестами (один пул на процесс или воркер xdist)"
+    )
+    group.addoption(
+        "--driver-max-uses", action="store", type=int, default=0,
+        help="Сколько тестов может отработать один драйвер пула до перезапуска (0 - без ограничения)"
+    )
+    group.addoption(
+        "--timing-db", action="store", default=None, metavar="PATH",
+        help="Записывать историю длительностей тестов и действий в базу SQLite (путь относительно корня проекта)"
+    )
+    group.addoption(
+        "--timing-order", action="store_true", default=False,
+        help="Запускать тесты от долгих к коротким по истории и делить их между воркерами xdist правилом LPT"
+    )
+    group.addoption(
+        "--timing-failed-first", action="store_true", default=False,
+        help="Запускать первыми тесты, последний запуск которых упал"
+    )
+    group.addoption(
+        "--timing-history", action="store", type=int, default=5,
+        help="Сколько последних запусков теста учитывать при оценке длительности"
+    )
+    group.addoption(
+        "--dependency-db", action="store", default=None, metavar="PATH",
+        help="Записывать граф зависимостей тестов от page objects в базу SQLite (путь относительно корня проекта)"
+    )
+    group.addoption(
+        "--affected-since", action="store", default=None, metavar="REF",
+        help="Запускать только тесты, затронутые изменениями относительно REF (git diff), по графу зависимостей"
+    )
+    group.addoption(
+        "--browsers", action="store", default=None, metavar="LIST",
+        help="Запускать тесты с драйверами в каждом браузере списка, например chrome,firefox"
+    )
+    group.addoption(
+        "--browser-limit", action="store", default=None, metavar="LIMITS",
+        help="Сколько воркеров xdist могут одновременно выполнять тесты браузера, например firefox=2,chrome=4"
+    )
+    group.addoption(
+        "--max-browsers", action="store", type=int, default=0,
+        help="Максимум одновременно живых браузеров на машине для всех воркеров xdist (0 - без ограничения)"
+    )
+    group.addoption(
+        "--min-available-mb", action="store", type=float, default=0,
+        help="Сколько мегабайт памяти машины должно остаться свободными после запуска браузера"
+    )
+    group.addoption(
+        "--max-browsers-rss-mb", action="store", type=float, default=0,
+        help="Ограничение суммарной памяти (RSS) браузеров процесса в мегабайтах (0 - без ограничения)"
+    )
+    group.addoption(
+        "--browser-admission-wait", action="store", type=float, default=600.0,
+        help="Сколько секунд запуск браузера ждет допуска"
+    )
+    group.addoption(
+        "--accounts", action="store", default=None, metavar="FILE",
+        help="JSON-файл с тестовыми аккаунтами для фикстур account и accounts"
+    )
+    group.addoption(
+        "--account-wait", action="store", type=float, default=300.0,
+        help="Сколько секунд тест ждет освобождения аккаунтов пула"
+    )
+    group.addoption(
+        "--account-session-ttl", action="store", type=float, default=3600.0,
+        help="Время жизни снимков сессий аккаунтов в секундах (0 - без ограничения)"
+    )
+
+
+def get_worker_id(config) -> str:
+    """Идентификатор воркера xdist ('gw0', ...) или 'master' без xdist"""
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        return workerinput["workerid"]
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+@pytest.fixture(scope="session")
+def state_reset():
+    """Сброс состояния браузера между тестами: алерт, окна, хранилища, cookies"""
+    resetter = StateResetter()
+
+    yield resetter
+
+    logging.info(f"Сброс состояния между тестами: {resetter.summary()}")
+
+
+@pytest.fixture
+def browser_type(request):
+    """Браузер теста: параметр матрицы --browsers или --browser-type"""
+    browser = getattr(request, "param", None) or request.config.getoption("--browser-type", default="chrome")
+    request.node.user_properties.append(("browser", browser))
+    return browser
+
+
+@pytest.fixture(scope="session")
+def browser_admission(request):
+    """Допуск браузеров процесса (--max-browsers, --min-available-mb) или None без ограничений"""
+    reporter = request.config.stash.get(ADMISSION_KEY, None)
+    return reporter.admission if reporter is not None else None
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request, state_reset, browser_admission):
+    """Пул драйверов процесса; драйверы закрываются в конце сессии"""
+    config = request.config
+    pool = DriverPool(
+        browser_type=config.getoption("--browser-type", default="chrome"),
+        headless=config.getoption("--headless-mode", default=False),
+        max_uses=config.getoption("--driver-max-uses"),
+        reset=state_reset,
+        admission=browser_admission,
+    )
+    config.stash[DRIVER_POOL_KEY] = pool
+    logging.info(f"Пул драйверов воркера {get_worker_id(config)} создан")
+
+    yield pool
+
+    pool.close_all()
+
+
+@pytest.fixture
+def pooled_driver(driver_pool, browser_type, request):
+    """Драйвер из пула; после теста состояние сбрасывается, и драйвер возвращается в пул"""
+    driver = driver_pool.acquire("default", browser_type)
+    request.node.driver = driver
+
+    yield driver
+
+    driver_pool.release(driver)
+
+
+@pytest.fixture
+def pooled_multi_driver(driver_pool, browser_type, request):
+    """Менеджер нескольких драйверов из пула с драйвером "default" """
+    manager = PooledDriverManager(driver_pool)
+    manager.create_driver("default", browser_type, driver_pool.headless)
+    request.node.multi_driver = manager
+
+    yield manager
+
+    manager.close_all_drivers()
+
+
+@pytest.fixture(scope="session")
+def account_default_password():
+    """
+    Пароль аккаунтов, для которых не задана переменная окружения с паролем
+
+    None - такие аккаунты не выдаются. Переопределяется в conftest, например для локального
+    стенда, который принимает любой пароль.
+    """
+    return None
+
+
+@pytest.fixture(scope="session")
+def account_pool(request, account_default_password):
+    """Пул тестовых аккаунтов из файла --accounts, общий для всех воркеров"""
+    path = request.config.getoption("--accounts")
+    if not path:
+        pytest.skip("Не задан файл аккаунтов (--accounts)")
+    try:
+        pool = AccountPool.from_file(request.config.rootpath / path, default_password=account_default_password,
+                                     session_max_age=request.config.getoption("--account-session-ttl"))
+    except AccountPasswordMissing as e:
+        pytest.skip(str(e))
+    request.config.stash[ACCOUNT_POOL_KEY] = pool
+
+    yield pool
+
+    logging.info(f"Статистика пула аккаунтов воркера {get_worker_id(request.config)}: {pool.stats}")
+    pool.close()
+
+
+@pytest.fixture
+def accounts(account_pool, request):
+    """
+    Выдача аккаунтов тесту: accounts(count) возвращает список AccountLease
+
+    Все аккаунты одного вызова выдаются сразу; после теста они возвращаются в пул.
+    """
+    leases = []
+    wait = request.config.getoption("--account-wait")
+
+    def lease(count=1):
+        if count > len(account_pool.accounts):
+            pytest.skip(f"Тесту нужно {count} аккаунтов, с заданными паролями только {len(account_pool.accounts)}")
+        leased = account_pool.lease_many(count, owner=request.node.nodeid, timeout=wait)
+        leases.extend(leased)
+        return leased
+
+    yield lease
+
+    for leased in leases:
+        leased.release()
+
+
+@pytest.fixture
+def account(accounts):
+    """Один аккаунт из пула на время теста"""
+    return accounts(1)[0]
+
+
+def pytest_sessionfinish(session):
+    """На воркере xdist передает статистику пула и повторов шагов контроллеру"""
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is None:
+        return
+    workeroutput["retry_stats"] = retry_metrics.as_dict()
+    pool = session.config.stash.get(DRIVER_POOL_KEY, None)
+    if pool is not None:
+        workeroutput["driver_pool_stats"] = pool.stats.as_dict()
+    admission = session.config.stash.get(ADMISSION_KEY, None)
+    if admission is not None:
+        workeroutput["admission_stats"] = admission.admission.stats.as_dict()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """На контроллере xdist собирает статистику пулов и повторов шагов воркеров"""
+    workeroutput = getattr(node, "workeroutput", {})
+    retry_metrics.merge(workeroutput.get("retry_stats", {}))
+    stats = workeroutput.get("driver_pool_stats")
+    if stats is not None:
+        worker_stats = node.config.stash.setdefault(WORKER_POOL_STATS_KEY, {})
+        worker_stats[node.workerinput["workerid"]] = DriverPoolStats(**stats)
+    admission = node.config.stash.get(ADMISSION_KEY, None)
+    if admission is not None and "admission_stats" in workeroutput:
+        admission.worker_stats[node.workerinput["workerid"]] = AdmissionStats(**workeroutput["admission_stats"])
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Выводит статистику повторов шагов и переиспользования драйверов"""
+    matrix = config.stash.get(BROWSER_MATRIX_KEY, None)
+    if matrix is not None:
+        matrix.write_summary(terminalreporter)
+
+    admission = config.stash.get(ADMISSION_KEY, None)
+    if admission is not None:
+        admission.write_summary(terminalreporter, get_worker_id(config))
+
+    retry_lines = retry_metrics.summary_lines()
+    if retry_lines:
+        terminalreporter.write_sep("-", "повторы шагов")
+        for line in retry_lines:
+            terminalreporter.write_line(line)
+
+    worker_stats = dict(config.stash.get(WORKER_POOL_STATS_KEY, {}))
+    pool = config.stash.get(DRIVER_POOL_KEY, None)
+    if pool is not None:
+        worker_stats[get_worker_id(config)] = pool.stats
+    if not worker_stats:
+        return
+
+    terminalreporter.write_sep("-", "пул драйверов")
+    for worker_id, stats in sorted(worker_stats.items()):
+        terminalreporter.write_line(f"{worker_id}: {stats.summary()}")
+    if len(worker_stats) > 1:
+        total = DriverPoolStats()
+        for stats in worker_stats.values():
+            total = total.merge(stats)
+        terminalreporter.write_line(f"всего: {total.summary()}")
+
+
+class TimingRecorder:
+    """
+    Собирает длительности тестов и действий page objects текущего процесса и пишет их в базу
+
+    Регистрируется как плагин pytest, чтобы получать отчеты о фазах тестов.
+    """
+
+    def __init__(self, database: TimingDatabase, worker_id: str, snapshot_time: float):
+        self.database = database
+        self.snapshot_time = snapshot_time
+        self.run_id = database.start_run(worker_id)
+        self._durations = {}
+        self._outcomes = {}
+        self._actions = {}
+        self._current = None
+        self._lock = threading.Lock()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        with self._lock:
+            self._current = item.nodeid
+            self._actions[item.nodeid] = {}
+        yield
+
+    def on_action(self, driver_name, object_name, method_name, duration, failed):
+        """Подписчик на действия auto_log; действия из потоков теста относятся к текущему тесту"""
+        with self._lock:
+            if self._current is None:
+                return
+            actions = self._actions[self._current]
+            timing = actions.get(f"{object_name}.{method_name}")
+            if timing is None:
+                timing = actions[f"{object_name}.{method_name}"] = ActionTiming()
+            timing.add(duration, failed)
+
+    def pytest_runtest_logreport(self, report):
+        with self._lock:
+            self._durations[report.nodeid] = self._durations.get(report.nodeid, 0.0) + report.duration
+            if report.failed:
+                self._outcomes[report.nodeid] = "failed"
+            elif report.skipped and report.nodeid not in self._outcomes:
+                self._outcomes[report.nodeid] = "skipped"
+            if report.when != "teardown":
+                return
+            duration = self._durations.pop(report.nodeid)
+            outcome = self._outcomes.pop(report.nodeid, "passed")
+            actions = self._actions.pop(report.nodeid, {})
+            if self._current == report.nodeid:
+                self._current = None
+        self.database.record_test(self.run_id, report.nodeid, duration, outcome, actions)
+
+    def close(self):
+        self.database.finish_run(self.run_id)
+        self.database.close()
+
+
+def get_worker_count(config) -> int:
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        return int(workerinput.get("workercount", 1))
+    return 1
+
+
+class DependencyRecorder:
+    """
+    Записывает, какие классы page objects создавал каждый тест
+
+    Учитываются объекты, созданные в фикстурах, теле теста и его потоках. Зависимости
+    прошедшего теста заменяют прежние, упавшего - дополняют их, пропущенного - не меняются.
+    """
+
+    def __init__(self, graph: DependencyGraph, root):
+        self.graph = graph
+        self.root = root
+        self._classes = {}
+        self._outcomes = {}
+        self._current = None
+        self._lock = threading.Lock()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        with self._lock:
+            self._current = item.nodeid
+            self._classes[item.nodeid] = set()
+        yield
+
+    def on_class_used(self, cls):
+        with self._lock:
+            if self._current is not None:
+                self._classes[self._current].add(cls)
+
+    def pytest_runtest_logreport(self, report):
+        with self._lock:
+            if report.failed:
+                self._outcomes[report.nodeid] = "failed"
+            elif report.when == "call" and report.nodeid not in self._outcomes:
+                self._outcomes[report.nodeid] = "skipped" if report.skipped else "passed"
+            if report.when != "teardown":
+                return
+            outcome = self._outcomes.pop(report.nodeid, "skipped")
+            classes = self._classes.pop(report.nodeid, set())
+            if self._current == report.nodeid:
+                self._current = None
+        if outcome == "skipped":
+            return
+        dependencies = {}
+        for cls in classes:
+            dependencies.update(class_dependencies(cls, self.root))
+        self.graph.record_test(report.nodeid, dependencies, replace=outcome == "passed")
+
+    def close(self):
+        self.graph.close()
+
+
+def configure_dependencies(config):
+    """Запись графа зависимостей и снимок изменений для --affected-since"""
+    path = config.getoption("--dependency-db")
+    base = config.getoption("--affected-since")
+    if path is None and not base:
+        # Без запроса граф не пишется и создание page objects не отслеживается
+        return
+    recorder = DependencyRecorder(DependencyGraph(config.rootpath / (path or DEFAULT_DEPENDENCY_DB)),
+                                  config.rootpath.resolve())
+    config.stash[DEPENDENCY_KEY] = recorder
+    config.pluginmanager.register(recorder, "page_object_dependencies")
+    add_usage_listener(recorder.on_class_used)
+
+    if not base:
+        return
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None and "affected" in workerinput:
+        # Воркеры отбирают тесты по снимку контроллера, иначе их наборы тестов разойдутся
+        config.stash[AFFECTED_KEY] = workerinput["affected"]
+        return
+    try:
+        changed = changed_files(config.rootpath, base)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise pytest.UsageError(f"Не удалось получить изменения относительно {base} из git: {e}")
+    config.stash[AFFECTED_KEY] = {"changed": sorted(changed), "graph": recorder.graph.snapshot()}
+
+
+class BrowserMatrix:
+    """
+    Матрица браузеров --browsers: параметризация тестов, ограничения браузеров и итоги по браузерам
+
+    Регистрируется как плагин pytest. Итоги собираются из отчетов о тестах, поэтому под xdist
+    они считаются на контроллере по отчетам всех воркеров.
+    """
+
+    def __init__(self, browsers, limits: Dict[str, int] = None, default_browser="chrome"):
+        self.browsers = browsers
+        self.limits = dict(limits or {})
+        self.default_browser = default_browser
+        self.results = {}
+        self._outcomes = {}
+
+    def pytest_generate_tests(self, metafunc):
+        if not self.browsers or "browser_type" not in metafunc.fixturenames:
+            return
+        for marker in metafunc.definition.iter_markers("parametrize"):
+            argnames = marker.args[0] if marker.args else marker.kwargs.get("argnames", ())
+            if "browser_type" in (argnames.replace(" ", "").split(",") if isinstance(argnames, str) else argnames):
+                return  # Тест сам задает браузеры
+        metafunc.parametrize("browser_type", self.browsers, indirect=True, ids=self.browsers)
+
+    def interleave_items(self, items):
+        """Чередует тесты разных браузеров, чтобы воркеры xdist получали их вперемешку"""
+        groups = {}
+        for item in items:
+            callspec = getattr(item, "callspec", None)
+            browser = callspec.params.get("browser_type") if callspec is not None else None
+            groups.setdefault(browser, []).append(item)
+        if len(groups) > 1:
+            items[:] = interleave(groups)
+
+    def item_browser(self, item) -> Optional[str]:
+        """Браузер теста или None, если тест не использует фикстуру browser_type"""
+        callspec = getattr(item, "callspec", None)
+        if callspec is not None and "browser_type" in callspec.params:
+            return callspec.params["browser_type"]
+        return self.default_browser if "browser_type" in getattr(item, "fixturenames", ()) else None
+
+    def pin_limited_items(self, items):
+        """
+        Закрепляет тесты ограниченных браузеров за limit группами xdist_group
+
+        Воркер выполняет группу целиком, поэтому тесты браузера одновременно идут не более
+        чем на limit воркерах, а остальные воркеры берут тесты других браузеров. Вызывается
+        на каждом воркере; порядок тестов одинаков, поэтому и группы совпадают.
+        """
+        if not self.limits:
+            return
+        groups = limit_groups((self.item_browser(item) for item in items), self.limits)
+        for item, group in zip(items, groups):
+            if group is not None:
+                # Группа браузера важнее других меток xdist_group (например, LPT из --timing-order)
+                item.add_marker(pytest.mark.xdist_group(name=group), append=False)
+
+    def pytest_runtest_logreport(self, report):
+        browser = browser_of(report.user_properties)
+        if browser is None:
+            return
+        results = self.results.setdefault(browser, BrowserResults())
+        results.duration += report.duration
+        if report.failed:
+            self._outcomes[report.nodeid] = "failed"
+        elif report.skipped and report.nodeid not in self._outcomes:
+            self._outcomes[report.nodeid] = "skipped"
+        if report.when == "teardown":
+            outcome = self._outcomes.pop(report.nodeid, "passed")
+            setattr(results, outcome, getattr(results, outcome) + 1)
+
+    def write_summary(self, terminalreporter):
+        if not self.results:
+            return
+        terminalreporter.write_sep("-", "результаты по браузерам")
+        for browser in sorted(self.results, key=lambda name: (name not in self.browsers, name)):
+            line = f"{browser}: {self.results[browser].summary()}"
+            if browser in self.limits:
+                line += f", воркеров не более {self.limits[browser]}"
+            terminalreporter.write_line(line)
+
+
+def configure_browser_matrix(config):
+    value = config.getoption("--browsers")
+    limits = config.getoption("--browser-limit")
+    if not value and not limits:
+        return
+    try:
+        browsers = parse_browsers(value) if value else []
+        limits = parse_limits(limits)
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    if limits and getattr(config.option, "numprocesses", None) and config.getoption("dist", None) != "loadgroup":
+        raise pytest.UsageError("--browser-limit под xdist соблюдается только с --dist loadgroup")
+    matrix = BrowserMatrix(browsers, limits, config.getoption("--browser-type", default="chrome"))
+    config.stash[BROWSER_MATRIX_KEY] = matrix
+    config.pluginmanager.register(matrix, "page_object_browser_matrix")
+
+
+class AdmissionReporter:
+    """
+    Время ожидания допуска браузеров по тестам
+
+    Ожидание теста (включая потоки его сценариев) передается через report.user_properties,
+    поэтому под xdist сводка по тестам собирается на контроллере.
+    """
+
+    # Сколько самых долгих ожиданий показывать в сводке
+    top_tests = 10
+
+    def __init__(self, admission: BrowserAdmission):
+        self.admission = admission
+        self.waits = {}
+        self.worker_stats = {}
+        self._wait_before = 0.0
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        self._wait_before = self.admission.stats.wait_time
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        if call.when == "teardown":
+            waited = self.admission.stats.wait_time - self._wait_before
+            if waited > 0:
+                item.user_properties.append(("browser_wait", round(waited, 3)))
+        yield
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "teardown":
+            waited = dict(report.user_properties).get("browser_wait")
+            if waited:
+                self.waits[report.nodeid] = waited
+
+    def write_summary(self, terminalreporter, worker_id):
+        stats = dict(self.worker_stats)
+        stats[worker_id] = self.admission.stats
+        total = AdmissionStats()
+        for worker_stats in stats.values():
+            total = total.merge(worker_stats)
+        if not total.admitted and not total.timeouts:
+            return
+        terminalreporter.write_sep("-", "ожидание браузеров")
+        terminalreporter.write_line(total.summary())
+        for nodeid, waited in sorted(self.waits.items(), key=lambda item: -item[1])[:self.top_tests]:
+            terminalreporter.write_line(f"{nodeid}: {waited:.1f}с")
+
+
+def configure_admission(config):
+    max_browsers = config.getoption("--max-browsers")
+    min_available = config.getoption("--min-available-mb")
+    max_rss = config.getoption("--max-browsers-rss-mb")
+    if not (max_browsers or min_available or max_rss):
+        return
+    slots = None
+    if max_browsers:
+        # Общий счетчик слотов ограничивает браузеры всех воркеров, а не каждого в отдельности
+        slots = BrowserSlots(config.rootpath / ".page_object_slots.sqlite", {MACHINE_SLOTS: max_browsers})
+    admission = BrowserAdmission(max_browsers=max_browsers or None, min_available_mb=min_available,
+                                 max_total_rss_mb=max_rss or None,
+                                 timeout=config.getoption("--browser-admission-wait"), slots=slots)
+    reporter = AdmissionReporter(admission)
+    config.stash[ADMISSION_KEY] = reporter
+    config.pluginmanager.register(reporter, "page_object_admission")
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    # Метку регистрирует и pytest-xdist; без него метки групп от плагина не вызывают предупреждений
+    config.addinivalue_line("markers", "xdist_group(name): тесты группы выполняются одним воркером xdist")
+    configure_browser_matrix(config)
+    configure_admission(config)
+    configure_timings(config)
+    configure_dependencies(config)
+
+
+def configure_timings(config):
+    timing_order = config.getoption("--timing-order")
+    path = config.getoption("--timing-db")
+    if path is None and not (timing_order or config.getoption("--timing-failed-first")):
+        return
+    if timing_order and getattr(config.option, "numprocesses", None) and config.getoption("dist", None) != "loadgroup":
+        raise pytest.UsageError("--timing-order под xdist делит тесты между воркерами только с --dist loadgroup")
+    path = config.rootpath / (path or DEFAULT_TIMING_DB)
+    workerinput = getattr(config, "workerinput", None)
+    # Воркеры видят историю на момент старта контроллера, иначе их порядок тестов разойдется
+    snapshot_time = workerinput.get("timing_snapshot", time.time()) if workerinput else time.time()
+    recorder = TimingRecorder(TimingDatabase(path), get_worker_id(config), snapshot_time)
+    config.stash[TIMING_KEY] = recorder
+    config.pluginmanager.register(recorder, "page_object_timing")
+    add_action_listener(recorder.on_action)
+
+
+def pytest_unconfigure(config):
+    admission = config.stash.get(ADMISSION_KEY, None)
+    if admission is not None:
+        config.pluginmanager.unregister(admission)
+        if admission.admission.slots is not None:
+            admission.admission.slots.close()
+
+    matrix = config.stash.get(BROWSER_MATRIX_KEY, None)
+    if matrix is not None:
+        config.pluginmanager.unregister(matrix)
+
+    dependencies = config.stash.get(DEPENDENCY_KEY, None)
+    if dependencies is not None:
+        remove_usage_listener(dependencies.on_class_used)
+        config.pluginmanager.unregister(dependencies)
+        dependencies.close()
+
+    recorder = config.stash.get(TIMING_KEY, None)
+    if recorder is None:
+        return
+    remove_action_listener(recorder.on_action)
+    config.pluginmanager.unregister(recorder)
+    if getattr(config, "workerinput", None) is None:
+        recorder.database.prune()
+    recorder.close()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """На контроллере xdist передает воркерам момент среза истории и снимок изменений"""
+    recorder = node.config.stash.get(TIMING_KEY, None)
+    if recorder is not None:
+        node.workerinput["timing_snapshot"] = recorder.snapshot_time
+    affected = node.config.stash.get(AFFECTED_KEY, None)
+    if affected is not None:
+        node.workerinput["affected"] = affected
+
+
+def pytest_collection_modifyitems(session, config, items):
+    """Отбирает затронутые изменениями тесты, чередует браузеры, упорядочивает по истории и делит между воркерами"""
+    deselect_unaffected(config, items)
+    matrix = config.stash.get(BROWSER_MATRIX_KEY, None)
+    if matrix is not None:
+        matrix.interleave_items(items)
+        matrix.pin_limited_items(items)
+    order_by_timings(config, items)
+
+
+def deselect_unaffected(config, items):
+    affected = config.stash.get(AFFECTED_KEY, None)
+    if affected is None:
+        return
+    test_files = {item.nodeid: item.nodeid.split("::")[0] for item in items}
+    selected, reason = select_affected(test_files, affected["graph"], set(affected["changed"]))
+    if reason is not None:
+        logging.info(f"Запускаются все тесты: {reason}")
+        return
+    deselected = [item for item in items if item.nodeid not in selected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
+    logging.info(f"Затронуто изменениями ({len(affected['changed'])} файлов): {len(items)} тестов, "
+                 f"не затронуто: {len(deselected)}")
+
+
+def order_by_timings(config, items):
+    recorder = config.stash.get(TIMING_KEY, None)
+    timing_order = config.getoption("--timing-order")
+    failed_first = config.getoption("--timing-failed-first")
+    if recorder is None or not (timing_order or failed_first):
+        return
+
+    database = recorder.database
+    known = database.estimated_durations(config.getoption("--timing-history"), before=recorder.snapshot_time)
+    durations = fill_missing_durations((item.nodeid for item in items), known)
+    failed = database.recent_failures(before=recorder.snapshot_time) if failed_first else set()
+    if not timing_order:
+        durations = {nodeid: 0.0 for nodeid in durations}
+
+    positions = {nodeid: index for index, nodeid in enumerate(order_by_history(list(durations), durations, failed))}
+    items.sort(key=lambda item: positions[item.nodeid])
+
+    workers = get_worker_count(config)
+    if timing_order and workers > 1:
+        shards = lpt_schedule(durations, workers)
+        shard_of = {nodeid: shard.index for shard in shards for nodeid in shard.keys}
+        for item in items:
+            if item.get_closest_marker("xdist_group") is None:
+                item.add_marker(pytest.mark.xdist_group(name=f"lpt{shard_of[item.nodeid]}"))
+        logging.info("Ожидаемая загрузка воркеров: " + ", ".join(
+            f"lpt{shard.index} {shard.load:.1f}с ({len(shard.keys)} тестов)" for shard in shards))
+    logging.info(f"Тесты упорядочены по истории: {len(known)} из {len(items)} с известной длительностью, "
+                 f"упавших в прошлый раз: {len(failed & set(durations))}")
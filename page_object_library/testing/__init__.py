@@ -0,0 +1,10 @@
+from .dom import FakeNode, el, document
+from .html_parser import parse_html
+from .selectors import compile_css, find_all
+from .xpath import evaluate_xpath, find_by_xpath
+from .fake_driver import FakeDriver, FakeElement, FakeCommandExecutor, FakeSwitchTo, FakeAlert
+from .snapshot import DocumentIndex, HtmlSnapshot, SnapshotDriver
+from .replay import (
+    CommandRecording, RecordedCommand, CommandRecorder, record_commands, ReplayCommandExecutor, ReplayDriver,
+    ReplayDivergenceError, Divergence, recording_file_name
+)
@@ -0,0 +1,208 @@
+import html
+import re
+from typing import Dict, Iterator, List, Optional, Union
+
+# Атрибуты, которые Selenium возвращает как "true"/None, а не строкой из разметки
+BOOLEAN_ATTRIBUTES = {"checked", "selected", "disabled", "hidden", "readonly", "required", "multiple", "autofocus"}
+
+# Теги, текст которых начинается с новой строки (как в отрисованном браузером тексте)
+BLOCK_TAGS = {"address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "fieldset", "figure",
+              "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol",
+              "p", "pre", "section", "table", "tr", "ul"}
+
+# Элементы без закрывающего тега
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+# Теги, содержимое которых не отображается
+NON_RENDERED_TAGS = {"head", "script", "style", "template", "title", "meta", "link"}
+
+DOCUMENT_TAG = "#document"
+
+_WHITESPACE = re.compile(r"[ \t\r\f\v]+")
+
+
+class FakeNode:
+    """
+    Узел декларативной модели DOM для FakeDriver
+
+    Содержимое узла - список строк (текст) и дочерних узлов в порядке документа.
+    Поведение при клике задается обработчиком on_click(driver, node).
+    """
+
+    def __init__(self, tag, attributes: Dict[str, str] = None, content: List[Union[str, "FakeNode"]] = None,
+                 on_click=None):
+        self.tag = tag.lower()
+        self.attributes = dict(attributes or {})
+        self.content: List[Union[str, FakeNode]] = []
+        self.parent: Optional[FakeNode] = None
+        self.on_click = on_click
+        for item in content or ():
+            self.append(item)
+
+    def append(self, item: Union[str, "FakeNode"]) -> Union[str, "FakeNode"]:
+        """Добавляет текст или дочерний узел в конец содержимого"""
+        if isinstance(item, FakeNode):
+            if item.parent is not None:
+                item.parent.remove(item)
+            item.parent = self
+        self.content.append(item)
+        return item
+
+    def remove(self, child: "FakeNode"):
+        """Удаляет дочерний узел"""
+        self.content = [item for item in self.content if item is not child]
+        child.parent = None
+
+    def clear_content(self):
+        """Удаляет все содержимое узла"""
+        for child in self.children:
+            child.parent = None
+        self.content = []
+
+    @property
+    def children(self) -> List["FakeNode"]:
+        """Дочерние узлы-элементы"""
+        return [item for item in self.content if isinstance(item, FakeNode)]
+
+    @property
+    def id(self) -> Optional[str]:
+        return self.attributes.get("id")
+
+    @property
+    def classes(self) -> List[str]:
+        return self.attributes.get("class", "").split()
+
+    @property
+    def root(self) -> "FakeNode":
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
+
+    def iter_descendants(self) -> Iterator["FakeNode"]:
+        """Обходит потомков в порядке документа (без самого узла)"""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def iter_ancestors(self) -> Iterator["FakeNode"]:
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def previous_siblings(self) -> List["FakeNode"]:
+        """Предшествующие узлы-элементы с тем же родителем, ближайший первым"""
+        if self.parent is None:
+            return []
+        siblings = self.parent.children
+        return list(reversed(siblings[:siblings.index(self)]))
+
+    def is_displayed(self) -> bool:
+        """Отображается ли узел с учетом скрытых предков"""
+        for node in (self, *self.iter_ancestors()):
+            if node.tag == DOCUMENT_TAG:
+                break
+            if node.tag in NON_RENDERED_TAGS or "hidden" in node.attributes:
+                return False
+            if node.tag == "input" and node.attributes.get("type") == "hidden":
+                return False
+            if "display:none" in node.attributes.get("style", "").replace(" ", ""):
+                return False
+        return True
+
+    def is_enabled(self) -> bool:
+        return "disabled" not in self.attributes
+
+    def text_content(self) -> str:
+        """Весь текст узла, включая скрытые элементы (textContent)"""
+        return "".join(item if isinstance(item, str) else item.text_content() for item in self.content)
+
+    def visible_text(self) -> str:
+        """Отображаемый текст узла (innerText / WebElement.text)"""
+        if not self.is_displayed():
+            return ""
+        lines = []
+        self._collect_text(lines)
+        text = "".join(lines)
+        return "\n".join(_WHITESPACE.sub(" ", line).strip() for line in text.split("\n")).strip("\n")
+
+    def _collect_text(self, parts: List[str]):
+        block = self.tag in BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        for item in self.content:
+            if isinstance(item, str):
+                parts.append(item.replace("\n", " "))
+            elif item.tag not in NON_RENDERED_TAGS and "hidden" not in item.attributes and item.is_displayed():
+                item._collect_text(parts)
+        if block:
+            parts.append("\n")
+
+    def clone(self) -> "FakeNode":
+        """Глубокая копия узла (обработчики кликов переносятся без копирования)"""
+        return FakeNode(self.tag, self.attributes,
+                        [item if isinstance(item, str) else item.clone() for item in self.content],
+                        on_click=self.on_click)
+
+    def to_html(self) -> str:
+        """Сериализует узел в HTML"""
+        if self.tag == DOCUMENT_TAG:
+            return "<!DOCTYPE html>" + "".join(self._content_html())
+        attributes = "".join(
+            f' {name}' if value == "" and name in BOOLEAN_ATTRIBUTES else f' {name}="{html.escape(value)}"'
+            for name, value in self.attributes.items()
+        )
+        if self.tag in VOID_TAGS:
+            return f"<{self.tag}{attributes}>"
+        return f"<{self.tag}{attributes}>{''.join(self._content_html())}</{self.tag}>"
+
+    def _content_html(self):
+        for item in self.content:
+            yield html.escape(item, quote=False) if isinstance(item, str) else item.to_html()
+
+    def __repr__(self):
+        attributes = "".join(f"{'#' if name == 'id' else '.' if name == 'class' else ''}"
+                             f"{value.replace(' ', '.') if name in ('id', 'class') else ''}"
+                             for name, value in self.attributes.items() if name in ("id", "class"))
+        return f"<FakeNode {self.tag}{attributes}>"
+
+
+def _attribute_name(name: str) -> str:
+    """class_ -> class, data_action -> data-action"""
+    return name.rstrip("_").replace("_", "-")
+
+
+def el(tag, *content, on_click=None, **attributes) -> FakeNode:
+    """
+    Создает узел DOM декларативно
+
+    Позиционные аргументы - текст и дочерние узлы, именованные - атрибуты:
+    class_="a-price" -> class, data_action="x" -> data-action. Значение True задает
+    логический атрибут (checked=True), False и None атрибут опускают.
+
+        el("div", el("span", "$12", class_="a-offscreen"), id="price")
+    """
+    normalized = {}
+    for name, value in attributes.items():
+        if value is None or value is False:
+            continue
+        normalized[_attribute_name(name)] = "" if value is True else str(value)
+    return FakeNode(tag, normalized, list(content), on_click=on_click)
+
+
+def document(*content, title=None) -> FakeNode:
+    """Создает документ: html с head (title) и body с переданным содержимым"""
+    head = el("head", el("title", title)) if title is not None else el("head")
+    return FakeNode(DOCUMENT_TAG, content=[el("html", head, el("body", *content))])
+
+
+def as_document(node: FakeNode) -> FakeNode:
+    """Возвращает узел-документ: готовый документ как есть, иначе оборачивает узел"""
+    if node.tag == DOCUMENT_TAG:
+        return node
+    if node.tag == "html":
+        return FakeNode(DOCUMENT_TAG, content=[node])
+    return document(node)
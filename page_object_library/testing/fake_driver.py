@@ -0,0 +1,753 @@
+import base64
+import itertools
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+from urllib.parse import urlencode, urljoin, urlsplit, urlunsplit
+
+from selenium.common.exceptions import (
+    ElementNotInteractableException,
+    InvalidSessionIdException,
+    JavascriptException,
+    NoAlertPresentException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.command import Command
+
+from page_object_library.core.state_reset import STORAGE_RESET_SCRIPT
+from page_object_library.core.base_page import DOCUMENT_IDENTITY_SCRIPT
+from page_object_library.testing.dom import BLOCK_TAGS, BOOLEAN_ATTRIBUTES, FakeNode, as_document, document, el
+from page_object_library.testing.html_parser import parse_html
+from page_object_library.testing.selectors import find_all
+from page_object_library.utils.diagnostics import DIAGNOSTICS_SCRIPT
+
+# Команда проверки видимости: в W3C ее нет, Selenium выполняет для нее скрипт
+IS_ELEMENT_DISPLAYED = "isElementDisplayed"
+
+# Прозрачный PNG 1x1: FakeDriver ничего не отрисовывает, но скриншоты должны оставаться валидными файлами
+BLANK_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+SUBMIT_KEYS = (Keys.ENTER, Keys.RETURN)
+
+# Значения CSS-свойств, не заданных в атрибуте style
+CSS_DEFAULTS = {"visibility": "visible", "opacity": "1"}
+
+# Страница: готовый DOM (копируется при каждой загрузке), HTML-разметка или функция (driver, url) -> DOM
+PageSource = Union[FakeNode, str, Callable[["FakeDriver", str], FakeNode]]
+
+_session_ids = itertools.count(1)
+
+
+class FakeElement:
+    """Элемент FakeDriver с интерфейсом WebElement"""
+
+    def __init__(self, parent: "FakeDriver", id_: str):
+        self._parent = parent
+        self._id = id_
+
+    @property
+    def parent(self) -> "FakeDriver":
+        return self._parent
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @property
+    def node(self) -> FakeNode:
+        """Узел DOM элемента (для проверок в тестах)"""
+        return self._parent.resolve_element(self._id)
+
+    def _execute(self, command, params=None):
+        params = dict(params or {})
+        params["id"] = self._id
+        return self._parent.execute(command, params)
+
+    @property
+    def tag_name(self) -> str:
+        return self._execute(Command.GET_ELEMENT_TAG_NAME)
+
+    @property
+    def text(self) -> str:
+        return self._execute(Command.GET_ELEMENT_TEXT)
+
+    def click(self):
+        self._execute(Command.CLICK_ELEMENT)
+
+    def clear(self):
+        self._execute(Command.CLEAR_ELEMENT)
+
+    def send_keys(self, *value):
+        self._execute(Command.SEND_KEYS_TO_ELEMENT, {"text": "".join(str(item) for item in value)})
+
+    def get_attribute(self, name) -> Optional[str]:
+        return self._execute(Command.GET_ELEMENT_ATTRIBUTE, {"name": name})
+
+    def get_dom_attribute(self, name) -> Optional[str]:
+        return self.node.attributes.get(name)
+
+    def get_property(self, name):
+        return self._execute(Command.GET_ELEMENT_PROPERTY, {"name": name})
+
+    def is_displayed(self) -> bool:
+        return self._execute(IS_ELEMENT_DISPLAYED)
+
+    def value_of_css_property(self, property_name) -> str:
+        return self._execute(Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY, {"propertyName": property_name})
+
+    def is_enabled(self) -> bool:
+        return self._execute(Command.IS_ELEMENT_ENABLED)
+
+    def is_selected(self) -> bool:
+        return self._execute(Command.IS_ELEMENT_SELECTED)
+
+    def find_element(self, by=By.ID, value=None) -> "FakeElement":
+        return self._execute(Command.FIND_CHILD_ELEMENT, {"using": by, "value": value})
+
+    def find_elements(self, by=By.ID, value=None) -> List["FakeElement"]:
+        return self._execute(Command.FIND_CHILD_ELEMENTS, {"using": by, "value": value})
+
+    @property
+    def rect(self) -> Dict[str, int]:
+        return {"x": 0, "y": 0, "width": 0, "height": 0}
+
+    @property
+    def location(self) -> Dict[str, int]:
+        return {"x": 0, "y": 0}
+
+    @property
+    def size(self) -> Dict[str, int]:
+        return {"width": 0, "height": 0}
+
+    @property
+    def screenshot_as_png(self) -> bytes:
+        return self._execute(Command.ELEMENT_SCREENSHOT)
+
+    def screenshot(self, filename) -> bool:
+        Path(filename).write_bytes(self.screenshot_as_png)
+        return True
+
+    def __eq__(self, other):
+        return isinstance(other, FakeElement) and self._parent is other._parent and self._id == other._id
+
+    def __hash__(self):
+        return hash((id(self._parent), self._id))
+
+    def __repr__(self):
+        return f"<FakeElement {self._id} {self._parent.describe_element(self._id)}>"
+
+
+class FakeAlert:
+    """Алерт FakeDriver с интерфейсом selenium Alert"""
+
+    def __init__(self, driver: "FakeDriver"):
+        self._driver = driver
+
+    @property
+    def text(self) -> str:
+        return self._driver.execute(Command.W3C_GET_ALERT_TEXT)
+
+    def dismiss(self):
+        self._driver.execute(Command.W3C_DISMISS_ALERT)
+
+    def accept(self):
+        self._driver.execute(Command.W3C_ACCEPT_ALERT)
+
+
+class FakeSwitchTo:
+    """Переключение окон и алертов FakeDriver с интерфейсом selenium SwitchTo"""
+
+    def __init__(self, driver: "FakeDriver"):
+        self._driver = driver
+
+    @property
+    def alert(self) -> FakeAlert:
+        alert = FakeAlert(self._driver)
+        _ = alert.text
+        return alert
+
+    def window(self, window_name):
+        self._driver.execute(Command.SWITCH_TO_WINDOW, {"handle": window_name})
+
+    def new_window(self, type_hint=None):
+        handle = self._driver.execute(Command.NEW_WINDOW, {"type": type_hint})["handle"]
+        self.window(handle)
+
+
+class FakeCommandExecutor:
+    """
+    Исполнитель команд FakeDriver с интерфейсом execute(command, params) как у RemoteConnection
+
+    Все действия драйвера и элементов проходят через execute, поэтому подсчет команд
+    (instrument_driver) и бюджеты команд работают так же, как с настоящим браузером.
+    """
+
+    def __init__(self, driver: "FakeDriver"):
+        self._driver = driver
+        self._handlers = {
+            Command.GET: driver._cmd_get,
+            Command.GET_CURRENT_URL: lambda params: driver._current_url,
+            Command.GET_TITLE: driver._cmd_title,
+            Command.GET_PAGE_SOURCE: lambda params: driver._document.to_html(),
+            Command.GO_BACK: driver._cmd_back,
+            Command.GO_FORWARD: driver._cmd_forward,
+            Command.REFRESH: lambda params: driver._load(driver._current_url, record_history=False),
+            Command.FIND_ELEMENT: driver._cmd_find_element,
+            Command.FIND_ELEMENTS: driver._cmd_find_elements,
+            Command.FIND_CHILD_ELEMENT: driver._cmd_find_element,
+            Command.FIND_CHILD_ELEMENTS: driver._cmd_find_elements,
+            Command.CLICK_ELEMENT: driver._cmd_click,
+            Command.CLEAR_ELEMENT: driver._cmd_clear,
+            Command.SEND_KEYS_TO_ELEMENT: driver._cmd_send_keys,
+            Command.GET_ELEMENT_TEXT: lambda params: driver._node(params).visible_text(),
+            Command.GET_ELEMENT_TAG_NAME: lambda params: driver._node(params).tag,
+            Command.GET_ELEMENT_ATTRIBUTE: driver._cmd_get_attribute,
+            Command.GET_ELEMENT_PROPERTY: driver._cmd_get_property,
+            Command.IS_ELEMENT_ENABLED: lambda params: driver._node(params).is_enabled(),
+            Command.IS_ELEMENT_SELECTED: lambda params: driver._is_selected(driver._node(params)),
+            IS_ELEMENT_DISPLAYED: lambda params: driver._node(params).is_displayed(),
+            Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY: driver._cmd_css_property,
+            Command.W3C_EXECUTE_SCRIPT: driver._cmd_execute_script,
+            Command.SCREENSHOT: lambda params: BLANK_PNG,
+            Command.ELEMENT_SCREENSHOT: lambda params: driver._node(params) and BLANK_PNG,
+            Command.GET_ALL_COOKIES: lambda params: [dict(cookie) for cookie in driver._cookies.values()],
+            Command.ADD_COOKIE: lambda params: driver._cookies.__setitem__(params["cookie"]["name"],
+                                                                           dict(params["cookie"])),
+            Command.DELETE_COOKIE: lambda params: driver._cookies.pop(params["name"], None) and None,
+            Command.DELETE_ALL_COOKIES: lambda params: driver._cookies.clear(),
+            Command.W3C_MAXIMIZE_WINDOW: lambda params: None,
+            Command.W3C_GET_WINDOW_HANDLES: lambda params: list(driver._windows),
+            Command.W3C_GET_CURRENT_WINDOW_HANDLE: lambda params: driver._current_window(),
+            Command.NEW_WINDOW: driver._cmd_new_window,
+            Command.SWITCH_TO_WINDOW: driver._cmd_switch_to_window,
+            Command.CLOSE: driver._cmd_close,
+            Command.W3C_GET_ALERT_TEXT: lambda params: driver._alert(),
+            Command.W3C_DISMISS_ALERT: driver._cmd_close_alert,
+            Command.W3C_ACCEPT_ALERT: driver._cmd_close_alert,
+            Command.QUIT: driver._cmd_quit,
+        }
+
+    def execute(self, command, params=None):
+        handler = self._handlers.get(command)
+        if handler is None:
+            raise WebDriverException(f"Команда '{command}' не поддерживается FakeDriver")
+        if self._driver.quit_count and command != Command.QUIT:
+            raise InvalidSessionIdException(f"Сессия {self._driver.session_id} завершена")
+        return {"value": handler(params or {})}
+
+
+class FakeDriver:
+    """
+    WebDriver в памяти поверх декларативной модели DOM для тестов page objects без браузера
+
+    Страницы задаются словарем {URL или путь: DOM}, DOM строится функциями el() и document()
+    или разбирается из HTML-разметки.
+    Клик переходит по ссылкам, отправляет формы, переключает чекбоксы и вызывает on_click
+    ближайшего узла; ввод текста меняет атрибут value, Enter отправляет форму.
+
+    При fail_fast=True поиск несуществующего элемента сразу выбрасывает TimeoutException,
+    и ожидания WebDriverWait в page objects завершаются мгновенно вместо полного таймаута.
+    Ожидание видимости или активности существующего элемента по-прежнему идет по таймауту.
+
+    Окна FakeDriver - только дескрипторы, все они показывают один документ; алерт
+    открывается присваиванием alert_text. После quit() все команды, кроме повторного
+    quit(), выбрасывают InvalidSessionIdException.
+    """
+
+    def __init__(self, pages: Dict[str, PageSource] = None, base_url="http://fake.test", fail_fast=True):
+        """
+        Args:
+            pages: Страницы {URL или путь (например, "/s"): DOM или функция (driver, url) -> DOM}
+            base_url: Базовый URL для относительных путей страниц
+            fail_fast: Сразу выбрасывать TimeoutException, если элемент не найден
+        """
+        self.base_url = base_url.rstrip("/")
+        self.fail_fast = fail_fast
+        self.ready_state = "complete"
+        self.form_data: Optional[Dict[str, str]] = None
+        self.session_id = f"fake-{next(_session_ids)}"
+        self.name = "fake"
+        self.capabilities = {"browserName": "fake"}
+        self.quit_count = 0
+        self.alert_text: Optional[str] = None
+        self.local_storage: Dict[str, str] = {}
+        self.session_storage: Dict[str, str] = {}
+        self.pages: Dict[str, PageSource] = {}
+        self.scripts: Dict[str, Callable] = {
+            "return document.readyState": lambda driver: driver.ready_state,
+            "return document.readyState;": lambda driver: driver.ready_state,
+            DOCUMENT_IDENTITY_SCRIPT: lambda driver: [driver._current_url, f"{driver.session_id}-{driver._document_id}"],
+            DIAGNOSTICS_SCRIPT: lambda driver: {"url": driver._current_url, "readyState": driver.ready_state,
+                                                "pendingRequests": 0},
+            "arguments[0].click();": lambda driver, element: driver._click(driver._node({"id": element.id})),
+            "arguments[0].scrollIntoView(true);": lambda driver, element: None,
+            "arguments[0].scrollIntoView();": lambda driver, element: None,
+            STORAGE_RESET_SCRIPT: lambda driver: driver.local_storage.clear() or driver.session_storage.clear(),
+        }
+        self.command_executor = FakeCommandExecutor(self)
+
+        self._document = document(title="")
+        self._document_id = 0
+        self._current_url = "about:blank"
+        self._history: List[str] = []
+        self._forward: List[str] = []
+        self._cookies: Dict[str, dict] = {}
+        self._windows: List[str] = [f"{self.session_id}-w1"]
+        self._window: Optional[str] = self._windows[0]
+        self._window_counter = itertools.count(2)
+        self._elements: Dict[str, FakeNode] = {}
+        self._element_ids: Dict[int, str] = {}
+        self._element_counter = itertools.count(1)
+
+        for url, page in (pages or {}).items():
+            self.add_page(url, page)
+
+    # Настройка
+
+    def add_page(self, url: str, page: PageSource):
+        """Регистрирует страницу по URL или пути"""
+        self.pages[self._page_key(url)] = page
+        return self
+
+    def register_script(self, script: str, handler: Callable):
+        """Регистрирует обработчик скрипта execute_script: handler(driver, *args)"""
+        self.scripts[script] = handler
+        return self
+
+    @property
+    def document(self) -> FakeNode:
+        """Текущий DOM (для подготовки состояния и проверок в тестах)"""
+        return self._document
+
+    # Интерфейс WebDriver
+
+    def execute(self, command, params=None):
+        return self.command_executor.execute(command, params)["value"]
+
+    def get(self, url):
+        self.execute(Command.GET, {"url": url})
+
+    @property
+    def current_url(self) -> str:
+        return self.execute(Command.GET_CURRENT_URL)
+
+    @property
+    def title(self) -> str:
+        return self.execute(Command.GET_TITLE)
+
+    @property
+    def page_source(self) -> str:
+        return self.execute(Command.GET_PAGE_SOURCE)
+
+    def back(self):
+        self.execute(Command.GO_BACK)
+
+    def forward(self):
+        self.execute(Command.GO_FORWARD)
+
+    def refresh(self):
+        self.execute(Command.REFRESH)
+
+    def find_element(self, by=By.ID, value=None) -> FakeElement:
+        return self.execute(Command.FIND_ELEMENT, {"using": by, "value": value})
+
+    def find_elements(self, by=By.ID, value=None) -> List[FakeElement]:
+        return self.execute(Command.FIND_ELEMENTS, {"using": by, "value": value})
+
+    def execute_script(self, script, *args):
+        return self.execute(Command.W3C_EXECUTE_SCRIPT, {"script": script, "args": list(args)})
+
+    def get_screenshot_as_png(self) -> bytes:
+        return self.execute(Command.SCREENSHOT)
+
+    def get_screenshot_as_base64(self) -> str:
+        return base64.b64encode(self.get_screenshot_as_png()).decode("ascii")
+
+    def save_screenshot(self, filename) -> bool:
+        Path(filename).write_bytes(self.get_screenshot_as_png())
+        return True
+
+    get_screenshot_as_file = save_screenshot
+
+    def get_cookies(self) -> List[dict]:
+        return self.execute(Command.GET_ALL_COOKIES)
+
+    def get_cookie(self, name) -> Optional[dict]:
+        return next((cookie for cookie in self.get_cookies() if cookie["name"] == name), None)
+
+    def add_cookie(self, cookie_dict: dict):
+        self.execute(Command.ADD_COOKIE, {"cookie": cookie_dict})
+
+    def delete_cookie(self, name):
+        self.execute(Command.DELETE_COOKIE, {"name": name})
+
+    def delete_all_cookies(self):
+        self.execute(Command.DELETE_ALL_COOKIES)
+
+    @property
+    def window_handles(self) -> List[str]:
+        return self.execute(Command.W3C_GET_WINDOW_HANDLES)
+
+    @property
+    def current_window_handle(self) -> str:
+        return self.execute(Command.W3C_GET_CURRENT_WINDOW_HANDLE)
+
+    @property
+    def switch_to(self) -> "FakeSwitchTo":
+        return FakeSwitchTo(self)
+
+    def close(self):
+        self.execute(Command.CLOSE)
+
+    def maximize_window(self):
+        self.execute(Command.W3C_MAXIMIZE_WINDOW)
+
+    def quit(self):
+        self.execute(Command.QUIT)
+
+    # Элементы
+
+    def resolve_element(self, element_id: str) -> FakeNode:
+        """Возвращает узел элемента или выбрасывает StaleElementReferenceException"""
+        node = self._elements.get(element_id)
+        if node is None or node.root is not self._document:
+            raise StaleElementReferenceException(f"Элемент {element_id} больше не находится в документе")
+        return node
+
+    def describe_element(self, element_id: str) -> str:
+        node = self._elements.get(element_id)
+        return repr(node) if node is not None else "?"
+
+    def _wrap(self, node: FakeNode) -> FakeElement:
+        element_id = self._element_ids.get(id(node))
+        if element_id is None or self._elements.get(element_id) is not node:
+            element_id = f"{self.session_id}-e{next(self._element_counter)}"
+            self._elements[element_id] = node
+            self._element_ids[id(node)] = element_id
+        return FakeElement(self, element_id)
+
+    def _node(self, params) -> FakeNode:
+        return self.resolve_element(params["id"])
+
+    # Навигация
+
+    def _page_key(self, url: str) -> str:
+        if url.startswith(self.base_url):
+            url = url[len(self.base_url):]
+        return url.split("#", 1)[0] or "/"
+
+    def _find_page(self, url: str) -> Optional[PageSource]:
+        key = self._page_key(url)
+        path = urlsplit(key).path or "/"
+        for candidate in (url.split("#", 1)[0], key, path):
+            if candidate in self.pages:
+                return self.pages[candidate]
+        return None
+
+    def _build_document(self, page: Optional[PageSource], url: str) -> FakeNode:
+        """Создает DOM загружаемой страницы"""
+        if page is None:
+            if url == "about:blank":
+                return document(title="")
+            return document(el("h1", "404 Not Found"), title="404 Not Found")
+        if isinstance(page, FakeNode):
+            return as_document(page.clone())
+        if isinstance(page, str):
+            return parse_html(page)
+        return as_document(page(self, url))
+
+    def _load(self, url: str, record_history=True):
+        dom = self._build_document(self._find_page(url), url)
+
+        if record_history and self._current_url != "about:blank":
+            self._history.append(self._current_url)
+            self._forward.clear()
+        self._document = dom
+        self._document_id += 1
+        self._current_url = url
+        self._elements.clear()
+        self._element_ids.clear()
+
+    def _cmd_get(self, params):
+        url = urljoin(self._current_url if self._current_url != "about:blank" else self.base_url + "/",
+                      params["url"])
+        self.form_data = None
+        self._load(url)
+
+    def _cmd_back(self, params):
+        if self._history:
+            self._forward.append(self._current_url)
+            self._load(self._history.pop(), record_history=False)
+
+    def _cmd_forward(self, params):
+        if self._forward:
+            self._history.append(self._current_url)
+            self._load(self._forward.pop(), record_history=False)
+
+    def _cmd_title(self, params) -> str:
+        titles = find_all(self._document, By.TAG_NAME, "title")
+        return titles[0].text_content().strip() if titles else ""
+
+    def _cmd_quit(self, params):
+        self.quit_count += 1
+
+    # Окна и алерты
+
+    def _current_window(self) -> str:
+        if self._window is None:
+            raise NoSuchWindowException("Текущее окно закрыто")
+        return self._window
+
+    def _cmd_new_window(self, params) -> dict:
+        handle = f"{self.session_id}-w{next(self._window_counter)}"
+        self._windows.append(handle)
+        return {"handle": handle, "type": params.get("type", "tab")}
+
+    def _cmd_switch_to_window(self, params):
+        if params["handle"] not in self._windows:
+            raise NoSuchWindowException(f"Окно {params['handle']} не найдено")
+        self._window = params["handle"]
+
+    def _cmd_close(self, params) -> List[str]:
+        self._windows.remove(self._current_window())
+        self._window = None
+        return list(self._windows)
+
+    def _alert(self) -> str:
+        if self.alert_text is None:
+            raise NoAlertPresentException("Алерт не открыт")
+        return self.alert_text
+
+    def _cmd_close_alert(self, params):
+        self._alert()
+        self.alert_text = None
+
+    # Поиск
+
+    def _cmd_find_elements(self, params) -> List[FakeElement]:
+        root = self._node(params) if "id" in params else self._document
+        return [self._wrap(node) for node in self._find_nodes(root, params["using"], params["value"])]
+
+    def _find_nodes(self, root: FakeNode, by: str, value: str) -> List[FakeNode]:
+        return find_all(root, by, value)
+
+    def _cmd_find_element(self, params) -> FakeElement:
+        elements = self._cmd_find_elements(params)
+        if elements:
+            return elements[0]
+        message = f"Элемент не найден: {params['using']}={params['value']!r} ({self._current_url})"
+        if self.fail_fast:
+            raise TimeoutException(message)
+        raise NoSuchElementException(message)
+
+    # Действия
+
+    def _cmd_click(self, params):
+        self._click(self._node(params))
+
+    def _click(self, node: FakeNode):
+        if not node.is_displayed():
+            raise ElementNotInteractableException(f"Элемент {node!r} скрыт")
+        if not node.is_enabled():
+            return
+
+        input_type = node.attributes.get("type", "").lower()
+        if node.tag == "input" and input_type == "checkbox":
+            self._toggle(node, "checked", "checked" not in node.attributes)
+        elif node.tag == "input" and input_type == "radio":
+            self._select_radio(node)
+        elif node.tag == "option":
+            self._select_option(node)
+
+        chain = (node, *node.iter_ancestors())
+        for target in chain:
+            if target.on_click is not None:
+                target.on_click(self, target)
+                return
+
+        for target in chain:
+            if target.tag == "a" and "href" in target.attributes:
+                self._cmd_get({"url": target.attributes["href"]})
+                return
+
+        if self._is_submit(node):
+            form = next((ancestor for ancestor in node.iter_ancestors() if ancestor.tag == "form"), None)
+            if form is not None:
+                self._submit(form, node)
+
+    def _check_writable(self):
+        """Проверяет, можно ли менять DOM действиями пользователя"""
+
+    def _toggle(self, node: FakeNode, attribute: str, value: bool):
+        self._check_writable()
+        if value:
+            node.attributes[attribute] = ""
+        else:
+            node.attributes.pop(attribute, None)
+
+    def _select_radio(self, node: FakeNode):
+        name = node.attributes.get("name")
+        if name:
+            for other in find_all(self._document, By.NAME, name):
+                if other.attributes.get("type", "").lower() == "radio":
+                    self._toggle(other, "checked", False)
+        self._toggle(node, "checked", True)
+
+    def _select_option(self, node: FakeNode):
+        select = next((ancestor for ancestor in node.iter_ancestors() if ancestor.tag == "select"), None)
+        if select is not None and "multiple" in select.attributes:
+            self._toggle(node, "selected", "selected" not in node.attributes)
+            return
+        if select is not None:
+            for option in find_all(select, By.TAG_NAME, "option"):
+                self._toggle(option, "selected", False)
+        self._toggle(node, "selected", True)
+
+    @staticmethod
+    def _is_submit(node: FakeNode) -> bool:
+        input_type = node.attributes.get("type", "").lower()
+        if node.tag == "button":
+            return input_type in ("", "submit")
+        return node.tag == "input" and input_type in ("submit", "image")
+
+    def _submit(self, form: FakeNode, submitter: FakeNode = None):
+        data = {}
+        for field in form.iter_descendants():
+            name = field.attributes.get("name")
+            if not name or "disabled" in field.attributes:
+                continue
+            input_type = field.attributes.get("type", "").lower()
+            if field.tag == "input" and input_type in ("checkbox", "radio") and "checked" not in field.attributes:
+                continue
+            if field.tag in ("input", "button") and self._is_submit(field) and field is not submitter:
+                continue
+            if field.tag in ("input", "textarea", "button") or field.tag == "select":
+                data[name] = self._value(field)
+
+        action = urljoin(self._current_url, form.attributes.get("action") or self._current_url)
+        if form.attributes.get("method", "get").lower() == "get":
+            scheme, netloc, path, _, _ = urlsplit(action)
+            action = urlunsplit((scheme, netloc, path, urlencode(data), ""))
+        self.form_data = data
+        self._load(action)
+
+    def _cmd_clear(self, params):
+        node = self._node(params)
+        self._check_editable(node)
+        node.attributes["value"] = ""
+
+    def _cmd_send_keys(self, params):
+        node = self._node(params)
+        self._check_editable(node)
+        text = params["text"]
+        for key in SUBMIT_KEYS:
+            text = text.replace(key, "\n")
+        typed, _, rest = text.partition("\n")
+        node.attributes["value"] = self._value(node) + "".join(char for char in typed if not "\ue000" <= char <= "\uf8ff")
+        if _ or rest:
+            form = next((ancestor for ancestor in node.iter_ancestors() if ancestor.tag == "form"), None)
+            if form is not None:
+                self._submit(form)
+
+    def _check_editable(self, node: FakeNode):
+        self._check_writable()
+        if not node.is_displayed() or not node.is_enabled() or "readonly" in node.attributes:
+            raise ElementNotInteractableException(f"Элемент {node!r} недоступен для ввода")
+
+    # Атрибуты и свойства
+
+    def _options(self, select: FakeNode) -> List[FakeNode]:
+        return find_all(select, By.TAG_NAME, "option")
+
+    def _is_selected(self, node: FakeNode) -> bool:
+        if node.tag == "input":
+            return "checked" in node.attributes
+        if node.tag != "option":
+            return False
+        if "selected" in node.attributes:
+            return True
+        select = next((ancestor for ancestor in node.iter_ancestors() if ancestor.tag == "select"), None)
+        if select is None or "multiple" in select.attributes:
+            return False
+        options = self._options(select)
+        return options[0] is node and not any("selected" in option.attributes for option in options)
+
+    def _value(self, node: FakeNode) -> str:
+        if node.tag == "select":
+            selected = [option for option in self._options(node) if self._is_selected(option)]
+            return self._value(selected[0]) if selected else ""
+        if node.tag == "option":
+            return node.attributes.get("value", node.text_content().strip())
+        if node.tag == "textarea" and "value" not in node.attributes:
+            return node.text_content()
+        return node.attributes.get("value", "")
+
+    def _cmd_get_property(self, params):
+        node = self._node(params)
+        name = params["name"]
+        if name in ("checked", "selected"):
+            return self._is_selected(node)
+        if name == "disabled":
+            return not node.is_enabled()
+        if name == "value":
+            return self._value(node)
+        if name == "index" and node.tag == "option":
+            select = next((ancestor for ancestor in node.iter_ancestors() if ancestor.tag == "select"), None)
+            return self._options(select).index(node) if select is not None else 0
+        if name == "tagName":
+            return node.tag.upper()
+        if name == "innerText":
+            return node.visible_text()
+        if name == "textContent":
+            return node.text_content()
+        if name == "innerHTML":
+            return "".join(node._content_html())
+        if name == "outerHTML":
+            return node.to_html()
+        if name in ("href", "src") and name in node.attributes:
+            return urljoin(self._current_url, node.attributes[name])
+        if name == "className":
+            return node.attributes.get("class", "")
+        return node.attributes.get(name)
+
+    def _cmd_css_property(self, params) -> str:
+        """Значение CSS-свойства из атрибута style; стили страницы не вычисляются"""
+        node = self._node(params)
+        name = params["propertyName"].lower()
+        for declaration in node.attributes.get("style", "").split(";"):
+            prop, _, value = declaration.partition(":")
+            if prop.strip().lower() == name:
+                return value.strip()
+        if name == "display":
+            return "none" if not node.is_displayed() else "block" if node.tag in BLOCK_TAGS else "inline"
+        return CSS_DEFAULTS.get(name, "")
+
+    def _cmd_get_attribute(self, params):
+        node = self._node(params)
+        name = params["name"]
+        if name in BOOLEAN_ATTRIBUTES:
+            if name in ("checked", "selected"):
+                return "true" if self._is_selected(node) else None
+            return "true" if name in node.attributes else None
+        if name == "class":
+            name = "className"
+        value = self._cmd_get_property({"id": params["id"], "name": name})
+        if value is None or isinstance(value, str):
+            return value
+        return str(value)
+
+    # Скрипты
+
+    def _cmd_execute_script(self, params):
+        handler = self.scripts.get(params["script"]) or self.scripts.get(params["script"].strip())
+        if handler is None:
+            raise JavascriptException(f"FakeDriver не умеет выполнять скрипт: {params['script'][:80]!r}. "
+                                      f"Зарегистрируйте обработчик через register_script()")
+        return handler(self, *params.get("args", ()))
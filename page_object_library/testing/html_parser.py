@@ -0,0 +1,77 @@
+from html.parser import HTMLParser
+
+from page_object_library.testing.dom import DOCUMENT_TAG, VOID_TAGS, FakeNode
+
+# Открывающий тег, который неявно закрывает незакрытые теги из множества (как в парсере браузера)
+_IMPLICITLY_CLOSES = {
+    "li": {"li"},
+    "option": {"option"},
+    "tr": {"tr", "td", "th"},
+    "td": {"td", "th"},
+    "th": {"td", "th"},
+    "dt": {"dt", "dd"},
+    "dd": {"dt", "dd"},
+}
+_CLOSES_PARAGRAPH = {"address", "article", "aside", "blockquote", "div", "dl", "fieldset", "footer", "form",
+                     "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "main", "nav", "ol", "p", "pre",
+                     "section", "table", "ul"}
+# Границы, за которые неявное закрытие не распространяется
+_SCOPE_TAGS = {"ul", "ol", "select", "table", "tbody", "thead", "dl", DOCUMENT_TAG}
+
+
+class _TreeBuilder(HTMLParser):
+    """Строит дерево FakeNode из HTML, прощая незакрытые и лишние закрывающие теги"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.document = FakeNode(DOCUMENT_TAG)
+        self.stack = [self.document]
+
+    def _close_implicit(self, tag):
+        closes = _IMPLICITLY_CLOSES.get(tag, set())
+        if tag in _CLOSES_PARAGRAPH:
+            closes = closes | {"p"}
+        closed_from = None
+        for index in range(len(self.stack) - 1, 0, -1):
+            open_tag = self.stack[index].tag
+            if open_tag in _SCOPE_TAGS:
+                break
+            if open_tag in closes:
+                closed_from = index
+        if closed_from is not None:
+            del self.stack[closed_from:]
+
+    def handle_starttag(self, tag, attrs):
+        self._close_implicit(tag)
+        attributes = {}
+        for name, value in attrs:
+            attributes.setdefault(name, value if value is not None else "")
+        node = self.stack[-1].append(FakeNode(tag, attributes))
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.stack[-1].tag == tag:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        for index in range(len(self.stack) - 1, 0, -1):
+            if self.stack[index].tag == tag:
+                del self.stack[index:]
+                return
+
+    def handle_data(self, data):
+        parent = self.stack[-1]
+        if parent.content and isinstance(parent.content[-1], str):
+            parent.content[-1] += data
+        else:
+            parent.append(data)
+
+
+def parse_html(source: str) -> FakeNode:
+    """Разбирает HTML в документ FakeNode"""
+    builder = _TreeBuilder()
+    builder.feed(source)
+    builder.close()
+    return builder.document
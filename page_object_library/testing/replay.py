@@ -0,0 +1,333 @@
+import gzip
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.options import ArgOptions
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+RECORDING_FORMAT = "page-object-commands"
+RECORDING_VERSION = 1
+RECORDING_SUFFIX = ".json.gz"
+
+# Команды только для чтения, которые ожидания WebDriverWait повторяют в цикле.
+# Их число при воспроизведении может отличаться от записи, это не считается расхождением.
+POLLING_COMMANDS = {
+    Command.FIND_ELEMENT, Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENT, Command.FIND_CHILD_ELEMENTS,
+    Command.W3C_EXECUTE_SCRIPT, Command.GET_CURRENT_URL, Command.GET_TITLE, Command.GET_ELEMENT_ATTRIBUTE,
+    Command.GET_ELEMENT_PROPERTY, Command.IS_ELEMENT_ENABLED, Command.IS_ELEMENT_SELECTED,
+    Command.GET_ELEMENT_TEXT, Command.GET_ELEMENT_RECT,
+}
+
+# Команды завершения сессии, которые можно выполнить и сверх записи
+SESSION_END_COMMANDS = {Command.QUIT, Command.CLOSE, Command.DELETE_SESSION}
+
+
+def _canonical(value) -> str:
+    """Каноническое JSON-представление для сравнения и хранения"""
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def recording_file_name(test_id: str, driver_name="default", failed=False) -> str:
+    """Имя файла записи для теста и драйвера; записи упавших прогонов получают суффикс __failed"""
+    safe_id = re.sub(r"[^\w.-]+", "_", test_id).strip("_")
+    return f"{safe_id}__{driver_name}{'__failed' if failed else ''}{RECORDING_SUFFIX}"
+
+
+@dataclass
+class RecordedCommand:
+    """Команда WebDriver с ответом; параметры и ответ хранятся в каноническом JSON"""
+    command: str
+    params: str
+    response: str
+    duration: float = 0.0
+
+    @property
+    def key(self):
+        return self.command, self.params
+
+    def describe(self, limit=120) -> str:
+        params = self.params if len(self.params) <= limit else f"{self.params[:limit]}..."
+        return f"{self.command} {params}"
+
+
+@dataclass
+class CommandRecording:
+    """Запись трафика WebDriver одного драйвера"""
+    session: Dict[str, Any] = field(default_factory=dict)
+    commands: List[RecordedCommand] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def recorded_duration(self) -> float:
+        """Суммарное время команд при записи"""
+        return sum(command.duration for command in self.commands)
+
+    def save(self, path) -> Path:
+        """
+        Сохраняет запись в сжатый gzip JSON
+
+        Одинаковые параметры и ответы (например, опросы readyState или атомы get_attribute)
+        хранятся один раз в таблице values, команды ссылаются на них по индексу.
+        """
+        values, positions = [], {}
+
+        def ref(serialized):
+            if serialized not in positions:
+                positions[serialized] = len(values)
+                values.append(json.loads(serialized))
+            return positions[serialized]
+
+        data = {
+            "format": RECORDING_FORMAT,
+            "version": RECORDING_VERSION,
+            "metadata": self.metadata,
+            "session": self.session,
+            "commands": [[command.command, ref(command.params), ref(command.response), round(command.duration, 4)]
+                         for command in self.commands],
+            "values": values,
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=9) as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"), default=str)
+        return path
+
+    @classmethod
+    def load(cls, path) -> "CommandRecording":
+        """Загружает запись, сохраненную save()"""
+        with open(path, "rb") as f:
+            raw = f.read()
+        if raw[:2] == b"\x1f\x8b":
+            raw = gzip.decompress(raw)
+        data = json.loads(raw.decode("utf-8"))
+        if data.get("format") != RECORDING_FORMAT or data.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Неподдерживаемый формат записи команд: {path}")
+
+        values = [_canonical(value) for value in data["values"]]
+        commands = [RecordedCommand(command, values[params], values[response], duration)
+                    for command, params, response, duration in data["commands"]]
+        return cls(session=data["session"], commands=commands, metadata=data.get("metadata", {}))
+
+
+class CommandRecorder:
+    """
+    Записывает все команды WebDriver драйвера и ответы на них
+
+    Оборачивает command_executor.execute так же, как подсчет команд (instrument_driver),
+    и восстанавливает исходный метод при остановке.
+    """
+
+    def __init__(self, driver, **metadata):
+        self.driver = driver
+        self.recording = CommandRecording(metadata=metadata)
+        self._original_execute = None
+        self._lock = threading.Lock()
+
+    def start(self) -> "CommandRecorder":
+        if self._original_execute is not None:
+            return self
+        executor = self.driver.command_executor
+        self._original_execute = executor.execute
+        self.recording.session = {"sessionId": getattr(self.driver, "session_id", None),
+                                  "capabilities": getattr(self.driver, "caps", None) or getattr(self.driver, "capabilities", {})}
+        self.recording.metadata.setdefault("created", datetime.now().isoformat(timespec="seconds"))
+        original_execute = self._original_execute
+
+        def execute(command, params=None):
+            serialized_params = _canonical(params)
+            start_time = time.perf_counter()
+            try:
+                response = original_execute(command, params)
+            except Exception as e:
+                self._add(command, serialized_params, {"__error__": {"type": type(e).__name__, "message": str(e)}},
+                          time.perf_counter() - start_time)
+                raise
+            self._add(command, serialized_params, response, time.perf_counter() - start_time)
+            return response
+
+        executor.execute = execute
+        return self
+
+    def _add(self, command, params, response, duration):
+        with self._lock:
+            self.recording.commands.append(RecordedCommand(command, params, _canonical(response), duration))
+
+    def stop(self) -> CommandRecording:
+        if self._original_execute is not None:
+            self.driver.command_executor.execute = self._original_execute
+            self._original_execute = None
+        return self.recording
+
+    def save(self, path) -> Path:
+        path = self.recording.save(path)
+        logging.info(f"Запись команд WebDriver сохранена: {path} ({len(self.recording.commands)} команд)")
+        return path
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        return False
+
+
+def record_commands(driver, **metadata) -> CommandRecorder:
+    """Создает запись команд драйвера для использования в блоке with"""
+    return CommandRecorder(driver, **metadata)
+
+
+class ReplayDivergenceError(WebDriverException):
+    """Команда при воспроизведении не совпала с записью"""
+
+
+@dataclass
+class Divergence:
+    """Расхождение последовательности команд с записью"""
+    position: int
+    expected: Optional[str]
+    actual: str
+
+    def __str__(self):
+        return (f"команда #{self.position}: ожидалась {self.expected or '<конец записи>'}, "
+                f"получена {self.actual}")
+
+
+class ReplayCommandExecutor:
+    """
+    Исполнитель команд, отвечающий записанными ответами без браузера и сети
+
+    Каждая команда сверяется со следующей командой записи. Опросы (POLLING_COMMANDS)
+    после последней команды, меняющей состояние, можно повторять в любом количестве:
+    лишний опрос получает последний записанный ответ, а лишние записанные опросы пропускаются. При расхождении в строгом
+    режиме выбрасывается ReplayDivergenceError, в мягком - ищется ближайшая
+    совпадающая команда впереди (lookahead), а расхождение только запоминается.
+    """
+
+    def __init__(self, recording: CommandRecording, strict=True, lookahead=50):
+        self.recording = recording
+        self.strict = strict
+        self.lookahead = lookahead
+        self.position = 0
+        self.repeated = 0
+        self.divergences: List[Divergence] = []
+        # Опросы, выполненные после последней команды, меняющей состояние
+        self._polled: Dict[tuple, RecordedCommand] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        """Количество невоспроизведенных команд записи (без хвоста повторов последних опросов)"""
+        position = self._skip_repeats(self.position)
+        return len(self.recording.commands) - position
+
+    def _skip_repeats(self, position) -> int:
+        commands = self.recording.commands
+        while position < len(commands) and commands[position].key in self._polled:
+            position += 1
+        return position
+
+    def _serve(self, entry: RecordedCommand, position: int):
+        self.position = position + 1
+        if entry.command in POLLING_COMMANDS:
+            self._polled[entry.key] = entry
+        else:
+            self._polled.clear()
+        return self._response(entry)
+
+    @staticmethod
+    def _response(entry: RecordedCommand):
+        # Новый объект на каждый вызов: WebDriver.execute изменяет ответ на месте
+        response = json.loads(entry.response)
+        if isinstance(response, dict) and "__error__" in response:
+            error = response["__error__"]
+            raise WebDriverException(f"{error['type']}: {error['message']}")
+        return response
+
+    def execute(self, command, params=None):
+        if command == Command.NEW_SESSION:
+            return {"value": self.recording.session}
+
+        key = (command, _canonical(params))
+        commands = self.recording.commands
+        with self._lock:
+            if self.position < len(commands) and commands[self.position].key == key:
+                return self._serve(commands[self.position], self.position)
+
+            skipped = self._skip_repeats(self.position)
+            if skipped < len(commands) and commands[skipped].key == key:
+                return self._serve(commands[skipped], skipped)
+
+            if key in self._polled:
+                self.repeated += 1
+                return self._response(self._polled[key])
+
+            if command in SESSION_END_COMMANDS and skipped >= len(commands):
+                return {"value": None}
+
+            expected = commands[self.position].describe() if self.position < len(commands) else None
+            divergence = Divergence(self.position, expected, RecordedCommand(command, key[1], "").describe())
+            self.divergences.append(divergence)
+            logging.error(f"Расхождение с записью команд WebDriver: {divergence}")
+
+            if not self.strict:
+                window = commands[self.position:self.position + self.lookahead]
+                for offset, entry in enumerate(window):
+                    if entry.key == key:
+                        return self._serve(entry, self.position + offset)
+            raise ReplayDivergenceError(f"Расхождение с записью: {divergence}")
+
+    def close(self):
+        pass
+
+
+class ReplayDriver(RemoteWebDriver):
+    """
+    WebDriver, воспроизводящий записанный трафик без браузера и сети
+
+    Это обычный удаленный WebDriver Selenium, поэтому элементы, ошибки и ожидания
+    работают так же, как при записи, а команды выполняются мгновенно.
+    """
+
+    def __init__(self, recording: Union[CommandRecording, str, Path], strict=True, lookahead=50):
+        """
+        Args:
+            recording: Запись или путь к файлу записи
+            strict: Выбрасывать ReplayDivergenceError при первом расхождении
+            lookahead: Глубина поиска совпадающей команды в мягком режиме
+        """
+        if not isinstance(recording, CommandRecording):
+            recording = CommandRecording.load(recording)
+        self.recording = recording
+        self.replay_started = time.perf_counter()
+        super().__init__(command_executor=ReplayCommandExecutor(recording, strict, lookahead), options=ArgOptions())
+
+    @property
+    def divergences(self) -> List[Divergence]:
+        return self.command_executor.divergences
+
+    def check_replay(self):
+        """Выбрасывает ReplayDivergenceError, если были расхождения или часть записи не воспроизведена"""
+        problems = [str(divergence) for divergence in self.divergences]
+        remaining = self.command_executor.remaining
+        if remaining:
+            next_command = self.recording.commands[len(self.recording.commands) - remaining]
+            problems.append(f"не воспроизведено {remaining} команд записи, начиная с {next_command.describe()}")
+        if problems:
+            raise ReplayDivergenceError("Воспроизведение разошлось с записью: " + "; ".join(problems))
+
+    def replay_summary(self) -> str:
+        """Краткая сводка воспроизведения для логов"""
+        executor = self.command_executor
+        return (f"воспроизведено {executor.position} из {len(self.recording.commands)} команд "
+                f"за {time.perf_counter() - self.replay_started:.2f}с "
+                f"(при записи {self.recording.recorded_duration:.2f}с), повторов опросов: {executor.repeated}, "
+                f"расхождений: {len(self.divergences)}")
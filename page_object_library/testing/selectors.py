@@ -0,0 +1,293 @@
+import functools
+import re
+from typing import Callable, List, Optional, Tuple
+
+from selenium.common.exceptions import InvalidSelectorException
+from selenium.webdriver.common.by import By
+
+from page_object_library.testing.dom import FakeNode
+from page_object_library.testing.xpath import find_by_xpath
+
+_IDENT = r"-?[_a-zA-Z\u00a0-\uffff][_a-zA-Z0-9\u00a0-\uffff-]*"
+_STRING = r"\"(?:[^\"\\]|\\.)*\"|'(?:[^'\\]|\\.)*'"
+
+_TAG = re.compile(rf"\*|{_IDENT}")
+_ID = re.compile(rf"#({_IDENT})")
+_CLASS = re.compile(rf"\.({_IDENT})")
+_ATTRIBUTE = re.compile(rf"\[\s*({_IDENT})\s*(?:([~|^$*]?=)\s*({_STRING}|{_IDENT}|-?\d+)\s*)?(i\s*)?\]")
+_PSEUDO = re.compile(rf":({_IDENT})(?:\(\s*([^)]*?)\s*\))?")
+_COMBINATOR = re.compile(r"\s*([>+~])\s*|\s+")
+
+_ATTRIBUTE_OPERATORS = {
+    "=": lambda actual, expected: actual == expected,
+    "~=": lambda actual, expected: expected in actual.split(),
+    "|=": lambda actual, expected: actual == expected or actual.startswith(expected + "-"),
+    "^=": lambda actual, expected: bool(expected) and actual.startswith(expected),
+    "$=": lambda actual, expected: bool(expected) and actual.endswith(expected),
+    "*=": lambda actual, expected: bool(expected) and expected in actual,
+}
+
+
+def _unquote(value: str) -> str:
+    if value and value[0] in "\"'":
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+def _element_index(node: FakeNode, from_end=False) -> int:
+    siblings = node.parent.children if node.parent is not None else [node]
+    index = siblings.index(node)
+    return len(siblings) - index if from_end else index + 1
+
+
+def _nth_matcher(argument: str) -> Callable[[int], bool]:
+    """Разбирает аргумент :nth-child (число, odd, even, an+b)"""
+    argument = argument.replace(" ", "").lower()
+    if argument == "odd":
+        argument = "2n+1"
+    elif argument == "even":
+        argument = "2n"
+    if argument.lstrip("+-").isdigit():
+        position = int(argument)
+        return lambda index: index == position
+    match = re.fullmatch(r"([+-]?\d*)n([+-]\d+)?", argument)
+    if not match:
+        raise InvalidSelectorException(f"Неподдерживаемый аргумент :nth-child({argument})")
+    step = match.group(1)
+    a = -1 if step == "-" else int(step) if step not in ("", "+") else 1
+    b = int(match.group(2) or 0)
+    if a == 0:
+        return lambda index: index == b
+    return lambda index: (index - b) % a == 0 and (index - b) // a >= 0
+
+
+class _Compound:
+    """Составной простой селектор: tag#id.class[attr]:pseudo"""
+    __slots__ = ("tag", "checks", "index_key")
+
+    def __init__(self, tag: Optional[str], checks: List[Callable[[FakeNode], bool]], index_key=None):
+        self.tag = tag
+        self.checks = checks
+        # Самый избирательный признак для поиска кандидатов по индексу: ("id"|"class"|"tag", значение)
+        self.index_key = index_key or (("tag", tag) if tag is not None else None)
+
+    def matches(self, node: FakeNode) -> bool:
+        if self.tag is not None and node.tag != self.tag:
+            return False
+        return all(check(node) for check in self.checks)
+
+
+def _pseudo_check(name: str, argument: Optional[str]) -> Callable[[FakeNode], bool]:
+    name = name.lower()
+    if name == "first-child":
+        return lambda node: _element_index(node) == 1
+    if name == "last-child":
+        return lambda node: _element_index(node, from_end=True) == 1
+    if name == "only-child":
+        return lambda node: _element_index(node) == 1 and _element_index(node, from_end=True) == 1
+    if name in ("nth-child", "nth-last-child") and argument is not None:
+        matcher = _nth_matcher(argument)
+        from_end = name == "nth-last-child"
+        return lambda node: matcher(_element_index(node, from_end))
+    if name == "checked":
+        return lambda node: "checked" in node.attributes or "selected" in node.attributes
+    if name == "disabled":
+        return lambda node: "disabled" in node.attributes
+    if name == "enabled":
+        return lambda node: "disabled" not in node.attributes
+    if name == "empty":
+        return lambda node: not node.content
+    if name == "not" and argument:
+        selector = _parse(argument)
+        return lambda node: not selector(node)
+    raise InvalidSelectorException(f"Неподдерживаемый псевдокласс :{name}")
+
+
+def _parse_compound(selector: str, position: int) -> Tuple[_Compound, int]:
+    tag = None
+    start = position
+    match = _TAG.match(selector, position)
+    if match:
+        tag = None if match.group(0) == "*" else match.group(0).lower()
+        position = match.end()
+
+    checks = []
+    index_key = None
+    while position < len(selector):
+        if match := _ID.match(selector, position):
+            value = match.group(1)
+            checks.append(lambda node, value=value: node.attributes.get("id") == value)
+            index_key = ("id", value)
+        elif match := _CLASS.match(selector, position):
+            value = match.group(1)
+            checks.append(lambda node, value=value: value in node.classes)
+            if index_key is None:
+                index_key = ("class", value)
+        elif match := _ATTRIBUTE.match(selector, position):
+            name, operator, raw_value, ignore_case = match.groups()
+            if operator is None:
+                checks.append(lambda node, name=name: name in node.attributes)
+            else:
+                compare = _ATTRIBUTE_OPERATORS[operator]
+                value = _unquote(raw_value)
+                if ignore_case:
+                    checks.append(lambda node, name=name, value=value.lower(), compare=compare:
+                                  name in node.attributes and compare(node.attributes[name].lower(), value))
+                else:
+                    checks.append(lambda node, name=name, value=value, compare=compare:
+                                  name in node.attributes and compare(node.attributes[name], value))
+        elif match := _PSEUDO.match(selector, position):
+            checks.append(_pseudo_check(match.group(1), match.group(2)))
+        else:
+            break
+        position = match.end()
+
+    if position == start:
+        raise InvalidSelectorException(f"Некорректный CSS-селектор: '{selector}' (позиция {position})")
+    return _Compound(tag, checks, index_key), position
+
+
+def _parse_complex(selector: str) -> List[Tuple[Optional[str], _Compound]]:
+    """Разбирает селектор без запятых в список (комбинатор перед частью, часть)"""
+    parts = []
+    combinator = None
+    position = 0
+    while True:
+        compound, position = _parse_compound(selector, position)
+        parts.append((combinator, compound))
+        if position >= len(selector):
+            return parts
+        match = _COMBINATOR.match(selector, position)
+        if not match or match.end() >= len(selector):
+            raise InvalidSelectorException(f"Некорректный CSS-селектор: '{selector}' (позиция {position})")
+        combinator = match.group(1) or " "
+        position = match.end()
+
+
+def _matches_parts(node: FakeNode, parts, index: int) -> bool:
+    combinator, compound = parts[index]
+    if not compound.matches(node):
+        return False
+    if index == 0:
+        return True
+    if combinator == ">":
+        return node.parent is not None and _matches_parts(node.parent, parts, index - 1)
+    if combinator == " ":
+        return any(_matches_parts(ancestor, parts, index - 1) for ancestor in node.iter_ancestors())
+    siblings = node.previous_siblings()
+    if combinator == "+":
+        return bool(siblings) and _matches_parts(siblings[0], parts, index - 1)
+    return any(_matches_parts(sibling, parts, index - 1) for sibling in siblings)
+
+
+def _split_groups(selector: str) -> List[str]:
+    """Делит список селекторов по запятым вне скобок и кавычек"""
+    groups, depth, quote, start = [], 0, None, 0
+    for index, char in enumerate(selector):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            groups.append(selector[start:index])
+            start = index + 1
+    groups.append(selector[start:])
+    return [group.strip() for group in groups]
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_groups(selector: str) -> List[List[Tuple[Optional[str], _Compound]]]:
+    groups = _split_groups(selector)
+    if not all(groups):
+        raise InvalidSelectorException(f"Некорректный CSS-селектор: '{selector}'")
+    return [_parse_complex(group) for group in groups]
+
+
+@functools.lru_cache(maxsize=512)
+def _parse(selector: str) -> Callable[[FakeNode], bool]:
+    compiled = _parse_groups(selector)
+    return lambda node: any(_matches_parts(node, parts, len(parts) - 1) for parts in compiled)
+
+
+def compile_css(selector: str) -> Callable[[FakeNode], bool]:
+    """
+    Компилирует CSS-селектор в предикат узла
+
+    Поддерживаются: тег, *, #id, .class, [attr], [attr=v] (~= |= ^= $= *=, флаг i),
+    комбинаторы (пробел, >, +, ~), списки через запятую и псевдоклассы :first-child,
+    :last-child, :only-child, :nth-child(), :nth-last-child(), :checked, :disabled,
+    :enabled, :empty, :not().
+    """
+    return _parse(selector.strip())
+
+
+def css_index_keys(selector: str) -> Optional[List[Tuple[str, str]]]:
+    """
+    Ключи индекса, покрывающие все узлы, подходящие под селектор
+
+    Для каждой группы селектора берется признак последней составной части (id, класс
+    или тег). Если хотя бы у одной группы такого признака нет, возвращается None.
+    """
+    keys = []
+    for parts in _parse_groups(selector.strip()):
+        key = parts[-1][1].index_key
+        if key is None:
+            return None
+        keys.append(key)
+    return keys
+
+
+def index_keys(by: str, value: str) -> Optional[List[Tuple[str, str]]]:
+    """Ключи индекса для стратегии поиска Selenium или None, если индекс не сужает поиск"""
+    if by == By.ID:
+        return [("id", value)]
+    if by == By.NAME:
+        return [("name", value)]
+    if by == By.CLASS_NAME:
+        return [("class", value.strip())]
+    if by == By.TAG_NAME:
+        return [("tag", value.lower())]
+    if by == By.CSS_SELECTOR:
+        return css_index_keys(value)
+    if by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        return [("tag", "a")]
+    return None
+
+
+def _link_text(node: FakeNode) -> str:
+    return node.visible_text().strip()
+
+
+def build_matcher(by: str, value: str) -> Callable[[FakeNode], bool]:
+    """Возвращает предикат узла для стратегии поиска Selenium"""
+    if by == By.ID:
+        return lambda node: node.attributes.get("id") == value
+    if by == By.NAME:
+        return lambda node: node.attributes.get("name") == value
+    if by == By.CLASS_NAME:
+        if not value or " " in value.strip():
+            raise InvalidSelectorException(f"Составные имена классов не поддерживаются: '{value}'")
+        return lambda node: value in node.classes
+    if by == By.TAG_NAME:
+        tag = value.lower()
+        return lambda node: node.tag == tag
+    if by == By.CSS_SELECTOR:
+        return compile_css(value)
+    if by == By.LINK_TEXT:
+        return lambda node: node.tag == "a" and _link_text(node) == value
+    if by == By.PARTIAL_LINK_TEXT:
+        return lambda node: node.tag == "a" and value in _link_text(node)
+    raise InvalidSelectorException(f"Стратегия поиска '{by}' не поддерживается FakeDriver")
+
+
+def find_all(root: FakeNode, by: str, value: str) -> List[FakeNode]:
+    """Находит потомков узла, подходящих под локатор, в порядке документа"""
+    if by == By.XPATH:
+        return find_by_xpath(root, value)
+    matcher = build_matcher(by, value)
+    return [node for node in root.iter_descendants() if matcher(node)]
@@ -0,0 +1,160 @@
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+from page_object_library.testing.dom import FakeNode
+from page_object_library.testing.fake_driver import FakeDriver, PageSource
+from page_object_library.testing.html_parser import parse_html
+from page_object_library.testing.selectors import build_matcher, find_all, index_keys
+from page_object_library.testing.xpath import find_by_xpath
+
+
+class DocumentIndex:
+    """
+    Индекс неизменяемого документа: узлы по id, классу, имени и тегу
+
+    Поиск берет кандидатов из индекса и проверяет только их, вместо обхода всего дерева.
+    Интервалы обхода (позиция узла и последнего потомка) позволяют за O(1) проверить,
+    лежит ли кандидат внутри элемента, от которого идет поиск.
+    """
+
+    def __init__(self, root: FakeNode):
+        self.root = root
+        self.maps: Dict[str, Dict[str, List[FakeNode]]] = {
+            "id": defaultdict(list), "class": defaultdict(list), "name": defaultdict(list), "tag": defaultdict(list),
+        }
+        self._spans: Dict[int, List[int]] = {}
+        self._build()
+
+    def _build(self):
+        position = 0
+        self._spans[id(self.root)] = [position, position]
+        stack = [(self.root, False)]
+        while stack:
+            node, visited = stack.pop()
+            if visited:
+                self._spans[id(node)][1] = position
+                continue
+            if node is not self.root:
+                position += 1
+                self._spans[id(node)] = [position, position]
+                self._add(node)
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(node.children))
+
+    def _add(self, node: FakeNode):
+        self.maps["tag"][node.tag].append(node)
+        if node.id:
+            self.maps["id"][node.id].append(node)
+        for class_name in node.classes:
+            self.maps["class"][class_name].append(node)
+        name = node.attributes.get("name")
+        if name:
+            self.maps["name"][name].append(node)
+
+    def position(self, node: FakeNode) -> int:
+        return self._spans[id(node)][0]
+
+    def contains(self, ancestor: FakeNode, node: FakeNode) -> bool:
+        """Является ли node потомком ancestor"""
+        start, end = self._spans[id(ancestor)]
+        return start < self._spans[id(node)][0] <= end
+
+    def candidates(self, by: str, value: str) -> Optional[List[FakeNode]]:
+        """Кандидаты для локатора в порядке документа или None, если индекс не сужает поиск"""
+        keys = index_keys(by, value)
+        if keys is None:
+            return None
+        if len(keys) == 1:
+            kind, key = keys[0]
+            return self.maps[kind].get(key, [])
+        unique = {}
+        for kind, key in keys:
+            for node in self.maps[kind].get(key, ()):
+                unique[id(node)] = node
+        return sorted(unique.values(), key=self.position)
+
+    def find(self, root: FakeNode, by: str, value: str) -> List[FakeNode]:
+        """Находит потомков root, подходящих под локатор"""
+        if by == By.XPATH:
+            return find_by_xpath(root, value)
+        candidates = self.candidates(by, value)
+        if candidates is None:
+            return find_all(root, by, value)
+        matcher = build_matcher(by, value)
+        if root is self.root:
+            return [node for node in candidates if matcher(node)]
+        return [node for node in candidates if self.contains(root, node) and matcher(node)]
+
+
+class HtmlSnapshot:
+    """Сохраненная HTML-страница, разобранная один раз в индексированное дерево"""
+
+    def __init__(self, source: str, name: str = None):
+        self.name = name
+        self.document = parse_html(source)
+        self.index = DocumentIndex(self.document)
+
+    @classmethod
+    def from_file(cls, path, encoding="utf-8") -> "HtmlSnapshot":
+        path = Path(path)
+        return cls(path.read_text(encoding=encoding), name=path.name)
+
+    def __repr__(self):
+        return f"HtmlSnapshot({self.name or 'html'})"
+
+
+SnapshotSource = Union[HtmlSnapshot, Path, str]
+
+
+class SnapshotDriver(FakeDriver):
+    """
+    Драйвер, отвечающий на запросы page objects по сохраненным HTML-страницам
+
+    Каждый снимок разбирается один раз; все загрузки страницы используют общее дерево
+    и индекс, поэтому чтение текста и атрибутов не требует ни браузера, ни копирования DOM.
+    Переходы по ссылкам и отправка GET-форм работают между снимками, а действия,
+    меняющие DOM (ввод текста, чекбоксы), запрещены: снимок только для чтения.
+    """
+
+    def __init__(self, snapshots: Dict[str, SnapshotSource] = None, base_url="http://fake.test", fail_fast=True,
+                 pages: Dict[str, PageSource] = None):
+        """
+        Args:
+            snapshots: Снимки {URL или путь: HtmlSnapshot, путь к файлу (Path) или HTML-разметка}
+            base_url: Базовый URL для относительных путей
+            fail_fast: Сразу выбрасывать TimeoutException, если элемент не найден
+            pages: Дополнительные страницы FakeDriver
+        """
+        super().__init__(pages, base_url=base_url, fail_fast=fail_fast)
+        self._index: Optional[DocumentIndex] = None
+        for url, snapshot in (snapshots or {}).items():
+            self.add_snapshot(url, snapshot)
+
+    def add_snapshot(self, url: str, snapshot: SnapshotSource) -> HtmlSnapshot:
+        """Регистрирует снимок страницы; файл и разметка разбираются сразу"""
+        if isinstance(snapshot, Path):
+            snapshot = HtmlSnapshot.from_file(snapshot)
+        elif isinstance(snapshot, str):
+            snapshot = HtmlSnapshot(snapshot, name=url)
+        self.add_page(url, snapshot)
+        return snapshot
+
+    def _build_document(self, page, url) -> FakeNode:
+        if isinstance(page, HtmlSnapshot):
+            self._index = page.index
+            return page.document
+        self._index = None
+        return super()._build_document(page, url)
+
+    def _find_nodes(self, root: FakeNode, by: str, value: str) -> List[FakeNode]:
+        if self._index is None:
+            return super()._find_nodes(root, by, value)
+        return self._index.find(root, by, value)
+
+    def _check_writable(self):
+        if self._index is not None:
+            raise WebDriverException("Снимок HTML доступен только для чтения")
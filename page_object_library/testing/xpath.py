@@ -0,0 +1,503 @@
+import functools
+import math
+import re
+from typing import Callable, List
+
+from selenium.common.exceptions import InvalidSelectorException
+
+from page_object_library.testing.dom import FakeNode
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<string>"[^"]*"|'[^']*')
+      | (?P<number>\d+(?:\.\d*)?|\.\d+)
+      | (?P<operator>//|/|::|\.\.|\.|\(|\)|\[|\]|@|,|\||!=|<=|>=|=|<|>|\*|\+|-)
+      | (?P<name>[A-Za-z_][\w.-]*)
+    )""", re.VERBOSE)
+
+NODE_TYPES = {"node", "text"}
+REVERSE_AXES = {"parent", "ancestor", "ancestor-or-self", "preceding-sibling"}
+
+
+class _Text:
+    """Текстовый узел результата XPath"""
+    __slots__ = ("value", "parent")
+
+    def __init__(self, value, parent):
+        self.value = value
+        self.parent = parent
+
+
+class _Attribute:
+    """Атрибут как узел результата XPath"""
+    __slots__ = ("name", "value", "parent")
+
+    def __init__(self, name, value, parent):
+        self.name = name
+        self.value = value
+        self.parent = parent
+
+
+class _Context:
+    __slots__ = ("item", "position", "size")
+
+    def __init__(self, item, position=1, size=1):
+        self.item = item
+        self.position = position
+        self.size = size
+
+
+# Преобразования типов XPath 1.0
+
+def _string_value(item) -> str:
+    if isinstance(item, FakeNode):
+        return item.text_content()
+    return item.value
+
+
+def to_string(value) -> str:
+    if isinstance(value, list):
+        return _string_value(value[0]) if value else ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        return str(int(value)) if value.is_integer() else str(value)
+    return value
+
+
+def to_number(value) -> float:
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, float):
+        return value
+    try:
+        return float(to_string(value).strip())
+    except ValueError:
+        return math.nan
+
+
+def to_boolean(value) -> bool:
+    if isinstance(value, float):
+        return value != 0 and not math.isnan(value)
+    return bool(value)
+
+
+def _compare_atomic(operator, left, right) -> bool:
+    if operator in ("=", "!="):
+        if isinstance(left, bool) or isinstance(right, bool):
+            equal = to_boolean(left) == to_boolean(right)
+        elif isinstance(left, float) or isinstance(right, float):
+            equal = to_number(left) == to_number(right)
+        else:
+            equal = to_string(left) == to_string(right)
+        return equal if operator == "=" else not equal
+    left, right = to_number(left), to_number(right)
+    return {"<": left < right, ">": left > right, "<=": left <= right, ">=": left >= right}[operator]
+
+
+def _compare(operator, left, right) -> bool:
+    if isinstance(left, list) and isinstance(right, bool) or isinstance(right, list) and isinstance(left, bool):
+        return _compare_atomic(operator, to_boolean(left), to_boolean(right))
+    if isinstance(left, list):
+        return any(_compare(operator, _string_value(item), right) for item in left)
+    if isinstance(right, list):
+        return any(_compare(operator, left, _string_value(item)) for item in right)
+    return _compare_atomic(operator, left, right)
+
+
+# Оси
+
+def _content_items(node: FakeNode):
+    return [item if isinstance(item, FakeNode) else _Text(item, node) for item in node.content]
+
+
+def _descendants(node: FakeNode):
+    for item in _content_items(node):
+        yield item
+        if isinstance(item, FakeNode):
+            yield from _descendants(item)
+
+
+def _parent(item):
+    return item.parent
+
+
+def _siblings(item, following: bool):
+    parent = _parent(item)
+    if parent is None or isinstance(item, _Attribute):
+        return []
+    items = parent.content
+    index = next(i for i, candidate in enumerate(items)
+                 if candidate is item or isinstance(item, _Text) and candidate is item.value)
+    selected = items[index + 1:] if following else list(reversed(items[:index]))
+    return [candidate if isinstance(candidate, FakeNode) else _Text(candidate, parent) for candidate in selected]
+
+
+def _axis_items(axis, item):
+    if axis == "child":
+        return _content_items(item) if isinstance(item, FakeNode) else []
+    if axis == "descendant":
+        return list(_descendants(item)) if isinstance(item, FakeNode) else []
+    if axis == "descendant-or-self":
+        return [item] + (list(_descendants(item)) if isinstance(item, FakeNode) else [])
+    if axis == "self":
+        return [item]
+    if axis == "parent":
+        parent = _parent(item)
+        return [parent] if parent is not None else []
+    if axis in ("ancestor", "ancestor-or-self"):
+        result = [item] if axis == "ancestor-or-self" else []
+        parent = _parent(item)
+        while parent is not None:
+            result.append(parent)
+            parent = parent.parent
+        return result
+    if axis == "following-sibling":
+        return _siblings(item, following=True)
+    if axis == "preceding-sibling":
+        return _siblings(item, following=False)
+    if axis == "attribute":
+        if not isinstance(item, FakeNode):
+            return []
+        return [_Attribute(name, value, item) for name, value in item.attributes.items()]
+    raise InvalidSelectorException(f"Ось XPath '{axis}' не поддерживается")
+
+
+def _node_test(axis, test) -> Callable[[object], bool]:
+    if test == "node()":
+        return lambda item: True
+    if test == "text()":
+        return lambda item: isinstance(item, _Text)
+    principal = _Attribute if axis == "attribute" else FakeNode
+    if test == "*":
+        return lambda item: isinstance(item, principal) and getattr(item, "tag", None) != "#document"
+    name = test.lower()
+    if principal is _Attribute:
+        return lambda item: isinstance(item, _Attribute) and item.name == name
+    return lambda item: isinstance(item, FakeNode) and item.tag == name
+
+
+def _document_order(items: List) -> List:
+    """Удаляет повторы элементов и сортирует их в порядке документа"""
+    nodes = [item for item in items if isinstance(item, FakeNode)]
+    if len(nodes) != len(items):
+        return items
+    unique = list({id(node): node for node in nodes}.values())
+    if len(unique) < 2:
+        return unique
+    root = unique[0].root
+    order = {id(root): 0}
+    for position, node in enumerate(root.iter_descendants(), 1):
+        order[id(node)] = position
+    return sorted(unique, key=lambda node: order.get(id(node), -1))
+
+
+def _apply_predicates(items, predicates):
+    for predicate in predicates:
+        size = len(items)
+        selected = []
+        for position, item in enumerate(items, 1):
+            result = predicate(_Context(item, position, size))
+            if isinstance(result, float):
+                if result == position:
+                    selected.append(item)
+            elif to_boolean(result):
+                selected.append(item)
+        items = selected
+    return items
+
+
+# Функции
+
+def _optional_string(context, args):
+    return to_string(args[0]) if args else _string_value(context.item)
+
+
+def _normalize_space(context, args):
+    return " ".join(_optional_string(context, args).split())
+
+
+def _translate(context, args):
+    source, replaced, replacement = (to_string(arg) for arg in args)
+    table = {}
+    for index, char in enumerate(replaced):
+        table.setdefault(ord(char), replacement[index] if index < len(replacement) else None)
+    return source.translate(table)
+
+
+def _substring(context, args):
+    text = to_string(args[0])
+    start = round(to_number(args[1]))
+    if len(args) > 2:
+        end = start + round(to_number(args[2]))
+        return text[max(start - 1, 0):max(end - 1, 0)]
+    return text[max(start - 1, 0):]
+
+
+FUNCTIONS = {
+    "last": lambda context, args: float(context.size),
+    "position": lambda context, args: float(context.position),
+    "count": lambda context, args: float(len(args[0])),
+    "string": lambda context, args: _optional_string(context, args),
+    "concat": lambda context, args: "".join(to_string(arg) for arg in args),
+    "contains": lambda context, args: to_string(args[1]) in to_string(args[0]),
+    "starts-with": lambda context, args: to_string(args[0]).startswith(to_string(args[1])),
+    "ends-with": lambda context, args: to_string(args[0]).endswith(to_string(args[1])),
+    "normalize-space": _normalize_space,
+    "translate": _translate,
+    "substring": _substring,
+    "string-length": lambda context, args: float(len(_optional_string(context, args))),
+    "not": lambda context, args: not to_boolean(args[0]),
+    "true": lambda context, args: True,
+    "false": lambda context, args: False,
+    "boolean": lambda context, args: to_boolean(args[0]),
+    "number": lambda context, args: to_number(args[0] if args else [context.item]),
+    "name": lambda context, args: _item_name(args[0][0] if args and args[0] else context.item),
+    "local-name": lambda context, args: _item_name(args[0][0] if args and args[0] else context.item),
+}
+
+
+def _item_name(item) -> str:
+    if isinstance(item, FakeNode):
+        return "" if item.tag == "#document" else item.tag
+    return getattr(item, "name", "")
+
+
+# Разбор выражений
+
+class _Parser:
+    """Рекурсивный разбор подмножества XPath 1.0 в дерево функций context -> значение"""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = self._tokenize(expression)
+        self.position = 0
+
+    def _tokenize(self, expression):
+        tokens, position = [], 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = _TOKEN.match(expression, position)
+            if not match or match.end() == position:
+                self._error(f"неожиданный символ в позиции {position}")
+            kind = match.lastgroup
+            tokens.append((kind, match.group(kind)))
+            position = match.end()
+        return tokens
+
+    def _error(self, message):
+        raise InvalidSelectorException(f"Некорректный XPath '{self.expression}': {message}")
+
+    def peek(self, offset=0):
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def accept(self, value) -> bool:
+        if self.peek()[1] == value and self.peek()[0] in ("operator", "name"):
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, value):
+        if not self.accept(value):
+            self._error(f"ожидалось '{value}', получено '{self.peek()[1]}'")
+
+    def parse(self):
+        expression = self.parse_or()
+        if self.position != len(self.tokens):
+            self._error(f"лишний фрагмент '{self.peek()[1]}'")
+        return expression
+
+    def _binary(self, parse_operand, operators, combine):
+        left = parse_operand()
+        while self.peek()[1] in operators and self.peek()[0] in ("operator", "name"):
+            operator = self.take()[1]
+            right = parse_operand()
+            left = combine(operator, left, right)
+        return left
+
+    def parse_or(self):
+        return self._binary(self.parse_and, ("or",),
+                            lambda op, left, right: lambda c: to_boolean(left(c)) or to_boolean(right(c)))
+
+    def parse_and(self):
+        return self._binary(self.parse_equality, ("and",),
+                            lambda op, left, right: lambda c: to_boolean(left(c)) and to_boolean(right(c)))
+
+    def parse_equality(self):
+        return self._binary(self.parse_relational, ("=", "!="),
+                            lambda op, left, right: lambda c: _compare(op, left(c), right(c)))
+
+    def parse_relational(self):
+        return self._binary(self.parse_additive, ("<", ">", "<=", ">="),
+                            lambda op, left, right: lambda c: _compare(op, left(c), right(c)))
+
+    def parse_additive(self):
+        def combine(op, left, right):
+            if op == "+":
+                return lambda c: to_number(left(c)) + to_number(right(c))
+            return lambda c: to_number(left(c)) - to_number(right(c))
+        return self._binary(self.parse_unary, ("+", "-"), combine)
+
+    def parse_unary(self):
+        if self.accept("-"):
+            operand = self.parse_unary()
+            return lambda c: -to_number(operand(c))
+        return self.parse_union()
+
+    def parse_union(self):
+        return self._binary(self.parse_path, ("|",),
+                            lambda op, left, right: lambda c: _document_order(left(c) + right(c)))
+
+    def _starts_primary(self) -> bool:
+        kind, value = self.peek()
+        if kind in ("string", "number") or value == "(" and kind == "operator":
+            return True
+        return kind == "name" and self.peek(1)[1] == "(" and value not in NODE_TYPES
+
+    def parse_path(self):
+        kind, value = self.peek()
+        if self._starts_primary():
+            primary = self.parse_primary()
+            predicates = self.parse_predicates()
+            if predicates:
+                base = primary
+                primary = lambda c: _apply_predicates(_document_order(base(c)), predicates)
+            if self.peek()[1] in ("/", "//"):
+                steps = self.parse_relative_path(leading=self.take()[1])
+                return lambda c: self._evaluate_steps(primary(c), steps)
+            return primary
+
+        if kind == "operator" and value in ("/", "//"):
+            self.take()
+            if value == "/" and not self._starts_step():
+                return lambda c: [c.item.root if isinstance(c.item, FakeNode) else c.item.parent.root]
+            steps = self.parse_relative_path(leading=value)
+            return lambda c: self._evaluate_steps([_root(c.item)], steps)
+
+        steps = self.parse_relative_path()
+        return lambda c: self._evaluate_steps([c.item], steps)
+
+    def _starts_step(self) -> bool:
+        kind, value = self.peek()
+        return kind == "name" or value in (".", "..", "@", "*")
+
+    def parse_relative_path(self, leading=None):
+        steps = []
+        if leading == "//":
+            steps.append(("descendant-or-self", "node()", []))
+        steps.append(self.parse_step())
+        while self.peek()[1] in ("/", "//") and self.peek()[0] == "operator":
+            if self.take()[1] == "//":
+                steps.append(("descendant-or-self", "node()", []))
+            steps.append(self.parse_step())
+        return steps
+
+    def parse_step(self):
+        if self.accept("."):
+            return "self", "node()", []
+        if self.accept(".."):
+            return "parent", "node()", []
+
+        axis = "child"
+        if self.accept("@"):
+            axis = "attribute"
+        elif self.peek()[0] == "name" and self.peek(1)[1] == "::":
+            axis = self.take()[1]
+            self.take()
+
+        kind, value = self.take()
+        if value == "*" and kind == "operator":
+            test = "*"
+        elif kind == "name":
+            if value in NODE_TYPES and self.peek()[1] == "(":
+                self.expect("(")
+                self.expect(")")
+                test = f"{value}()"
+            else:
+                test = value
+        else:
+            self._error(f"ожидался шаг пути, получено '{value}'")
+        return axis, test, self.parse_predicates()
+
+    def parse_predicates(self):
+        predicates = []
+        while self.accept("["):
+            predicates.append(self.parse_or())
+            self.expect("]")
+        return predicates
+
+    def parse_primary(self):
+        kind, value = self.take()
+        if kind == "string":
+            text = value[1:-1]
+            return lambda c: text
+        if kind == "number":
+            number = float(value)
+            return lambda c: number
+        if value == "(":
+            expression = self.parse_or()
+            self.expect(")")
+            return expression
+
+        function = FUNCTIONS.get(value)
+        if function is None:
+            self._error(f"функция '{value}' не поддерживается")
+        self.expect("(")
+        args = []
+        if not self.accept(")"):
+            args.append(self.parse_or())
+            while self.accept(","):
+                args.append(self.parse_or())
+            self.expect(")")
+        return lambda c: function(c, [arg(c) for arg in args])
+
+    @staticmethod
+    def _evaluate_steps(items, steps):
+        if not isinstance(items, list):
+            raise InvalidSelectorException("Путь XPath применен не к набору узлов")
+        for axis, test, predicates in steps:
+            matches_test = _node_test(axis, test)
+            result = []
+            for item in items:
+                selected = [candidate for candidate in _axis_items(axis, item) if matches_test(candidate)]
+                result.extend(_apply_predicates(selected, predicates))
+            items = _document_order(result) if len(items) > 1 or axis in REVERSE_AXES else result
+        return items
+
+
+def _root(item):
+    return item.root if isinstance(item, FakeNode) else item.parent.root
+
+
+@functools.lru_cache(maxsize=512)
+def compile_xpath(expression: str) -> Callable[[_Context], object]:
+    """Компилирует выражение XPath 1.0 (подмножество) в функцию контекста"""
+    return _Parser(expression).parse()
+
+
+def evaluate_xpath(expression: str, node: FakeNode):
+    """Вычисляет выражение XPath относительно узла: набор узлов, строку, число или булево значение"""
+    return compile_xpath(expression)(_Context(node))
+
+
+def find_by_xpath(node: FakeNode, expression: str) -> List[FakeNode]:
+    """
+    Находит элементы по XPath, как find_elements(By.XPATH) в браузере
+
+    Поддерживаются оси (child, descendant, parent, ancestor, sibling, attribute, self),
+    сокращения (//, ., .., @, *), предикаты с позицией, операторы сравнения, and/or,
+    объединение | и функции contains, starts-with, normalize-space, text() и другие.
+    Результат, не являющийся набором элементов, приводит к InvalidSelectorException.
+    """
+    result = evaluate_xpath(expression, node)
+    if not isinstance(result, list) or not all(isinstance(item, FakeNode) for item in result):
+        raise InvalidSelectorException(f"Результат XPath '{expression}' не является набором элементов")
+    return [item for item in result if item.tag != "#document"]
@@ -1,2 +1,9 @@
-from .logger import setup_logger
-from .decorators import auto_log
+from .logger import setup_logger, RingBufferHandler, get_failure_buffer
+from .decorators import auto_log, no_auto_log, set_auto_log_enabled, is_auto_log_enabled
+from .decorators import add_action_listener, remove_action_listener
+from .context import ContextThreadPoolExecutor, bind_context, get_call_depth, get_call_stack
+from .diagnostics import SlowActionDetector, SlowActionEvent, slow_action_detector, configure_slow_actions
+from .artifacts import DriverArtifacts, DirectoryArtifactStore, ArtifactBundleStore, FailureArtifactCollector, FailureCapture
+from .timings import TimingDatabase, ActionTiming, lpt_schedule
+from .dependencies import DependencyGraph, add_usage_listener, remove_usage_listener, select_affected
+from .retry import RetryPolicy, RetryMetrics, retry, retry_metrics
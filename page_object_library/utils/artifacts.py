@@ -0,0 +1,402 @@
+import base64
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from page_object_library.utils.context import ContextThreadPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Можно ли перекодировать и уменьшать скриншоты
+PILLOW_AVAILABLE = Image is not None
+
+# Форматы, в которые ArtifactBundleStore перекодирует скриншоты (кроме png нужен Pillow)
+IMAGE_FORMATS = {"png": "PNG", "jpeg": "JPEG", "webp": "WEBP"}
+
+
+@dataclass
+class DriverArtifacts:
+    """Состояние одного драйвера в момент падения теста"""
+    driver_name: str
+    url: Optional[str] = None
+    screenshot_base64: Optional[str] = None
+    page_source: Optional[str] = None
+    console_log: Optional[List[Dict[str, Any]]] = None
+    errors: Dict[str, str] = field(default_factory=dict)
+    capture_time: float = 0.0
+
+    @property
+    def screenshot(self) -> Optional[bytes]:
+        """PNG-скриншот; декодируется при записи, а не в потоке теста"""
+        return base64.b64decode(self.screenshot_base64) if self.screenshot_base64 else None
+
+    def metadata(self) -> Dict[str, Any]:
+        return {"driver": self.driver_name, "url": self.url, "console_log": self.console_log,
+                "errors": self.errors, "capture_time": round(self.capture_time, 3)}
+
+
+def collect_driver_artifacts(driver, driver_name: str, deadline: float = None,
+                             artifacts: DriverArtifacts = None) -> DriverArtifacts:
+    """
+    Снимает URL, скриншот, исходный код страницы и лог консоли браузера
+
+    Ошибка одного шага не мешает остальным; шаги после deadline (time.monotonic) пропускаются.
+    """
+    artifacts = artifacts or DriverArtifacts(driver_name)
+    start_time = time.monotonic()
+    steps = [
+        ("url", lambda: driver.current_url),
+        ("screenshot_base64", driver.get_screenshot_as_base64),
+        ("page_source", lambda: driver.page_source),
+    ]
+    # Лог консоли отдают только браузеры на Chromium
+    if hasattr(driver, "get_log"):
+        steps.append(("console_log", lambda: driver.get_log("browser")))
+
+    for name, step in steps:
+        if deadline is not None and time.monotonic() >= deadline:
+            artifacts.errors[name] = "пропущено: истек лимит времени"
+            continue
+        try:
+            setattr(artifacts, name, step())
+        except Exception as e:
+            artifacts.errors[name] = f"{type(e).__name__}: {e}"
+    artifacts.capture_time = time.monotonic() - start_time
+    return artifacts
+
+
+def safe_file_name(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name).strip("_")
+
+
+class DirectoryArtifactStore:
+    """Записывает артефакты каждого драйвера в каталог: PNG, HTML и JSON с URL, логом консоли и ошибками"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def save(self, test_name: str, timestamp: str, artifacts: List[DriverArtifacts]) -> List[Path]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for item in artifacts:
+            base = self.directory / safe_file_name(f"{test_name}_{item.driver_name}_{timestamp}")
+
+            screenshot = item.screenshot
+            if screenshot is not None:
+                paths.append(base.with_name(base.name + ".png"))
+                paths[-1].write_bytes(screenshot)
+            if item.page_source is not None:
+                paths.append(base.with_name(base.name + ".html"))
+                paths[-1].write_text(item.page_source, encoding="utf-8")
+            paths.append(base.with_name(base.name + ".json"))
+            paths[-1].write_text(json.dumps(item.metadata(), ensure_ascii=False, indent=2, default=str),
+                                 encoding="utf-8")
+        return paths
+
+
+class ArtifactBundleStore:
+    """
+    Компактное хранилище артефактов падений с дедупликацией по содержимому
+
+    На каждый тест пишется один сжатый манифест bundles/<тест>_<время>.json.gz с метаданными
+    всех драйверов (URL, лог консоли, ошибки) и ссылками на объекты. Скриншоты (уменьшенные
+    и перекодированные в JPEG/WebP, если установлен Pillow) и сжатый gzip DOM хранятся
+    в objects/ под именем хеша содержимого, поэтому одинаковые падения параметризованных
+    тестов занимают место один раз.
+
+    При превышении max_bytes удаляются самые старые манифесты и объекты, на которые
+    больше никто не ссылается. Сохранения одного хранилища выполняются по очереди, поэтому
+    вытеснение не удалит объект, который параллельная запись решила переиспользовать;
+    каталог рассчитан на один процесс-писатель.
+    """
+
+    def __init__(self, directory, image_format="png", image_quality=75, max_image_width=None, max_bytes=None):
+        """
+        Args:
+            directory: Каталог хранилища
+            image_format: Формат скриншотов: png, jpeg или webp
+            image_quality: Качество JPEG/WebP (1-95)
+            max_image_width: Максимальная ширина скриншота в пикселях (None - без уменьшения)
+            max_bytes: Ограничение размера хранилища в байтах (None - без ограничения)
+        """
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Неподдерживаемый формат скриншотов: {image_format}")
+        if Image is None and (image_format != "png" or max_image_width):
+            logging.warning("Pillow не установлен: скриншоты сохраняются в PNG без уменьшения")
+            image_format, max_image_width = "png", None
+        self.directory = Path(directory)
+        self.image_format = image_format
+        self.image_quality = image_quality
+        self.max_image_width = max_image_width
+        self.max_bytes = max_bytes
+        self.objects_dir = self.directory / "objects"
+        self.bundles_dir = self.directory / "bundles"
+        self.stats = {"bundles": 0, "objects_written": 0, "objects_reused": 0, "evicted_bundles": 0}
+        self._lock = threading.RLock()
+
+    def save(self, test_name: str, timestamp: str, artifacts: List[DriverArtifacts]) -> List[Path]:
+        # Объекты, манифест и вытеснение - под одной блокировкой: иначе вытеснение в другом потоке
+        # записи удалит объект, который этот манифест переиспользует, до того как манифест записан
+        with self._lock:
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            self.bundles_dir.mkdir(parents=True, exist_ok=True)
+
+            drivers = []
+            for item in artifacts:
+                entry = item.metadata()
+                screenshot = item.screenshot
+                if screenshot is not None:
+                    entry["screenshot"] = self._put_screenshot(screenshot)
+                if item.page_source is not None:
+                    entry["page_source"] = self._put(item.page_source.encode("utf-8"), ".html.gz", gzip.compress)
+                drivers.append(entry)
+
+            manifest = {"test": test_name, "timestamp": timestamp,
+                        "created": datetime.now().isoformat(timespec="seconds"), "drivers": drivers}
+            path = self._bundle_path(test_name, timestamp)
+            self._write_atomic(path, gzip.compress(json.dumps(manifest, ensure_ascii=False, default=str).encode("utf-8")))
+            self.stats["bundles"] += 1
+            if self.max_bytes:
+                self.evict(keep=path)
+        return [path]
+
+    def _bundle_path(self, test_name, timestamp) -> Path:
+        base = safe_file_name(f"{test_name}_{timestamp}")
+        path = self.bundles_dir / f"{base}.json.gz"
+        counter = 1
+        while path.exists():
+            counter += 1
+            path = self.bundles_dir / f"{base}_{counter}.json.gz"
+        return path
+
+    def _put_screenshot(self, png: bytes) -> str:
+        settings = f"{self.image_format}:{self.image_quality}:{self.max_image_width}".encode("ascii")
+        extension = ".jpg" if self.image_format == "jpeg" else f".{self.image_format}"
+        return self._put(png, extension, self._encode_image, salt=settings)
+
+    def _encode_image(self, png: bytes) -> bytes:
+        if self.image_format == "png" and not self.max_image_width:
+            return png
+        image = Image.open(io.BytesIO(png))
+        if self.max_image_width and image.width > self.max_image_width:
+            height = round(image.height * self.max_image_width / image.width)
+            image = image.resize((self.max_image_width, height))
+        if self.image_format == "jpeg":
+            image = image.convert("RGB")
+        output = io.BytesIO()
+        image.save(output, IMAGE_FORMATS[self.image_format], quality=self.image_quality, optimize=True)
+        return output.getvalue()
+
+    def _put(self, content: bytes, extension: str, encode, salt=b"") -> str:
+        """Сохраняет объект под хешем исходного содержимого; кодирование выполняется только для новых"""
+        name = hashlib.sha256(salt + content).hexdigest() + extension
+        path = self.objects_dir / name
+        if path.exists():
+            # Обновляем время, чтобы объект не считался старым при вытеснении
+            os.utime(path)
+            self.stats["objects_reused"] += 1
+        else:
+            self._write_atomic(path, encode(content))
+            self.stats["objects_written"] += 1
+        return f"objects/{name}"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        temp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+    def load_bundle(self, path) -> Dict[str, Any]:
+        """Читает манифест теста"""
+        return json.loads(gzip.decompress(Path(path).read_bytes()).decode("utf-8"))
+
+    def read_object(self, reference: str) -> bytes:
+        """Возвращает содержимое объекта по ссылке из манифеста (DOM распаковывается)"""
+        data = (self.directory / reference).read_bytes()
+        return gzip.decompress(data) if reference.endswith(".gz") else data
+
+    @property
+    def size(self) -> int:
+        """Текущий размер хранилища в байтах"""
+        return sum(path.stat().st_size for folder in (self.bundles_dir, self.objects_dir)
+                   if folder.exists() for path in folder.iterdir())
+
+    def evict(self, keep: Path = None) -> int:
+        """Удаляет самые старые манифесты, пока хранилище больше max_bytes; возвращает число удаленных"""
+        with self._lock:
+            bundles = sorted(self.bundles_dir.glob("*.json.gz"), key=lambda path: path.stat().st_mtime)
+            references = {path: self._references(path) for path in bundles}
+            counts: Dict[str, int] = {}
+            for refs in references.values():
+                for reference in refs:
+                    counts[reference] = counts.get(reference, 0) + 1
+
+            size = self.size
+            evicted = 0
+            for path in bundles:
+                if size <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                size -= self._unlink(path)
+                for reference in references[path]:
+                    counts[reference] -= 1
+                    if counts[reference] == 0:
+                        size -= self._unlink(self.directory / reference)
+                evicted += 1
+            self.stats["evicted_bundles"] += evicted
+
+        if evicted:
+            logging.info(f"Из хранилища артефактов вытеснено {evicted} старых падений, размер {size} байт")
+        return evicted
+
+    def _references(self, path: Path) -> set:
+        try:
+            manifest = self.load_bundle(path)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Не удалось прочитать манифест артефактов {path}: {e}")
+            return set()
+        return {driver[key] for driver in manifest["drivers"] for key in ("screenshot", "page_source") if key in driver}
+
+    @staticmethod
+    def _unlink(path: Path) -> int:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            return size
+        except FileNotFoundError:
+            return 0
+
+
+@dataclass
+class FailureCapture:
+    """Результат сбора артефактов упавшего теста; запись на диск идет в фоне"""
+    test_name: str
+    timestamp: str
+    artifacts: List[DriverArtifacts]
+    timed_out: List[str]
+    duration: float
+    writes: list = field(default_factory=list)
+
+    def wait(self, timeout=None) -> List[Path]:
+        """Дожидается записи на диск и возвращает пути записанных файлов"""
+        done, _ = wait(self.writes, timeout=timeout)
+        return [path for future in done if future.exception() is None for path in future.result()]
+
+
+class FailureArtifactCollector:
+    """
+    Параллельный сбор артефактов падения со всех драйверов теста
+
+    Запросы к драйверам выполняются одновременно и ограничены time_limit секунд на тест:
+    тест ждет только их, потому что после теста драйвер закроют или сбросят.
+    Декодирование скриншотов и запись файлов выполняются в фоновом пуле потоков;
+    flush() дожидается незавершенных записей (например, в конце сессии).
+    """
+
+    def __init__(self, store=None, time_limit=10.0, max_workers=8, write_workers=2):
+        """
+        Args:
+            store: Хранилище с методом save(test_name, timestamp, artifacts всех драйверов) -> список путей
+            time_limit: Лимит времени на сбор артефактов одного теста в секундах
+            max_workers: Число потоков для запросов к драйверам
+            write_workers: Число потоков записи на диск
+        """
+        self.store = store or DirectoryArtifactStore("screenshots")
+        self.time_limit = time_limit
+        self._capture_executor = ContextThreadPoolExecutor(max_workers=max_workers,
+                                                           thread_name_prefix="artifact-capture")
+        self._write_executor = ThreadPoolExecutor(max_workers=write_workers, thread_name_prefix="artifact-write")
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def capture(self, test_name: str, drivers: Dict[str, Any]) -> FailureCapture:
+        """Собирает артефакты всех драйверов и ставит их запись в очередь"""
+        start_time = time.monotonic()
+        deadline = start_time + self.time_limit
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        partial = {name: DriverArtifacts(name) for name in drivers}
+        futures = {
+            self._capture_executor.submit(collect_driver_artifacts, driver, name, deadline, partial[name]): name
+            for name, driver in drivers.items()
+        }
+        done, not_done = wait(futures, timeout=self.time_limit)
+
+        artifacts, timed_out = [], []
+        for future, name in futures.items():
+            if future in done and future.exception() is None:
+                artifacts.append(future.result())
+                continue
+            if future in done:
+                partial[name].errors["capture"] = f"{type(future.exception()).__name__}: {future.exception()}"
+            else:
+                timed_out.append(name)
+            # Поток может еще дописывать результат, поэтому сохраняем копию собранного к этому моменту
+            snapshot = replace(partial[name], errors=dict(partial[name].errors))
+            if future not in done:
+                snapshot.errors["capture"] = f"не уложились в {self.time_limit}с"
+            artifacts.append(snapshot)
+
+        duration = time.monotonic() - start_time
+        if timed_out:
+            logging.warning(f"Сбор артефактов теста {test_name} прерван по лимиту {self.time_limit}с "
+                            f"для драйверов: {', '.join(timed_out)}")
+        logging.info(f"Артефакты падения теста {test_name} сняты с {len(drivers)} драйверов за {duration:.2f}с")
+
+        capture = FailureCapture(test_name, timestamp, artifacts, timed_out, duration)
+        capture.writes.append(self._submit_write(test_name, timestamp, artifacts))
+        return capture
+
+    def _submit_write(self, test_name, timestamp, artifacts):
+        future = self._write_executor.submit(self._write, test_name, timestamp, artifacts)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def _write(self, test_name, timestamp, artifacts) -> List[Path]:
+        try:
+            paths = self.store.save(test_name, timestamp, artifacts)
+        except Exception as e:
+            logging.error(f"Не удалось сохранить артефакты теста {test_name}: {e}")
+            raise
+        logging.info(f"Артефакты теста {test_name} сохранены: {', '.join(str(path) for path in paths)}")
+        return paths
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self, timeout=None) -> bool:
+        """Дожидается записи всех артефактов; возвращает False, если не успели за timeout"""
+        with self._lock:
+            pending = list(self._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def shutdown(self, timeout=None):
+        """Дожидается записей и останавливает пулы потоков"""
+        if not self.flush(timeout):
+            logging.warning(f"Не все артефакты падений записаны: осталось {self.pending}")
+        self._capture_executor.shutdown(wait=False, cancel_futures=True)
+        self._write_executor.shutdown(wait=False)
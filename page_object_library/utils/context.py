@@ -0,0 +1,44 @@
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Tuple
+
+# Глубина вложенности вызовов auto_log в текущем контексте (потоке или задаче asyncio)
+call_depth = contextvars.ContextVar("auto_log_call_depth", default=0)
+
+# Стек текущих вызовов auto_log: кортеж строк вида "driver:Object.method"
+call_stack = contextvars.ContextVar("auto_log_call_stack", default=())
+
+
+def get_call_depth() -> int:
+    """Возвращает глубину вложенности вызовов в текущем контексте"""
+    return call_depth.get()
+
+
+def get_call_stack() -> Tuple[str, ...]:
+    """Возвращает стек вызовов auto_log в текущем контексте (от внешнего к внутреннему)"""
+    return call_stack.get()
+
+
+def bind_context(func: Callable) -> Callable:
+    """
+    Привязывает функцию к копии текущего контекста
+
+    Вызовы, выполненные в другом потоке, продолжат вложенность логов
+    с того места, где функция была передана в поток.
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+
+    return wrapper
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor, переносящий contextvars вызывающего кода в задачи"""
+
+    def submit(self, fn, /, *args, **kwargs):
+        context = contextvars.copy_context()
+        return super().submit(context.run, fn, *args, **kwargs)
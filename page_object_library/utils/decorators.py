@@ -1,14 +1,26 @@
 import functools
 import inspect
 import logging
+import os
 import threading
 import time
+import weakref
 from typing import Any, Callable
 
 from page_object_library.core.locator import Locator
+from page_object_library.utils.context import call_depth, call_stack
+from page_object_library.utils.diagnostics import slow_action_detector
 
-# Хранилище для глубины вызовов
-call_depth_store = threading.local()
+# Глобальный выключатель логирования: PAGE_OBJECT_AUTO_LOG=0 отключает его для бенчмарков
+_auto_log_enabled = os.environ.get("PAGE_OBJECT_AUTO_LOG", "1") != "0"
+
+# Подписчики на завершение действий: callback(driver_name, object_name, method_name, duration, failed)
+_action_listeners = []
+
+# Реестр методов классов, обернутых auto_log: {класс: [(имя метода, исходный метод, обертка)]}.
+# Слабые ссылки на классы, чтобы динамически создаваемые классы не накапливались в реестре
+_instrumented_methods = weakref.WeakKeyDictionary()
+_instrumented_lock = threading.Lock()
 
 # Словарь с описаниями действий для методов
 METHOD_DESCRIPTIONS = {
@@ -62,6 +74,18 @@ METHOD_DESCRIPTIONS = {
     "get_price": "Получение цены",
     "get_subtotal": "Получение промежуточной суммы",
     "proceed_to_checkout": "Переход к оформлению заказа",
+    "go_to_cart": "Переход в корзину",
+    "go_to_checkout": "Переход к оформлению заказа",
+    "get_cart_items": "Получение товаров корзины",
+    "get_cart_items_count": "Получение количества товаров в корзине",
+    "get_subtotal_as_float": "Получение промежуточной суммы как числа",
+    "get_product_title": "Получение названия товара",
+    "get_product_price": "Получение цены товара",
+    "get_product_price_as_float": "Получение цены товара как числа",
+    "get_price_as_float": "Получение цены как числа",
+    "select_suggestion": "Выбор подсказки поиска",
+    "open_account_menu": "Открытие меню аккаунта",
+    "get_value": "Получение значения поля",
 }
 
 
@@ -114,99 +138,213 @@ def format_param_value(name: str, value: Any) -> str:
     return f"{value}"
 
 
+def add_action_listener(listener: Callable):
+    """
+    Подписывает функцию на завершение каждого действия под auto_log
+
+    Функция вызывается как listener(driver_name, object_name, method_name, duration, failed).
+    """
+    _action_listeners.append(listener)
+    return listener
+
+
+def remove_action_listener(listener: Callable):
+    """Отписывает функцию от завершения действий"""
+    if listener in _action_listeners:
+        _action_listeners.remove(listener)
+
+
+def _notify_action_listeners(driver_name, object_name, method_name, duration, failed):
+    for listener in list(_action_listeners):
+        try:
+            listener(driver_name, object_name, method_name, duration, failed)
+        except Exception as e:
+            logging.error(f"Ошибка в подписчике на действия {listener}: {e}")
+
+
+class _CallSpec:
+    """Предварительно вычисленные данные метода, общие для всех его вызовов"""
+    __slots__ = ("func", "signature", "method_name", "action_description")
+
+    def __init__(self, func):
+        self.func = func
+        self.signature = inspect.signature(func)
+        self.method_name = func.__name__
+        self.action_description = get_method_description(func.__name__)
+
+
+def _logged_call(spec: _CallSpec, args, kwargs):
+    """Общая обертка вызова метода с логированием, используемая всеми методами под auto_log"""
+    if not _auto_log_enabled:
+        return spec.func(*args, **kwargs)
+
+    depth = call_depth.get()
+    indent = "  " * depth
+
+    method_name = spec.method_name
+
+    obj = args[0]
+
+    # Получаем имя драйвера вместо ID
+    if hasattr(obj, 'driver_name'):
+        driver_identifier = obj.driver_name
+    else:
+        driver_identifier = f"#{id(obj.driver)}" if hasattr(obj, 'driver') else 'unknown'
+
+    if hasattr(obj, 'page_name'):
+        object_name = obj.page_name
+    elif hasattr(obj, 'group_name'):
+        object_name = obj.group_name
+    else:
+        object_name = obj.__class__.__name__
+
+    action_description = spec.action_description
+
+    bound_args = spec.signature.bind(*args, **kwargs)
+    bound_args.apply_defaults()
+
+    params = []
+    element_description = None
+
+    # Проверяем, есть ли у самого объекта описание (для BaseElement и его наследников)
+    if hasattr(obj, 'description') and obj.description:
+        element_description = obj.description
+
+    for name, value in list(bound_args.arguments.items())[1:]:
+        if name == "description":
+            continue  # Пропускаем параметр description
+        formatted_value = format_param_value(name, value)
+        if formatted_value is None:
+            continue
+        if name == "locator" or name == "element_type" or name == "multiple":
+            if name == "locator" and formatted_value:
+                params.append(f"{formatted_value}")
+            elif name == "element_type" and value is not None:
+                params.append(f"как {value.__name__}")
+            elif name == "multiple" and value:
+                params.append("множественный")
+        else:
+            params.append(f"{name}={formatted_value}")
+
+    prefix = f"[Driver {driver_identifier}] {object_name}"
+
+    # Используем описание элемента, если оно есть
+    if element_description and method_name in ["click", "type", "get_text", "is_visible", "is_present"]:
+        action = f"{action_description} - {element_description}"
+    else:
+        action = f"{action_description}"
+
+    if params:
+        log_message = f"{prefix}: {action} ({', '.join(params)})"
+    else:
+        log_message = f"{prefix}: {action}"
+
+    logging.info(f"{indent}➡️  {log_message}")
+
+    depth_token = call_depth.set(depth + 1)
+    stack_token = call_stack.set(call_stack.get() + (f"{driver_identifier}:{object_name}.{method_name}",))
+
+    start_time = time.time()
+    try:
+        result = spec.func(*args, **kwargs)
+
+        end_time = time.time()
+        duration = end_time - start_time
+
+        if duration > slow_action_detector.get_threshold(method_name):
+            duration_str = f" (за {duration:.2f}с)"
+        else:
+            duration_str = ""
+
+        logging.info(f"{indent}✅ {log_message} - успешно{duration_str}")
+        slow_action_detector.check(obj, driver_identifier, object_name, method_name, duration)
+        _notify_action_listeners(driver_identifier, object_name, method_name, duration, False)
+
+        return result
+    except Exception as e:
+        logging.error(f"{indent}❌ {log_message} - ошибка: {str(e)}")
+        duration = time.time() - start_time
+        slow_action_detector.check(obj, driver_identifier, object_name, method_name, duration, failed=True)
+        _notify_action_listeners(driver_identifier, object_name, method_name, duration, True)
+        raise
+    finally:
+        call_stack.reset(stack_token)
+        call_depth.reset(depth_token)
+
+
 def auto_log(func: Callable) -> Callable:
     """Декоратор для автоматического логирования с человеко-читаемыми сообщениями"""
+    if getattr(func, '__auto_logged__', False):
+        return func
+
+    spec = _CallSpec(func)
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        if not hasattr(call_depth_store, 'depth'):
-            call_depth_store.depth = 0
+        return _logged_call(spec, args, kwargs)
 
-        indent = "  " * call_depth_store.depth
+    wrapper.__auto_logged__ = True
+    return wrapper
 
-        method_name = func.__name__
 
-        obj = args[0]
+def no_auto_log(func: Callable) -> Callable:
+    """Маркер, исключающий метод из автоматического логирования через LocatorMeta"""
+    func.__no_auto_log__ = True
+    return func
 
-        # Получаем имя драйвера вместо ID
-        if hasattr(obj, 'driver_name'):
-            driver_identifier = obj.driver_name
-        else:
-            driver_identifier = f"#{id(obj.driver)}" if hasattr(obj, 'driver') else 'unknown'
 
-        if hasattr(obj, 'page_name'):
-            object_name = obj.page_name
-        elif hasattr(obj, 'group_name'):
-            object_name = obj.group_name
-        else:
-            object_name = obj.__class__.__name__
-
-        action_description = get_method_description(method_name)
-
-        sig = inspect.signature(func)
-        bound_args = sig.bind(*args, **kwargs)
-        bound_args.apply_defaults()
-
-        params = []
-        element_description = None
-
-        # Проверяем, есть ли у самого объекта описание (для BaseElement и его наследников)
-        if hasattr(obj, 'description') and obj.description:
-            element_description = obj.description
-
-        for name, value in list(bound_args.arguments.items())[1:]:
-            if name == "description":
-                continue  # Пропускаем параметр description
-            formatted_value = format_param_value(name, value)
-            if formatted_value is None:
-                continue
-            if name == "locator" or name == "element_type" or name == "multiple":
-                if name == "locator" and formatted_value:
-                    params.append(f"{formatted_value}")
-                elif name == "element_type" and value is not None:
-                    params.append(f"как {value.__name__}")
-                elif name == "multiple" and value:
-                    params.append("множественный")
-            else:
-                params.append(f"{name}={formatted_value}")
+def _should_instrument(cls, attr_name, attr_value) -> bool:
+    """Проверяет, нужно ли автоматически обернуть метод класса"""
+    if attr_name.startswith('_') or not inspect.isfunction(attr_value):
+        return False
+    if getattr(attr_value, '__no_auto_log__', False) or getattr(attr_value, '__auto_logged__', False):
+        return False
+    return attr_name not in getattr(cls, 'auto_log_exclude', ())
 
-        prefix = f"[Driver {driver_identifier}] {object_name}"
 
-        # Используем описание элемента, если оно есть
-        if element_description and method_name in ["click", "type", "get_text", "is_visible", "is_present"]:
-            action = f"{action_description} - {element_description}"
-        else:
-            action = f"{action_description}"
+def instrument_class(cls):
+    """
+    Оборачивает публичные методы класса в auto_log и регистрирует обернутые методы
 
-        if params:
-            log_message = f"{prefix}: {action} ({', '.join(params)})"
+    Вызывается метаклассом LocatorMeta при создании класса. Методы оборачиваются,
+    если у класса включен атрибут auto_log_methods. Уже обернутые вручную методы
+    тоже регистрируются, чтобы выключатель set_auto_log_enabled мог их восстановить.
+    """
+    auto_instrument = getattr(cls, 'auto_log_methods', False)
+
+    for attr_name, attr_value in list(cls.__dict__.items()):
+        if getattr(attr_value, '__auto_logged__', False):
+            raw, wrapped = attr_value.__wrapped__, attr_value
+        elif auto_instrument and _should_instrument(cls, attr_name, attr_value):
+            raw, wrapped = attr_value, auto_log(attr_value)
         else:
-            log_message = f"{prefix}: {action}"
+            continue
 
-        logging.info(f"{indent}➡️  {log_message}")
+        with _instrumented_lock:
+            _instrumented_methods.setdefault(cls, []).append((attr_name, raw, wrapped))
+        setattr(cls, attr_name, wrapped if _auto_log_enabled else raw)
 
-        call_depth_store.depth += 1
+    return cls
 
-        try:
-            start_time = time.time()
 
-            result = func(*args, **kwargs)
+def set_auto_log_enabled(enabled: bool):
+    """
+    Глобальный выключатель auto_log
 
-            end_time = time.time()
-            duration = end_time - start_time
+    При выключении восстанавливает исходные методы во всех классах с метаклассом
+    LocatorMeta, чтобы бенчмарки шли без накладных расходов на логирование.
+    """
+    global _auto_log_enabled
+    _auto_log_enabled = enabled
 
-            if duration > 1.0:
-                duration_str = f" (за {duration:.2f}с)"
-            else:
-                duration_str = ""
+    with _instrumented_lock:
+        classes = list(_instrumented_methods.items())
 
-            logging.info(f"{indent}✅ {log_message} - успешно{duration_str}")
+    for cls, methods in classes:
+        for attr_name, raw, wrapped in methods:
+            setattr(cls, attr_name, wrapped if enabled else raw)
 
-            return result
-        except Exception as e:
-            logging.error(f"{indent}❌ {log_message} - ошибка: {str(e)}")
-            raise
-        finally:
-            call_depth_store.depth -= 1
 
-    return wrapper
\ No newline at end of file
+def is_auto_log_enabled() -> bool:
+    """Возвращает состояние глобального выключателя auto_log"""
+    return _auto_log_enabled
@@ -0,0 +1,185 @@
+import inspect
+import logging
+import sqlite3
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from page_object_library.core.locator import LocatorMeta
+
+# Подписчики на создание page objects: listener(класс)
+_usage_listeners = []
+
+# Модули самой библиотеки не попадают в граф: их изменение затрагивает все тесты
+LIBRARY_PACKAGE = "page_object_library"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tests (
+    nodeid TEXT PRIMARY KEY,
+    recorded REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS test_dependencies (
+    nodeid TEXT NOT NULL,
+    class_name TEXT NOT NULL,
+    module_path TEXT NOT NULL,
+    PRIMARY KEY (nodeid, class_name)
+);
+CREATE INDEX IF NOT EXISTS test_dependencies_module ON test_dependencies (module_path);
+"""
+
+
+def add_usage_listener(listener: Callable):
+    """Подписывает функцию на создание страниц, компонентов и элементов: listener(класс)"""
+    _usage_listeners.append(listener)
+    LocatorMeta.track_instances(True)
+    return listener
+
+
+def remove_usage_listener(listener: Callable):
+    if listener in _usage_listeners:
+        _usage_listeners.remove(listener)
+    if not _usage_listeners:
+        LocatorMeta.track_instances(False)
+
+
+def has_usage_listeners() -> bool:
+    return bool(_usage_listeners)
+
+
+def notify_class_used(cls):
+    for listener in list(_usage_listeners):
+        try:
+            listener(cls)
+        except Exception as e:
+            logging.error(f"Ошибка в подписчике на создание page objects {listener}: {e}")
+
+
+def class_dependencies(cls, root: Path) -> Dict[str, str]:
+    """
+    Классы проекта, от которых зависит класс page object: {модуль.класс: путь модуля от root}
+
+    Учитываются базовые классы из MRO, кроме классов библиотеки и классов вне root.
+    """
+    dependencies = {}
+    for klass in cls.__mro__:
+        module = klass.__module__ or ""
+        if module == "builtins" or module.split(".")[0] == LIBRARY_PACKAGE:
+            continue
+        try:
+            path = Path(inspect.getsourcefile(klass)).resolve().relative_to(root)
+        except (TypeError, ValueError):
+            continue
+        dependencies[f"{module}.{klass.__qualname__}"] = path.as_posix()
+    return dependencies
+
+
+class DependencyGraph:
+    """
+    Граф зависимостей тестов от модулей page objects в локальной базе SQLite
+
+    Как и история длительностей, база используется одновременно воркерами xdist (режим WAL).
+    """
+
+    def __init__(self, path, timeout=30.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), timeout=timeout, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+
+    def record_test(self, nodeid: str, dependencies: Dict[str, str], replace=True):
+        """
+        Записывает зависимости теста
+
+        Args:
+            nodeid: Идентификатор теста
+            dependencies: {модуль.класс: путь модуля}
+            replace: Заменить прежние зависимости (иначе объединить с ними, например для упавшего теста)
+        """
+        with self._lock, self._connection:
+            if replace:
+                self._connection.execute("DELETE FROM test_dependencies WHERE nodeid = ?", (nodeid,))
+            self._connection.execute("INSERT OR REPLACE INTO tests (nodeid, recorded) VALUES (?, ?)",
+                                     (nodeid, time.time()))
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO test_dependencies (nodeid, class_name, module_path) VALUES (?, ?, ?)",
+                [(nodeid, class_name, module_path) for class_name, module_path in dependencies.items()]
+            )
+
+    def snapshot(self) -> Dict[str, List[str]]:
+        """Граф целиком: {nodeid: [пути модулей]}, в том числе для тестов без зависимостей"""
+        with self._lock:
+            graph = {nodeid: set() for nodeid, in self._connection.execute("SELECT nodeid FROM tests")}
+            for nodeid, module_path in self._connection.execute(
+                    "SELECT DISTINCT nodeid, module_path FROM test_dependencies"):
+                graph.setdefault(nodeid, set()).add(module_path)
+        return {nodeid: sorted(modules) for nodeid, modules in graph.items()}
+
+    def tests_using(self, module_path: str) -> List[str]:
+        with self._lock:
+            return [nodeid for nodeid, in self._connection.execute(
+                "SELECT DISTINCT nodeid FROM test_dependencies WHERE module_path = ? ORDER BY nodeid", (module_path,))]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def changed_files(root, base="HEAD") -> Set[str]:
+    """Файлы, измененные относительно base (включая незакоммиченные и новые), пути от корня репозитория"""
+    root = Path(root)
+    top_level = Path(_git(root, "rev-parse", "--show-toplevel").strip()).resolve()
+    names = _git(root, "diff", "--name-only", base, "--").splitlines()
+    names += _git(root, "ls-files", "--others", "--exclude-standard", "--full-name").splitlines()
+    changed = set()
+    for name in filter(None, names):
+        try:
+            changed.add((top_level / name).resolve().relative_to(root.resolve()).as_posix())
+        except ValueError:
+            continue
+    return changed
+
+
+def _git(root: Path, *args) -> str:
+    return subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, check=True).stdout
+
+
+def select_affected(test_files: Dict[str, str], graph: Dict[str, Iterable[str]],
+                    changed: Set[str]) -> Tuple[Set[str], Optional[str]]:
+    """
+    Выбирает тесты, затронутые изменениями
+
+    Тест выбирается, если изменен его файл, если зависимостей теста еще нет в графе
+    или если изменен модуль page object, который он использовал. Если изменен любой другой
+    модуль Python (библиотека, conftest.py, вспомогательный код), выбираются все тесты.
+
+    Args:
+        test_files: {nodeid: путь файла теста}
+        graph: {nodeid: пути модулей page objects}
+        changed: Измененные файлы
+
+    Returns:
+        (выбранные nodeid, причина запуска всех тестов или None)
+    """
+    page_modules = {module for modules in graph.values() for module in modules}
+    test_paths = set(test_files.values())
+    for path in sorted(changed):
+        if not path.endswith(".py") or path in test_paths or path in page_modules or _is_test_module(path):
+            continue
+        return set(test_files), f"изменен модуль {path}, не входящий в граф зависимостей"
+
+    selected = set()
+    for nodeid, test_path in test_files.items():
+        if test_path in changed or nodeid not in graph or changed.intersection(graph[nodeid]):
+            selected.add(nodeid)
+    return selected, None
+
+
+def _is_test_module(path: str) -> bool:
+    # Новые или неотобранные файлы тестов не влияют на остальные тесты
+    name = path.rsplit("/", 1)[-1]
+    return name.startswith("test_") or name.endswith("_test.py")
@@ -0,0 +1,192 @@
+import datetime
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Один запрос к браузеру собирает URL, состояние документа и число незавершенных запросов.
+# Resource Timing появляется только после завершения запроса, поэтому незавершенные fetch/XHR
+# считает счетчик, который скрипт устанавливает на страницу при первом вызове. Пока счетчик
+# только установлен (запросы, начатые раньше, он не видел), число неизвестно и равно null.
+DIAGNOSTICS_SCRIPT = """
+var pending = null;
+if (window.jQuery && typeof window.jQuery.active === 'number') {
+    pending = window.jQuery.active;
+} else if (typeof window.__pageObjectPendingRequests === 'number') {
+    pending = window.__pageObjectPendingRequests;
+} else {
+    window.__pageObjectPendingRequests = 0;
+    var done = function () { window.__pageObjectPendingRequests -= 1; };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            window.__pageObjectPendingRequests += 1;
+            return fetch.apply(this, arguments).finally(done);
+        };
+    }
+    if (window.XMLHttpRequest) {
+        var send = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            window.__pageObjectPendingRequests += 1;
+            this.addEventListener('loadend', done);
+            return send.apply(this, arguments);
+        };
+    }
+}
+return {url: window.location.href, readyState: document.readyState, pendingRequests: pending};
+"""
+
+# Методы элементов, для которых имеет смысл делать скриншот элемента
+ELEMENT_ACTIONS = {"click", "type", "clear", "get_text", "get_attribute", "is_visible", "is_present",
+                   "check", "uncheck", "select", "select_by_text", "select_by_index"}
+
+
+@dataclass
+class SlowActionEvent:
+    """Событие медленного действия"""
+    driver_name: str
+    object_name: str
+    method_name: str
+    duration: float
+    threshold: float
+    timestamp: float
+    failed: bool = False
+    diagnostics: Dict[str, Any] = field(default_factory=dict)
+
+
+class SlowActionDetector:
+    """Детектор медленных действий с ограниченным по частоте сбором диагностики"""
+
+    def __init__(self, default_threshold=1.0, thresholds=None, capture=False, capture_dir="diagnostics",
+                 min_capture_interval=10.0, max_captures=20, max_events=1000):
+        """
+        Args:
+            default_threshold: Порог длительности по умолчанию в секундах
+            thresholds: Пороги для отдельных методов {имя_метода: секунды}
+            capture: Собирать ли диагностику при превышении порога
+            capture_dir: Директория для скриншотов элементов
+            min_capture_interval: Минимальный интервал между сборами диагностики для одного драйвера
+            max_captures: Максимальное количество сборов диагностики за сессию
+            max_events: Максимальное количество хранимых событий
+        """
+        self.default_threshold = default_threshold
+        self.thresholds = dict(thresholds or {})
+        self.capture = capture
+        self.capture_dir = Path(capture_dir)
+        self.min_capture_interval = min_capture_interval
+        self.max_captures = max_captures
+        self.events = deque(maxlen=max_events)
+        self.captures = 0
+        self.throttled = 0
+        self._last_capture: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, **settings):
+        """Изменяет настройки детектора"""
+        for name, value in settings.items():
+            if not hasattr(self, name):
+                raise ValueError(f"Неизвестная настройка детектора медленных действий: {name}")
+            if name == "thresholds":
+                value = dict(value or {})
+            elif name == "capture_dir":
+                value = Path(value)
+            setattr(self, name, value)
+
+    def get_threshold(self, method_name: str) -> float:
+        """Возвращает порог длительности для метода"""
+        return self.thresholds.get(method_name, self.default_threshold)
+
+    def check(self, obj, driver_name, object_name, method_name, duration, failed=False) -> Optional[SlowActionEvent]:
+        """
+        Регистрирует событие, если длительность превысила порог метода
+
+        Returns:
+            Событие медленного действия или None
+        """
+        threshold = self.get_threshold(method_name)
+        if duration <= threshold:
+            return None
+
+        event = SlowActionEvent(driver_name, object_name, method_name, duration, threshold, time.time(), failed)
+
+        if self.capture and self._acquire_capture_slot(str(driver_name)):
+            event.diagnostics = self._capture(obj, event)
+
+        with self._lock:
+            self.events.append(event)
+
+        logging.warning(
+            f"🐢 [Driver {driver_name}] {object_name}.{method_name} выполнялся {duration:.2f}с "
+            f"(порог {threshold:.2f}с){self._format_diagnostics(event.diagnostics)}"
+        )
+        return event
+
+    def _acquire_capture_slot(self, driver_key: str) -> bool:
+        """Проверяет ограничения частоты и количества сборов диагностики"""
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_capture.get(driver_key)
+            if self.captures >= self.max_captures or (last is not None and now - last < self.min_capture_interval):
+                self.throttled += 1
+                return False
+            self._last_capture[driver_key] = now
+            self.captures += 1
+            return True
+
+    def _capture(self, obj, event: SlowActionEvent) -> Dict[str, Any]:
+        """Собирает легковесную диагностику состояния браузера"""
+        diagnostics = {}
+        driver = getattr(obj, 'driver', None)
+        if driver is None:
+            return diagnostics
+
+        try:
+            diagnostics.update(driver.execute_script(DIAGNOSTICS_SCRIPT) or {})
+        except Exception as e:
+            diagnostics["error"] = str(e)
+
+        # Скриншот делаем только для уже найденного элемента, чтобы не тратить время на повторный поиск
+        element = getattr(obj, '_element', None)
+        if element is not None and event.method_name in ELEMENT_ACTIONS:
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            filepath = self.capture_dir / f"{event.driver_name}_{event.object_name}_{event.method_name}_{timestamp}.png"
+            try:
+                self.capture_dir.mkdir(exist_ok=True, parents=True)
+                if element.screenshot(str(filepath)):
+                    diagnostics["screenshot"] = str(filepath)
+            except Exception as e:
+                diagnostics["screenshot_error"] = str(e)
+
+        return diagnostics
+
+    @staticmethod
+    def _format_diagnostics(diagnostics: Dict[str, Any]) -> str:
+        if not diagnostics:
+            return ""
+        return " [" + ", ".join(f"{name}={value}" for name, value in diagnostics.items()) + "]"
+
+    def get_events(self):
+        """Возвращает список зарегистрированных событий"""
+        with self._lock:
+            return list(self.events)
+
+    def reset(self):
+        """Очищает события и счетчики сборов диагностики"""
+        with self._lock:
+            self.events.clear()
+            self.captures = 0
+            self.throttled = 0
+            self._last_capture.clear()
+
+
+# Общий детектор, используемый декоратором auto_log
+slow_action_detector = SlowActionDetector()
+
+
+def configure_slow_actions(**settings):
+    """Настраивает общий детектор медленных действий"""
+    slow_action_detector.configure(**settings)
+    return slow_action_detector
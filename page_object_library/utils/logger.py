@@ -1,11 +1,113 @@
 import logging
+import threading
+from collections import deque
+from itertools import count
 from pathlib import Path
 import datetime
 import sys
 
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Буфер логов текущего теста (используется в режиме "логи только для упавших тестов")
+_failure_buffer = None
+
+
+class RingBufferHandler(logging.Handler):
+    """Обработчик, накапливающий записи логов в ограниченном кольцевом буфере в памяти.
+
+    Записи ниже keep_level хранятся в буфере фиксированного размера и вытесняются
+    начиная с самых старых. Записи уровня keep_level и выше никогда не вытесняются.
+    На диск буфер пишется только по явному вызову dump().
+    """
+
+    def __init__(self, capacity=1000, keep_level=logging.WARNING, level=logging.NOTSET):
+        """
+        Args:
+            capacity: Максимальное количество записей ниже keep_level в буфере
+            keep_level: Уровень, начиная с которого записи сохраняются всегда (None - не сохранять отдельно)
+            level: Минимальный уровень записей, попадающих в буфер
+        """
+        super().__init__(level)
+        self.capacity = capacity
+        self.keep_level = keep_level
+        self._sequence = count()
+        self._records = deque(maxlen=capacity)
+        self._kept = []
+        self._dropped = 0
+        self._buffer_lock = threading.Lock()
+
+    def emit(self, record):
+        """Сохраняет запись в буфер без форматирования и без ввода-вывода"""
+        with self._buffer_lock:
+            entry = (next(self._sequence), record)
+            if self.keep_level is not None and record.levelno >= self.keep_level:
+                self._kept.append(entry)
+                return
+            if len(self._records) == self._records.maxlen:
+                self._dropped += 1
+            self._records.append(entry)
+
+    @property
+    def dropped(self):
+        """Количество записей, вытесненных из буфера"""
+        return self._dropped
+
+    def __len__(self):
+        return len(self._records) + len(self._kept)
+
+    def get_records(self):
+        """Возвращает записи буфера в порядке их поступления"""
+        with self._buffer_lock:
+            entries = list(self._records) + self._kept
+        return [record for _, record in sorted(entries, key=lambda entry: entry[0])]
+
+    def reset(self):
+        """Очищает буфер"""
+        with self._buffer_lock:
+            self._records.clear()
+            self._kept = []
+            self._dropped = 0
+
+    def dump(self, log_file):
+        """
+        Записывает содержимое буфера в файл
+
+        Args:
+            log_file: Путь к файлу логов
+
+        Returns:
+            Путь к записанному файлу
+        """
+        log_file = Path(log_file)
+        log_file.parent.mkdir(exist_ok=True, parents=True)
+        formatter = self.formatter or logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+
+        with open(log_file, 'w', encoding='utf-8') as f:
+            if self._dropped:
+                f.write(f"... вытеснено из буфера записей: {self._dropped}\n")
+            for record in self.get_records():
+                f.write(formatter.format(record) + "\n")
+
+        return log_file
+
+
+def get_failure_buffer():
+    """Возвращает буфер логов текущего теста или None, если режим не включен"""
+    return _failure_buffer
+
+
+def setup_logger(log_level=logging.INFO, log_dir="logs", log_to_console=True, log_prefix="test",
+                 failure_only=False, buffer_capacity=1000, keep_level=logging.WARNING):
+    """Настройка логгера для тестов
+
+    В режиме failure_only записи логов накапливаются в кольцевом буфере в памяти
+    и записываются на диск только для упавших тестов (см. get_failure_buffer).
+    В общий лог-файл и на консоль в этом режиме попадают только записи уровня keep_level
+    и выше (WARNING, если keep_level=None), поэтому прошедшие тесты почти не пишут логов.
+    """
+    global _failure_buffer
 
-def setup_logger(log_level=logging.INFO, log_dir="logs", log_to_console=True, log_prefix="test"):
-    """Настройка логгера для тестов"""
     log_path = Path(log_dir)
     log_path.mkdir(exist_ok=True, parents=True)
 
@@ -23,22 +125,33 @@ def setup_logger(log_level=logging.INFO, log_dir="logs", log_to_console=True, lo
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
 
-    log_format = "%(asctime)s - %(levelname)s - %(message)s"
-    date_format = "%Y-%m-%d %H:%M:%S"
+    log_format = LOG_FORMAT
+    date_format = DATE_FORMAT
 
     handlers = []
+    # Уровень записей, которые выводятся сразу, не дожидаясь падения теста
+    output_level = log_level
+    if failure_only:
+        output_level = max(log_level, keep_level if keep_level is not None else logging.WARNING)
 
     try:
         file_handler = logging.FileHandler(log_file, mode='w', encoding='utf-8')
-        file_handler.setLevel(log_level)
+        file_handler.setLevel(output_level)
         file_handler.setFormatter(logging.Formatter(log_format, date_format))
         handlers.append(file_handler)
     except Exception as e:
         print(f"Не удалось создать файловый обработчик: {e}")
 
+    if failure_only:
+        _failure_buffer = RingBufferHandler(buffer_capacity, keep_level, level=log_level)
+        _failure_buffer.setFormatter(logging.Formatter(log_format, date_format))
+        handlers.append(_failure_buffer)
+    else:
+        _failure_buffer = None
+
     if log_to_console:
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(log_level)
+        console_handler.setLevel(output_level)
         console_handler.setFormatter(logging.Formatter(log_format, date_format))
         handlers.append(console_handler)
 
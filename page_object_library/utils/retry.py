@@ -0,0 +1,241 @@
+import functools
+import logging
+import threading
+import time
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    StaleElementReferenceException,
+)
+
+# Исключения, после которых шаг обычно проходит со второй попытки на том же драйвере
+TRANSIENT_EXCEPTIONS = (
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+)
+
+
+@dataclass
+class RetryCounters:
+    """Повторы одного шага"""
+    calls: int = 0
+    retries: int = 0
+    recovered: int = 0
+    exhausted: int = 0
+    recover_failures: int = 0
+
+    def as_dict(self) -> dict:
+        return {item.name: getattr(self, item.name) for item in fields(self)}
+
+    def merge(self, other: "RetryCounters") -> "RetryCounters":
+        return RetryCounters(**{name: value + getattr(other, name) for name, value in self.as_dict().items()})
+
+
+class RetryMetrics:
+    """Счетчики повторов по шагам (Объект.метод) для итоговой сводки"""
+
+    def __init__(self):
+        self._steps: Dict[str, RetryCounters] = {}
+        self._lock = threading.Lock()
+
+    def record(self, step: str, retries: int, succeeded: bool, recover_failures=0):
+        with self._lock:
+            counters = self._steps.setdefault(step, RetryCounters())
+            counters.calls += 1
+            counters.retries += retries
+            counters.recover_failures += recover_failures
+            if succeeded:
+                counters.recovered += 1
+            else:
+                counters.exhausted += 1
+
+    def snapshot(self) -> Dict[str, RetryCounters]:
+        with self._lock:
+            return {step: RetryCounters(**counters.as_dict()) for step, counters in self._steps.items()}
+
+    def as_dict(self) -> Dict[str, dict]:
+        return {step: counters.as_dict() for step, counters in self.snapshot().items()}
+
+    def merge(self, steps: Dict[str, dict]):
+        """Добавляет счетчики другого процесса (воркера xdist)"""
+        with self._lock:
+            for step, counters in steps.items():
+                self._steps[step] = self._steps.get(step, RetryCounters()).merge(RetryCounters(**counters))
+
+    def reset(self):
+        with self._lock:
+            self._steps.clear()
+
+    def summary_lines(self):
+        return [
+            f"{step}: повторов {counters.retries}, помогло {counters.recovered}, не помогло {counters.exhausted}"
+            for step, counters in sorted(self.snapshot().items(), key=lambda item: -item[1].retries)
+        ]
+
+
+# Счетчики повторов процесса; собираются плагином pytest
+retry_metrics = RetryMetrics()
+
+
+class RetryPolicy:
+    """
+    Повтор шага на том же драйвере при временных ошибках
+
+    Задержка между попытками растет экспоненциально (base_delay * multiplier ** n) до max_delay.
+    Перед повтором вызывается recover(obj, exception), например для закрытия всплывающего окна.
+    Исключение проверяется вместе с цепочкой причин, так как действия элементов
+    оборачивают исходную ошибку Selenium.
+    """
+
+    def __init__(self, exceptions: Tuple[Type[BaseException], ...] = TRANSIENT_EXCEPTIONS, attempts=3,
+                 base_delay=0.1, max_delay=2.0, multiplier=2.0, recover: Optional[Callable] = None,
+                 metrics: RetryMetrics = None):
+        """
+        Args:
+            exceptions: Исключения, после которых шаг повторяется
+            attempts: Максимальное число попыток, включая первую
+            base_delay: Задержка перед первым повтором в секундах
+            max_delay: Верхняя граница задержки
+            multiplier: Множитель задержки для каждой следующей попытки
+            recover: Восстановление перед повтором: recover(obj, exception)
+            metrics: Куда записывать счетчики (по умолчанию retry_metrics)
+        """
+        if attempts < 1:
+            raise ValueError("attempts должен быть не меньше 1")
+        self.exceptions = tuple(exceptions)
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.recover = recover
+        self.metrics = metrics if metrics is not None else retry_metrics
+
+    def replace(self, **changes) -> "RetryPolicy":
+        """Копия политики с другими параметрами"""
+        settings = dict(exceptions=self.exceptions, attempts=self.attempts, base_delay=self.base_delay,
+                        max_delay=self.max_delay, multiplier=self.multiplier, recover=self.recover,
+                        metrics=self.metrics)
+        settings.update(changes)
+        return RetryPolicy(**settings)
+
+    def delay(self, retry: int) -> float:
+        """Задержка перед повтором с номером retry (с 1)"""
+        return min(self.max_delay, self.base_delay * self.multiplier ** (retry - 1))
+
+    def is_transient(self, exception: BaseException, excluded: Tuple[Type[BaseException], ...] = ()) -> bool:
+        """Временная ли ошибка; excluded - исключения, которые в этот раз не повторяются"""
+        seen = set()
+        while exception is not None and id(exception) not in seen:
+            if isinstance(exception, excluded):
+                return False
+            if isinstance(exception, self.exceptions):
+                return True
+            seen.add(id(exception))
+            exception = exception.__cause__ or exception.__context__
+        return False
+
+    def call(self, func: Callable, obj, *args, step: str = None, on_retry: Callable = None,
+             excluded: Tuple[Type[BaseException], ...] = (), **kwargs):
+        """
+        Вызывает func(obj, *args, **kwargs) с повторами
+
+        Args:
+            step: Название шага для логов и метрик
+            on_retry: Дополнительное восстановление объекта перед повтором: on_retry(exception)
+            excluded: Исключения политики, которые для этого вызова не повторяются
+        """
+        step = step or f"{type(obj).__name__}.{func.__name__}"
+        retries = recover_failures = 0
+        while True:
+            try:
+                result = func(obj, *args, **kwargs)
+            except Exception as e:
+                if not self.is_transient(e, excluded):
+                    if retries:
+                        self.metrics.record(step, retries, False, recover_failures)
+                    raise
+                if retries + 1 >= self.attempts:
+                    logging.warning(f"Шаг {step} не прошел за {self.attempts} попыток: {e}")
+                    self.metrics.record(step, retries, False, recover_failures)
+                    raise
+                retries += 1
+                delay = self.delay(retries)
+                logging.warning(f"Шаг {step} упал ({type(e).__name__}), повтор {retries} "
+                                f"из {self.attempts - 1} через {delay:.2f}с")
+                recover_failures += self._recover(obj, e, on_retry)
+                time.sleep(delay)
+                continue
+            if retries:
+                logging.info(f"Шаг {step} прошел после {retries} повторов")
+                self.metrics.record(step, retries, True, recover_failures)
+            return result
+
+    def _recover(self, obj, exception, on_retry) -> int:
+        hooks = []
+        if on_retry is not None:
+            hooks.append(functools.partial(on_retry, exception))
+        if self.recover is not None:
+            hooks.append(functools.partial(self.recover, obj, exception))
+
+        failures = 0
+        for hook in hooks:
+            try:
+                hook()
+            except Exception as e:
+                logging.warning(f"Ошибка восстановления перед повтором: {e}")
+                failures += 1
+        return failures
+
+
+def step_name(obj, method_name: str) -> str:
+    """Название шага как в логах auto_log: страница, компонент или описание элемента"""
+    name = getattr(obj, "page_name", None) or getattr(obj, "group_name", None) \
+        or getattr(obj, "description", None) or type(obj).__name__
+    return f"{name}.{method_name}"
+
+
+def retry(policy: RetryPolicy = None, **settings):
+    """
+    Декоратор метода страницы или компонента: повторяет шаг по политике
+
+    Пример:
+        @retry(recover=lambda page, error: page.close_popup())
+        def add_to_cart(self): ...
+
+    Args:
+        policy: Готовая политика; settings переопределяют ее параметры или создают новую
+    """
+    if policy is None:
+        policy = RetryPolicy(**settings)
+    elif settings:
+        policy = policy.replace(**settings)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            return policy.call(func, self, *args, step=step_name(self, func.__name__), **kwargs)
+        wrapper.retry_policy = policy
+        return wrapper
+    return decorator
+
+
+def element_retry(func):
+    """
+    Повтор действия элемента по его политике retry_policy (None отключает повторы)
+
+    Перед повтором элемент забывает найденный ранее WebElement, чтобы найти его заново.
+    Элемент, созданный из готового WebElement (например, элемент ElementGroup), заново
+    найти нельзя, поэтому устаревшая ссылка на него не повторяется.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        policy = self.retry_policy
+        if policy is None:
+            return func(self, *args, **kwargs)
+        return policy.call(func, self, *args, step=step_name(self, func.__name__), on_retry=self._prepare_retry,
+                           excluded=() if self._located else (StaleElementReferenceException,), **kwargs)
+    return wrapper
@@ -0,0 +1,192 @@
+import heapq
+import sqlite3
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    worker TEXT NOT NULL,
+    started REAL NOT NULL,
+    finished REAL
+);
+CREATE TABLE IF NOT EXISTS test_results (
+    run_id INTEGER NOT NULL,
+    nodeid TEXT NOT NULL,
+    duration REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    finished REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS test_results_nodeid ON test_results (nodeid, finished);
+CREATE TABLE IF NOT EXISTS action_timings (
+    run_id INTEGER NOT NULL,
+    nodeid TEXT NOT NULL,
+    action TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    total REAL NOT NULL,
+    failures INTEGER NOT NULL,
+    finished REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS action_timings_action ON action_timings (action, finished);
+"""
+
+
+@dataclass
+class ActionTiming:
+    """Суммарное время одного действия page object (Объект.метод) за тест"""
+    calls: int = 0
+    total: float = 0.0
+    failures: int = 0
+
+    def add(self, duration: float, failed: bool):
+        self.calls += 1
+        self.total += duration
+        self.failures += int(failed)
+
+
+class TimingDatabase:
+    """
+    История длительностей тестов и действий page objects в локальной базе SQLite
+
+    База используется одновременно несколькими процессами (воркерами xdist): включен
+    режим WAL, а запись ждет освобождения блокировки до timeout секунд.
+    """
+
+    def __init__(self, path, timeout=30.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), timeout=timeout, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+
+    def start_run(self, worker="master") -> int:
+        with self._lock, self._connection:
+            cursor = self._connection.execute("INSERT INTO runs (worker, started) VALUES (?, ?)", (worker, time.time()))
+            return cursor.lastrowid
+
+    def finish_run(self, run_id: int):
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE runs SET finished = ? WHERE id = ?", (time.time(), run_id))
+
+    def record_test(self, run_id: int, nodeid: str, duration: float, outcome: str,
+                    actions: Dict[str, ActionTiming] = None):
+        """Записывает результат теста и время его действий одной транзакцией"""
+        finished = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO test_results (run_id, nodeid, duration, outcome, finished) VALUES (?, ?, ?, ?, ?)",
+                (run_id, nodeid, duration, outcome, finished)
+            )
+            self._connection.executemany(
+                "INSERT INTO action_timings (run_id, nodeid, action, calls, total, failures, finished) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, nodeid, action, timing.calls, timing.total, timing.failures, finished)
+                 for action, timing in (actions or {}).items()]
+            )
+
+    def estimated_durations(self, history=5, before: float = None) -> Dict[str, float]:
+        """Средняя длительность последних history запусков каждого теста (без пропущенных)"""
+        rows = self._query(
+            "SELECT nodeid, AVG(duration) FROM ("
+            "  SELECT nodeid, duration,"
+            "         ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY finished DESC) AS position"
+            "  FROM test_results WHERE outcome != 'skipped' AND finished < ?"
+            ") WHERE position <= ? GROUP BY nodeid",
+            (before if before is not None else time.time(), history)
+        )
+        return dict(rows)
+
+    def recent_failures(self, before: float = None) -> Set[str]:
+        """Тесты, последний запуск которых упал"""
+        rows = self._query(
+            "SELECT nodeid FROM ("
+            "  SELECT nodeid, outcome,"
+            "         ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY finished DESC) AS position"
+            "  FROM test_results WHERE outcome != 'skipped' AND finished < ?"
+            ") WHERE position = 1 AND outcome = 'failed'",
+            (before if before is not None else time.time(),)
+        )
+        return {nodeid for nodeid, in rows}
+
+    def slowest_actions(self, limit=10, since: float = 0.0) -> List[Tuple[str, int, float, int]]:
+        """Действия с наибольшим суммарным временем: (действие, вызовы, среднее время, ошибки)"""
+        return self._query(
+            "SELECT action, SUM(calls), SUM(total) / SUM(calls), SUM(failures) FROM action_timings "
+            "WHERE finished >= ? GROUP BY action ORDER BY SUM(total) DESC LIMIT ?",
+            (since, limit)
+        )
+
+    def prune(self, keep=20):
+        """Оставляет только keep последних результатов каждого теста (с их действиями) и удаляет пустые запуски"""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM test_results WHERE rowid IN ("
+                "  SELECT rowid FROM ("
+                "    SELECT rowid, ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY finished DESC) AS position"
+                "    FROM test_results"
+                "  ) WHERE position > ?"
+                ")", (keep,)
+            )
+            self._connection.execute(
+                "DELETE FROM action_timings WHERE NOT EXISTS ("
+                "  SELECT 1 FROM test_results AS result WHERE result.nodeid = action_timings.nodeid"
+                "  AND result.finished = action_timings.finished AND result.run_id = action_timings.run_id"
+                ")"
+            )
+            self._connection.execute(
+                "DELETE FROM runs WHERE finished IS NOT NULL AND id NOT IN (SELECT DISTINCT run_id FROM test_results)"
+            )
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+@dataclass
+class Shard:
+    """Группа тестов одного воркера и ее ожидаемая длительность"""
+    index: int
+    load: float = 0.0
+    keys: List[str] = field(default_factory=list)
+
+
+def lpt_schedule(durations: Dict[str, float], workers: int) -> List[Shard]:
+    """
+    Распределяет тесты по воркерам правилом LPT (longest processing time first)
+
+    Тесты по убыванию длительности по очереди отдаются наименее загруженному воркеру,
+    что дает расписание не хуже 4/3 от оптимального.
+    """
+    shards = [Shard(index) for index in range(max(1, workers))]
+    heap = [(0.0, shard.index) for shard in shards]
+    for key in sorted(durations, key=lambda key: (-durations[key], key)):
+        load, index = heapq.heappop(heap)
+        shard = shards[index]
+        shard.keys.append(key)
+        shard.load = load + durations[key]
+        heapq.heappush(heap, (shard.load, index))
+    return shards
+
+
+def fill_missing_durations(keys: Iterable[str], known: Dict[str, float], default=1.0) -> Dict[str, float]:
+    """Длительности для всех ключей; тестам без истории назначается медиана известных"""
+    keys = list(keys)
+    history = [known[key] for key in keys if key in known]
+    fallback = statistics.median(history) if history else default
+    return {key: known.get(key, fallback) for key in keys}
+
+
+def order_by_history(keys: List[str], durations: Dict[str, float], failed: Optional[Set[str]] = None) -> List[str]:
+    """Порядок запуска: сначала недавно упавшие (если переданы), затем от долгих к коротким"""
+    failed = failed or set()
+    return sorted(keys, key=lambda key: (key not in failed, -durations[key]))
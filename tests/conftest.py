@@ -1,10 +1,22 @@
 import pytest
 import logging
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
+from types import SimpleNamespace
 
 from page_object_library import DriverFactory, MultiDriverManager, PageFactory, MultiPageFactory
-from page_object_library import setup_logger
+from page_object_library import setup_logger, get_failure_buffer, configure_slow_actions
+from page_object_library import track_commands, check_command_budget, instrument_driver
+from page_object_library import ArtifactBundleStore, FailureArtifactCollector, StateResetter, HttpReset
+from page_object_library.utils.artifacts import PILLOW_AVAILABLE
+from page_object_library.testing import CommandRecorder, ReplayDriver, ReplayDivergenceError, recording_file_name
+from examples.amazon.stand_in_shop import StandInShop
+
+pytest_plugins = ["page_object_library.pytest_plugin"]
+
+LOG_LEVELS = {"DEBUG": logging.DEBUG, "INFO": logging.INFO, "WARNING": logging.WARNING, "ERROR": logging.ERROR}
 
 
 def pytest_addoption(parser):
@@ -21,33 +33,291 @@ def pytest_addoption(parser):
         "--base-url", action="store", default="https://www.amazon.com",
         help="Базовый URL для тестирования"
     )
+    parser.addoption(
+        "--stand-in-shop", action="store_true", default=False,
+        help="Запустить локальный стенд магазина и использовать его вместо --base-url"
+    )
+    parser.addoption(
+        "--stand-in-latency", action="store", type=float, default=0.0,
+        help="Искусственная задержка ответов локального стенда в секундах"
+    )
+    parser.addoption(
+        "--log-failures-only", action="store_true", default=False,
+        help="Держать логи теста в памяти и записывать на диск только для упавших тестов"
+    )
+    parser.addoption(
+        "--log-buffer-size", action="store", type=int, default=1000,
+        help="Размер кольцевого буфера логов одного теста"
+    )
+    parser.addoption(
+        "--log-keep-level", action="store", default="WARNING", type=str.upper, choices=[*LOG_LEVELS, "NONE"],
+        help="Уровень, начиная с которого записи не вытесняются из буфера (NONE - вытеснять все)"
+    )
+    parser.addoption(
+        "--slow-threshold", action="store", type=float, default=1.0,
+        help="Порог длительности действия в секундах, после которого оно считается медленным"
+    )
+    parser.addoption(
+        "--slow-action-capture", action="store_true", default=False,
+        help="Собирать диагностику (URL, readyState, запросы, скриншот элемента) для медленных действий"
+    )
+    parser.addoption(
+        "--artifact-time-limit", action="store", type=float, default=10.0,
+        help="Лимит времени в секундах на сбор артефактов падения со всех драйверов теста"
+    )
+    parser.addoption(
+        "--artifact-format", action="store", default=None, choices=["png", "jpeg", "webp"],
+        help="Формат скриншотов падений (по умолчанию webp с Pillow и png без него; jpeg и webp требуют Pillow)"
+    )
+    parser.addoption(
+        "--artifact-quality", action="store", type=int, default=70,
+        help="Качество скриншотов падений в формате jpeg/webp"
+    )
+    parser.addoption(
+        "--artifact-max-width", action="store", type=int, default=None,
+        help="Максимальная ширина скриншотов падений в пикселях (0 - без уменьшения; "
+             "по умолчанию 1280 с Pillow, без него скриншоты не уменьшаются)"
+    )
+    parser.addoption(
+        "--artifact-store-mb", action="store", type=float, default=500,
+        help="Ограничение размера хранилища артефактов падений в мегабайтах (0 - без ограничения)"
+    )
+    parser.addoption(
+        "--record-commands", action="store", default=None, metavar="DIR",
+        help="Записывать команды WebDriver и ответы каждого теста в каталог DIR"
+    )
+    parser.addoption(
+        "--replay-commands", action="store", default=None, metavar="DIR",
+        help="Воспроизводить команды WebDriver из записей в каталоге DIR без браузера"
+    )
+    parser.addoption(
+        "--replay-failed", action="store_true", default=False,
+        help="Воспроизводить записи упавших прогонов (файлы с суффиксом __failed)"
+    )
+    parser.addoption(
+        "--replay-lenient", action="store_true", default=False,
+        help="Не прерывать воспроизведение при расхождении, а пытаться продолжить и сообщить в конце теста"
+    )
+
+
+def pytest_configure(config):
+    """Настройка детектора медленных действий, сбора артефактов падений, аккаунтов и регистрация маркеров"""
+    config.addinivalue_line(
+        "markers",
+        "command_budget(max_round_trips, action='fail'): бюджет команд WebDriver на тест ('fail' или 'warn')"
+    )
+    configure_slow_actions(
+        default_threshold=config.getoption("--slow-threshold"),
+        capture=config.getoption("--slow-action-capture"),
+        capture_dir=SCREENSHOTS_DIR / "slow_actions"
+    )
+    store_mb = config.getoption("--artifact-store-mb")
+    # Без Pillow умолчания не требуют перекодирования; предупреждение только о явно заданных настройках
+    image_format = config.getoption("--artifact-format") or ("webp" if PILLOW_AVAILABLE else "png")
+    max_image_width = config.getoption("--artifact-max-width")
+    if max_image_width is None:
+        max_image_width = 1280 if PILLOW_AVAILABLE else 0
+    store = ArtifactBundleStore(
+        FAILURE_ARTIFACTS_DIR,
+        image_format=image_format,
+        image_quality=config.getoption("--artifact-quality"),
+        max_image_width=max_image_width or None,
+        max_bytes=int(store_mb * 1024 * 1024) or None
+    )
+    config.failure_artifacts = FailureArtifactCollector(store, time_limit=config.getoption("--artifact-time-limit"))
+    if config.option.accounts is None:
+        config.option.accounts = str(ACCOUNTS_FILE)
+
+
+def pytest_unconfigure(config):
+    """Дожидается фоновой записи артефактов падений"""
+    collector = getattr(config, "failure_artifacts", None)
+    if collector is not None:
+        collector.shutdown(timeout=60)
 
 
 @pytest.fixture(scope="session")
-def setup_logging():
+def setup_logging(request):
     """Настройка логирования на уровне сессии"""
-    return setup_logger()
+    keep_level_name = request.config.getoption("--log-keep-level")
+    return setup_logger(
+        failure_only=request.config.getoption("--log-failures-only"),
+        buffer_capacity=request.config.getoption("--log-buffer-size"),
+        keep_level=None if keep_level_name == "NONE" else LOG_LEVELS[keep_level_name]
+    )
+
+
+@pytest.fixture(scope="session")
+def stand_in_shop(request):
+    """Локальный стенд магазина, повторяющий DOM Amazon"""
+    with StandInShop(latency=request.config.getoption("--stand-in-latency")) as shop:
+        yield shop
+
+
+@pytest.fixture(scope="session")
+def account_default_password(request):
+    """На локальном стенде аккаунтам без пароля в окружении подставляется пароль-заглушка"""
+    if request.config.getoption("--stand-in-shop"):
+        return StandInShop.placeholder_password
+    return None
 
 
 @pytest.fixture(scope="session")
 def base_url(request):
-    """Фикстура для получения базового URL из командной строки"""
+    """Фикстура для получения базового URL из командной строки или адреса локального стенда"""
+    if request.config.getoption("--stand-in-shop"):
+        return request.getfixturevalue("stand_in_shop").url
     return request.config.getoption("--base-url")
 
 
+@pytest.fixture(scope="session")
+def state_reset(request):
+    """Сброс состояния между тестами; на локальном стенде корзина сессии очищается запросом к стенду"""
+    resetter = StateResetter()
+    if request.config.getoption("--stand-in-shop"):
+        shop = request.getfixturevalue("stand_in_shop")
+        # Вход сохраняется: снимки сессий аккаунтов остаются действительными
+        resetter.add(HttpReset(shop.reset_url, data={"scope": "cart"}, name="корзина стенда"), first=True)
+
+    yield resetter
+
+    logging.info(f"Сброс состояния между тестами: {resetter.summary()}")
+
+
+@pytest.fixture
+def command_traffic(request, monkeypatch):
+    """
+    Запись или воспроизведение трафика WebDriver теста (--record-commands / --replay-commands)
+
+    Подменяет DriverFactory.create_driver: при записи оборачивает настоящий драйвер,
+    при воспроизведении возвращает ReplayDriver из файла теста. После теста записи
+    сохраняются (упавшего - с суффиксом __failed, чтобы воспроизвести падение через
+    --replay-failed), а расхождения с записью превращаются в падение теста.
+    """
+    record_dir = request.config.getoption("--record-commands")
+    replay_dir = request.config.getoption("--replay-commands")
+    replay_failed = request.config.getoption("--replay-failed")
+    if not record_dir and not replay_dir:
+        yield None
+        return
+
+    create_driver = DriverFactory.create_driver
+    recorders, replay_drivers = {}, {}
+
+    def record_driver(browser_type="chrome", headless=False, options=None, driver_name="default"):
+        driver = create_driver(browser_type, headless, options, driver_name=driver_name)
+        recorders[driver_name] = CommandRecorder(driver, test=request.node.nodeid, driver_name=driver_name,
+                                                 browser_type=browser_type).start()
+        return driver
+
+    def replay_driver(browser_type="chrome", headless=False, options=None, driver_name="default"):
+        path = Path(replay_dir) / recording_file_name(request.node.nodeid, driver_name, failed=replay_failed)
+        if not path.exists():
+            pytest.skip(f"Нет записи команд WebDriver: {path}")
+        driver = ReplayDriver(path, strict=not request.config.getoption("--replay-lenient"))
+        instrument_driver(driver, driver_name)
+        replay_drivers[driver_name] = driver
+        return driver
+
+    monkeypatch.setattr(DriverFactory, "create_driver", staticmethod(replay_driver if replay_dir else record_driver))
+    yield recorders or replay_drivers
+
+    failed = getattr(request.node, "test_failed", False)
+    for driver_name, recorder in recorders.items():
+        recorder.stop()
+        recorder.save(Path(record_dir) / recording_file_name(request.node.nodeid, driver_name, failed=failed))
+
+    problems = []
+    for driver_name, driver in replay_drivers.items():
+        logging.info(f"Воспроизведение драйвера '{driver_name}': {driver.replay_summary()}")
+        try:
+            driver.check_replay()
+        except ReplayDivergenceError as e:
+            problems.append(f"{driver_name}: {e.msg}")
+    if problems and not failed:
+        pytest.fail("\n".join(problems), pytrace=False)
+
+
 @pytest.fixture
-def driver(setup_logging, request):
-    """Фикстура для создания одиночного драйвера"""
-    browser_type = request.config.getoption("--browser-type", default="chrome")
+def driver(setup_logging, command_traffic, state_reset, browser_type, browser_admission, request):
+    """Фикстура для создания одиночного драйвера (из пула воркера при --reuse-drivers)"""
+    # Запись и воспроизведение трафика требуют отдельного драйвера на тест, поэтому идут мимо пула
+    if request.config.getoption("--reuse-drivers") and command_traffic is None:
+        yield request.getfixturevalue("pooled_driver")
+        return
+
     headless = request.config.getoption("--headless-mode", default=False)
 
-    driver = DriverFactory.create_driver(browser_type, headless)
+    if browser_admission is None:
+        driver = DriverFactory.create_driver(browser_type, headless)
+    else:
+        driver = browser_admission.launch(lambda: DriverFactory.create_driver(browser_type, headless),
+                                          owner=request.node.nodeid)
 
     request.node.driver = driver
 
     yield driver
 
-    driver.quit()
+    # Запросы сброса не попадают в записи трафика, иначе запись зависела бы от --stand-in-shop
+    try:
+        if command_traffic is None:
+            state_reset.before_quit(driver)
+        driver.quit()
+    finally:
+        # Место браузера освобождается и при ошибке закрытия, иначе следующие запуски будут ждать допуска
+        if browser_admission is not None:
+            browser_admission.dispose(driver)
+
+
+class FakeBrowserDriver:
+    """Заглушка браузера для тестов менеджеров драйверов без запуска браузера"""
+
+    def __init__(self, name):
+        self.name = name
+        self.quit_count = 0
+        self.current_url = "about:blank"
+
+    def execute_script(self, script, *args):
+        return [self.current_url, self.name]
+
+    def quit(self):
+        self.quit_count += 1
+
+
+@pytest.fixture
+def fake_driver_startup_delay():
+    """Задержка запуска заглушки браузера в fake_drivers, в секундах"""
+    return 0.05
+
+
+@pytest.fixture
+def fake_drivers(monkeypatch, fake_driver_startup_delay):
+    """Подменяет DriverFactory.create_driver заглушкой с задержкой запуска; возвращает список созданных драйверов"""
+    created = []
+    lock = threading.Lock()
+
+    def create_driver(browser_type="chrome", headless=False, options=None, driver_name="default"):
+        time.sleep(fake_driver_startup_delay)
+        driver = FakeBrowserDriver(driver_name)
+        with lock:
+            created.append(driver)
+        return driver
+
+    monkeypatch.setattr(DriverFactory, "create_driver", staticmethod(create_driver))
+    return created
+
+
+@pytest.fixture
+def plugin_config(tmp_path):
+    """Фабрика минимальной конфигурации pytest для функций настройки плагина: plugin_config(опции, numprocesses)"""
+    def make(options, numprocesses=None, dist="no"):
+        values = {"dist": dist, **options}
+        return SimpleNamespace(
+            rootpath=tmp_path, option=SimpleNamespace(numprocesses=numprocesses), stash=pytest.Stash(),
+            getoption=lambda name, default=None: values.get(name, default),
+            pluginmanager=SimpleNamespace(register=lambda plugin, name=None: None, unregister=lambda plugin: None),
+        )
+    return make
 
 
 @pytest.fixture
@@ -57,11 +327,14 @@ def page_factory(driver, base_url):
 
 
 @pytest.fixture
-def multi_driver(setup_logging, request):
-    """Фикстура для создания менеджера нескольких драйверов"""
-    manager = MultiDriverManager()
+def multi_driver(setup_logging, command_traffic, state_reset, browser_type, browser_admission, request):
+    """Фикстура для создания менеджера нескольких драйверов (из пула воркера при --reuse-drivers)"""
+    if request.config.getoption("--reuse-drivers") and command_traffic is None:
+        yield request.getfixturevalue("pooled_multi_driver")
+        return
+
+    manager = MultiDriverManager(admission=browser_admission)
 
-    browser_type = request.config.getoption("--browser-type", default="chrome")
     headless = request.config.getoption("--headless-mode", default=False)
 
     # Создаем драйвер по умолчанию
@@ -71,13 +344,17 @@ def multi_driver(setup_logging, request):
 
     yield manager
 
-    manager.close_all_drivers()
+    try:
+        if command_traffic is None:
+            for driver in manager.get_all_drivers().values():
+                state_reset.before_quit(driver)
+    finally:
+        manager.close_all_drivers()
 
 
 @pytest.fixture
-def multi_page_factory(multi_driver, base_url, request):
+def multi_page_factory(multi_driver, base_url, browser_type, request):
     """Фикстура для фабрики страниц с несколькими драйверами и базовым URL"""
-    browser_type = request.config.getoption("--browser-type", default="chrome")
     headless = request.config.getoption("--headless-mode", default=False)
     return MultiPageFactory(
         multi_driver,
@@ -87,35 +364,83 @@ def multi_page_factory(multi_driver, base_url, request):
     )
 
 
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Считает команды WebDriver, отправленные телом теста, и проверяет бюджет"""
+    with track_commands(keep_records=False) as tracker:
+        result = yield
+
+    item.command_tracker = tracker
+    if tracker.count:
+        logging.info(f"Команды WebDriver в тесте {item.name}: {tracker.summary()}")
+
+    marker = item.get_closest_marker("command_budget")
+    if marker is not None:
+        max_round_trips = marker.kwargs.get("max_round_trips", marker.args[0] if marker.args else None)
+        try:
+            check_command_budget(tracker, max_round_trips, marker.kwargs.get("action", "fail"), item.name)
+        except AssertionError as e:
+            pytest.fail(str(e), pytrace=False)
+
+    return result
+
+
 SCREENSHOTS_DIR = Path("screenshots")
 SCREENSHOTS_DIR.mkdir(exist_ok=True)
+FAILED_LOGS_DIR = Path("logs") / "failed"
+FAILURE_ARTIFACTS_DIR = SCREENSHOTS_DIR / "failures"
+ACCOUNTS_FILE = Path(__file__).parent / "accounts.json"
+
+
+def pytest_runtest_setup(item):
+    """Очищает буфер логов перед началом теста"""
+    buffer = get_failure_buffer()
+    if buffer is not None:
+        buffer.reset()
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
-    """Хук для создания скриншота при падении теста"""
+    """Хук для сбора артефактов (скриншот, HTML, URL, лог консоли) и сохранения логов при падении теста"""
     outcome = yield
     rep = outcome.get_result()
 
-    if rep.when == "call" and rep.failed:
-        driver = item.funcargs.get("driver", None)
-        if driver is not None:
-            take_screenshot(driver, item.name)
-
-        multi_driver = item.funcargs.get("multi_driver", None)
-        if multi_driver is not None:
-            for name, driver in multi_driver.drivers.items():
-                take_screenshot(driver, f"{item.name}_{name}")
-
+    if rep.failed:
+        item.test_failed = True
 
-def take_screenshot(driver, test_name):
-    """Создает скриншот текущего состояния браузера"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{test_name}_{timestamp}.png"
-    filepath = SCREENSHOTS_DIR / filename
+    if rep.when == "teardown":
+        save_failure_log(item)
 
-    try:
-        driver.save_screenshot(str(filepath))
-        logging.info(f"Скриншот сохранен: {filepath}")
-    except Exception as e:
-        logging.error(f"Не удалось сохранить скриншот: {e}")
+    if rep.when == "call" and rep.failed:
+        drivers = failed_test_drivers(item)
+        if drivers:
+            # Ждем только запросы к браузерам (до --artifact-time-limit), запись файлов идет в фоне
+            item.failure_artifacts = item.config.failure_artifacts.capture(item.name, drivers)
+
+
+def failed_test_drivers(item):
+    """Драйверы упавшего теста {имя: драйвер} из фикстур driver и multi_driver"""
+    drivers = {}
+    driver = item.funcargs.get("driver", None)
+    if driver is not None:
+        drivers["default"] = driver
+
+    multi_driver = item.funcargs.get("multi_driver", None)
+    if multi_driver is not None:
+        for name, driver in multi_driver.get_all_drivers().items():
+            drivers[f"multi_{name}" if name in drivers else name] = driver
+    return drivers
+
+
+def save_failure_log(item):
+    """Записывает буфер логов на диск, если тест упал, и очищает буфер"""
+    buffer = get_failure_buffer()
+    if buffer is None:
+        return
+
+    if getattr(item, "test_failed", False):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        log_file = buffer.dump(FAILED_LOGS_DIR / f"{item.name}_{timestamp}.log")
+        logging.warning(f"Лог упавшего теста сохранен: {log_file}")
+
+    buffer.reset()
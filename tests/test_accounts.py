@@ -0,0 +1,114 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from page_object_library import AccountPool, AccountPoolExhausted
+from page_object_library.core import Account, AccountPasswordMissing, load_accounts
+from page_object_library.testing import FakeDriver
+
+
+@pytest.fixture
+def accounts_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEST_BUYER2_PASSWORD", "from-env")
+    path = tmp_path / "accounts.json"
+    path.write_text(json.dumps({"accounts": [
+        {"id": "buyer1", "email": "one@example.com", "password": "secret1", "region": "us"},
+        {"id": "buyer2", "email": "two@example.com", "password_env": "TEST_BUYER2_PASSWORD"},
+    ]}))
+    return path
+
+
+def test_load_accounts_reads_passwords_from_environment(accounts_file, monkeypatch):
+    first, second = load_accounts(accounts_file)
+
+    assert (first.id, first.password, first.extra) == ("buyer1", "secret1", {"region": "us"})
+    assert second.password == "from-env"
+
+    # Аккаунт без пароля в окружении пропускается или получает пароль по умолчанию
+    monkeypatch.delenv("TEST_BUYER2_PASSWORD")
+    assert [account.id for account in load_accounts(accounts_file)] == ["buyer1"]
+    assert load_accounts(accounts_file, default_password="placeholder")[1].password == "placeholder"
+
+
+def test_load_accounts_without_any_password_fails(tmp_path):
+    path = tmp_path / "accounts.json"
+    path.write_text(json.dumps({"accounts": [
+        {"id": "buyer1", "email": "one@example.com", "password_env": "TEST_MISSING_PASSWORD"},
+    ]}))
+
+    with pytest.raises(AccountPasswordMissing, match="TEST_MISSING_PASSWORD"):
+        load_accounts(path)
+
+
+def test_pools_sharing_state_lease_distinct_accounts(accounts_file):
+    # Два пула над одним каталогом ведут себя как два воркера xdist
+    first_pool = AccountPool.from_file(accounts_file, poll_interval=0.01)
+    second_pool = AccountPool.from_file(accounts_file, poll_interval=0.01)
+
+    lease = first_pool.lease("test_a")
+    other = second_pool.lease("test_b")
+
+    assert {lease.id, other.id} == {"buyer1", "buyer2"}
+    with pytest.raises(AccountPoolExhausted):
+        second_pool.lease("test_c", timeout=0.05)
+
+    lease.release()
+    assert second_pool.lease("test_c").id == lease.id
+
+
+def test_lease_many_is_all_or_nothing(accounts_file):
+    pool = AccountPool.from_file(accounts_file, poll_interval=0.01)
+    held = pool.lease("test_a")
+
+    with pytest.raises(AccountPoolExhausted):
+        pool.lease_many(2, "test_b", timeout=0.05)
+    assert pool.leased_ids() == [held.id]
+
+    held.release()
+    assert sorted(lease.id for lease in pool.lease_many(2, "test_b")) == ["buyer1", "buyer2"]
+    with pytest.raises(ValueError):
+        pool.lease_many(3)
+
+
+def test_lease_of_finished_process_is_reclaimed(accounts_file):
+    state_dir = accounts_file.parent / ".account_pool"
+    script = (
+        "import sys; from page_object_library import AccountPool; from page_object_library.core import Account; "
+        "pool = AccountPool([Account('buyer1', 'one@example.com')], sys.argv[1]); pool.lease('crashed')"
+    )
+    subprocess.run([sys.executable, "-c", script, str(state_dir)], check=True)
+
+    pool = AccountPool([Account("buyer1", "one@example.com")], state_dir)
+
+    assert pool.lease("next", timeout=0).id == "buyer1"
+
+
+def test_session_snapshot_is_reused_by_next_lease(accounts_file):
+    pool = AccountPool.from_file(accounts_file)
+    logins = []
+
+    def login(driver):
+        def log_in(account):
+            logins.append(account.id)
+            driver.add_cookie({"name": "session-id", "value": account.id})
+            return "home"
+        return log_in
+
+    with pool.lease("test_a") as lease:
+        driver = FakeDriver(base_url="http://shop.test")
+        driver.get("/")
+        assert lease.sign_in(driver, "http://shop.test/", login(driver)) == "home"
+
+    with pool.lease("test_b") as lease:
+        driver = FakeDriver(base_url="http://shop.test")
+        assert lease.sign_in(driver, "http://shop.test/", login(driver),
+                             is_signed_in=lambda: driver.get_cookie("session-id") is not None) is None
+        assert driver.get_cookie("session-id")["value"] == "buyer1"
+
+        # Сайт не признал восстановленную сессию: снимок удаляется, выполняется обычный вход
+        assert lease.sign_in(driver, "http://shop.test/", login(driver), is_signed_in=lambda: False) == "home"
+
+    assert logins == ["buyer1", "buyer1"]
+    assert (pool.stats["logins"], pool.stats["sessions_restored"]) == (2, 1)
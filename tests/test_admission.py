@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+
+import pytest
+
+from page_object_library import AdmissionTimeout, BrowserAdmission, DriverFactory, DriverPool, MultiDriverManager
+from page_object_library.core import BrowserSlots
+from page_object_library.core.admission import MACHINE_SLOTS, MB, process_tree_rss, read_available_memory
+from page_object_library.testing import FakeDriver
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "условие не выполнилось"
+        time.sleep(0.005)
+
+
+def test_manager_caps_live_browsers(fake_drivers):
+    admission = BrowserAdmission(max_browsers=2, poll_interval=0.01)
+    manager = MultiDriverManager(admission=admission)
+
+    def user(index):
+        manager.create_driver(f"user{index}")
+        time.sleep(0.02)
+        manager.close_driver(f"user{index}")
+
+    threads = [threading.Thread(target=user, args=(index,)) for index in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fake_drivers) == 5 and all(driver.quit_count == 1 for driver in fake_drivers)
+    assert admission.stats.peak_live == 2 and admission.live_count == 0
+    assert admission.stats.waits >= 3 and set(admission.stats.waits_by_owner) <= {f"user{i}" for i in range(5)}
+
+
+def test_queue_is_ordered_by_priority_then_arrival():
+    admission = BrowserAdmission(max_browsers=1, poll_interval=0.01)
+    first = admission.launch(object, owner="first")
+    order = []
+
+    def request(owner, priority):
+        driver = admission.launch(object, owner=owner, priority=priority)
+        order.append(owner)
+        admission.dispose(driver)
+
+    threads = []
+    for owner, priority in [("early", 0), ("late", 0), ("urgent", 5)]:
+        threads.append(threading.Thread(target=request, args=(owner, priority)))
+        threads[-1].start()
+        wait_for(lambda: admission.waiting == len(threads))
+
+    admission.dispose(first)
+    for thread in threads:
+        thread.join()
+
+    assert order == ["urgent", "early", "late"]
+
+
+def test_memory_gate_reserves_launching_browsers():
+    available = {"bytes": 1300 * MB}
+    admission = BrowserAdmission(min_available_mb=1000, browser_memory_mb=400, poll_interval=0.01,
+                                 available_memory=lambda: available["bytes"], tree_rss=lambda pids: {})
+
+    # Первый браузер допускается всегда, второму после него не хватит памяти
+    first = admission.launch(object, owner="first")
+    with pytest.raises(AdmissionTimeout):
+        admission.launch(object, owner="second", timeout=0.05)
+    assert (admission.stats.timeouts, admission.waiting) == (1, 0)
+
+    available["bytes"] = 1500 * MB
+    second = admission.launch(object, owner="second")
+
+    assert admission.live_count == 2
+    admission.dispose(first)
+    admission.dispose(second)
+
+
+def test_total_rss_limit_uses_measured_browsers():
+    driver = FakeDriver()
+    driver.service = type("Service", (), {"process": type("Process", (), {"pid": 4242})()})()
+    measured = []
+
+    def tree_rss(pids):
+        measured.append(list(pids))
+        return {pid: 700 * MB for pid in pids}
+
+    # Пока замер не обновлен, RSS нового браузера неизвестен и резервируется оценка 500 МБ
+    admission = BrowserAdmission(max_total_rss_mb=1000, poll_interval=60, tree_rss=tree_rss)
+    admission.launch(lambda: driver, owner="first")
+    assert admission.can_launch() and measured == []
+    admission.dispose(driver)
+
+    admission = BrowserAdmission(max_total_rss_mb=1000, poll_interval=0, tree_rss=tree_rss)
+    admission.launch(lambda: driver, owner="first")
+    assert not admission.can_launch()
+    assert measured[-1] == [4242]
+    admission.dispose(driver)
+    assert admission.can_launch()
+
+
+def test_browser_cap_is_shared_through_slots(tmp_path):
+    # Два допуска над одной базой слотов ведут себя как два воркера xdist
+    first, second = (
+        BrowserAdmission(max_browsers=2, poll_interval=0.01,
+                         slots=BrowserSlots(tmp_path / "slots.sqlite", {MACHINE_SLOTS: 2}))
+        for _ in range(2)
+    )
+    driver = first.launch(object, owner="first")
+    drivers = [second.launch(object, owner="second")]
+
+    assert not first.can_launch() and not second.can_launch()
+    with pytest.raises(AdmissionTimeout):
+        second.launch(object, owner="third", timeout=0.05)
+    assert (second.waiting, second.live_count, second.slots.busy(MACHINE_SLOTS)) == (0, 1, 2)
+
+    # Слот освобождается и после закрытия браузера, и после неудачного запуска
+    first.dispose(driver)
+    with pytest.raises(RuntimeError):
+        first.launch(lambda: (_ for _ in ()).throw(RuntimeError("браузер не запустился")), owner="broken")
+    drivers.append(second.launch(object, owner="third"))
+    assert (first.live_count, second.live_count, second.slots.busy(MACHINE_SLOTS)) == (0, 2, 2)
+
+
+def test_pool_closes_idle_driver_for_new_browser(monkeypatch):
+    launched = []
+
+    def create_driver(browser_type="chrome", headless=False, options=None, driver_name="default"):
+        launched.append(FakeDriver(base_url="http://shop.test"))
+        return launched[-1]
+
+    monkeypatch.setattr(DriverFactory, "create_driver", staticmethod(create_driver))
+    pool = DriverPool(admission=BrowserAdmission(max_browsers=1, timeout=1.0))
+    pool.release(pool.acquire("buyer"))
+
+    seller = pool.acquire("seller")
+
+    assert seller is launched[1] and launched[0].quit_count == 1
+    assert (pool.stats.evicted, pool.idle_count, pool.admission.live_count) == (1, 0, 1)
+
+
+@pytest.mark.skipif(read_available_memory() is None, reason="нет /proc")
+def test_proc_readers_measure_current_process():
+    assert read_available_memory() > 0
+    assert process_tree_rss([os.getpid()])[os.getpid()] > 0
@@ -9,7 +9,7 @@ from examples.amazon.pages import (
 )
 
 
-def test_search_add_to_cart_checkout(page_factory):
+def test_search_add_to_cart_checkout(page_factory, account):
     """
     Тест полного цикла покупки:
     1. Вход в аккаунт
@@ -21,8 +21,7 @@ def test_search_add_to_cart_checkout(page_factory):
     logging.info("=== Начало теста с добавлением элемента в корзину и проверкой стоимости ===")
 
     login_page = page_factory.create_page(AmazonLoginPage)
-    login_page.open()
-    home_page = login_page.login("vancous220@gmail.com", "MyStrongPassword")
+    home_page = login_page.sign_in(account)
 
     search_results = home_page.header.search("levoit air purifier")
 
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+from page_object_library import (
+    AsyncBaseElement, AsyncBasePage, AsyncPageFactory, BaseElement, BasePage, MultiDriverManager, MultiPageFactory,
+    auto_log
+)
+
+ACTION_DELAY = 0.1
+
+
+class SlowElement(BaseElement):
+
+    @auto_log
+    def click(self):
+        time.sleep(ACTION_DELAY)
+        return threading.current_thread().name
+
+
+class SlowPage(BasePage):
+
+    def _init_elements(self):
+        self.buy_button = SlowElement(self, ("id", "buy"), "Кнопка купить")
+
+    def open(self):
+        time.sleep(ACTION_DELAY)
+        return self
+
+    def checkout(self):
+        return self.buy_button.click()
+
+
+@pytest.fixture
+def async_factory(fake_drivers):
+    manager = MultiDriverManager()
+    factory = AsyncPageFactory(MultiPageFactory(manager, default_base_url="http://localhost"))
+    yield factory
+    factory.close()
+    manager.close_all_drivers()
+
+
+def test_sessions_run_concurrently_and_keep_log_nesting(async_factory, caplog):
+    caplog.set_level(logging.INFO)
+    users = [f"user{i}" for i in range(8)]
+
+    async def user_flow(name):
+        page = await async_factory.create_page(SlowPage, name)
+        page = await page.open()
+        assert isinstance(page, AsyncBasePage)
+        assert isinstance(page.buy_button, AsyncBaseElement)
+        return await page.checkout()
+
+    async def main():
+        start = time.perf_counter()
+        threads = await asyncio.gather(*(user_flow(name) for name in users))
+        return threads, time.perf_counter() - start
+
+    threads, elapsed = asyncio.run(main())
+
+    assert elapsed < len(users) * 2 * ACTION_DELAY / 2
+    assert len(set(threads)) == len(users)
+
+    messages = [record.getMessage() for record in caplog.records]
+    for name in users:
+        assert f"➡️  [Driver {name}] SlowPage: Вызов метода checkout" in messages
+        assert f"  ➡️  [Driver {name}] SlowElement: Клик по элементу - Кнопка купить" in messages
+
+
+def test_calls_on_one_driver_are_serialized(async_factory):
+
+    async def main():
+        page = await async_factory.create_page(SlowPage, "default")
+        start = time.perf_counter()
+        threads = await asyncio.gather(page.buy_button.click(), page.buy_button.click())
+        return threads, time.perf_counter() - start
+
+    threads, elapsed = asyncio.run(main())
+
+    assert threads[0] == threads[1]
+    assert elapsed >= 2 * ACTION_DELAY
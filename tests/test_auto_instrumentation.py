@@ -0,0 +1,70 @@
+import logging
+
+import pytest
+
+from page_object_library import BasePage, ElementGroup, no_auto_log, set_auto_log_enabled
+
+
+class InstrumentedPage(BasePage):
+    auto_log_exclude = ("excluded",)
+
+    def login(self, email):
+        return email
+
+    @no_auto_log
+    def marked(self):
+        return "marked"
+
+    def excluded(self):
+        return "excluded"
+
+    def _private(self):
+        return "private"
+
+
+class InstrumentedComponent(ElementGroup):
+
+    def search(self, search_text):
+        return search_text
+
+
+@pytest.fixture
+def page():
+    return InstrumentedPage(object(), base_url="http://localhost")
+
+
+def test_public_methods_are_wrapped_at_class_creation(page, caplog):
+    caplog.set_level(logging.INFO)
+
+    assert page.login("user@example.com") == "user@example.com"
+    assert getattr(InstrumentedPage.login, "__auto_logged__", False)
+    assert 'InstrumentedPage: Выполнение входа (email="user@example.com")' in caplog.text
+
+
+def test_opt_out_markers_and_private_methods_are_not_wrapped():
+    for name in ("marked", "excluded", "_private"):
+        assert not getattr(getattr(InstrumentedPage, name), "__auto_logged__", False)
+
+
+def test_component_methods_are_wrapped(page, caplog):
+    caplog.set_level(logging.INFO)
+
+    InstrumentedComponent(page).search("levoit")
+
+    assert 'InstrumentedComponent: Поиск (search_text="levoit")' in caplog.text
+
+
+def test_kill_switch_restores_raw_methods(page, caplog):
+    wrapped_login = InstrumentedPage.login
+    caplog.set_level(logging.INFO)
+
+    set_auto_log_enabled(False)
+    try:
+        assert InstrumentedPage.login is wrapped_login.__wrapped__
+        assert not getattr(BasePage.open, "__auto_logged__", False)
+        page.login("user@example.com")
+        assert caplog.text == ""
+    finally:
+        set_auto_log_enabled(True)
+
+    assert InstrumentedPage.login is wrapped_login
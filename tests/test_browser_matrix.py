@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import pytest
+
+from page_object_library.core.browser_matrix import (
+    BrowserSlots, BrowserSlotTimeout, interleave, limit_groups, parse_browsers, parse_limits
+)
+from page_object_library.pytest_plugin import BrowserMatrix
+
+
+def test_parse_browsers_and_limits():
+    assert parse_browsers(" Chrome, firefox,chrome") == ["chrome", "firefox"]
+    assert parse_limits("firefox=2, chrome=4") == {"firefox": 2, "chrome": 4}
+    assert parse_limits(None) == {}
+
+    with pytest.raises(ValueError):
+        parse_browsers("chrome,safari")
+    with pytest.raises(ValueError):
+        parse_limits("firefox=0")
+
+
+def test_interleave_keeps_order_within_browser():
+    assert interleave({"chrome": ["c1", "c2", "c3"], "firefox": ["f1"]}) == ["c1", "f1", "c2", "c3"]
+
+
+def test_limited_browser_is_pinned_to_limit_groups():
+    browsers = ["chrome", "firefox", "chrome", "firefox", None, "firefox"]
+
+    assert limit_groups(browsers, {"firefox": 2}) == [
+        None, "browser-firefox-0", None, "browser-firefox-1", None, "browser-firefox-0"
+    ]
+
+
+class Item:
+    def __init__(self, browser, groups=()):
+        self.callspec = SimpleNamespace(params={"browser_type": browser})
+        self.own_markers = [pytest.mark.xdist_group(name=group).mark for group in groups]
+
+    def add_marker(self, marker, append=True):
+        self.own_markers.insert(len(self.own_markers) if append else 0, marker.mark)
+
+    def get_closest_marker(self, name):
+        return next((marker for marker in self.own_markers if marker.name == name), None)
+
+
+def test_pinned_browser_group_takes_precedence():
+    items = [Item("chrome", ["lpt0"]), Item("firefox", ["lpt1"])]
+
+    BrowserMatrix(["chrome", "firefox"], {"firefox": 1}).pin_limited_items(items)
+
+    assert [item.get_closest_marker("xdist_group").kwargs["name"] for item in items] == ["lpt0", "browser-firefox-0"]
+
+
+def test_slots_limit_browser_across_processes(tmp_path):
+    # Два экземпляра над одной базой ведут себя как два воркера xdist
+    first = BrowserSlots(tmp_path / "slots.sqlite", {"firefox": 1}, poll_interval=0.01)
+    second = BrowserSlots(tmp_path / "slots.sqlite", {"firefox": 1}, poll_interval=0.01)
+
+    slot = first.acquire("firefox", "test_a")
+    assert second.acquire("chrome", "test_b") is None  # chrome без ограничения
+    with pytest.raises(BrowserSlotTimeout):
+        second.acquire("firefox", "test_b", timeout=0.05)
+
+    first.release("firefox", slot)
+    assert second.acquire("firefox", "test_b") == 0
+    assert second.busy("firefox") == 1
+
+
+def report(nodeid, when, outcome, browser, duration=1.0):
+    return SimpleNamespace(nodeid=nodeid, when=when, duration=duration, user_properties=[("browser", browser)],
+                           failed=outcome == "failed", skipped=outcome == "skipped")
+
+
+def test_results_are_counted_per_browser():
+    matrix = BrowserMatrix(["chrome", "firefox"])
+    for browser, outcomes in {"chrome": ["passed", "passed", "passed"], "firefox": ["passed", "failed", "passed"]}.items():
+        nodeid = f"tests/test_shop.py::test_cart[{browser}]"
+        for when, outcome in zip(("setup", "call", "teardown"), outcomes):
+            matrix.pytest_runtest_logreport(report(nodeid, when, outcome, browser))
+    matrix.pytest_runtest_logreport(report("tests/test_shop.py::test_search[firefox]", "setup", "skipped", "firefox"))
+    matrix.pytest_runtest_logreport(report("tests/test_shop.py::test_search[firefox]", "teardown", "passed", "firefox"))
+
+    chrome, firefox = matrix.results["chrome"], matrix.results["firefox"]
+    assert (chrome.passed, chrome.failed, chrome.duration) == (1, 0, 3.0)
+    assert (firefox.passed, firefox.failed, firefox.skipped) == (0, 1, 1)
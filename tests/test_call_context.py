@@ -0,0 +1,68 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from page_object_library import BasePage, ContextThreadPoolExecutor, bind_context, get_call_depth, get_call_stack
+
+
+class ContextPage(BasePage):
+
+    def outer(self, callback):
+        return callback()
+
+    def inner(self, barrier=None):
+        if barrier is not None:
+            barrier.wait(timeout=5)
+        return get_call_depth(), get_call_stack()
+
+
+def make_page(driver_name):
+    return ContextPage(object(), base_url="http://localhost", driver_name=driver_name)
+
+
+def test_context_is_carried_into_executor_tasks():
+    page = make_page("user1")
+
+    with ContextThreadPoolExecutor(max_workers=1) as executor:
+        depth, stack = page.outer(lambda: executor.submit(page.inner).result())
+
+    assert depth == 2
+    assert stack == ("user1:ContextPage.outer", "user1:ContextPage.inner")
+
+
+def test_plain_executor_starts_from_empty_context():
+    page = make_page("user1")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        depth, stack = page.outer(lambda: executor.submit(bind_context(page.inner)).result())
+        plain_depth, _ = page.outer(lambda: executor.submit(page.inner).result())
+
+    assert depth == 2
+    assert plain_depth == 1
+
+
+def test_concurrent_users_keep_separate_nesting():
+    pages = [make_page(f"user{i}") for i in range(4)]
+    barrier = threading.Barrier(len(pages))
+
+    with ContextThreadPoolExecutor(max_workers=len(pages)) as executor:
+        futures = [executor.submit(page.outer, lambda page=page: page.inner(barrier)) for page in pages]
+        results = [future.result() for future in futures]
+
+    for page, (depth, stack) in zip(pages, results):
+        assert depth == 2
+        assert stack == (f"{page.driver_name}:ContextPage.outer", f"{page.driver_name}:ContextPage.inner")
+
+
+def test_asyncio_tasks_keep_separate_nesting():
+    pages = [make_page(f"user{i}") for i in range(3)]
+
+    async def run_user(page):
+        return await asyncio.to_thread(page.outer, page.inner)
+
+    async def main():
+        return await asyncio.gather(*(run_user(page) for page in pages))
+
+    for page, (depth, stack) in zip(pages, asyncio.run(main())):
+        assert depth == 2
+        assert stack[0] == f"{page.driver_name}:ContextPage.outer"
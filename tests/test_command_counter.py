@@ -0,0 +1,62 @@
+import logging
+
+import pytest
+
+from page_object_library import instrument_driver, track_commands, check_command_budget
+
+
+class FakeCommandExecutor:
+    def execute(self, command, params):
+        return {"value": None}
+
+
+class FakeDriver:
+    def __init__(self):
+        self.command_executor = FakeCommandExecutor()
+
+
+def test_commands_are_counted_per_driver_and_per_scope():
+    user1, user2 = FakeDriver(), FakeDriver()
+    stats = instrument_driver(user1, "user1")
+    instrument_driver(user2, "user2")
+
+    user1.command_executor.execute("get", {"url": "http://localhost"})
+    with track_commands() as tracker:
+        user1.command_executor.execute("findElement", {"using": "css selector", "value": "#cart"})
+        user2.command_executor.execute("clickElement", None)
+
+    assert stats.count == 2
+    assert stats.by_command == {"get": 1, "findElement": 1}
+    assert tracker.count == 2
+    assert {name: driver_stats.count for name, driver_stats in tracker.by_driver.items()} == {"user1": 1, "user2": 1}
+    assert tracker.records[0].payload_size > 0
+    assert tracker.records[1].payload_size == 0
+
+
+def test_repeated_instrumentation_only_renames_driver():
+    driver = FakeDriver()
+    stats = instrument_driver(driver, "default")
+
+    assert instrument_driver(driver, "user2") is stats
+    with track_commands() as tracker:
+        driver.command_executor.execute("getTitle", None)
+
+    assert stats.count == 1
+    assert list(tracker.by_driver) == ["user2"]
+
+
+def test_command_budget_fail_and_warn(caplog):
+    driver = FakeDriver()
+    instrument_driver(driver)
+
+    with track_commands() as tracker:
+        for _ in range(3):
+            driver.command_executor.execute("getCurrentUrl", None)
+
+    assert check_command_budget(tracker, max_round_trips=3)
+    with pytest.raises(AssertionError, match="3 > 2"):
+        check_command_budget(tracker, max_round_trips=2)
+
+    caplog.set_level(logging.WARNING)
+    assert not check_command_budget(tracker, max_round_trips=2, action="warn")
+    assert "Превышен бюджет команд WebDriver" in caplog.text
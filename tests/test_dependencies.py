@@ -0,0 +1,99 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from examples.amazon.components import HeaderComponent
+from examples.amazon.pages import AmazonHomePage, AmazonLoginPage
+from page_object_library import DependencyGraph, PageFactory
+from page_object_library.core.locator import LocatorMeta
+from page_object_library.pytest_plugin import DEPENDENCY_KEY, configure_dependencies, pytest_unconfigure
+from page_object_library.testing import FakeDriver
+from page_object_library.utils import add_usage_listener, remove_usage_listener, select_affected
+from page_object_library.utils.dependencies import changed_files, class_dependencies
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def used_classes():
+    classes = set()
+    listener = add_usage_listener(classes.add)
+    yield classes
+    remove_usage_listener(listener)
+
+
+def test_pages_components_and_elements_are_reported(used_classes):
+    factory = PageFactory(FakeDriver(base_url="http://shop.test"), base_url="http://shop.test")
+
+    factory.create_page(AmazonLoginPage).navigate_to(AmazonHomePage)
+
+    assert {AmazonLoginPage, AmazonHomePage, HeaderComponent} <= used_classes
+    dependencies = {}
+    for cls in used_classes:
+        dependencies.update(class_dependencies(cls, ROOT))
+    # Классы библиотеки (Input, Button, BasePage) в граф не попадают
+    assert dependencies == {
+        "examples.amazon.pages.AmazonLoginPage": "examples/amazon/pages.py",
+        "examples.amazon.pages.AmazonHomePage": "examples/amazon/pages.py",
+        "examples.amazon.components.HeaderComponent": "examples/amazon/components.py",
+    }
+
+
+def test_graph_replaces_passed_and_merges_failed_results(tmp_path):
+    graph = DependencyGraph(tmp_path / "deps.sqlite")
+    graph.record_test("tests/test_a.py::test_a", {"pages.Login": "pages.py"})
+    graph.record_test("tests/test_a.py::test_a", {"components.Header": "components.py"}, replace=False)
+    graph.record_test("tests/test_b.py::test_b", {})
+
+    assert graph.snapshot() == {"tests/test_a.py::test_a": ["components.py", "pages.py"],
+                                "tests/test_b.py::test_b": []}
+
+    graph.record_test("tests/test_a.py::test_a", {"pages.Login": "pages.py"})
+    assert graph.tests_using("components.py") == []
+    graph.close()
+
+
+def test_select_affected_uses_graph_and_falls_back_to_all():
+    test_files = {"tests/test_a.py::test_a": "tests/test_a.py", "tests/test_b.py::test_b": "tests/test_b.py",
+                  "tests/test_c.py::test_c": "tests/test_c.py", "tests/test_new.py::test_new": "tests/test_new.py"}
+    graph = {"tests/test_a.py::test_a": ["pages.py"], "tests/test_b.py::test_b": ["components.py"],
+             "tests/test_c.py::test_c": []}
+
+    assert select_affected(test_files, graph, {"pages.py", "README.md"}) == (
+        {"tests/test_a.py::test_a", "tests/test_new.py::test_new"}, None)
+    assert select_affected(test_files, graph, {"tests/test_c.py"})[0] == {
+        "tests/test_c.py::test_c", "tests/test_new.py::test_new"}
+
+    selected, reason = select_affected(test_files, graph, {"tests/conftest.py"})
+    assert selected == set(test_files) and "tests/conftest.py" in reason
+
+
+def test_changed_files_include_uncommitted_and_new_files(tmp_path):
+    def git(*args):
+        subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                       cwd=tmp_path, check=True, capture_output=True)
+
+    git("init", "-q")
+    (tmp_path / "pages.py").write_text("A = 1\n")
+    (tmp_path / "components.py").write_text("B = 1\n")
+    git("add", ".")
+    git("commit", "-q", "-m", "init")
+
+    (tmp_path / "pages.py").write_text("A = 2\n")
+    (tmp_path / "test_new.py").write_text("")
+
+    assert changed_files(tmp_path) == {"pages.py", "test_new.py"}
+
+
+def test_dependency_graph_is_recorded_only_on_request(plugin_config, tmp_path):
+    config = plugin_config({})
+    configure_dependencies(config)
+    assert config.stash.get(DEPENDENCY_KEY, None) is None and not list(tmp_path.iterdir())
+    assert "__call__" not in vars(LocatorMeta)
+
+    config = plugin_config({"--dependency-db": "deps.sqlite"})
+    configure_dependencies(config)
+    assert "__call__" in vars(LocatorMeta)
+    pytest_unconfigure(config)
+    assert "__call__" not in vars(LocatorMeta) and (tmp_path / "deps.sqlite").exists()
@@ -0,0 +1,61 @@
+from page_object_library import SlowActionDetector
+
+
+class FakeElement:
+    def __init__(self):
+        self.screenshots = []
+
+    def screenshot(self, filename):
+        self.screenshots.append(filename)
+        return True
+
+
+class FakeDriver:
+    def __init__(self):
+        self.scripts = 0
+
+    def execute_script(self, script):
+        self.scripts += 1
+        return {"url": "http://localhost/cart", "readyState": "interactive", "pendingRequests": 2}
+
+
+class FakeElementObject:
+    def __init__(self):
+        self.driver = FakeDriver()
+        self._element = FakeElement()
+
+
+def test_per_method_thresholds():
+    detector = SlowActionDetector(default_threshold=1.0, thresholds={"click": 0.1})
+
+    assert detector.check(None, "default", "Button", "get_text", 0.5) is None
+    event = detector.check(None, "default", "Button", "click", 0.5)
+
+    assert event.threshold == 0.1
+    assert detector.get_events() == [event]
+
+
+def test_capture_collects_diagnostics_and_element_screenshot(tmp_path):
+    detector = SlowActionDetector(default_threshold=0.0, capture=True, capture_dir=tmp_path)
+    obj = FakeElementObject()
+
+    event = detector.check(obj, "default", "Button", "click", 0.5)
+
+    assert event.diagnostics["readyState"] == "interactive"
+    assert event.diagnostics["pendingRequests"] == 2
+    assert obj._element.screenshots == [event.diagnostics["screenshot"]]
+
+
+def test_capture_is_throttled_per_driver(tmp_path):
+    detector = SlowActionDetector(default_threshold=0.0, capture=True, capture_dir=tmp_path,
+                                  min_capture_interval=60, max_captures=2)
+    obj = FakeElementObject()
+
+    detector.check(obj, "default", "Page", "open", 0.5)
+    detector.check(obj, "default", "Page", "open", 0.5)
+    detector.check(obj, "user2", "Page", "open", 0.5)
+    detector.check(obj, "user3", "Page", "open", 0.5)
+
+    assert obj.driver.scripts == 2
+    assert detector.throttled == 2
+    assert len(detector.get_events()) == 4
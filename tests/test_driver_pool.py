@@ -0,0 +1,96 @@
+import pytest
+
+from page_object_library import DriverFactory, DriverPool, DriverPoolStats, PooledDriverManager
+from page_object_library.testing import FakeDriver
+
+
+@pytest.fixture
+def launched(monkeypatch):
+    """Подменяет запуск браузера на FakeDriver; возвращает список запущенных драйверов"""
+    created = []
+
+    def create_driver(browser_type="chrome", headless=False, options=None, driver_name="default"):
+        driver = FakeDriver(base_url="http://shop.test")
+        driver.name = driver_name
+        created.append(driver)
+        return driver
+
+    monkeypatch.setattr(DriverFactory, "create_driver", staticmethod(create_driver))
+    return created
+
+
+def test_driver_is_reset_and_reused(launched):
+    pool = DriverPool()
+    driver = pool.acquire()
+    driver.get("/cart")
+    driver.add_cookie({"name": "session-id", "value": "1"})
+    driver.local_storage["cart"] = "2"
+    driver.switch_to.new_window("tab")
+    driver.alert_text = "Leave site?"
+
+    pool.release(driver)
+
+    assert pool.acquire() is driver
+    assert driver.current_url == "about:blank"
+    assert driver.get_cookies() == [] and driver.local_storage == {}
+    assert driver.window_handles == [driver.current_window_handle]
+    assert driver.alert_text is None
+    assert (pool.stats.created, pool.stats.reused, pool.stats.resets) == (1, 1, 1)
+
+
+def test_broken_driver_is_replaced(launched):
+    pool = DriverPool()
+    driver = pool.acquire()
+    pool.release(driver)
+    driver.quit()
+
+    replacement = pool.acquire()
+
+    assert replacement is not driver and replacement is launched[1]
+    assert pool.stats.replaced == 1
+
+
+def test_driver_failing_reset_is_discarded(launched):
+    pool = DriverPool(reset=lambda driver: False)
+    driver = pool.acquire()
+
+    pool.release(driver)
+
+    assert driver.quit_count == 1
+    assert pool.idle_count == 0 and pool.stats.reset_failures == 1
+
+
+def test_drivers_are_pooled_by_name_and_limited_by_uses(launched):
+    pool = DriverPool(max_uses=2)
+    default, user2 = pool.acquire("default"), pool.acquire("user2")
+    pool.release(default)
+    pool.release(user2)
+
+    assert pool.acquire("user2") is user2
+    pool.release(user2)
+
+    assert user2.quit_count == 1 and pool.stats.retired == 1
+    assert pool.acquire("user2") is launched[2]
+
+
+def test_pooled_manager_returns_drivers_to_pool(launched):
+    pool = DriverPool()
+    manager = PooledDriverManager(pool)
+    manager.create_driver("default")
+    manager.create_driver("user2")
+
+    manager.close_all_drivers()
+
+    assert pool.idle_count == 2 and pool.leased_count == 0
+    assert all(driver.quit_count == 0 for driver in launched)
+    assert PooledDriverManager(pool).create_driver("user2") is launched[1]
+
+    pool.close_all()
+    assert all(driver.quit_count == 1 for driver in launched)
+
+
+def test_stats_merge_and_summary():
+    total = DriverPoolStats(created=1, reused=3).merge(DriverPoolStats(created=2, reused=2, replaced=1))
+
+    assert (total.created, total.reused, total.replaced) == (3, 5, 1)
+    assert "переиспользовано 5, 62%" in total.summary()
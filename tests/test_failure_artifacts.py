@@ -0,0 +1,150 @@
+import base64
+import io
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from page_object_library import ArtifactBundleStore, DirectoryArtifactStore, FailureArtifactCollector
+from page_object_library.utils.artifacts import DriverArtifacts
+from page_object_library.testing import FakeDriver, document, el
+
+
+class SlowDriver(FakeDriver):
+    """FakeDriver с медленным скриншотом и логом консоли, как у Chromium"""
+
+    def __init__(self, delay):
+        super().__init__({"/cart": document(el("h1", "Cart"), title="Cart")}, base_url="http://shop.test")
+        self.delay = delay
+        self.get("/cart")
+
+    def get_screenshot_as_base64(self):
+        time.sleep(self.delay)
+        return super().get_screenshot_as_base64()
+
+    def get_log(self, log_type):
+        return [{"level": "SEVERE", "message": "Uncaught TypeError"}]
+
+
+@pytest.fixture
+def collector(tmp_path):
+    collector = FailureArtifactCollector(DirectoryArtifactStore(tmp_path), time_limit=2)
+    yield collector
+    collector.shutdown()
+
+
+def test_drivers_are_captured_concurrently(collector, tmp_path):
+    drivers = {f"user{index}": SlowDriver(0.2) for index in range(4)}
+
+    start_time = time.monotonic()
+    capture = collector.capture("test_checkout", drivers)
+    elapsed = time.monotonic() - start_time
+
+    assert elapsed < 0.6
+    paths = capture.wait(timeout=5)
+    assert len(paths) == 12
+    metadata = json.loads((tmp_path / f"test_checkout_user0_{capture.timestamp}.json").read_text(encoding="utf-8"))
+    assert metadata["url"] == "http://shop.test/cart"
+    assert metadata["console_log"][0]["level"] == "SEVERE"
+    assert "<h1>Cart</h1>" in (tmp_path / f"test_checkout_user0_{capture.timestamp}.html").read_text(encoding="utf-8")
+    assert (tmp_path / f"test_checkout_user0_{capture.timestamp}.png").read_bytes().startswith(b"\x89PNG")
+
+
+def test_capture_is_capped_by_time_limit(tmp_path):
+    collector = FailureArtifactCollector(DirectoryArtifactStore(tmp_path), time_limit=0.2)
+
+    start_time = time.monotonic()
+    capture = collector.capture("test_slow", {"default": SlowDriver(1), "fast": SlowDriver(0)})
+
+    assert time.monotonic() - start_time < 0.6
+    assert capture.timed_out == ["default"]
+    slow = next(item for item in capture.artifacts if item.driver_name == "default")
+    assert slow.url == "http://shop.test/cart" and slow.screenshot_base64 is None
+    assert "capture" in slow.errors
+    collector.shutdown(timeout=5)
+
+
+def test_errors_are_recorded_per_step(collector):
+    driver = FakeDriver()
+    driver.quit()
+
+    capture = collector.capture("test_dead", {"default": driver})
+
+    assert set(capture.artifacts[0].errors) == {"url", "screenshot_base64", "page_source"}
+    assert [path.suffix for path in capture.wait(timeout=5)] == [".json"]
+
+
+def driver_artifacts(name, page_source, screenshot=b"\x89PNG-fake"):
+    return DriverArtifacts(name, url="http://shop.test/cart", page_source=page_source,
+                           screenshot_base64=base64.b64encode(screenshot).decode("ascii"))
+
+
+def test_bundle_store_deduplicates_content(tmp_path):
+    store = ArtifactBundleStore(tmp_path)
+
+    first, = store.save("test_cart[1]", "20240101_000000", [driver_artifacts("default", "<html>cart</html>")])
+    second, = store.save("test_cart[2]", "20240101_000000", [driver_artifacts("default", "<html>cart</html>")])
+
+    assert len(list((tmp_path / "objects").iterdir())) == 2
+    assert store.stats["objects_reused"] == 2
+    manifest = store.load_bundle(second)
+    assert manifest["test"] == "test_cart[2]" and manifest["drivers"][0]["url"] == "http://shop.test/cart"
+    assert store.read_object(manifest["drivers"][0]["page_source"]) == b"<html>cart</html>"
+    assert store.load_bundle(first)["drivers"][0]["screenshot"] == manifest["drivers"][0]["screenshot"]
+
+
+def test_bundle_store_evicts_oldest(tmp_path):
+    store = ArtifactBundleStore(tmp_path, max_bytes=6000)
+    paths = []
+    for index in range(5):
+        page = "".join(f"<p>{index}-{line}</p>" for line in range(300)) + os.urandom(800).hex()
+        paths += store.save(f"test_{index}", "20240101_000000", [driver_artifacts("default", page, os.urandom(500))])
+        os.utime(paths[-1], (index, index))
+
+    assert store.size <= 6000
+    assert store.stats["evicted_bundles"] >= 1
+    assert not paths[0].exists() and paths[-1].exists()
+    remaining = {ref for path in paths if path.exists() for ref in store._references(path)}
+    assert {f"objects/{path.name}" for path in (tmp_path / "objects").iterdir()} == remaining
+
+
+def test_bundle_store_saves_are_serialized(tmp_path, monkeypatch):
+    # Два потока записи коллектора: вытеснение не должно удалить объект, который переиспользует соседняя запись
+    store = ArtifactBundleStore(tmp_path, max_bytes=2000)
+    active, overlaps = [], []
+    write_atomic = store._write_atomic
+
+    def slow_write(path, data):
+        active.append(path)
+        overlaps.append(len(active))
+        time.sleep(0.01)
+        write_atomic(path, data)
+        active.remove(path)
+
+    monkeypatch.setattr(store, "_write_atomic", slow_write)
+    threads = [threading.Thread(target=store.save, args=(f"test_{index}", "20240101_000000",
+                                                         [driver_artifacts("default", "<html>cart</html>")]))
+               for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(overlaps) == 1
+    references = {ref for path in (tmp_path / "bundles").iterdir() for ref in store._references(path)}
+    assert references and all((tmp_path / reference).exists() for reference in references)
+
+
+def test_bundle_store_downscales_screenshots(tmp_path):
+    image_module = pytest.importorskip("PIL.Image")
+    output = io.BytesIO()
+    image_module.new("RGB", (2000, 1000), "white").save(output, "PNG")
+    store = ArtifactBundleStore(tmp_path, image_format="webp", max_image_width=500)
+
+    path, = store.save("test_wide", "20240101_000000", [driver_artifacts("default", "<html/>", output.getvalue())])
+
+    reference = store.load_bundle(path)["drivers"][0]["screenshot"]
+    assert reference.endswith(".webp")
+    assert image_module.open(tmp_path / reference).size == (500, 250)
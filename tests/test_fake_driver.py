@@ -0,0 +1,183 @@
+import time
+
+import pytest
+from selenium.common.exceptions import InvalidSelectorException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from examples.amazon.components import ProductDetailsComponent
+from examples.amazon.pages import AmazonCartPage, AmazonHomePage, AmazonProductPage, AmazonSearchResultsPage
+from page_object_library import instrument_driver, track_commands
+from page_object_library.testing import FakeDriver, document, el, find_all
+
+BASE_URL = "http://shop.test"
+
+
+def header():
+    return el("form",
+              el("input", id="twotabsearchtextbox", name="k", type="text"),
+              el("input", id="nav-search-submit-button", type="submit", value="Go"),
+              el("a", "Account", id="nav-link-accountList", href="/ap/signin"),
+              el("a", "Cart", id="nav-cart", href="/gp/cart/view.html"),
+              action="/s", method="get")
+
+
+def search_results(driver, url):
+    return document(header(), *[
+        el("div", el("a", el("span", f"Levoit Air Purifier {index}", class_="a-size-medium"),
+                     href=f"/dp/B0{index}"),
+           class_="s-result-item")
+        for index in range(3)
+    ], title="Amazon.com : search")
+
+
+def product_page(*price):
+    return document(header(),
+                    el("span", "Levoit Air Purifier", id="productTitle"),
+                    *price,
+                    el("input", id="add-to-cart-button", type="submit", value="Add to Cart"),
+                    title="Amazon.com: Levoit")
+
+
+def cart_page(*prices):
+    items = [el("div",
+                el("span", f"Item {index}", class_="a-truncate-cut"),
+                el("span", price, class_="sc-price"),
+                el("input", type="submit", value="Delete"),
+                class_="sc-list-item")
+             for index, price in enumerate(prices)]
+    return document(header(), *items,
+                    el("div", el("span", "$1,234.50"), id="sc-subtotal-amount-activecart"),
+                    title="Amazon.com Shopping Cart")
+
+
+@pytest.fixture
+def fake_driver():
+    return FakeDriver({"/": document(header(), title="Amazon.com"), "/s": search_results},
+                      base_url=BASE_URL)
+
+
+def open_product(driver, *price):
+    driver.add_page("/dp/B01", product_page(*price))
+    driver.get("/dp/B01")
+    return AmazonProductPage(driver, base_url=BASE_URL, driver_name="fake")
+
+
+@pytest.mark.parametrize("price, expected", [
+    ((el("span", el("span", "12", class_="a-price-whole"), el("span", "99", class_="a-price-fraction"),
+         class_="a-price"),), 12.99),
+    ((el("span", el("span", "$1,024.50", class_="a-offscreen"), class_="a-price"),), 1024.5),
+    ((el("span", "$7.25", id="priceblock_ourprice"),), 7.25),
+])
+def test_product_price_fallbacks(fake_driver, price, expected):
+    page = open_product(fake_driver, *price)
+
+    assert page.get_product_price_as_float() == expected
+
+
+def test_product_price_missing_fails_fast(fake_driver):
+    page = open_product(fake_driver)
+
+    start_time = time.perf_counter()
+    with pytest.raises(Exception, match="Не удалось найти цену"):
+        page.get_product_price()
+    assert time.perf_counter() - start_time < 1
+
+
+def test_parse_price_to_float():
+    assert ProductDetailsComponent.parse_price_to_float(" $12,123.45 ") == 12123.45
+
+
+def test_search_and_select_product(fake_driver):
+    home = AmazonHomePage(fake_driver, base_url=BASE_URL, driver_name="fake").open()
+    fake_driver.add_page("/dp/B00", product_page())
+
+    results = home.header.search("levoit air purifier")
+    assert isinstance(results, AmazonSearchResultsPage)
+    assert fake_driver.current_url == f"{BASE_URL}/s?k=levoit+air+purifier"
+
+    product = results.select_product(0)
+    assert isinstance(product, AmazonProductPage)
+    assert product.get_product_title() == "Levoit Air Purifier"
+
+
+def test_select_product_out_of_range(fake_driver):
+    fake_driver.get("/s?k=levoit")
+    results = AmazonSearchResultsPage(fake_driver, base_url=BASE_URL, driver_name="fake")
+
+    with pytest.raises(ValueError, match="индексом 5"):
+        results.select_product(5)
+
+
+def test_cart_items_and_subtotal(fake_driver):
+    fake_driver.add_page("/gp/cart/view.html", cart_page("$19.99", "$5.00"))
+    cart = AmazonCartPage(fake_driver, base_url=BASE_URL, driver_name="fake").open()
+
+    assert cart.get_cart_items_count() == 2
+    assert cart.get_subtotal_as_float() == 1234.5
+
+
+def test_commands_are_counted(fake_driver):
+    instrument_driver(fake_driver, "fake")
+    with track_commands() as tracker:
+        AmazonHomePage(fake_driver, base_url=BASE_URL, driver_name="fake").open()
+
+    assert tracker.total.by_command["get"] == 1
+    assert tracker.total.by_command["w3cExecuteScript"] >= 1
+
+
+def test_element_goes_stale_after_navigation(fake_driver):
+    fake_driver.get("/")
+    search_input = fake_driver.find_element(By.ID, "twotabsearchtextbox")
+    fake_driver.get("/s?k=x")
+
+    with pytest.raises(StaleElementReferenceException):
+        search_input.send_keys("levoit")
+
+
+def test_missing_element_raises_timeout_immediately(fake_driver):
+    fake_driver.get("/")
+
+    with pytest.raises(TimeoutException):
+        fake_driver.find_element(By.ID, "missing")
+
+
+def test_form_controls():
+    driver = FakeDriver({"/": document(
+        el("input", type="checkbox", id="gift"),
+        el("input", type="radio", name="ship", value="fast", id="fast", checked=True),
+        el("input", type="radio", name="ship", value="slow", id="slow"),
+        el("select", el("option", "One", value="1"), el("option", "Two", value="2"), id="qty"),
+        el("button", "Hidden", id="hidden", style="display: none"),
+    )})
+    driver.get("/")
+
+    driver.find_element(By.ID, "gift").click()
+    driver.find_element(By.ID, "slow").click()
+    driver.find_element(By.CSS_SELECTOR, "#qty option:nth-child(2)").click()
+
+    assert driver.find_element(By.ID, "gift").is_selected()
+    assert not driver.find_element(By.ID, "fast").is_selected()
+    assert driver.find_element(By.ID, "qty").get_attribute("value") == "2"
+    assert not driver.find_element(By.ID, "hidden").is_displayed()
+
+
+@pytest.mark.parametrize("selector, expected", [
+    ("div.item > span", ["a", "b"]),
+    ("div span", ["a", "b", "c"]),
+    ("span:first-child", ["a", "c"]),
+    ("span[data-kind^='pri'], .other span", ["b", "c"]),
+    ("div.item span + span", ["b"]),
+    ("span:not([data-kind])", ["a", "c"]),
+])
+def test_css_selectors(selector, expected):
+    root = document(
+        el("div", el("span", "a"), el("span", "b", data_kind="price"), class_="item"),
+        el("div", el("p", el("span", "c")), class_="other"),
+    )
+
+    assert [node.text_content() for node in find_all(root, By.CSS_SELECTOR, selector)] == expected
+
+
+def test_invalid_selector():
+    with pytest.raises(InvalidSelectorException):
+        find_all(document(), By.CSS_SELECTOR, "div >")
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from page_object_library import BasePage, MultiDriverManager, MultiPageFactory
+from page_object_library.load import LoadProfile, LoadRunner, Scenario, percentile
+
+
+class CatalogPage(BasePage):
+
+    def browse(self):
+        time.sleep(0.01)
+
+    def buy(self):
+        raise RuntimeError("нет в наличии")
+
+
+def browse(user):
+    user.create_page(CatalogPage).browse()
+
+
+def buy(user):
+    user.create_page(CatalogPage).buy()
+
+
+@pytest.fixture
+def multi_factory(fake_drivers):
+    manager = MultiDriverManager()
+    yield MultiPageFactory(manager, default_base_url="http://localhost")
+    manager.close_all_drivers()
+
+
+def test_percentile_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_iterations_mode_collects_per_action_metrics(multi_factory, fake_drivers):
+    scenarios = [Scenario("browse", browse, weight=3), Scenario("buy", buy, weight=1)]
+    runner = LoadRunner(multi_factory, scenarios, LoadProfile(users=3, iterations=8, seed=1))
+
+    report = runner.run()
+
+    assert report.iterations == 24
+    assert sum(row["count"] for row in report.scenarios.values()) == 24
+    assert report.errors == report.scenarios["buy"]["errors"] == report.scenarios["buy"]["count"]
+    assert report.actions["CatalogPage.browse"]["count"] == report.scenarios["browse"]["count"]
+    assert report.actions["CatalogPage.browse"]["p50"] >= 0.01
+    assert sorted(driver.name for driver in fake_drivers) == ["vu0", "vu1", "vu2"]
+    assert all(driver.quit_count == 1 for driver in fake_drivers)
+    assert "CatalogPage.browse" in report.format_table()
+
+
+def test_duration_mode_with_ramp_up_and_down(multi_factory):
+    profile = LoadProfile(users=2, duration=0.4, ramp_up=0.2, ramp_down=0.2, seed=1)
+
+    start = time.perf_counter()
+    report = LoadRunner(multi_factory, [Scenario("browse", browse)], profile).run()
+
+    assert time.perf_counter() - start < 1.0
+    assert report.iterations > 0
+    assert profile.start_delay(1) == pytest.approx(0.1)
+    assert profile.stop_time(0, 0.0) == pytest.approx(0.3)
+    assert profile.stop_time(1, 0.0) == pytest.approx(0.4)
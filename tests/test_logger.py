@@ -0,0 +1,67 @@
+import logging
+
+from page_object_library import RingBufferHandler, setup_logger
+
+
+def make_logger(handler):
+    logger = logging.getLogger(f"ring_buffer_test_{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    return logger
+
+
+def test_ring_buffer_evicts_oldest_but_keeps_warnings():
+    handler = RingBufferHandler(capacity=3, keep_level=logging.WARNING)
+    logger = make_logger(handler)
+
+    logger.info("info 1")
+    logger.warning("warning 1")
+    for i in range(2, 6):
+        logger.info(f"info {i}")
+
+    messages = [record.getMessage() for record in handler.get_records()]
+    assert messages == ["warning 1", "info 3", "info 4", "info 5"]
+    assert handler.dropped == 2
+
+
+def test_ring_buffer_without_keep_level_evicts_everything():
+    handler = RingBufferHandler(capacity=2, keep_level=None)
+    logger = make_logger(handler)
+
+    logger.error("error 1")
+    logger.info("info 1")
+    logger.info("info 2")
+
+    assert [record.getMessage() for record in handler.get_records()] == ["info 1", "info 2"]
+
+
+def test_ring_buffer_dump_and_reset(tmp_path):
+    handler = RingBufferHandler(capacity=10)
+    logger = make_logger(handler)
+
+    logger.info("➡️  шаг теста")
+    log_file = handler.dump(tmp_path / "failed" / "test.log")
+
+    assert "➡️  шаг теста" in log_file.read_text(encoding="utf-8")
+
+    handler.reset()
+    assert len(handler) == 0
+
+
+def test_failure_only_mode_outputs_only_kept_records(tmp_path):
+    root_logger = logging.getLogger()
+    saved_handlers, saved_level = root_logger.handlers[:], root_logger.level
+    try:
+        setup_logger(log_dir=tmp_path, failure_only=True, keep_level=logging.ERROR)
+        handlers = root_logger.handlers[:]
+    finally:
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+            handler.close()
+        for handler in saved_handlers:
+            root_logger.addHandler(handler)
+        root_logger.setLevel(saved_level)
+
+    # Кроме буфера, обработчики получают только записи, которые сохраняются и для прошедших тестов
+    assert {handler.level for handler in handlers if not isinstance(handler, RingBufferHandler)} == {logging.ERROR}
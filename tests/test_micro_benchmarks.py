@@ -0,0 +1,29 @@
+from benchmarks.baseline import compare
+from benchmarks.micro import normalize_baseline, run
+
+
+def test_micro_benchmarks_smoke():
+    results = run(repeat=1, scale=0.001)
+
+    assert "auto_log_call" in results and "page_factory_create_cached" in results
+    assert all(metrics["ns_per_op"] > 0 for metrics in results.values())
+
+
+def test_compare_reports_only_regressions_above_tolerance():
+    baseline = {"results": {"fast": {"ns_per_op": 100.0}, "slow": {"ns_per_op": 100.0}}}
+    results = {"fast": {"ns_per_op": 110.0}, "slow": {"ns_per_op": 150.0}, "new": {"ns_per_op": 1.0}}
+
+    regressions = compare(results, baseline, ["ns_per_op"], tolerance_percent=25)
+
+    assert len(regressions) == 1 and regressions[0].startswith("slow.ns_per_op")
+
+
+def test_baseline_is_scaled_to_current_machine():
+    baseline = {"calibration_ns": 1000.0,
+                "results": {"cpu": {"ns_per_op": 100.0, "peak_bytes_per_op": 50.0}, "latency": {"ns_per_op": 100.0}}}
+
+    normalized = normalize_baseline(baseline, 2000.0, skip={"latency"})
+
+    assert normalized["results"] == {"cpu": {"ns_per_op": 200.0, "peak_bytes_per_op": 50.0},
+                                     "latency": {"ns_per_op": 100.0}}
+    assert normalize_baseline({"results": {}}, 2000.0) == {"results": {}}
@@ -2,7 +2,7 @@ import logging
 from examples.amazon.pages import AmazonLoginPage
 
 
-def test_two_users_parallel_shopping(multi_page_factory):
+def test_two_users_parallel_shopping(multi_page_factory, accounts):
     """
     Улучшенный тест параллельной работы двух пользователей:
     - Драйверы создаются автоматически при создании страниц
@@ -10,16 +10,15 @@ def test_two_users_parallel_shopping(multi_page_factory):
     - В логах отображаются понятные имена драйверов
     """
     logging.info("=== Начало улучшенного теста с двумя пользователями ===")
+    account_user1, account_user2 = accounts(2)
 
     logging.info(">>> Пользователь 1: создаем страницу логина")
     login_page_user1 = multi_page_factory.create_page(AmazonLoginPage, "default")
-    login_page_user1.open()
-    home_page_user1 = login_page_user1.login("vancous220@gmail.com", "MyStrongPassword")
+    home_page_user1 = login_page_user1.sign_in(account_user1)
 
     logging.info(">>> Пользователь 2: создаем страницу логина")
     login_page_user2 = multi_page_factory.create_page(AmazonLoginPage, "user2")
-    login_page_user2.open()
-    home_page_user2 = login_page_user2.login("test_user2@example.com", "Password123")
+    home_page_user2 = login_page_user2.sign_in(account_user2)
 
     logging.info(">>> Пользователь 3: создаем страницу логина в Firefox")
     login_page_user3 = multi_page_factory.create_page(
@@ -74,3 +73,42 @@ def test_two_users_parallel_shopping(multi_page_factory):
         "Товар в корзине пользователя 2 не соответствует выбранному"
 
     logging.info("✅ Улучшенный тест успешно завершен - драйверы создавались автоматически!")
+
+
+def test_two_users_concurrent_shopping(multi_page_factory, accounts):
+    """
+    Те же шаги двух пользователей, но каждый пользователь выполняется в своем потоке:
+    - Общее время равно времени самого долгого пользователя, а не сумме
+    - Пользователи синхронизируются перед проверкой корзин
+    """
+    logging.info("=== Начало теста с двумя пользователями, работающими одновременно ===")
+
+    search_query = "levoit air purifier"
+
+    def shopping_flow(lease, product_index):
+        def flow(user):
+            home_page = user.create_page(AmazonLoginPage).sign_in(lease)
+
+            product_page = home_page.header.search(search_query).select_product(product_index)
+            product_title = product_page.get_product_title()
+            product_page.add_to_cart()
+
+            user.sync("added_to_cart", timeout=60)
+
+            cart_items = home_page.header.go_to_cart().get_cart_items()
+            assert len(cart_items) == 1, \
+                f"Ожидался 1 товар в корзине пользователя {user.driver_name}, найдено {len(cart_items)}"
+            return product_title, cart_items[0].get_title()
+        return flow
+
+    account_user1, account_user2 = accounts(2)
+    results = multi_page_factory.run_parallel({
+        "default": shopping_flow(account_user1, 0),
+        "user2": shopping_flow(account_user2, 1),
+    }, raise_on_error=True)
+
+    for name, result in results.items():
+        product_title, cart_item_title = result.result
+        logging.info(f"Пользователь {name} выбрал: {product_title[:50]}... за {result.duration:.2f}с")
+        assert cart_item_title in product_title or product_title in cart_item_title, \
+            f"Товар в корзине пользователя {name} не соответствует выбранному"
@@ -0,0 +1,104 @@
+import gc
+
+from page_object_library import BasePage, PageFactory
+from page_object_library.core.base_page import DOCUMENT_IDENTITY_SCRIPT
+from page_object_library.testing import FakeDriver
+
+
+class NavigatingDriver:
+    """Драйвер, у которого каждый переход создает новый документ"""
+
+    def __init__(self):
+        self.current_url = "http://localhost/"
+        self.document_id = 0
+        self.scripts = 0
+
+    def get(self, url):
+        self.current_url = url
+        self.document_id += 1
+
+    def execute_script(self, script):
+        self.scripts += 1
+        if "readyState" in script:
+            return "complete"
+        return [self.current_url, str(self.document_id)]
+
+
+class HomePage(BasePage):
+    pass
+
+
+class CartPage(BasePage):
+    DEFAULT_URL = "/cart"
+
+
+class ProductPage(BasePage):
+    pass
+
+
+def test_cache_hit_and_navigation_invalidation():
+    driver = NavigatingDriver()
+    factory = PageFactory(driver, base_url="http://localhost")
+
+    home = factory.create_page(HomePage).open()
+    assert factory.create_page(HomePage) is home
+
+    driver.get("http://localhost/cart")
+    assert factory.create_page(HomePage) is not home
+
+    stats = factory.cache_stats
+    assert (stats.hits, stats.misses, stats.invalidations) == (1, 2, 1)
+
+
+def test_unopened_pages_are_served_without_browser_requests():
+    driver = NavigatingDriver()
+    factory = PageFactory(driver, base_url="http://localhost")
+
+    product = factory.create_page(ProductPage)
+    driver.get("http://localhost/product")
+
+    assert factory.create_page(ProductPage) is product
+    assert driver.scripts == 0
+
+
+def test_create_then_open_cycles_hit_the_cache():
+    driver = FakeDriver(base_url="http://localhost")
+    driver.add_page("/cart", "<html><body>Корзина</body></html>")
+    identity_checks = []
+    read_identity = driver.scripts[DOCUMENT_IDENTITY_SCRIPT]
+    driver.register_script(DOCUMENT_IDENTITY_SCRIPT, lambda d: identity_checks.append(1) or read_identity(d))
+    factory = PageFactory(driver, base_url="http://localhost")
+
+    pages = [factory.create_page(CartPage).open() for _ in range(3)]
+
+    # Первая страница открывается по промаху; проверка документа нужна только двум попаданиям
+    assert pages[0] is pages[1] is pages[2]
+    assert (factory.cache_stats.hits, factory.cache_stats.misses) == (2, 1)
+    assert len(identity_checks) == 3 + 2
+
+
+def test_lru_eviction():
+    driver = NavigatingDriver()
+    factory = PageFactory(driver, base_url="http://localhost", cache_size=2)
+
+    home = factory.create_page(HomePage)
+    cart = factory.create_page(CartPage)
+    factory.create_page(HomePage)
+    product = factory.create_page(ProductPage)
+
+    assert factory.cache_stats.evictions == 1
+    assert factory.create_page(HomePage) is home
+    assert factory.create_page(CartPage) is not cart
+    assert product is not None
+
+
+def test_cache_holds_weak_references_and_respects_ttl():
+    driver = NavigatingDriver()
+    factory = PageFactory(driver, base_url="http://localhost", cache_ttl=0)
+
+    factory.create_page(HomePage)
+    gc.collect()
+    factory.create_page(HomePage)
+
+    assert factory.cache_stats.expirations == 1
+    assert factory.cache_stats.hits == 0
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from page_object_library import BasePage, MultiDriverManager, MultiPageFactory, ParallelScenarioError
+
+STEP_DELAY = 0.2
+
+
+class HomePage(BasePage):
+    pass
+
+
+@pytest.fixture
+def multi_factory(fake_drivers):
+    manager = MultiDriverManager()
+    yield MultiPageFactory(manager, default_base_url="http://localhost")
+    manager.close_all_drivers()
+
+
+def shopping_flow(events):
+    def flow(user):
+        page = user.create_page(HomePage)
+        time.sleep(STEP_DELAY)
+        events.append((user.driver_name, "logged_in"))
+        user.sync("logged_in")
+        events.append((user.driver_name, "after_sync"))
+        return page.driver_name, threading.current_thread().name
+    return flow
+
+
+def test_flows_run_concurrently_on_own_drivers(multi_factory, fake_driver_startup_delay):
+    events = []
+    flow = shopping_flow(events)
+
+    start = time.perf_counter()
+    results = multi_factory.run_parallel({"user1": flow, "user2": flow, "user3": flow})
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 2 * (STEP_DELAY + fake_driver_startup_delay)
+    assert all(result.ok for result in results.values())
+    assert {name: result.result[0] for name, result in results.items()} == {
+        "user1": "user1", "user2": "user2", "user3": "user3"
+    }
+    assert len({result.result[1] for result in results.values()}) == 3
+    assert all(result.duration >= STEP_DELAY for result in results.values())
+
+    # Ни один пользователь не прошел точку синхронизации раньше, чем все до нее дошли
+    assert [event for _, event in events] == ["logged_in"] * 3 + ["after_sync"] * 3
+
+
+def test_failure_breaks_sync_points_and_is_collected(multi_factory):
+    def failing(user):
+        raise RuntimeError("товар не найден")
+
+    def waiting(user):
+        user.sync("checkout", timeout=5)
+
+    results = multi_factory.run_parallel({"user1": failing, "user2": waiting})
+
+    assert isinstance(results["user1"].exception, RuntimeError)
+    assert isinstance(results["user2"].exception, threading.BrokenBarrierError)
+
+    with pytest.raises(ParallelScenarioError, match="товар не найден"):
+        multi_factory.run_parallel({"user1": failing, "user2": waiting}, raise_on_error=True)
+
+
+def test_interrupt_is_propagated_instead_of_collected(multi_factory):
+    def interrupted(user):
+        raise SystemExit(2)
+
+    def waiting(user):
+        user.sync("checkout", timeout=5)
+
+    start = time.perf_counter()
+    with pytest.raises(SystemExit):
+        multi_factory.run_parallel({"user1": interrupted, "user2": waiting})
+
+    # Точки синхронизации сломаны, поэтому второй пользователь не ждет до таймаута
+    assert time.perf_counter() - start < 5
+
+
+def test_async_flavor(multi_factory):
+    events = []
+    flow = shopping_flow(events)
+
+    results = asyncio.run(multi_factory.run_parallel_async({"user1": flow, "user2": flow}))
+
+    assert sorted(results) == ["user1", "user2"]
+    assert all(result.ok for result in results.values())
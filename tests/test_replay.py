@@ -0,0 +1,131 @@
+import gzip
+import json
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.options import ArgOptions
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from page_object_library.testing import (
+    CommandRecording, ReplayDivergenceError, ReplayDriver, record_commands, recording_file_name
+)
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+
+class WireExecutor:
+    """Исполнитель команд, отвечающий как удаленный браузер: элемент #subtotal появляется со второго запроса"""
+
+    def __init__(self):
+        self.url = "about:blank"
+        self.lookups = 0
+
+    def execute(self, command, params):
+        if command == Command.NEW_SESSION:
+            return {"value": {"sessionId": "live-1", "capabilities": {"browserName": "wire"}}}
+        if command == Command.GET:
+            self.url = params["url"]
+            return {"value": None}
+        if command == Command.GET_CURRENT_URL:
+            return {"value": self.url}
+        if command == Command.FIND_ELEMENT:
+            self.lookups += 1
+            if self.lookups < 2:
+                return {"status": 404, "value": json.dumps({"value": {"error": "no such element", "message": "subtotal"}})}
+            return {"value": {ELEMENT_KEY: "e1"}}
+        if command == Command.GET_ELEMENT_TEXT:
+            return {"value": "$1,224.48"}
+        return {"value": None}
+
+    def close(self):
+        pass
+
+
+def scenario(driver):
+    driver.get("http://shop.test/gp/cart/view.html")
+    element = WebDriverWait(driver, 2, poll_frequency=0.01).until(
+        EC.presence_of_element_located((By.ID, "subtotal")))
+    return driver.current_url, element.text
+
+
+@pytest.fixture
+def recording():
+    driver = RemoteWebDriver(command_executor=WireExecutor(), options=ArgOptions())
+    with record_commands(driver, test="cart") as recorder:
+        assert scenario(driver) == ("http://shop.test/gp/cart/view.html", "$1,224.48")
+        driver.quit()
+    return recorder.recording
+
+
+def test_recording_roundtrip(recording, tmp_path):
+    path = recording.save(tmp_path / recording_file_name("tests/test_x.py::test[a b]", "default"))
+
+    loaded = CommandRecording.load(path)
+
+    assert path.name == "tests_test_x.py_test_a_b__default.json.gz"
+    assert recording_file_name("tests/test_x.py::test", "buyer", failed=True) == "tests_test_x.py_test__buyer__failed.json.gz"
+    assert [command.key for command in loaded.commands] == [command.key for command in recording.commands]
+    assert loaded.session["sessionId"] == "live-1"
+    assert json.loads(gzip.decompress(path.read_bytes()))["metadata"]["test"] == "cart"
+
+
+def test_replay_serves_recorded_responses(recording):
+    driver = ReplayDriver(recording)
+
+    assert scenario(driver) == ("http://shop.test/gp/cart/view.html", "$1,224.48")
+    driver.quit()
+    driver.check_replay()
+    assert driver.session_id == "live-1"
+
+
+def test_recorded_errors_are_replayed(recording):
+    driver = ReplayDriver(recording)
+    driver.get("http://shop.test/gp/cart/view.html")
+
+    with pytest.raises(NoSuchElementException):
+        driver.find_element(By.ID, "subtotal")
+
+
+def test_polling_count_may_differ(recording):
+    driver = ReplayDriver(recording)
+    driver.get("http://shop.test/gp/cart/view.html")
+    with pytest.raises(NoSuchElementException):
+        driver.find_element(By.ID, "subtotal")
+    element = driver.find_element(By.ID, "subtotal")
+
+    # Лишние опросы сверх записи отвечают последним записанным ответом
+    assert driver.current_url == driver.current_url == "http://shop.test/gp/cart/view.html"
+    assert element.text == element.text == "$1,224.48"
+    assert driver.current_url == "http://shop.test/gp/cart/view.html"
+    driver.quit()
+
+    driver.check_replay()
+    assert driver.command_executor.repeated == 3
+
+
+def test_divergence_is_reported(recording):
+    driver = ReplayDriver(recording)
+
+    with pytest.raises(ReplayDivergenceError, match="ожидалась get"):
+        driver.get("http://shop.test/")
+    assert len(driver.divergences) == 1
+
+
+def test_lenient_replay_resyncs_and_reports_unplayed_commands(recording):
+    driver = ReplayDriver(recording, strict=False)
+
+    assert driver.current_url == "http://shop.test/gp/cart/view.html"
+    with pytest.raises(ReplayDivergenceError, match="команда #0"):
+        driver.check_replay()
+
+
+def test_unplayed_commands_are_reported(recording):
+    driver = ReplayDriver(recording)
+    driver.get("http://shop.test/gp/cart/view.html")
+
+    with pytest.raises(ReplayDivergenceError, match="не воспроизведено"):
+        driver.check_replay()
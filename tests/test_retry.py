@@ -0,0 +1,119 @@
+import pytest
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
+from selenium.webdriver.common.by import By
+
+from page_object_library import BasePage, BaseElement, RetryPolicy, retry
+from page_object_library.testing import FakeDriver, document, el
+from page_object_library.utils import RetryMetrics
+
+BASE_URL = "http://shop.test"
+
+# Отдельные счетчики, чтобы тесты не попадали в сводку повторов сессии
+OVERLAY_METRICS = RetryMetrics()
+
+
+@pytest.fixture
+def metrics():
+    return RetryMetrics()
+
+
+def test_backoff_is_exponential_and_capped():
+    policy = RetryPolicy(base_delay=0.1, multiplier=2, max_delay=0.5)
+
+    assert [policy.delay(retry) for retry in range(1, 5)] == [0.1, 0.2, 0.4, 0.5]
+
+
+def test_wrapped_selenium_errors_are_transient():
+    policy = RetryPolicy()
+    try:
+        try:
+            raise StaleElementReferenceException("stale")
+        except StaleElementReferenceException as e:
+            raise Exception(f"Ошибка при клике: {e}")
+    except Exception as wrapped:
+        assert policy.is_transient(wrapped)
+    assert not policy.is_transient(NoSuchElementException("missing"))
+
+
+def test_stale_element_is_found_again_on_same_driver(metrics):
+    driver = FakeDriver(base_url=BASE_URL, pages={"/": lambda driver, url: document(el("h1", "Deals", id="title"))})
+    page = BasePage(driver, base_url=BASE_URL)
+    title = BaseElement(page, (By.ID, "title"), "Заголовок")
+    title.retry_policy = RetryPolicy(base_delay=0, metrics=metrics)
+    driver.get("/")
+    assert title.get_text() == "Deals"
+
+    driver.get("/")
+
+    assert title.get_text() == "Deals"
+    counters = metrics.snapshot()["Заголовок.get_text"]
+    assert (counters.retries, counters.recovered, counters.exhausted) == (1, 1, 0)
+
+
+def test_stale_element_without_locator_lookup_is_not_retried(metrics):
+    driver = FakeDriver(base_url=BASE_URL, pages={"/": lambda driver, url: document(el("h1", "Deals", id="title"))})
+    page = BasePage(driver, base_url=BASE_URL)
+    driver.get("/")
+    found = BaseElement(page, (By.ID, "title"), "Заголовок",
+                        element=driver.find_element(By.ID, "title"))
+    found.retry_policy = RetryPolicy(base_delay=0, metrics=metrics)
+
+    driver.get("/")
+
+    with pytest.raises(Exception) as error:
+        found.get_text()
+    assert RetryPolicy().is_transient(error.value)
+    assert metrics.snapshot() == {}
+
+
+class Overlay:
+    def __init__(self, blocked_clicks):
+        self.blocked_clicks = blocked_clicks
+        self.dismissed = 0
+        self.clicks = 0
+
+    @retry(attempts=3, base_delay=0, recover=lambda overlay, error: overlay.dismiss(), metrics=OVERLAY_METRICS)
+    def click_through(self):
+        self.clicks += 1
+        if self.clicks <= self.blocked_clicks:
+            raise ElementClickInterceptedException("overlay")
+        return "clicked"
+
+    @retry(base_delay=0, metrics=OVERLAY_METRICS)
+    def broken(self):
+        self.clicks += 1
+        raise ValueError("not transient")
+
+    def dismiss(self):
+        self.dismissed += 1
+
+
+def test_decorated_method_recovers_before_retry():
+    overlay = Overlay(blocked_clicks=2)
+
+    assert overlay.click_through() == "clicked"
+    assert (overlay.clicks, overlay.dismissed) == (3, 2)
+
+
+def test_retries_are_limited_and_skip_other_errors():
+    overlay = Overlay(blocked_clicks=5)
+    with pytest.raises(ElementClickInterceptedException):
+        overlay.click_through()
+    assert overlay.clicks == 3
+
+    overlay = Overlay(blocked_clicks=0)
+    with pytest.raises(ValueError):
+        overlay.broken()
+    assert overlay.clicks == 1
+
+
+def test_metrics_merge_and_summary(metrics):
+    metrics.record("Корзина.delete", retries=2, succeeded=True)
+    metrics.merge({"Корзина.delete": {"calls": 1, "retries": 2, "recovered": 0, "exhausted": 1,
+                                      "recover_failures": 0}})
+
+    assert metrics.summary_lines() == ["Корзина.delete: повторов 4, помогло 1, не помогло 1"]
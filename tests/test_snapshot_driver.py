@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import pytest
+from selenium.common.exceptions import InvalidSelectorException, WebDriverException
+from selenium.webdriver.common.by import By
+
+from examples.amazon.pages import AmazonCartPage, AmazonHomePage
+from page_object_library import Dropdown
+from page_object_library.testing import (
+    FakeDriver, HtmlSnapshot, SnapshotDriver, document, el, evaluate_xpath, find_all, find_by_xpath, parse_html
+)
+
+BASE_URL = "http://shop.test"
+CART_SNAPSHOT = Path(__file__).parent / "snapshots" / "amazon_cart.html"
+
+
+@pytest.fixture(scope="module")
+def cart_snapshot():
+    return HtmlSnapshot.from_file(CART_SNAPSHOT)
+
+
+@pytest.fixture
+def snapshot_driver(cart_snapshot):
+    return SnapshotDriver({
+        "/gp/cart/view.html": cart_snapshot,
+        "/": '<html><head><title>Amazon.com</title></head><body>'
+             '<a id="nav-cart" href="/gp/cart/view.html">Cart</a></body></html>',
+    }, base_url=BASE_URL)
+
+
+def test_cart_read_paths(snapshot_driver):
+    cart = AmazonCartPage(snapshot_driver, base_url=BASE_URL, driver_name="snapshot").open()
+
+    assert cart.title == "Amazon.com Shopping Cart"
+    assert cart.get_subtotal_as_float() == 1224.48
+    assert cart.get_cart_items_count() == 2
+    assert cart.get_cart_items()[0].get_price() == "$99.99"
+
+
+def test_navigation_between_snapshots(snapshot_driver):
+    home = AmazonHomePage(snapshot_driver, base_url=BASE_URL, driver_name="snapshot").open()
+
+    cart = home.go_to_cart()
+
+    assert snapshot_driver.current_url == f"{BASE_URL}/gp/cart/view.html"
+    assert cart.get_subtotal() == "$1,224.48"
+
+
+def test_snapshot_is_read_only(snapshot_driver):
+    snapshot_driver.get("/gp/cart/view.html")
+
+    with pytest.raises(WebDriverException, match="только для чтения"):
+        snapshot_driver.find_element(By.ID, "twotabsearchtextbox").send_keys("levoit")
+
+
+@pytest.mark.parametrize("by, value", [
+    (By.CSS_SELECTOR, ".sc-list-item .sc-price"),
+    (By.CSS_SELECTOR, "#sc-subtotal-amount-activecart > span, input[data-action='increase-quantity']"),
+    (By.CLASS_NAME, "a-truncate-cut"),
+    (By.NAME, "proceedToRetailCheckout"),
+    (By.TAG_NAME, "input"),
+    (By.CSS_SELECTOR, "[data-asin]"),
+])
+def test_index_matches_tree_walk(cart_snapshot, by, value):
+    expected = find_all(cart_snapshot.document, by, value)
+
+    assert expected
+    assert cart_snapshot.index.find(cart_snapshot.document, by, value) == expected
+
+
+def test_index_scoped_to_element(cart_snapshot):
+    item = cart_snapshot.index.find(cart_snapshot.document, By.CSS_SELECTOR, ".sc-list-item")[1]
+
+    prices = cart_snapshot.index.find(item, By.CLASS_NAME, "sc-price")
+
+    assert [price.text_content() for price in prices] == ["$1,024.50"]
+
+
+def test_hidden_elements_have_no_text(cart_snapshot):
+    hidden_price = find_all(cart_snapshot.document, By.CSS_SELECTOR, "#rhf .sc-price")[0]
+
+    assert not hidden_price.is_displayed() and hidden_price.visible_text() == ""
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("//div[@data-asin='B08XQWSMX9']//span[@class='a-truncate-cut']", ["LEVOIT Core 600S Smart Air Purifier"]),
+    ("//div[contains(@class, 'sc-list-item ')][1]//p/span", ["$99.99"]),
+    ("(//span[contains(@class, 'sc-price')])[last()]", ["$0.00"]),
+    ("//span[normalize-space(text()) = '2']", ["2"]),
+    ("(//a[starts-with(@href, '/dp/')])[2]/ancestor::div[@data-asin]/@data-quantity/..//span[@class='a-dropdown-prompt']",
+     ["1"]),
+    ("//input[@data-action='increase-quantity']/preceding-sibling::span[1]", ["2", "1"]),
+])
+def test_xpath(cart_snapshot, expression, expected):
+    assert [node.text_content() for node in find_by_xpath(cart_snapshot.document, expression)] == expected
+
+
+def test_xpath_values_and_errors():
+    root = parse_html("<ul><li>One</li><li>Two</li></ul>")
+
+    assert evaluate_xpath("count(//li)", root) == 2
+    assert evaluate_xpath("string(//li[2])", root) == "Two"
+    with pytest.raises(InvalidSelectorException):
+        find_by_xpath(root, "//li/text()")
+    with pytest.raises(InvalidSelectorException):
+        find_by_xpath(root, "//li[")
+
+
+def test_dropdown_select_by_text_uses_xpath():
+    driver = FakeDriver({"/": document(el("select", el("option", " One ", value="1"), el("option", "Two", value="2"),
+                                          id="qty"))})
+    driver.get("/")
+    page = AmazonHomePage(driver, base_url=driver.base_url, driver_name="fake")
+    dropdown = Dropdown(page, (By.ID, "qty"), "Количество")
+
+    dropdown.select_by_text("Two")
+
+    assert dropdown.get_selected_option().get_attribute("value") == "2"
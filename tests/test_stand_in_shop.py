@@ -0,0 +1,65 @@
+import re
+from http.cookiejar import CookieJar
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, build_opener
+
+import pytest
+
+from examples.amazon.stand_in_shop import PRODUCTS, StandInShop
+
+
+@pytest.fixture
+def shop():
+    with StandInShop() as shop:
+        yield shop
+
+
+@pytest.fixture
+def browser():
+    return build_opener(HTTPCookieProcessor(CookieJar()))
+
+
+def fetch(browser, url, form=None):
+    data = urlencode(form).encode() if form is not None else None
+    with browser.open(url, data=data) as response:
+        return response.geturl(), response.read().decode("utf-8")
+
+
+def test_pages_expose_locators_used_by_examples(shop, browser):
+    _, home = fetch(browser, shop.url + "/")
+    assert 'id="twotabsearchtextbox"' in home and 'id="nav-cart"' in home
+
+    _, results = fetch(browser, shop.search_url("levoit air purifier"))
+    assert results.count('class="a-size-medium"') == 3
+
+    _, product = fetch(browser, f"{shop.url}/dp/{PRODUCTS[0].asin}")
+    assert 'id="productTitle"' in product and 'id="add-to-cart-button"' in product
+    assert '<span class="a-price-whole">99</span><span class="a-price-fraction">99</span>' in product
+
+
+def test_sign_in_flow(shop, browser):
+    _, email_step = fetch(browser, shop.url + "/ap/signin?openid.mode=checkid_setup")
+    assert 'id="ap_email"' in email_step and 'id="continue"' in email_step
+
+    _, password_step = fetch(browser, shop.url + "/ap/signin?email=user%40example.com")
+    assert 'id="ap_password"' in password_step and 'id="signInSubmit"' in password_step
+
+    url, home = fetch(browser, shop.url + "/ap/signin", {"email": "user@example.com", "password": "secret"})
+    assert url == shop.url + "/"
+    assert "Hello, user@example.com" in home
+
+
+def test_cart_quantity_and_subtotal_are_per_session(shop, browser):
+    asin = PRODUCTS[2].asin
+    url, _ = fetch(browser, shop.url + "/cart/add", {"asin": asin})
+    assert url.endswith(f"/dp/{asin}?added=1")
+
+    _, cart = fetch(browser, shop.url + "/cart/update", {"asin": asin, "action": "+"})
+    assert cart.count('class="sc-list-item"') == 1
+    assert re.search(r'id="sc-subtotal-amount-activecart"><span[^>]*>\$2,499.00<', cart)
+
+    _, other_cart = fetch(build_opener(HTTPCookieProcessor(CookieJar())), shop.url + "/gp/cart/view.html")
+    assert 'class="sc-list-item"' not in other_cart
+
+    _, cart = fetch(browser, shop.url + "/cart/update", {"asin": asin, "action": "Delete"})
+    assert 'class="sc-list-item"' not in cart
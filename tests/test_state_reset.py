@@ -0,0 +1,83 @@
+import pytest
+
+from examples.amazon.stand_in_shop import PRODUCTS, StandInShop
+from page_object_library import DriverFactory, DriverPool, HttpReset, ResetStrategy, StateResetter
+from page_object_library.testing import FakeDriver
+
+
+class RecordingStep(ResetStrategy):
+    def __init__(self, name, calls, error=None):
+        self.name = name
+        self.calls = calls
+        self.error = error
+
+    def reset(self, driver):
+        self.calls.append(self.name)
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.fixture
+def shop():
+    with StandInShop() as shop:
+        yield shop
+
+
+def shop_session(shop, session_id="session-1"):
+    shop.state.users[session_id] = "buyer@example.com"
+    shop.state.carts[session_id] = {PRODUCTS[0].asin: 2}
+    driver = FakeDriver(base_url=shop.url)
+    driver.get("/")
+    driver.add_cookie({"name": "session-id", "value": session_id})
+    return driver
+
+
+def test_http_reset_clears_cart_of_browser_session_only(shop):
+    driver = shop_session(shop)
+    shop.state.carts["other"] = {PRODUCTS[1].asin: 1}
+    resetter = StateResetter().add(HttpReset(shop.reset_url, data={"scope": "cart"}, name="корзина"), first=True)
+
+    assert resetter(driver)
+
+    assert shop.state.carts == {"other": {PRODUCTS[1].asin: 1}}
+    assert shop.state.users == {"session-1": "buyer@example.com"}
+    assert driver.current_url == "about:blank" and driver.get_cookies() == []
+    assert [step.name for step in resetter.strategies][:2] == ["корзина", "алерт"]
+
+
+def test_before_quit_runs_only_site_steps(shop):
+    driver = shop_session(shop)
+    calls = []
+    resetter = StateResetter([HttpReset(shop.reset_url), RecordingStep("браузер", calls)])
+
+    assert resetter.before_quit(driver)
+
+    assert shop.state.carts == {} and shop.state.users == {}
+    assert calls == [] and driver.get_cookies() != []
+
+
+def test_failed_step_stops_reset_and_is_counted():
+    calls = []
+    resetter = StateResetter([RecordingStep("первый", calls, RuntimeError("нет ответа")),
+                              RecordingStep("второй", calls)])
+
+    assert not resetter(FakeDriver())
+    assert resetter.before_quit(FakeDriver())
+
+    assert calls == ["первый"]
+    assert resetter.failures == {"первый": 1}
+    assert "первый: 1 раз" in resetter.summary() and "ошибок 1" in resetter.summary()
+
+
+def test_pool_resets_with_state_resetter(monkeypatch):
+    monkeypatch.setattr(DriverFactory, "create_driver",
+                        staticmethod(lambda *args, **kwargs: FakeDriver(base_url="http://shop.test")))
+    calls = []
+    pool = DriverPool(reset=StateResetter().add(RecordingStep("сайт", calls), first=True))
+    driver = pool.acquire()
+    driver.get("/cart")
+
+    pool.release(driver)
+
+    assert calls == ["сайт"] and driver.current_url == "about:blank"
+    assert pool.acquire() is driver
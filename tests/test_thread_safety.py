@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from page_object_library import MultiDriverManager, MultiPageFactory
+
+THREADS = 32
+DRIVER_NAMES = ["default", "user2", "user3", "user4"]
+
+
+def hammer(func, calls):
+    barrier = threading.Barrier(THREADS)
+
+    def worker(index):
+        barrier.wait()
+        return [func(DRIVER_NAMES[(index + i) % len(DRIVER_NAMES)]) for i in range(calls)]
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        return [result for future in [executor.submit(worker, i) for i in range(THREADS)] for result in future.result()]
+
+
+def test_get_or_create_driver_creates_each_driver_once(fake_drivers):
+    manager = MultiDriverManager()
+
+    results = hammer(manager.get_or_create_driver, calls=20)
+
+    assert Counter(driver.name for driver in fake_drivers) == Counter(DRIVER_NAMES)
+    assert set(map(id, results)) == set(map(id, fake_drivers))
+    assert manager.current_driver_name in DRIVER_NAMES
+    assert sorted(manager.get_all_drivers()) == sorted(DRIVER_NAMES)
+
+
+def test_creation_of_different_drivers_is_not_serialized(fake_drivers, fake_driver_startup_delay):
+    manager = MultiDriverManager()
+    names = [f"user{i}" for i in range(THREADS)]
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        list(executor.map(manager.get_or_create_driver, names))
+    elapsed = time.monotonic() - start
+
+    assert len(fake_drivers) == THREADS
+    assert elapsed < fake_driver_startup_delay * THREADS / 4
+
+
+def test_multi_page_factory_get_factory_is_race_free(fake_drivers):
+    factory = MultiPageFactory(MultiDriverManager(), default_base_url="http://localhost")
+
+    results = hammer(factory.get_factory, calls=20)
+
+    assert len(fake_drivers) == len(DRIVER_NAMES)
+    assert len(set(map(id, results))) == len(DRIVER_NAMES)
+
+
+def test_concurrent_close_and_create(fake_drivers):
+    manager = MultiDriverManager()
+
+    def churn(name):
+        driver = manager.get_or_create_driver(name)
+        manager.close_driver(name)
+        return driver
+
+    hammer(churn, calls=5)
+    manager.close_all_drivers()
+
+    assert manager.get_all_drivers() == {}
+    assert manager.current_driver_name is None
+    assert all(driver.quit_count == 1 for driver in fake_drivers)
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from page_object_library import TimingDatabase, lpt_schedule
+from page_object_library.pytest_plugin import TIMING_KEY, configure_timings, pytest_unconfigure
+from page_object_library.utils.timings import ActionTiming, fill_missing_durations, order_by_history
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = TimingDatabase(tmp_path / "timings.sqlite")
+    yield database
+    database.close()
+
+
+def test_estimates_use_recent_history(database):
+    run_id = database.start_run()
+    for duration in (100.0, 4.0, 6.0):
+        database.record_test(run_id, "test_checkout", duration, "passed")
+    database.record_test(run_id, "test_search", 2.0, "skipped")
+
+    assert database.estimated_durations(history=2) == {"test_checkout": 5.0}
+    assert database.estimated_durations(history=2, before=0) == {}
+
+
+def test_recent_failures_use_last_result(database):
+    run_id = database.start_run()
+    database.record_test(run_id, "test_cart", 1.0, "failed")
+    database.record_test(run_id, "test_login", 1.0, "failed")
+    database.record_test(run_id, "test_login", 1.0, "passed")
+
+    assert database.recent_failures() == {"test_cart"}
+
+
+def test_action_timings_and_prune(database):
+    run_id = database.start_run()
+    click = ActionTiming()
+    click.add(0.5, False)
+    click.add(1.5, True)
+    for _ in range(3):
+        database.record_test(run_id, "test_cart", 1.0, "passed", {"CartPage.click": click})
+        time.sleep(0.001)
+
+    assert database.slowest_actions() == [("CartPage.click", 6, 1.0, 3)]
+    database.prune(keep=1)
+    assert database.slowest_actions() == [("CartPage.click", 2, 1.0, 1)]
+
+
+def test_lpt_schedule_balances_load():
+    durations = {"checkout": 7, "cart": 5, "search": 4, "login": 3, "home": 3, "product": 2}
+
+    shards = lpt_schedule(durations, workers=2)
+
+    assert sorted(shard.load for shard in shards) == [12, 12]
+    assert sorted(key for shard in shards for key in shard.keys) == sorted(durations)
+    assert shards[0].keys[0] == "checkout"
+
+
+def test_order_puts_failed_first_then_longest():
+    durations = fill_missing_durations(["a", "b", "c", "new"], {"a": 1.0, "b": 5.0, "c": 3.0})
+
+    assert durations["new"] == 3.0
+    assert order_by_history(["a", "b", "c", "new"], durations, failed={"a"}) == ["a", "b", "c", "new"]
+
+
+def test_timing_history_is_recorded_only_on_request(plugin_config, tmp_path):
+    config = plugin_config({"--timing-order": False, "--timing-failed-first": False})
+    configure_timings(config)
+    assert config.stash.get(TIMING_KEY, None) is None and not list(tmp_path.iterdir())
+
+    config = plugin_config({"--timing-db": "history.sqlite"})
+    configure_timings(config)
+    assert config.stash.get(TIMING_KEY, None) is not None
+    pytest_unconfigure(config)
+    assert (tmp_path / "history.sqlite").exists()
+
+
+def test_timing_order_under_xdist_requires_loadgroup(plugin_config):
+    with pytest.raises(pytest.UsageError, match="loadgroup"):
+        configure_timings(plugin_config({"--timing-order": True}, numprocesses=2))